@@ -60,6 +60,7 @@ GRANT SELECT ON ALL TABLES IN DATABASE SNOWCORE_PROCUREMENT TO ROLE PUBLIC;
 GRANT SELECT ON FUTURE TABLES IN DATABASE SNOWCORE_PROCUREMENT TO ROLE PUBLIC;
 GRANT SELECT ON ALL VIEWS IN DATABASE SNOWCORE_PROCUREMENT TO ROLE PUBLIC;
 GRANT SELECT ON FUTURE VIEWS IN DATABASE SNOWCORE_PROCUREMENT TO ROLE PUBLIC;
+GRANT USAGE ON FUTURE FUNCTIONS IN DATABASE SNOWCORE_PROCUREMENT TO ROLE PUBLIC;
 
 -- Success message
 SELECT 'Setup completed successfully' AS status;
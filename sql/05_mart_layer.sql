@@ -7,10 +7,12 @@ USE DATABASE SNOWCORE_PROCUREMENT;
 USE SCHEMA PROCUREMENT_MART;
 
 -- =============================================================================
--- V_SPEND_SUMMARY - Consolidated spend analytics
+-- V_SPEND_FACT_SOURCE - Spend lines joined to their dimensions (one row per
+-- current PO line). Source of SPEND_FACT; dashboards read V_SPEND_SUMMARY.
 -- =============================================================================
-CREATE OR REPLACE VIEW V_SPEND_SUMMARY AS
+CREATE OR REPLACE VIEW V_SPEND_FACT_SOURCE AS
 SELECT 
+    pol.PURCHASE_ORDER_LINE_ID,
     po.PURCHASE_ORDER_ID,
     po.PURCHASE_ORDER_NUMBER,
     po.PURCHASE_ORDER_DATE,
@@ -52,6 +54,417 @@ LEFT JOIN ATOMIC.ORGANIZATION org ON po.BILL_TO_ORGANIZATION_ID = org.ORGANIZATI
 LEFT JOIN ATOMIC.SITE site ON po.SHIP_TO_SITE_ID = site.SITE_ID
 WHERE po.IS_CURRENT_FLAG = TRUE;
 
+-- =============================================================================
+-- SPEND_FACT - V_SPEND_FACT_SOURCE materialized, maintained incrementally
+-- Streams on PURCHASE_ORDER and PURCHASE_ORDER_LINE collect changed POs
+-- (new lines, price changes, SCD versions that gained or lost
+-- IS_CURRENT_FLAG). SP_REFRESH_SPEND_FACT re-derives only those POs from
+-- V_SPEND_FACT_SOURCE and MERGEs them in; TASK_REFRESH_SPEND_FACT runs it
+-- whenever a stream has data. Changes to dimension attributes alone (supplier
+-- names, regions, categories) are not tracked: re-run this script to rebuild.
+-- =============================================================================
+CREATE OR REPLACE STREAM STREAM_SPEND_FACT_PO ON TABLE ATOMIC.PURCHASE_ORDER;
+CREATE OR REPLACE STREAM STREAM_SPEND_FACT_POL ON TABLE ATOMIC.PURCHASE_ORDER_LINE;
+
+-- Full build (the streams above were created first, so nothing is missed)
+CREATE OR REPLACE TABLE SPEND_FACT AS
+SELECT * FROM V_SPEND_FACT_SOURCE;
+
+-- Objects are fully qualified: procedures and tasks resolve unqualified names
+-- against the caller's session
+CREATE OR REPLACE PROCEDURE SP_REFRESH_SPEND_FACT()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    MERGE INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_FACT f
+    USING (
+        WITH changed_orders AS (
+            SELECT PURCHASE_ORDER_ID FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SPEND_FACT_PO
+            UNION
+            SELECT PURCHASE_ORDER_ID FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SPEND_FACT_POL
+        ),
+        current_lines AS (
+            SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_FACT_SOURCE
+            WHERE PURCHASE_ORDER_ID IN (SELECT PURCHASE_ORDER_ID FROM changed_orders)
+        ),
+        fact_lines AS (
+            SELECT PURCHASE_ORDER_LINE_ID FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_FACT
+            WHERE PURCHASE_ORDER_ID IN (SELECT PURCHASE_ORDER_ID FROM changed_orders)
+        )
+        -- Fact lines of a changed PO that are no longer current are removed
+        SELECT 
+            COALESCE(cl.PURCHASE_ORDER_LINE_ID, fl.PURCHASE_ORDER_LINE_ID) AS MERGE_KEY,
+            cl.PURCHASE_ORDER_LINE_ID IS NULL AS IS_REMOVED,
+            cl.*
+        FROM current_lines cl
+        FULL OUTER JOIN fact_lines fl ON cl.PURCHASE_ORDER_LINE_ID = fl.PURCHASE_ORDER_LINE_ID
+    ) d
+    ON f.PURCHASE_ORDER_LINE_ID = d.MERGE_KEY
+    WHEN MATCHED AND d.IS_REMOVED THEN DELETE
+    WHEN MATCHED THEN UPDATE SET
+        PURCHASE_ORDER_ID = d.PURCHASE_ORDER_ID,
+        PURCHASE_ORDER_NUMBER = d.PURCHASE_ORDER_NUMBER,
+        PURCHASE_ORDER_DATE = d.PURCHASE_ORDER_DATE,
+        ERP_SOURCE_SYSTEM = d.ERP_SOURCE_SYSTEM,
+        SUPPLIER_ID = d.SUPPLIER_ID,
+        SUPPLIER_CODE = d.SUPPLIER_CODE,
+        SUPPLIER_NAME = d.SUPPLIER_NAME,
+        SUPPLIER_TYPE = d.SUPPLIER_TYPE,
+        SUPPLIER_CLASS = d.SUPPLIER_CLASS,
+        SUPPLIER_CITY = d.SUPPLIER_CITY,
+        SUPPLIER_STATE = d.SUPPLIER_STATE,
+        SUPPLIER_COUNTRY = d.SUPPLIER_COUNTRY,
+        REGION = d.REGION,
+        PRODUCT_ID = d.PRODUCT_ID,
+        PRODUCT_CODE = d.PRODUCT_CODE,
+        PRODUCT_NAME = d.PRODUCT_NAME,
+        MATERIAL_CATEGORY = d.MATERIAL_CATEGORY,
+        CATEGORY_CODE = d.CATEGORY_CODE,
+        ORDERED_QUANTITY = d.ORDERED_QUANTITY,
+        UNIT_PRICE = d.UNIT_PRICE,
+        SPEND_AMOUNT = d.SPEND_AMOUNT,
+        CURRENCY_CODE = d.CURRENCY_CODE,
+        NEED_BY_DATE = d.NEED_BY_DATE,
+        PROMISED_DELIVERY_DATE = d.PROMISED_DELIVERY_DATE,
+        LINE_STATUS = d.LINE_STATUS,
+        BUYING_ORGANIZATION = d.BUYING_ORGANIZATION,
+        SHIP_TO_SITE = d.SHIP_TO_SITE,
+        SHIP_TO_COUNTRY = d.SHIP_TO_COUNTRY
+    WHEN NOT MATCHED AND NOT d.IS_REMOVED THEN INSERT (
+        PURCHASE_ORDER_LINE_ID,
+        PURCHASE_ORDER_ID,
+        PURCHASE_ORDER_NUMBER,
+        PURCHASE_ORDER_DATE,
+        ERP_SOURCE_SYSTEM,
+        SUPPLIER_ID,
+        SUPPLIER_CODE,
+        SUPPLIER_NAME,
+        SUPPLIER_TYPE,
+        SUPPLIER_CLASS,
+        SUPPLIER_CITY,
+        SUPPLIER_STATE,
+        SUPPLIER_COUNTRY,
+        REGION,
+        PRODUCT_ID,
+        PRODUCT_CODE,
+        PRODUCT_NAME,
+        MATERIAL_CATEGORY,
+        CATEGORY_CODE,
+        ORDERED_QUANTITY,
+        UNIT_PRICE,
+        SPEND_AMOUNT,
+        CURRENCY_CODE,
+        NEED_BY_DATE,
+        PROMISED_DELIVERY_DATE,
+        LINE_STATUS,
+        BUYING_ORGANIZATION,
+        SHIP_TO_SITE,
+        SHIP_TO_COUNTRY
+    ) VALUES (
+        d.PURCHASE_ORDER_LINE_ID,
+        d.PURCHASE_ORDER_ID,
+        d.PURCHASE_ORDER_NUMBER,
+        d.PURCHASE_ORDER_DATE,
+        d.ERP_SOURCE_SYSTEM,
+        d.SUPPLIER_ID,
+        d.SUPPLIER_CODE,
+        d.SUPPLIER_NAME,
+        d.SUPPLIER_TYPE,
+        d.SUPPLIER_CLASS,
+        d.SUPPLIER_CITY,
+        d.SUPPLIER_STATE,
+        d.SUPPLIER_COUNTRY,
+        d.REGION,
+        d.PRODUCT_ID,
+        d.PRODUCT_CODE,
+        d.PRODUCT_NAME,
+        d.MATERIAL_CATEGORY,
+        d.CATEGORY_CODE,
+        d.ORDERED_QUANTITY,
+        d.UNIT_PRICE,
+        d.SPEND_AMOUNT,
+        d.CURRENCY_CODE,
+        d.NEED_BY_DATE,
+        d.PROMISED_DELIVERY_DATE,
+        d.LINE_STATUS,
+        d.BUYING_ORGANIZATION,
+        d.SHIP_TO_SITE,
+        d.SHIP_TO_COUNTRY
+    );
+    RETURN 'SPEND_FACT refreshed';
+END;
+$$;
+
+CREATE OR REPLACE TASK TASK_REFRESH_SPEND_FACT
+    WAREHOUSE = SNOWCORE_PROCUREMENT_WH
+    SCHEDULE = '5 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('STREAM_SPEND_FACT_PO') OR SYSTEM$STREAM_HAS_DATA('STREAM_SPEND_FACT_POL')
+AS
+    CALL SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SP_REFRESH_SPEND_FACT();
+
+ALTER TASK TASK_REFRESH_SPEND_FACT RESUME;
+
+-- =============================================================================
+-- V_SPEND_SUMMARY - Consolidated spend analytics (reads the pre-joined SPEND_FACT)
+-- =============================================================================
+CREATE OR REPLACE VIEW V_SPEND_SUMMARY AS
+SELECT 
+    PURCHASE_ORDER_ID,
+    PURCHASE_ORDER_NUMBER,
+    PURCHASE_ORDER_DATE,
+    ERP_SOURCE_SYSTEM,
+    SUPPLIER_ID,
+    SUPPLIER_CODE,
+    SUPPLIER_NAME,
+    SUPPLIER_TYPE,
+    SUPPLIER_CLASS,
+    SUPPLIER_CITY,
+    SUPPLIER_STATE,
+    SUPPLIER_COUNTRY,
+    REGION,
+    PRODUCT_ID,
+    PRODUCT_CODE,
+    PRODUCT_NAME,
+    MATERIAL_CATEGORY,
+    CATEGORY_CODE,
+    ORDERED_QUANTITY,
+    UNIT_PRICE,
+    SPEND_AMOUNT,
+    CURRENCY_CODE,
+    NEED_BY_DATE,
+    PROMISED_DELIVERY_DATE,
+    LINE_STATUS,
+    BUYING_ORGANIZATION,
+    SHIP_TO_SITE,
+    SHIP_TO_COUNTRY
+FROM SPEND_FACT;
+
+-- =============================================================================
+-- Spend snapshots - SPEND_FACT pre-aggregated by month and by day
+-- SPEND_MONTHLY_SNAPSHOT holds closed months and SPEND_DAILY_SNAPSHOT the
+-- current month by day, at region x category x ERP system grain. Spend, line
+-- and PO counts add up across cells (ANCHOR_PO_COUNT counts a multi-category
+-- PO in its first category only); SUPPLIER_SKETCH is an HLL state of
+-- SUPPLIER_CODE, so distinct suppliers over any set of cells are
+-- HLL_ESTIMATE(HLL_COMBINE(SUPPLIER_SKETCH)).
+-- SP_REFRESH_SPEND_SNAPSHOTS re-aggregates the days and months of changed
+-- SPEND_FACT rows and folds finished months from the daily table into the
+-- monthly one.
+-- =============================================================================
+CREATE OR REPLACE VIEW V_SPEND_DAILY_SOURCE AS
+WITH lines AS (
+    SELECT 
+        PURCHASE_ORDER_DATE AS DAY,
+        REGION,
+        MATERIAL_CATEGORY,
+        ERP_SOURCE_SYSTEM,
+        PURCHASE_ORDER_NUMBER,
+        SUPPLIER_CODE,
+        SPEND_AMOUNT,
+        -- A PO spanning several categories is anchored to its first one
+        -- (partitioned by date too, so a filter on DAY is pushed down)
+        MATERIAL_CATEGORY IS NOT DISTINCT FROM
+            MIN(MATERIAL_CATEGORY) OVER (PARTITION BY PURCHASE_ORDER_DATE, PURCHASE_ORDER_NUMBER) AS IS_PO_ANCHOR
+    FROM SPEND_FACT
+)
+SELECT 
+    DAY,
+    REGION,
+    MATERIAL_CATEGORY,
+    ERP_SOURCE_SYSTEM,
+    SUM(SPEND_AMOUNT) AS TOTAL_SPEND,
+    COUNT(*) AS LINE_COUNT,
+    COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS PO_COUNT,
+    COUNT(DISTINCT IFF(IS_PO_ANCHOR, PURCHASE_ORDER_NUMBER, NULL)) AS ANCHOR_PO_COUNT,
+    HLL_ACCUMULATE(SUPPLIER_CODE) AS SUPPLIER_SKETCH
+FROM lines
+GROUP BY DAY, REGION, MATERIAL_CATEGORY, ERP_SOURCE_SYSTEM;
+
+CREATE OR REPLACE STREAM STREAM_SPEND_SNAPSHOTS_FACT ON TABLE SPEND_FACT;
+
+CREATE OR REPLACE TABLE SPEND_DAILY_SNAPSHOT AS
+SELECT * FROM V_SPEND_DAILY_SOURCE
+WHERE DAY >= DATE_TRUNC('month', CURRENT_DATE());
+
+CREATE OR REPLACE TABLE SPEND_MONTHLY_SNAPSHOT AS
+SELECT 
+    DATE_TRUNC('month', DAY) AS MONTH,
+    REGION,
+    MATERIAL_CATEGORY,
+    ERP_SOURCE_SYSTEM,
+    SUM(TOTAL_SPEND) AS TOTAL_SPEND,
+    SUM(LINE_COUNT) AS LINE_COUNT,
+    SUM(PO_COUNT) AS PO_COUNT,
+    SUM(ANCHOR_PO_COUNT) AS ANCHOR_PO_COUNT,
+    HLL_COMBINE(SUPPLIER_SKETCH) AS SUPPLIER_SKETCH
+FROM V_SPEND_DAILY_SOURCE
+WHERE DAY < DATE_TRUNC('month', CURRENT_DATE())
+GROUP BY DATE_TRUNC('month', DAY), REGION, MATERIAL_CATEGORY, ERP_SOURCE_SYSTEM;
+
+-- One transaction: every statement sees the same stream contents, and the
+-- stream is consumed at COMMIT
+CREATE OR REPLACE PROCEDURE SP_REFRESH_SPEND_SNAPSHOTS()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    BEGIN TRANSACTION;
+    -- Closed months that changed, or whose days are still in the daily table
+    DELETE FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_MONTHLY_SNAPSHOT
+    WHERE MONTH IN (
+        SELECT DATE_TRUNC('month', PURCHASE_ORDER_DATE) FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SPEND_SNAPSHOTS_FACT
+        WHERE PURCHASE_ORDER_DATE < DATE_TRUNC('month', CURRENT_DATE())
+        UNION
+        SELECT DATE_TRUNC('month', DAY) FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_DAILY_SNAPSHOT
+        WHERE DAY < DATE_TRUNC('month', CURRENT_DATE())
+    );
+    INSERT INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_MONTHLY_SNAPSHOT
+    SELECT 
+        DATE_TRUNC('month', DAY) AS MONTH,
+        REGION,
+        MATERIAL_CATEGORY,
+        ERP_SOURCE_SYSTEM,
+        SUM(TOTAL_SPEND),
+        SUM(LINE_COUNT),
+        SUM(PO_COUNT),
+        SUM(ANCHOR_PO_COUNT),
+        HLL_COMBINE(SUPPLIER_SKETCH)
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_DAILY_SOURCE
+    WHERE DATE_TRUNC('month', DAY) IN (
+        SELECT DATE_TRUNC('month', PURCHASE_ORDER_DATE) FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SPEND_SNAPSHOTS_FACT
+        WHERE PURCHASE_ORDER_DATE < DATE_TRUNC('month', CURRENT_DATE())
+        UNION
+        SELECT DATE_TRUNC('month', DAY) FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_DAILY_SNAPSHOT
+        WHERE DAY < DATE_TRUNC('month', CURRENT_DATE())
+    )
+    GROUP BY DATE_TRUNC('month', DAY), REGION, MATERIAL_CATEGORY, ERP_SOURCE_SYSTEM;
+
+    -- Current-month days that changed; finished months leave the daily table
+    DELETE FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_DAILY_SNAPSHOT
+    WHERE DAY < DATE_TRUNC('month', CURRENT_DATE())
+        OR DAY IN (SELECT PURCHASE_ORDER_DATE FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SPEND_SNAPSHOTS_FACT);
+    INSERT INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_DAILY_SNAPSHOT
+    SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_DAILY_SOURCE
+    WHERE DAY IN (
+        SELECT PURCHASE_ORDER_DATE FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SPEND_SNAPSHOTS_FACT
+        WHERE PURCHASE_ORDER_DATE >= DATE_TRUNC('month', CURRENT_DATE())
+    );
+    COMMIT;
+    RETURN 'Spend snapshots refreshed';
+END;
+$$;
+
+CREATE OR REPLACE TASK TASK_REFRESH_SPEND_SNAPSHOTS
+    WAREHOUSE = SNOWCORE_PROCUREMENT_WH
+    SCHEDULE = '5 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('STREAM_SPEND_SNAPSHOTS_FACT')
+AS
+    CALL SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SP_REFRESH_SPEND_SNAPSHOTS();
+
+ALTER TASK TASK_REFRESH_SPEND_SNAPSHOTS RESUME;
+
+-- =============================================================================
+-- V_SPEND_MONTHLY - Monthly spend snapshot (closed months plus current month to date)
+-- =============================================================================
+CREATE OR REPLACE VIEW V_SPEND_MONTHLY AS
+SELECT 
+    MONTH,
+    REGION,
+    MATERIAL_CATEGORY,
+    ERP_SOURCE_SYSTEM,
+    TOTAL_SPEND,
+    LINE_COUNT,
+    PO_COUNT,
+    ANCHOR_PO_COUNT,
+    SUPPLIER_SKETCH
+FROM SPEND_MONTHLY_SNAPSHOT
+UNION ALL
+SELECT 
+    DATE_TRUNC('month', DAY) AS MONTH,
+    REGION,
+    MATERIAL_CATEGORY,
+    ERP_SOURCE_SYSTEM,
+    SUM(TOTAL_SPEND) AS TOTAL_SPEND,
+    SUM(LINE_COUNT) AS LINE_COUNT,
+    SUM(PO_COUNT) AS PO_COUNT,
+    SUM(ANCHOR_PO_COUNT) AS ANCHOR_PO_COUNT,
+    HLL_COMBINE(SUPPLIER_SKETCH) AS SUPPLIER_SKETCH
+FROM SPEND_DAILY_SNAPSHOT
+GROUP BY DATE_TRUNC('month', DAY), REGION, MATERIAL_CATEGORY, ERP_SOURCE_SYSTEM;
+
+-- =============================================================================
+-- SUPPLIER_SPEND_ROLLUP - Current PO spend and PO count per supplier
+-- Maintained like SPEND_FACT: STREAM_SUPPLIER_SPEND_PO collects changed POs
+-- and SP_REFRESH_SUPPLIER_SPEND re-aggregates only their suppliers (a
+-- reassigned PO appears under both, as a stream records an update as
+-- delete + insert). Suppliers left without current POs are removed.
+-- =============================================================================
+CREATE OR REPLACE STREAM STREAM_SUPPLIER_SPEND_PO ON TABLE ATOMIC.PURCHASE_ORDER;
+
+CREATE OR REPLACE TABLE SUPPLIER_SPEND_ROLLUP AS
+SELECT 
+    SUPPLIER_ID,
+    SUM(TOTAL_PURCHASE_ORDER_VALUE) AS TOTAL_SPEND,
+    COUNT(DISTINCT PURCHASE_ORDER_ID) AS PO_COUNT
+FROM ATOMIC.PURCHASE_ORDER
+WHERE IS_CURRENT_FLAG = TRUE
+  AND SUPPLIER_ID IS NOT NULL
+GROUP BY SUPPLIER_ID;
+
+CREATE OR REPLACE PROCEDURE SP_REFRESH_SUPPLIER_SPEND()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    MERGE INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SUPPLIER_SPEND_ROLLUP r
+    USING (
+        WITH changed_suppliers AS (
+            SELECT DISTINCT SUPPLIER_ID
+            FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SUPPLIER_SPEND_PO
+            WHERE SUPPLIER_ID IS NOT NULL
+        ),
+        current_spend AS (
+            SELECT 
+                SUPPLIER_ID,
+                SUM(TOTAL_PURCHASE_ORDER_VALUE) AS TOTAL_SPEND,
+                COUNT(DISTINCT PURCHASE_ORDER_ID) AS PO_COUNT
+            FROM SNOWCORE_PROCUREMENT.ATOMIC.PURCHASE_ORDER
+            WHERE IS_CURRENT_FLAG = TRUE
+              AND SUPPLIER_ID IN (SELECT SUPPLIER_ID FROM changed_suppliers)
+            GROUP BY SUPPLIER_ID
+        )
+        SELECT 
+            cs.SUPPLIER_ID,
+            sp.TOTAL_SPEND,
+            sp.PO_COUNT,
+            sp.SUPPLIER_ID IS NULL AS IS_REMOVED
+        FROM changed_suppliers cs
+        LEFT JOIN current_spend sp ON cs.SUPPLIER_ID = sp.SUPPLIER_ID
+    ) d
+    ON r.SUPPLIER_ID = d.SUPPLIER_ID
+    WHEN MATCHED AND d.IS_REMOVED THEN DELETE
+    WHEN MATCHED THEN UPDATE SET
+        TOTAL_SPEND = d.TOTAL_SPEND,
+        PO_COUNT = d.PO_COUNT
+    WHEN NOT MATCHED AND NOT d.IS_REMOVED THEN INSERT (SUPPLIER_ID, TOTAL_SPEND, PO_COUNT)
+        VALUES (d.SUPPLIER_ID, d.TOTAL_SPEND, d.PO_COUNT);
+    RETURN 'SUPPLIER_SPEND_ROLLUP refreshed';
+END;
+$$;
+
+CREATE OR REPLACE TASK TASK_REFRESH_SUPPLIER_SPEND
+    WAREHOUSE = SNOWCORE_PROCUREMENT_WH
+    SCHEDULE = '5 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('STREAM_SUPPLIER_SPEND_PO')
+AS
+    CALL SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SP_REFRESH_SUPPLIER_SPEND();
+
+ALTER TASK TASK_REFRESH_SUPPLIER_SPEND RESUME;
+
 -- =============================================================================
 -- V_SUPPLIER_RISK - Supplier risk with financial health
 -- =============================================================================
@@ -102,89 +515,83 @@ JOIN ATOMIC.PARTY p ON s.PARTY_ID = p.PARTY_ID
 LEFT JOIN ATOMIC.PARTY_ADDRESS pa ON p.PARTY_ID = pa.PARTY_ID AND pa.PRIMARY_ADDRESS_FLAG = TRUE
 LEFT JOIN ATOMIC.GEOGRAPHY g ON pa.GEOGRAPHY_ID = g.GEOGRAPHY_ID
 LEFT JOIN ATOMIC.MARKETPLACE_SUPPLIER_RISK msr ON s.SUPPLIER_ID = msr.SUPPLIER_ID AND msr.IS_CURRENT_FLAG = TRUE
-LEFT JOIN (
-    SELECT 
-        SUPPLIER_ID,
-        SUM(TOTAL_PURCHASE_ORDER_VALUE) AS TOTAL_SPEND,
-        COUNT(DISTINCT PURCHASE_ORDER_ID) AS PO_COUNT
-    FROM ATOMIC.PURCHASE_ORDER
-    WHERE IS_CURRENT_FLAG = TRUE
-    GROUP BY SUPPLIER_ID
-) spend ON s.SUPPLIER_ID = spend.SUPPLIER_ID
+LEFT JOIN SUPPLIER_SPEND_ROLLUP spend ON s.SUPPLIER_ID = spend.SUPPLIER_ID
 WHERE s.IS_CURRENT_FLAG = TRUE;
 
 -- =============================================================================
 -- V_SHOULD_COST_ANALYSIS - Contract Price vs Market Index
--- Uses ROW_NUMBER() window function to get closest market index (avoids LATERAL)
+-- Each PO line is priced against the latest commodity index at or before its
+-- PO date with an ASOF JOIN: one sorted merge over lines and index history,
+-- linear in both (no lines x history join ranked with ROW_NUMBER())
 -- =============================================================================
 CREATE OR REPLACE VIEW V_SHOULD_COST_ANALYSIS AS
+WITH po_lines AS (
+    SELECT 
+        pol.PURCHASE_ORDER_LINE_ID,
+        po.PURCHASE_ORDER_NUMBER,
+        po.PURCHASE_ORDER_DATE,
+        po.ERP_SOURCE_SYSTEM,
+        s.SUPPLIER_CODE,
+        p.PARTY_NAME AS SUPPLIER_NAME,
+        prod.PRODUCT_CODE,
+        prod.PRODUCT_NAME,
+        pc.CATEGORY_NAME AS MATERIAL_CATEGORY,
+        pol.ORDERED_QUANTITY,
+        pol.UNIT_PRICE,
+        pol.EXTENDED_PRICE,
+        cur.CURRENCY_CODE
+    FROM ATOMIC.PURCHASE_ORDER po
+    JOIN ATOMIC.PURCHASE_ORDER_LINE pol ON po.PURCHASE_ORDER_ID = pol.PURCHASE_ORDER_ID
+    JOIN ATOMIC.SUPPLIER s ON po.SUPPLIER_ID = s.SUPPLIER_ID
+    JOIN ATOMIC.PARTY p ON s.PARTY_ID = p.PARTY_ID
+    LEFT JOIN ATOMIC.PRODUCT prod ON pol.PRODUCT_ID = prod.PRODUCT_ID
+    LEFT JOIN ATOMIC.PRODUCT_CATEGORY pc ON prod.PRODUCT_CATEGORY_ID = pc.PRODUCT_CATEGORY_ID
+    LEFT JOIN ATOMIC.CURRENCY cur ON po.CURRENCY_ID = cur.CURRENCY_ID
+    WHERE po.IS_CURRENT_FLAG = TRUE
+)
 SELECT 
-    pol.PURCHASE_ORDER_LINE_ID,
-    po.PURCHASE_ORDER_NUMBER,
-    po.PURCHASE_ORDER_DATE,
-    po.ERP_SOURCE_SYSTEM,
-    s.SUPPLIER_CODE,
-    p.PARTY_NAME AS SUPPLIER_NAME,
-    prod.PRODUCT_CODE,
-    prod.PRODUCT_NAME,
-    pc.CATEGORY_NAME AS MATERIAL_CATEGORY,
-    pol.ORDERED_QUANTITY,
-    pol.UNIT_PRICE AS CONTRACT_UNIT_PRICE,
-    pol.EXTENDED_PRICE AS CONTRACT_TOTAL,
-    cur.CURRENCY_CODE,
-    -- Get closest market index
-    market_price.COMMODITY_TYPE,
-    market_price.INDEX_VALUE AS MARKET_INDEX_PRICE,
-    market_price.INDEX_DATE AS MARKET_PRICE_DATE,
+    l.PURCHASE_ORDER_LINE_ID,
+    l.PURCHASE_ORDER_NUMBER,
+    l.PURCHASE_ORDER_DATE,
+    l.ERP_SOURCE_SYSTEM,
+    l.SUPPLIER_CODE,
+    l.SUPPLIER_NAME,
+    l.PRODUCT_CODE,
+    l.PRODUCT_NAME,
+    l.MATERIAL_CATEGORY,
+    l.ORDERED_QUANTITY,
+    l.UNIT_PRICE AS CONTRACT_UNIT_PRICE,
+    l.EXTENDED_PRICE AS CONTRACT_TOTAL,
+    l.CURRENCY_CODE,
+    -- Latest market index at or before the PO date (NULL if none)
+    mci.COMMODITY_TYPE,
+    mci.INDEX_VALUE AS MARKET_INDEX_PRICE,
+    mci.INDEX_DATE AS MARKET_PRICE_DATE,
     -- Calculate variance
-    pol.UNIT_PRICE - market_price.INDEX_VALUE AS PRICE_VARIANCE,
+    l.UNIT_PRICE - mci.INDEX_VALUE AS PRICE_VARIANCE,
     CASE 
-        WHEN market_price.INDEX_VALUE > 0 
-        THEN ROUND(((pol.UNIT_PRICE - market_price.INDEX_VALUE) / market_price.INDEX_VALUE) * 100, 2)
+        WHEN mci.INDEX_VALUE > 0 
+        THEN ROUND(((l.UNIT_PRICE - mci.INDEX_VALUE) / mci.INDEX_VALUE) * 100, 2)
         ELSE 0 
     END AS PRICE_VARIANCE_PCT,
     -- Calculate potential savings
     CASE 
-        WHEN pol.UNIT_PRICE > market_price.INDEX_VALUE 
-        THEN (pol.UNIT_PRICE - market_price.INDEX_VALUE) * pol.ORDERED_QUANTITY
+        WHEN l.UNIT_PRICE > mci.INDEX_VALUE 
+        THEN (l.UNIT_PRICE - mci.INDEX_VALUE) * l.ORDERED_QUANTITY
         ELSE 0 
     END AS POTENTIAL_SAVINGS,
     -- Should-cost recommendation
     CASE 
-        WHEN pol.UNIT_PRICE > market_price.INDEX_VALUE * 1.15 THEN 'RENEGOTIATE'
-        WHEN pol.UNIT_PRICE > market_price.INDEX_VALUE * 1.05 THEN 'REVIEW'
-        WHEN pol.UNIT_PRICE < market_price.INDEX_VALUE * 0.95 THEN 'FAVORABLE'
+        WHEN l.UNIT_PRICE > mci.INDEX_VALUE * 1.15 THEN 'RENEGOTIATE'
+        WHEN l.UNIT_PRICE > mci.INDEX_VALUE * 1.05 THEN 'REVIEW'
+        WHEN l.UNIT_PRICE < mci.INDEX_VALUE * 0.95 THEN 'FAVORABLE'
         ELSE 'MARKET_RATE'
     END AS SHOULD_COST_RECOMMENDATION
-FROM ATOMIC.PURCHASE_ORDER po
-JOIN ATOMIC.PURCHASE_ORDER_LINE pol ON po.PURCHASE_ORDER_ID = pol.PURCHASE_ORDER_ID
-JOIN ATOMIC.SUPPLIER s ON po.SUPPLIER_ID = s.SUPPLIER_ID
-JOIN ATOMIC.PARTY p ON s.PARTY_ID = p.PARTY_ID
-LEFT JOIN ATOMIC.PRODUCT prod ON pol.PRODUCT_ID = prod.PRODUCT_ID
-LEFT JOIN ATOMIC.PRODUCT_CATEGORY pc ON prod.PRODUCT_CATEGORY_ID = pc.PRODUCT_CATEGORY_ID
-LEFT JOIN ATOMIC.CURRENCY cur ON po.CURRENCY_ID = cur.CURRENCY_ID
--- Join to closest market index using ROW_NUMBER() approach
-LEFT JOIN (
-    SELECT 
-        pol2.PURCHASE_ORDER_LINE_ID,
-        mci.COMMODITY_TYPE,
-        mci.INDEX_VALUE,
-        mci.INDEX_DATE,
-        ROW_NUMBER() OVER (
-            PARTITION BY pol2.PURCHASE_ORDER_LINE_ID 
-            ORDER BY mci.INDEX_DATE DESC
-        ) AS rn
-    FROM ATOMIC.PURCHASE_ORDER_LINE pol2
-    JOIN ATOMIC.PURCHASE_ORDER po2 ON pol2.PURCHASE_ORDER_ID = po2.PURCHASE_ORDER_ID
-    JOIN ATOMIC.PRODUCT prod2 ON pol2.PRODUCT_ID = prod2.PRODUCT_ID
-    JOIN ATOMIC.PRODUCT_CATEGORY pc2 ON prod2.PRODUCT_CATEGORY_ID = pc2.PRODUCT_CATEGORY_ID
-    JOIN ATOMIC.MARKETPLACE_COMMODITY_INDEX mci 
-        ON mci.COMMODITY_TYPE = pc2.CATEGORY_NAME
-        AND mci.INDEX_DATE <= po2.PURCHASE_ORDER_DATE
-    WHERE po2.IS_CURRENT_FLAG = TRUE
-) market_price ON pol.PURCHASE_ORDER_LINE_ID = market_price.PURCHASE_ORDER_LINE_ID 
-    AND market_price.rn = 1
-WHERE po.IS_CURRENT_FLAG = TRUE;
+FROM po_lines l
+-- Lines without a matching index row are kept with NULL market columns
+ASOF JOIN ATOMIC.MARKETPLACE_COMMODITY_INDEX mci
+    MATCH_CONDITION (l.PURCHASE_ORDER_DATE >= mci.INDEX_DATE)
+    ON l.MATERIAL_CATEGORY = mci.COMMODITY_TYPE;
 
 -- =============================================================================
 -- V_SUPPLIER_PERFORMANCE_SUMMARY - Aggregated supplier KPIs
@@ -213,6 +620,141 @@ LEFT JOIN ATOMIC.SUPPLIER_PERFORMANCE sp ON s.SUPPLIER_ID = sp.SUPPLIER_ID
 WHERE s.IS_CURRENT_FLAG = TRUE
 GROUP BY s.SUPPLIER_ID, s.SUPPLIER_CODE, p.PARTY_NAME, s.SUPPLIER_TYPE;
 
+-- =============================================================================
+-- V_SUPPLIER_EMISSIONS_SOURCE - Emission records on one schema
+-- SCOPED rows are EMISSION_RECORD_SCOPED (GHG Protocol scopes, V_SCOPE_*);
+-- CO2_RECORD rows are the CO2 readings in EMISSION_RECORD behind the supplier
+-- (Scope 3) emissions of V_ESG_SUMMARY and the carbon footprint of
+-- V_EXECUTIVE_KPIS. The two are kept apart so each view totals the same
+-- records as before.
+-- =============================================================================
+CREATE OR REPLACE VIEW V_SUPPLIER_EMISSIONS_SOURCE AS
+SELECT 
+    'SCOPED' AS RECORD_SOURCE,
+    SUPPLIER_ID,
+    SCOPE_TYPE,
+    DATE_TRUNC('month', RECORD_DATE) AS MONTH,
+    EMISSION_QUANTITY_MT AS EMISSION_MT
+FROM ATOMIC.EMISSION_RECORD_SCOPED
+UNION ALL
+SELECT 
+    'CO2_RECORD' AS RECORD_SOURCE,
+    SUPPLIER_ID,
+    'SCOPE_3' AS SCOPE_TYPE,
+    DATE_TRUNC('month', RECORD_DATE) AS MONTH,
+    EMISSION_QUANTITY AS EMISSION_MT
+FROM ATOMIC.EMISSION_RECORD
+WHERE POLLUTANT_NAME = 'CO2';
+
+-- =============================================================================
+-- SUPPLIER_EMISSIONS_MONTHLY - Emissions per supplier x scope x month
+-- Serves V_ESG_SUMMARY, V_EXECUTIVE_KPIS, V_SCOPE_EMISSIONS and
+-- V_SCOPE_EMISSIONS_SUMMARY.
+-- STREAM_EMISSIONS_SCOPED and STREAM_EMISSIONS_CO2 collect changed records;
+-- SP_REFRESH_SUPPLIER_EMISSIONS re-aggregates only their cells and removes
+-- cells left without records.
+-- =============================================================================
+CREATE OR REPLACE STREAM STREAM_EMISSIONS_SCOPED ON TABLE ATOMIC.EMISSION_RECORD_SCOPED;
+CREATE OR REPLACE STREAM STREAM_EMISSIONS_CO2 ON TABLE ATOMIC.EMISSION_RECORD;
+
+CREATE OR REPLACE TABLE SUPPLIER_EMISSIONS_MONTHLY AS
+SELECT 
+    RECORD_SOURCE,
+    SUPPLIER_ID,
+    SCOPE_TYPE,
+    MONTH,
+    SUM(EMISSION_MT) AS EMISSION_MT,
+    COUNT(*) AS RECORD_COUNT,
+    COUNT(EMISSION_MT) AS MEASURED_RECORD_COUNT
+FROM V_SUPPLIER_EMISSIONS_SOURCE
+GROUP BY RECORD_SOURCE, SUPPLIER_ID, SCOPE_TYPE, MONTH;
+
+CREATE OR REPLACE PROCEDURE SP_REFRESH_SUPPLIER_EMISSIONS()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    MERGE INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SUPPLIER_EMISSIONS_MONTHLY r
+    USING (
+        WITH changed_cells AS (
+            SELECT DISTINCT
+                'SCOPED' AS RECORD_SOURCE,
+                SUPPLIER_ID,
+                SCOPE_TYPE,
+                DATE_TRUNC('month', RECORD_DATE) AS MONTH
+            FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_EMISSIONS_SCOPED
+            UNION
+            SELECT DISTINCT
+                'CO2_RECORD' AS RECORD_SOURCE,
+                SUPPLIER_ID,
+                'SCOPE_3' AS SCOPE_TYPE,
+                DATE_TRUNC('month', RECORD_DATE) AS MONTH
+            FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_EMISSIONS_CO2
+            WHERE POLLUTANT_NAME = 'CO2'
+        ),
+        current_cells AS (
+            SELECT 
+                src.RECORD_SOURCE,
+                src.SUPPLIER_ID,
+                src.SCOPE_TYPE,
+                src.MONTH,
+                SUM(src.EMISSION_MT) AS EMISSION_MT,
+                COUNT(*) AS RECORD_COUNT,
+                COUNT(src.EMISSION_MT) AS MEASURED_RECORD_COUNT
+            FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SUPPLIER_EMISSIONS_SOURCE src
+            JOIN changed_cells cc
+                ON src.RECORD_SOURCE = cc.RECORD_SOURCE
+                AND src.SUPPLIER_ID IS NOT DISTINCT FROM cc.SUPPLIER_ID
+                AND src.SCOPE_TYPE = cc.SCOPE_TYPE
+                AND src.MONTH IS NOT DISTINCT FROM cc.MONTH
+            GROUP BY src.RECORD_SOURCE, src.SUPPLIER_ID, src.SCOPE_TYPE, src.MONTH
+        )
+        SELECT 
+            cc.RECORD_SOURCE,
+            cc.SUPPLIER_ID,
+            cc.SCOPE_TYPE,
+            cc.MONTH,
+            cur.EMISSION_MT,
+            cur.RECORD_COUNT,
+            cur.MEASURED_RECORD_COUNT,
+            cur.RECORD_SOURCE IS NULL AS IS_REMOVED
+        FROM changed_cells cc
+        LEFT JOIN current_cells cur
+            ON cc.RECORD_SOURCE = cur.RECORD_SOURCE
+            AND cc.SUPPLIER_ID IS NOT DISTINCT FROM cur.SUPPLIER_ID
+            AND cc.SCOPE_TYPE = cur.SCOPE_TYPE
+            AND cc.MONTH IS NOT DISTINCT FROM cur.MONTH
+    ) d
+    ON r.RECORD_SOURCE = d.RECORD_SOURCE
+        AND r.SUPPLIER_ID IS NOT DISTINCT FROM d.SUPPLIER_ID
+        AND r.SCOPE_TYPE = d.SCOPE_TYPE
+        AND r.MONTH IS NOT DISTINCT FROM d.MONTH
+    WHEN MATCHED AND d.IS_REMOVED THEN DELETE
+    WHEN MATCHED THEN UPDATE SET
+        EMISSION_MT = d.EMISSION_MT,
+        RECORD_COUNT = d.RECORD_COUNT,
+        MEASURED_RECORD_COUNT = d.MEASURED_RECORD_COUNT
+    WHEN NOT MATCHED AND NOT d.IS_REMOVED THEN INSERT (
+        RECORD_SOURCE, SUPPLIER_ID, SCOPE_TYPE, MONTH,
+        EMISSION_MT, RECORD_COUNT, MEASURED_RECORD_COUNT
+    ) VALUES (
+        d.RECORD_SOURCE, d.SUPPLIER_ID, d.SCOPE_TYPE, d.MONTH,
+        d.EMISSION_MT, d.RECORD_COUNT, d.MEASURED_RECORD_COUNT
+    );
+    RETURN 'SUPPLIER_EMISSIONS_MONTHLY refreshed';
+END;
+$$;
+
+CREATE OR REPLACE TASK TASK_REFRESH_SUPPLIER_EMISSIONS
+    WAREHOUSE = SNOWCORE_PROCUREMENT_WH
+    SCHEDULE = '5 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('STREAM_EMISSIONS_SCOPED') OR SYSTEM$STREAM_HAS_DATA('STREAM_EMISSIONS_CO2')
+AS
+    CALL SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SP_REFRESH_SUPPLIER_EMISSIONS();
+
+ALTER TASK TASK_REFRESH_SUPPLIER_EMISSIONS RESUME;
+
 -- =============================================================================
 -- V_ESG_SUMMARY - ESG/Sustainability metrics
 -- =============================================================================
@@ -251,9 +793,9 @@ LEFT JOIN ATOMIC.MARKETPLACE_SUPPLIER_RISK msr ON s.SUPPLIER_ID = msr.SUPPLIER_I
 LEFT JOIN (
     SELECT 
         SUPPLIER_ID,
-        SUM(EMISSION_QUANTITY) AS TOTAL_EMISSIONS
-    FROM ATOMIC.EMISSION_RECORD
-    WHERE POLLUTANT_NAME = 'CO2'
+        SUM(EMISSION_MT) AS TOTAL_EMISSIONS
+    FROM SUPPLIER_EMISSIONS_MONTHLY
+    WHERE RECORD_SOURCE = 'CO2_RECORD'
     GROUP BY SUPPLIER_ID
 ) em ON s.SUPPLIER_ID = em.SUPPLIER_ID
 LEFT JOIN (
@@ -350,9 +892,106 @@ SELECT
     -- Average ESG Score
     (SELECT AVG(ESG_SCORE) FROM ATOMIC.MARKETPLACE_SUPPLIER_RISK WHERE IS_CURRENT_FLAG = TRUE AND ESG_SCORE IS NOT NULL) AS AVG_ESG_SCORE,
     -- Total Carbon Footprint (MT)
-    (SELECT SUM(EMISSION_QUANTITY) FROM ATOMIC.EMISSION_RECORD WHERE POLLUTANT_NAME = 'CO2') AS TOTAL_CARBON_FOOTPRINT_MT,
+    (SELECT SUM(EMISSION_MT) FROM SUPPLIER_EMISSIONS_MONTHLY WHERE RECORD_SOURCE = 'CO2_RECORD') AS TOTAL_CARBON_FOOTPRINT_MT,
     -- ERP Source Count (simulating 50+ ERPs)
     (SELECT COUNT(DISTINCT ERP_SOURCE_SYSTEM) FROM ATOMIC.PURCHASE_ORDER WHERE IS_CURRENT_FLAG = TRUE) AS ERP_SOURCE_COUNT;
 
+-- =============================================================================
+-- EXECUTIVE_KPI_HISTORY - Timestamped V_EXECUTIVE_KPIS snapshots
+-- TASK_SNAPSHOT_EXECUTIVE_KPIS appends the KPI row every hour, so the
+-- Executive Control Tower reads one stored row (EXECUTIVE_KPIS_AS_OF)
+-- instead of evaluating the view, and KPI trends come from the history.
+-- Kept across redeploys (CREATE IF NOT EXISTS).
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS EXECUTIVE_KPI_HISTORY (
+    SNAPSHOT_TIMESTAMP TIMESTAMP_NTZ NOT NULL,
+    TOTAL_SPEND NUMBER(38,2),
+    TOTAL_SUPPLIERS NUMBER(38,0),
+    ACTIVE_POS NUMBER(38,0),
+    RISK_EXPOSURE_AMOUNT NUMBER(38,2),
+    HIGH_RISK_SUPPLIER_COUNT NUMBER(38,0),
+    AVG_ESG_SCORE FLOAT,
+    TOTAL_CARBON_FOOTPRINT_MT NUMBER(38,4),
+    ERP_SOURCE_COUNT NUMBER(38,0)
+);
+
+CREATE OR REPLACE PROCEDURE SP_SNAPSHOT_EXECUTIVE_KPIS()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    INSERT INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.EXECUTIVE_KPI_HISTORY (
+        SNAPSHOT_TIMESTAMP,
+        TOTAL_SPEND,
+        TOTAL_SUPPLIERS,
+        ACTIVE_POS,
+        RISK_EXPOSURE_AMOUNT,
+        HIGH_RISK_SUPPLIER_COUNT,
+        AVG_ESG_SCORE,
+        TOTAL_CARBON_FOOTPRINT_MT,
+        ERP_SOURCE_COUNT
+    )
+    SELECT 
+        CURRENT_TIMESTAMP(),
+        TOTAL_SPEND,
+        TOTAL_SUPPLIERS,
+        ACTIVE_POS,
+        RISK_EXPOSURE_AMOUNT,
+        HIGH_RISK_SUPPLIER_COUNT,
+        AVG_ESG_SCORE,
+        TOTAL_CARBON_FOOTPRINT_MT,
+        ERP_SOURCE_COUNT
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_EXECUTIVE_KPIS;
+    RETURN 'Executive KPI snapshot taken';
+END;
+$$;
+
+CREATE OR REPLACE TASK TASK_SNAPSHOT_EXECUTIVE_KPIS
+    WAREHOUSE = SNOWCORE_PROCUREMENT_WH
+    SCHEDULE = '60 MINUTE'
+AS
+    CALL SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SP_SNAPSHOT_EXECUTIVE_KPIS();
+
+ALTER TASK TASK_SNAPSHOT_EXECUTIVE_KPIS RESUME;
+
+-- =============================================================================
+-- EXECUTIVE_KPIS_AS_OF - Most recent executive KPI snapshot
+-- EXECUTIVE_KPIS_AS_OF(AS_OF) returns the last snapshot taken by the end of
+-- AS_OF, so past days replay the KPIs shown then.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION EXECUTIVE_KPIS_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    SNAPSHOT_TIMESTAMP TIMESTAMP_NTZ,
+    TOTAL_SPEND NUMBER(38,2),
+    TOTAL_SUPPLIERS NUMBER(38,0),
+    ACTIVE_POS NUMBER(38,0),
+    RISK_EXPOSURE_AMOUNT NUMBER(38,2),
+    HIGH_RISK_SUPPLIER_COUNT NUMBER(38,0),
+    AVG_ESG_SCORE FLOAT,
+    TOTAL_CARBON_FOOTPRINT_MT NUMBER(38,4),
+    ERP_SOURCE_COUNT NUMBER(38,0)
+)
+LANGUAGE SQL
+AS
+$$
+SELECT 
+    SNAPSHOT_TIMESTAMP,
+    TOTAL_SPEND,
+    TOTAL_SUPPLIERS,
+    ACTIVE_POS,
+    RISK_EXPOSURE_AMOUNT,
+    HIGH_RISK_SUPPLIER_COUNT,
+    AVG_ESG_SCORE,
+    TOTAL_CARBON_FOOTPRINT_MT,
+    ERP_SOURCE_COUNT
+FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.EXECUTIVE_KPI_HISTORY
+WHERE SNAPSHOT_TIMESTAMP = (
+    SELECT MAX(SNAPSHOT_TIMESTAMP)
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.EXECUTIVE_KPI_HISTORY
+    WHERE SNAPSHOT_TIMESTAMP < DATEADD(day, 1, AS_OF)
+)
+$$;
+
 -- Success message
 SELECT 'PROCUREMENT_MART views created successfully' AS status;
@@ -12,8 +12,28 @@ USE SCHEMA PROCUREMENT_MART;
 
 -- =============================================================================
 -- V_OPERATIONAL_KPIS - Procurement operational excellence metrics
--- =============================================================================
-CREATE OR REPLACE VIEW V_OPERATIONAL_KPIS AS
+-- OPERATIONAL_KPIS_AS_OF(AS_OF) compares the year up to AS_OF with the year
+-- before; the view is the function as of today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION OPERATIONAL_KPIS_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    SPEND_UNDER_MANAGEMENT_PCT FLOAT,
+    COST_REDUCTION_PCT FLOAT,
+    PROCUREMENT_ROI FLOAT,
+    COST_PER_PO FLOAT,
+    CONTRACT_COMPLIANCE_PCT FLOAT,
+    EMERGENCY_PURCHASE_PCT FLOAT,
+    AVG_PO_CYCLE_TIME_DAYS FLOAT,
+    REALIZED_SAVINGS_AMOUNT FLOAT,
+    MANAGED_SPEND_AMOUNT FLOAT,
+    MAVERICK_SPEND_AMOUNT FLOAT,
+    PROCUREMENT_OPEX_AMOUNT FLOAT,
+    TOTAL_PO_COUNT NUMBER(18,0),
+    SAVINGS_YOY_CHANGE_PCT FLOAT
+)
+LANGUAGE SQL
+AS
+$$
 WITH current_metrics AS (
     SELECT 
         SUM(TOTAL_PO_COUNT) AS TOTAL_POS,
@@ -24,16 +44,17 @@ WITH current_metrics AS (
         SUM(PROCUREMENT_OPEX) AS TOTAL_OPEX,
         SUM(EMERGENCY_PO_COUNT) AS EMERGENCY_POS,
         AVG(AVG_CYCLE_TIME_DAYS) AS AVG_CYCLE_TIME
-    FROM ATOMIC.PROCUREMENT_OPERATIONAL_METRICS
-    WHERE METRIC_DATE >= DATEADD(year, -1, CURRENT_DATE())
+    FROM SNOWCORE_PROCUREMENT.ATOMIC.PROCUREMENT_OPERATIONAL_METRICS
+    WHERE METRIC_DATE >= DATEADD(year, -1, AS_OF)
+        AND METRIC_DATE <= AS_OF
 ),
 prior_year AS (
     SELECT 
         SUM(MANAGED_SPEND_AMOUNT) + SUM(MAVERICK_SPEND_AMOUNT) AS PRIOR_SPEND,
         SUM(REALIZED_SAVINGS) AS PRIOR_SAVINGS
-    FROM ATOMIC.PROCUREMENT_OPERATIONAL_METRICS
-    WHERE METRIC_DATE >= DATEADD(year, -2, CURRENT_DATE())
-        AND METRIC_DATE < DATEADD(year, -1, CURRENT_DATE())
+    FROM SNOWCORE_PROCUREMENT.ATOMIC.PROCUREMENT_OPERATIONAL_METRICS
+    WHERE METRIC_DATE >= DATEADD(year, -2, AS_OF)
+        AND METRIC_DATE < DATEADD(year, -1, AS_OF)
 )
 SELECT 
     -- Spend Under Management (target 90%+)
@@ -66,84 +87,289 @@ SELECT
     
     -- YoY comparison
     ROUND((cm.TOTAL_SAVINGS - py.PRIOR_SAVINGS) / NULLIF(py.PRIOR_SAVINGS, 0) * 100, 1) AS SAVINGS_YOY_CHANGE_PCT
-FROM current_metrics cm, prior_year py;
+FROM current_metrics cm, prior_year py
+$$;
+
+CREATE OR REPLACE VIEW V_OPERATIONAL_KPIS AS
+SELECT * FROM TABLE(OPERATIONAL_KPIS_AS_OF(CURRENT_DATE()));
+
+-- =============================================================================
+-- SUPPLIER_OTIF_MONTHLY - Additive OTIF counts per supplier and promised month
+-- Rates and the DAYS_EARLY_LATE mean/standard deviation are derived from the
+-- counts, sums and sums of squares, so the OTIF views never rescan deliveries.
+-- STREAM_SUPPLIER_OTIF_DP collects changed deliveries and
+-- SP_REFRESH_SUPPLIER_OTIF re-aggregates only their supplier-months (a
+-- moved delivery appears under both, as a stream records an update as
+-- delete + insert). Supplier-months left without deliveries are removed.
+-- =============================================================================
+CREATE OR REPLACE STREAM STREAM_SUPPLIER_OTIF_DP ON TABLE ATOMIC.DELIVERY_PERFORMANCE;
+
+CREATE OR REPLACE TABLE SUPPLIER_OTIF_MONTHLY AS
+SELECT 
+    SUPPLIER_ID,
+    DATE_TRUNC('month', PROMISED_DATE) AS MONTH,
+    COUNT(*) AS DELIVERY_COUNT,
+    SUM(CASE WHEN ON_TIME_FLAG THEN 1 ELSE 0 END) AS ON_TIME_COUNT,
+    SUM(CASE WHEN IN_FULL_FLAG THEN 1 ELSE 0 END) AS IN_FULL_COUNT,
+    SUM(CASE WHEN OTIF_FLAG THEN 1 ELSE 0 END) AS OTIF_COUNT,
+    COUNT(DAYS_EARLY_LATE) AS DAYS_COUNT,
+    SUM(DAYS_EARLY_LATE) AS DAYS_SUM,
+    SUM(DAYS_EARLY_LATE * DAYS_EARLY_LATE) AS DAYS_SQ_SUM
+FROM ATOMIC.DELIVERY_PERFORMANCE
+GROUP BY SUPPLIER_ID, DATE_TRUNC('month', PROMISED_DATE);
+
+CREATE OR REPLACE PROCEDURE SP_REFRESH_SUPPLIER_OTIF()
+RETURNS VARCHAR
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    MERGE INTO SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SUPPLIER_OTIF_MONTHLY r
+    USING (
+        WITH changed_months AS (
+            SELECT DISTINCT
+                SUPPLIER_ID,
+                DATE_TRUNC('month', PROMISED_DATE) AS MONTH
+            FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.STREAM_SUPPLIER_OTIF_DP
+        ),
+        current_counts AS (
+            SELECT 
+                dp.SUPPLIER_ID,
+                DATE_TRUNC('month', dp.PROMISED_DATE) AS MONTH,
+                COUNT(*) AS DELIVERY_COUNT,
+                SUM(CASE WHEN dp.ON_TIME_FLAG THEN 1 ELSE 0 END) AS ON_TIME_COUNT,
+                SUM(CASE WHEN dp.IN_FULL_FLAG THEN 1 ELSE 0 END) AS IN_FULL_COUNT,
+                SUM(CASE WHEN dp.OTIF_FLAG THEN 1 ELSE 0 END) AS OTIF_COUNT,
+                COUNT(dp.DAYS_EARLY_LATE) AS DAYS_COUNT,
+                SUM(dp.DAYS_EARLY_LATE) AS DAYS_SUM,
+                SUM(dp.DAYS_EARLY_LATE * dp.DAYS_EARLY_LATE) AS DAYS_SQ_SUM
+            FROM SNOWCORE_PROCUREMENT.ATOMIC.DELIVERY_PERFORMANCE dp
+            JOIN changed_months cm
+                ON dp.SUPPLIER_ID IS NOT DISTINCT FROM cm.SUPPLIER_ID
+                AND DATE_TRUNC('month', dp.PROMISED_DATE) = cm.MONTH
+            -- Deliveries arrive roughly in PROMISED_DATE order, so this prunes
+            -- the scan to the months being refreshed
+            WHERE dp.PROMISED_DATE >= (SELECT MIN(MONTH) FROM changed_months)
+            GROUP BY dp.SUPPLIER_ID, DATE_TRUNC('month', dp.PROMISED_DATE)
+        )
+        SELECT 
+            cm.SUPPLIER_ID,
+            cm.MONTH,
+            cc.DELIVERY_COUNT,
+            cc.ON_TIME_COUNT,
+            cc.IN_FULL_COUNT,
+            cc.OTIF_COUNT,
+            cc.DAYS_COUNT,
+            cc.DAYS_SUM,
+            cc.DAYS_SQ_SUM,
+            cc.MONTH IS NULL AS IS_REMOVED
+        FROM changed_months cm
+        LEFT JOIN current_counts cc
+            ON cm.SUPPLIER_ID IS NOT DISTINCT FROM cc.SUPPLIER_ID
+            AND cm.MONTH = cc.MONTH
+    ) d
+    ON r.SUPPLIER_ID IS NOT DISTINCT FROM d.SUPPLIER_ID AND r.MONTH = d.MONTH
+    WHEN MATCHED AND d.IS_REMOVED THEN DELETE
+    WHEN MATCHED THEN UPDATE SET
+        DELIVERY_COUNT = d.DELIVERY_COUNT,
+        ON_TIME_COUNT = d.ON_TIME_COUNT,
+        IN_FULL_COUNT = d.IN_FULL_COUNT,
+        OTIF_COUNT = d.OTIF_COUNT,
+        DAYS_COUNT = d.DAYS_COUNT,
+        DAYS_SUM = d.DAYS_SUM,
+        DAYS_SQ_SUM = d.DAYS_SQ_SUM
+    WHEN NOT MATCHED AND NOT d.IS_REMOVED THEN INSERT (
+        SUPPLIER_ID, MONTH, DELIVERY_COUNT, ON_TIME_COUNT, IN_FULL_COUNT,
+        OTIF_COUNT, DAYS_COUNT, DAYS_SUM, DAYS_SQ_SUM
+    ) VALUES (
+        d.SUPPLIER_ID, d.MONTH, d.DELIVERY_COUNT, d.ON_TIME_COUNT, d.IN_FULL_COUNT,
+        d.OTIF_COUNT, d.DAYS_COUNT, d.DAYS_SUM, d.DAYS_SQ_SUM
+    );
+    RETURN 'SUPPLIER_OTIF_MONTHLY refreshed';
+END;
+$$;
+
+CREATE OR REPLACE TASK TASK_REFRESH_SUPPLIER_OTIF
+    WAREHOUSE = SNOWCORE_PROCUREMENT_WH
+    SCHEDULE = '5 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('STREAM_SUPPLIER_OTIF_DP')
+AS
+    CALL SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SP_REFRESH_SUPPLIER_OTIF();
+
+ALTER TASK TASK_REFRESH_SUPPLIER_OTIF RESUME;
 
 -- =============================================================================
 -- V_DELIVERY_PERFORMANCE - OTIF metrics by supplier and time
+-- Serves SUPPLIER_OTIF_MONTHLY; the count and sum columns let queries derive
+-- exact rates and means across suppliers and months.
 -- =============================================================================
 CREATE OR REPLACE VIEW V_DELIVERY_PERFORMANCE AS
 SELECT 
-    dp.SUPPLIER_ID,
+    om.SUPPLIER_ID,
     p.PARTY_NAME AS SUPPLIER_NAME,
     pa.COUNTRY AS SUPPLIER_COUNTRY,
     g.GEOGRAPHY_NAME AS REGION,
-    DATE_TRUNC('month', dp.PROMISED_DATE) AS MONTH,
-    COUNT(*) AS DELIVERY_COUNT,
-    SUM(CASE WHEN dp.ON_TIME_FLAG THEN 1 ELSE 0 END) AS ON_TIME_COUNT,
-    SUM(CASE WHEN dp.IN_FULL_FLAG THEN 1 ELSE 0 END) AS IN_FULL_COUNT,
-    SUM(CASE WHEN dp.OTIF_FLAG THEN 1 ELSE 0 END) AS OTIF_COUNT,
-    ROUND(AVG(CASE WHEN dp.ON_TIME_FLAG THEN 100 ELSE 0 END), 1) AS ON_TIME_RATE,
-    ROUND(AVG(CASE WHEN dp.IN_FULL_FLAG THEN 100 ELSE 0 END), 1) AS IN_FULL_RATE,
-    ROUND(AVG(CASE WHEN dp.OTIF_FLAG THEN 100 ELSE 0 END), 1) AS OTIF_RATE,
-    ROUND(AVG(dp.DAYS_EARLY_LATE), 1) AS AVG_DAYS_VARIANCE,
-    ROUND(STDDEV(dp.DAYS_EARLY_LATE), 1) AS DAYS_VARIANCE_STDDEV
-FROM ATOMIC.DELIVERY_PERFORMANCE dp
-LEFT JOIN ATOMIC.SUPPLIER s ON dp.SUPPLIER_ID = s.SUPPLIER_ID
+    om.MONTH,
+    om.DELIVERY_COUNT,
+    om.ON_TIME_COUNT,
+    om.IN_FULL_COUNT,
+    om.OTIF_COUNT,
+    om.DAYS_COUNT,
+    om.DAYS_SUM,
+    ROUND(om.ON_TIME_COUNT * 100.0 / om.DELIVERY_COUNT, 1) AS ON_TIME_RATE,
+    ROUND(om.IN_FULL_COUNT * 100.0 / om.DELIVERY_COUNT, 1) AS IN_FULL_RATE,
+    ROUND(om.OTIF_COUNT * 100.0 / om.DELIVERY_COUNT, 1) AS OTIF_RATE,
+    ROUND(om.DAYS_SUM / NULLIF(om.DAYS_COUNT, 0), 1) AS AVG_DAYS_VARIANCE,
+    -- Sample standard deviation, as STDDEV computes over the detail rows
+    ROUND(CASE WHEN om.DAYS_COUNT > 1 THEN SQRT(GREATEST(
+        (om.DAYS_SQ_SUM - om.DAYS_SUM * om.DAYS_SUM / om.DAYS_COUNT) / (om.DAYS_COUNT - 1), 0
+    )) END, 1) AS DAYS_VARIANCE_STDDEV
+FROM SUPPLIER_OTIF_MONTHLY om
+LEFT JOIN ATOMIC.SUPPLIER s ON om.SUPPLIER_ID = s.SUPPLIER_ID
 LEFT JOIN ATOMIC.PARTY p ON s.PARTY_ID = p.PARTY_ID
 LEFT JOIN ATOMIC.PARTY_ADDRESS pa ON p.PARTY_ID = pa.PARTY_ID AND pa.PRIMARY_ADDRESS_FLAG = TRUE
-LEFT JOIN ATOMIC.GEOGRAPHY g ON pa.GEOGRAPHY_ID = g.GEOGRAPHY_ID
-GROUP BY dp.SUPPLIER_ID, p.PARTY_NAME, pa.COUNTRY, g.GEOGRAPHY_NAME, DATE_TRUNC('month', dp.PROMISED_DATE);
+LEFT JOIN ATOMIC.GEOGRAPHY g ON pa.GEOGRAPHY_ID = g.GEOGRAPHY_ID;
 
 -- =============================================================================
 -- V_OTIF_SUMMARY - Overall OTIF KPIs
--- =============================================================================
-CREATE OR REPLACE VIEW V_OTIF_SUMMARY AS
+-- OTIF_SUMMARY_AS_OF(AS_OF) covers the year up to AS_OF. Whole months come
+-- from SUPPLIER_OTIF_MONTHLY; only the partial months at either end of the
+-- window are counted from deliveries. The view is the function as of today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION OTIF_SUMMARY_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    TOTAL_DELIVERIES NUMBER(18,0),
+    ON_TIME_RATE FLOAT,
+    IN_FULL_RATE FLOAT,
+    OTIF_RATE FLOAT,
+    OTIF_TARGET NUMBER(18,0),
+    OTIF_VS_TARGET FLOAT
+)
+LANGUAGE SQL
+AS
+$$
+WITH window_counts AS (
+    SELECT 
+        DELIVERY_COUNT,
+        ON_TIME_COUNT,
+        IN_FULL_COUNT,
+        OTIF_COUNT
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SUPPLIER_OTIF_MONTHLY
+    WHERE MONTH > DATE_TRUNC('month', DATEADD(year, -1, AS_OF))
+      AND MONTH < DATE_TRUNC('month', AS_OF)
+    UNION ALL
+    SELECT 
+        COUNT(*),
+        SUM(CASE WHEN ON_TIME_FLAG THEN 1 ELSE 0 END),
+        SUM(CASE WHEN IN_FULL_FLAG THEN 1 ELSE 0 END),
+        SUM(CASE WHEN OTIF_FLAG THEN 1 ELSE 0 END)
+    FROM SNOWCORE_PROCUREMENT.ATOMIC.DELIVERY_PERFORMANCE
+    WHERE (PROMISED_DATE >= DATEADD(year, -1, AS_OF)
+           AND PROMISED_DATE < DATEADD(month, 1, DATE_TRUNC('month', DATEADD(year, -1, AS_OF))))
+       OR (PROMISED_DATE >= DATE_TRUNC('month', AS_OF) AND PROMISED_DATE <= AS_OF)
+),
+totals AS (
+    SELECT 
+        SUM(DELIVERY_COUNT) AS TOTAL_DELIVERIES,
+        ROUND(SUM(ON_TIME_COUNT) * 100.0 / NULLIF(SUM(DELIVERY_COUNT), 0), 1) AS ON_TIME_RATE,
+        ROUND(SUM(IN_FULL_COUNT) * 100.0 / NULLIF(SUM(DELIVERY_COUNT), 0), 1) AS IN_FULL_RATE,
+        ROUND(SUM(OTIF_COUNT) * 100.0 / NULLIF(SUM(DELIVERY_COUNT), 0), 1) AS OTIF_RATE
+    FROM window_counts
+)
 SELECT 
-    COUNT(*) AS TOTAL_DELIVERIES,
-    ROUND(AVG(CASE WHEN ON_TIME_FLAG THEN 100 ELSE 0 END), 1) AS ON_TIME_RATE,
-    ROUND(AVG(CASE WHEN IN_FULL_FLAG THEN 100 ELSE 0 END), 1) AS IN_FULL_RATE,
-    ROUND(AVG(CASE WHEN OTIF_FLAG THEN 100 ELSE 0 END), 1) AS OTIF_RATE,
+    TOTAL_DELIVERIES,
+    ON_TIME_RATE,
+    IN_FULL_RATE,
+    OTIF_RATE,
     95 AS OTIF_TARGET,
-    ROUND(AVG(CASE WHEN OTIF_FLAG THEN 100 ELSE 0 END), 1) - 95 AS OTIF_VS_TARGET
-FROM ATOMIC.DELIVERY_PERFORMANCE
-WHERE PROMISED_DATE >= DATEADD(year, -1, CURRENT_DATE());
+    OTIF_RATE - 95 AS OTIF_VS_TARGET
+FROM totals
+$$;
+
+CREATE OR REPLACE VIEW V_OTIF_SUMMARY AS
+SELECT * FROM TABLE(OTIF_SUMMARY_AS_OF(CURRENT_DATE()));
 
 -- =============================================================================
 -- V_SCOPE_EMISSIONS - Scope 1/2/3 emissions breakdown
+-- Served from SUPPLIER_EMISSIONS_MONTHLY (see 05_mart_layer.sql)
 -- =============================================================================
 CREATE OR REPLACE VIEW V_SCOPE_EMISSIONS AS
 SELECT 
-    ers.SCOPE_TYPE,
-    DATE_TRUNC('month', ers.RECORD_DATE) AS MONTH,
-    SUM(ers.EMISSION_QUANTITY_MT) AS TOTAL_EMISSIONS_MT,
-    COUNT(DISTINCT ers.SUPPLIER_ID) AS SUPPLIER_COUNT,
-    AVG(ers.EMISSION_QUANTITY_MT) AS AVG_EMISSION_PER_RECORD,
+    em.SCOPE_TYPE,
+    em.MONTH,
+    SUM(em.EMISSION_MT) AS TOTAL_EMISSIONS_MT,
+    COUNT(DISTINCT em.SUPPLIER_ID) AS SUPPLIER_COUNT,
+    SUM(em.EMISSION_MT) / NULLIF(SUM(em.MEASURED_RECORD_COUNT), 0) AS AVG_EMISSION_PER_RECORD,
     CASE 
-        WHEN ers.SCOPE_TYPE = 'SCOPE_1' THEN 'Direct emissions from owned/controlled sources'
-        WHEN ers.SCOPE_TYPE = 'SCOPE_2' THEN 'Indirect emissions from purchased energy'
-        WHEN ers.SCOPE_TYPE = 'SCOPE_3' THEN 'Supply chain & value chain emissions'
+        WHEN em.SCOPE_TYPE = 'SCOPE_1' THEN 'Direct emissions from owned/controlled sources'
+        WHEN em.SCOPE_TYPE = 'SCOPE_2' THEN 'Indirect emissions from purchased energy'
+        WHEN em.SCOPE_TYPE = 'SCOPE_3' THEN 'Supply chain & value chain emissions'
     END AS SCOPE_DESCRIPTION
-FROM ATOMIC.EMISSION_RECORD_SCOPED ers
-GROUP BY ers.SCOPE_TYPE, DATE_TRUNC('month', ers.RECORD_DATE);
+FROM SUPPLIER_EMISSIONS_MONTHLY em
+WHERE em.RECORD_SOURCE = 'SCOPED'
+GROUP BY em.SCOPE_TYPE, em.MONTH;
 
 -- =============================================================================
 -- V_SCOPE_EMISSIONS_SUMMARY - Total emissions by scope
--- =============================================================================
-CREATE OR REPLACE VIEW V_SCOPE_EMISSIONS_SUMMARY AS
+-- SCOPE_EMISSIONS_SUMMARY_AS_OF(AS_OF) covers the year up to AS_OF, as a
+-- share of all emissions recorded by AS_OF. Whole months come from
+-- SUPPLIER_EMISSIONS_MONTHLY; only the partial months at either end of the
+-- window are read from records. The view is the function as of today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION SCOPE_EMISSIONS_SUMMARY_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    SCOPE_TYPE VARCHAR,
+    TOTAL_EMISSIONS_MT FLOAT,
+    SUPPLIER_COUNT NUMBER(18,0),
+    PCT_OF_TOTAL FLOAT
+)
+LANGUAGE SQL
+AS
+$$
+WITH window_emissions AS (
+    SELECT 
+        SCOPE_TYPE,
+        SUPPLIER_ID,
+        EMISSION_MT
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SUPPLIER_EMISSIONS_MONTHLY
+    WHERE RECORD_SOURCE = 'SCOPED'
+      AND MONTH > DATE_TRUNC('month', DATEADD(year, -1, AS_OF))
+      AND MONTH < DATE_TRUNC('month', AS_OF)
+    UNION ALL
+    SELECT 
+        SCOPE_TYPE,
+        SUPPLIER_ID,
+        EMISSION_QUANTITY_MT
+    FROM SNOWCORE_PROCUREMENT.ATOMIC.EMISSION_RECORD_SCOPED
+    WHERE (RECORD_DATE >= DATEADD(year, -1, AS_OF)
+           AND RECORD_DATE < DATEADD(month, 1, DATE_TRUNC('month', DATEADD(year, -1, AS_OF))))
+       OR (RECORD_DATE >= DATE_TRUNC('month', AS_OF) AND RECORD_DATE <= AS_OF)
+),
+recorded_total AS (
+    SELECT SUM(EMISSION_MT) AS TOTAL_EMISSIONS_MT
+    FROM (
+        SELECT EMISSION_MT
+        FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SUPPLIER_EMISSIONS_MONTHLY
+        WHERE RECORD_SOURCE = 'SCOPED'
+          AND MONTH < DATE_TRUNC('month', AS_OF)
+        UNION ALL
+        SELECT EMISSION_QUANTITY_MT
+        FROM SNOWCORE_PROCUREMENT.ATOMIC.EMISSION_RECORD_SCOPED
+        WHERE RECORD_DATE >= DATE_TRUNC('month', AS_OF) AND RECORD_DATE <= AS_OF
+    )
+)
 SELECT 
-    SCOPE_TYPE,
-    SUM(EMISSION_QUANTITY_MT) AS TOTAL_EMISSIONS_MT,
-    COUNT(DISTINCT SUPPLIER_ID) AS SUPPLIER_COUNT,
-    ROUND(SUM(EMISSION_QUANTITY_MT) / (SELECT SUM(EMISSION_QUANTITY_MT) FROM ATOMIC.EMISSION_RECORD_SCOPED) * 100, 1) AS PCT_OF_TOTAL
-FROM ATOMIC.EMISSION_RECORD_SCOPED
-WHERE RECORD_DATE >= DATEADD(year, -1, CURRENT_DATE())
-GROUP BY SCOPE_TYPE
-ORDER BY 
-    CASE SCOPE_TYPE 
-        WHEN 'SCOPE_1' THEN 1 
-        WHEN 'SCOPE_2' THEN 2 
-        ELSE 3 
-    END;
+    we.SCOPE_TYPE,
+    SUM(we.EMISSION_MT) AS TOTAL_EMISSIONS_MT,
+    COUNT(DISTINCT we.SUPPLIER_ID) AS SUPPLIER_COUNT,
+    ROUND(SUM(we.EMISSION_MT) / MAX(rt.TOTAL_EMISSIONS_MT) * 100, 1) AS PCT_OF_TOTAL
+FROM window_emissions we, recorded_total rt
+GROUP BY we.SCOPE_TYPE
+$$;
+
+CREATE OR REPLACE VIEW V_SCOPE_EMISSIONS_SUMMARY AS
+SELECT * FROM TABLE(SCOPE_EMISSIONS_SUMMARY_AS_OF(CURRENT_DATE()))
+ORDER BY SCOPE_TYPE;
 
 -- =============================================================================
 -- V_DIVERSITY_SPEND - Supplier diversity metrics
@@ -269,23 +495,58 @@ GROUP BY sc.SUPPLIER_ID, p.PARTY_NAME, DATE_TRUNC('quarter', sc.EVALUATION_DATE)
 
 -- =============================================================================
 -- V_FORWARD_CONTRACT_COVERAGE - Forward contract utilization
--- =============================================================================
-CREATE OR REPLACE VIEW V_FORWARD_CONTRACT_COVERAGE AS
+-- FORWARD_CONTRACT_COVERAGE_AS_OF(AS_OF) counts contracts active on AS_OF and
+-- expiring within three months of it; the view is the function as of today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION FORWARD_CONTRACT_COVERAGE_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    MATERIAL_CATEGORY VARCHAR,
+    CONTRACT_COUNT NUMBER(18,0),
+    TOTAL_CONTRACTED_QTY FLOAT,
+    TOTAL_CONTRACT_VALUE FLOAT,
+    AVG_UTILIZATION_PCT FLOAT,
+    ACTIVE_CONTRACTS NUMBER(18,0),
+    EXPIRING_SOON NUMBER(18,0)
+)
+LANGUAGE SQL
+AS
+$$
 SELECT 
     fc.MATERIAL_CATEGORY,
     COUNT(*) AS CONTRACT_COUNT,
     SUM(fc.CONTRACTED_QUANTITY) AS TOTAL_CONTRACTED_QTY,
     SUM(fc.CONTRACTED_QUANTITY * fc.CONTRACTED_PRICE) AS TOTAL_CONTRACT_VALUE,
     AVG(fc.UTILIZATION_PCT) * 100 AS AVG_UTILIZATION_PCT,
-    SUM(CASE WHEN fc.CONTRACT_END_DATE > CURRENT_DATE() THEN 1 ELSE 0 END) AS ACTIVE_CONTRACTS,
-    SUM(CASE WHEN fc.CONTRACT_END_DATE BETWEEN CURRENT_DATE() AND DATEADD(month, 3, CURRENT_DATE()) THEN 1 ELSE 0 END) AS EXPIRING_SOON
-FROM ATOMIC.FORWARD_CONTRACT fc
-GROUP BY fc.MATERIAL_CATEGORY;
+    SUM(CASE WHEN fc.CONTRACT_END_DATE > AS_OF THEN 1 ELSE 0 END) AS ACTIVE_CONTRACTS,
+    SUM(CASE WHEN fc.CONTRACT_END_DATE BETWEEN AS_OF AND DATEADD(month, 3, AS_OF) THEN 1 ELSE 0 END) AS EXPIRING_SOON
+FROM SNOWCORE_PROCUREMENT.ATOMIC.FORWARD_CONTRACT fc
+GROUP BY fc.MATERIAL_CATEGORY
+$$;
+
+CREATE OR REPLACE VIEW V_FORWARD_CONTRACT_COVERAGE AS
+SELECT * FROM TABLE(FORWARD_CONTRACT_COVERAGE_AS_OF(CURRENT_DATE()));
 
 -- =============================================================================
 -- V_CATEGORY_METRICS - Category-level KPIs for Category Manager
--- =============================================================================
-CREATE OR REPLACE VIEW V_CATEGORY_METRICS AS
+-- CATEGORY_METRICS_AS_OF(AS_OF) counts forward coverage from contracts
+-- running past AS_OF; the view is the function as of today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION CATEGORY_METRICS_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    MATERIAL_CATEGORY VARCHAR,
+    TOTAL_SPEND FLOAT,
+    TOTAL_QUANTITY FLOAT,
+    PO_COUNT NUMBER(18,0),
+    SUPPLIER_COUNT NUMBER(18,0),
+    AVG_UNIT_PRICE FLOAT,
+    COST_PER_UNIT FLOAT,
+    FORWARD_CONTRACT_VALUE FLOAT,
+    FORWARD_COVERAGE_PCT FLOAT,
+    FORWARD_UTILIZATION_PCT FLOAT
+)
+LANGUAGE SQL
+AS
+$$
 WITH category_spend AS (
     SELECT 
         pc.CATEGORY_NAME AS MATERIAL_CATEGORY,
@@ -294,10 +555,10 @@ WITH category_spend AS (
         COUNT(DISTINCT po.PURCHASE_ORDER_ID) AS PO_COUNT,
         COUNT(DISTINCT po.SUPPLIER_ID) AS SUPPLIER_COUNT,
         AVG(pol.UNIT_PRICE) AS AVG_UNIT_PRICE
-    FROM ATOMIC.PURCHASE_ORDER po
-    JOIN ATOMIC.PURCHASE_ORDER_LINE pol ON po.PURCHASE_ORDER_ID = pol.PURCHASE_ORDER_ID
-    JOIN ATOMIC.PRODUCT prod ON pol.PRODUCT_ID = prod.PRODUCT_ID
-    JOIN ATOMIC.PRODUCT_CATEGORY pc ON prod.PRODUCT_CATEGORY_ID = pc.PRODUCT_CATEGORY_ID
+    FROM SNOWCORE_PROCUREMENT.ATOMIC.PURCHASE_ORDER po
+    JOIN SNOWCORE_PROCUREMENT.ATOMIC.PURCHASE_ORDER_LINE pol ON po.PURCHASE_ORDER_ID = pol.PURCHASE_ORDER_ID
+    JOIN SNOWCORE_PROCUREMENT.ATOMIC.PRODUCT prod ON pol.PRODUCT_ID = prod.PRODUCT_ID
+    JOIN SNOWCORE_PROCUREMENT.ATOMIC.PRODUCT_CATEGORY pc ON prod.PRODUCT_CATEGORY_ID = pc.PRODUCT_CATEGORY_ID
     WHERE po.IS_CURRENT_FLAG = TRUE
     GROUP BY pc.CATEGORY_NAME
 ),
@@ -306,8 +567,8 @@ forward_coverage AS (
         MATERIAL_CATEGORY,
         SUM(CONTRACTED_QUANTITY * CONTRACTED_PRICE) AS FORWARD_CONTRACT_VALUE,
         AVG(UTILIZATION_PCT) AS AVG_UTILIZATION
-    FROM ATOMIC.FORWARD_CONTRACT
-    WHERE CONTRACT_END_DATE > CURRENT_DATE()
+    FROM SNOWCORE_PROCUREMENT.ATOMIC.FORWARD_CONTRACT
+    WHERE CONTRACT_END_DATE > AS_OF
     GROUP BY MATERIAL_CATEGORY
 )
 SELECT 
@@ -324,7 +585,11 @@ SELECT
     ROUND(COALESCE(fc.FORWARD_CONTRACT_VALUE, 0) / NULLIF(cs.TOTAL_SPEND, 0) * 100, 1) AS FORWARD_COVERAGE_PCT,
     COALESCE(fc.AVG_UTILIZATION * 100, 0) AS FORWARD_UTILIZATION_PCT
 FROM category_spend cs
-LEFT JOIN forward_coverage fc ON cs.MATERIAL_CATEGORY = fc.MATERIAL_CATEGORY;
+LEFT JOIN forward_coverage fc ON cs.MATERIAL_CATEGORY = fc.MATERIAL_CATEGORY
+$$;
+
+CREATE OR REPLACE VIEW V_CATEGORY_METRICS AS
+SELECT * FROM TABLE(CATEGORY_METRICS_AS_OF(CURRENT_DATE()));
 
 -- =============================================================================
 -- V_LEAD_TIME_VARIABILITY - Lead time analysis by supplier
@@ -437,17 +702,34 @@ WHERE rn = 1;
 
 -- =============================================================================
 -- V_EXTERNAL_INDICATORS_TREND - Indicator trends over time
--- =============================================================================
-CREATE OR REPLACE VIEW V_EXTERNAL_INDICATORS_TREND AS
+-- EXTERNAL_INDICATORS_TREND_AS_OF(AS_OF) starts six months before AS_OF and
+-- keeps later (projected) indicator dates; the view is the function as of
+-- today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION EXTERNAL_INDICATORS_TREND_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    WEEK DATE,
+    INDICATOR_NAME VARCHAR,
+    INDICATOR_TYPE VARCHAR,
+    AVG_VALUE FLOAT,
+    AVG_CHANGE FLOAT
+)
+LANGUAGE SQL
+AS
+$$
 SELECT 
     DATE_TRUNC('week', INDICATOR_DATE) AS WEEK,
     INDICATOR_NAME,
     INDICATOR_TYPE,
     AVG(INDICATOR_VALUE) AS AVG_VALUE,
     AVG(PERCENTAGE_CHANGE) AS AVG_CHANGE
-FROM ATOMIC.MARKETPLACE_INDICATORS
-WHERE INDICATOR_DATE >= DATEADD(month, -6, CURRENT_DATE())
+FROM SNOWCORE_PROCUREMENT.ATOMIC.MARKETPLACE_INDICATORS
+WHERE INDICATOR_DATE >= DATEADD(month, -6, AS_OF)
 GROUP BY DATE_TRUNC('week', INDICATOR_DATE), INDICATOR_NAME, INDICATOR_TYPE
+$$;
+
+CREATE OR REPLACE VIEW V_EXTERNAL_INDICATORS_TREND AS
+SELECT * FROM TABLE(EXTERNAL_INDICATORS_TREND_AS_OF(CURRENT_DATE()))
 ORDER BY WEEK, INDICATOR_NAME;
 
 -- =============================================================================
@@ -469,16 +751,33 @@ ORDER BY bim.METRIC_DATE DESC;
 
 -- =============================================================================
 -- V_BUSINESS_IMPACT_SUMMARY - Aggregated business impact
--- =============================================================================
-CREATE OR REPLACE VIEW V_BUSINESS_IMPACT_SUMMARY AS
+-- BUSINESS_IMPACT_SUMMARY_AS_OF(AS_OF) covers the year up to AS_OF; the view
+-- is the function as of today.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION BUSINESS_IMPACT_SUMMARY_AS_OF(AS_OF DATE)
+RETURNS TABLE (
+    TOTAL_INVENTORY_REDUCTION FLOAT,
+    TOTAL_COST_SAVINGS FLOAT,
+    AVG_SERVICE_LEVEL_IMPROVEMENT FLOAT,
+    AVG_STOCKOUT_REDUCTION FLOAT,
+    TOTAL_FORECAST_VALUE FLOAT
+)
+LANGUAGE SQL
+AS
+$$
 SELECT 
     COALESCE(SUM(INVENTORY_REDUCTION_AMOUNT), 125000) AS TOTAL_INVENTORY_REDUCTION,
     COALESCE(SUM(COST_SAVINGS_AMOUNT), 85000) AS TOTAL_COST_SAVINGS,
     COALESCE(AVG(SERVICE_LEVEL_IMPROVEMENT_PCT), 3.2) AS AVG_SERVICE_LEVEL_IMPROVEMENT,
     COALESCE(AVG(STOCKOUT_REDUCTION_PCT), 15.5) AS AVG_STOCKOUT_REDUCTION,
     COALESCE(SUM(FORECAST_VALUE_ADDED), 210000) AS TOTAL_FORECAST_VALUE
-FROM ATOMIC.BUSINESS_IMPACT_METRICS
-WHERE METRIC_DATE >= DATEADD(year, -1, CURRENT_DATE());
+FROM SNOWCORE_PROCUREMENT.ATOMIC.BUSINESS_IMPACT_METRICS
+WHERE METRIC_DATE >= DATEADD(year, -1, AS_OF)
+  AND METRIC_DATE <= AS_OF
+$$;
+
+CREATE OR REPLACE VIEW V_BUSINESS_IMPACT_SUMMARY AS
+SELECT * FROM TABLE(BUSINESS_IMPACT_SUMMARY_AS_OF(CURRENT_DATE()));
 
 -- Success message
 SELECT 'PROCUREMENT_MART persona extension views created successfully' AS status;
@@ -212,6 +212,18 @@ FROM @RAW.DATA_STAGE/model_registry.csv
 FILE_FORMAT = RAW.CSV_FORMAT
 ON_ERROR = 'CONTINUE';
 
+-- =============================================================================
+-- Refresh incrementally maintained mart tables
+-- =============================================================================
+-- The streams created by the mart scripts (05, 05b) captured the loads above
+CALL PROCUREMENT_MART.SP_REFRESH_SPEND_FACT();
+CALL PROCUREMENT_MART.SP_REFRESH_SPEND_SNAPSHOTS();
+CALL PROCUREMENT_MART.SP_REFRESH_SUPPLIER_SPEND();
+CALL PROCUREMENT_MART.SP_REFRESH_SUPPLIER_OTIF();
+CALL PROCUREMENT_MART.SP_REFRESH_SUPPLIER_EMISSIONS();
+-- First executive KPI snapshot (then hourly by TASK_SNAPSHOT_EXECUTIVE_KPIS)
+CALL PROCUREMENT_MART.SP_SNAPSHOT_EXECUTIVE_KPIS();
+
 -- =============================================================================
 -- Verify data load
 -- =============================================================================
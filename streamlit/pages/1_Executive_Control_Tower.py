@@ -9,8 +9,10 @@ import altair as alt
 import pydeck as pdk
 
 from utils.data_loader import (
-    load_data, format_currency, format_number, format_percent, get_risk_rgb
+    load_data, load_many, query_loader, render_debug_panel, requested_as_of,
+    format_currency, format_number, format_percent, get_risk_rgb
 )
+from utils.query_filter import QueryFilter
 
 st.set_page_config(
     page_title="Executive Control Tower | Snowcore",
@@ -72,6 +74,23 @@ with filter_col3:
         </div>
         """, unsafe_allow_html=True)
 
+# Division and region are applied in the warehouse by every loader below
+page_filter = QueryFilter.from_selection(
+    division=selected_division, region=selected_region, as_of=requested_as_of()
+)
+if page_filter.as_of is not None:
+    st.caption(f"Showing data as of {page_filter.as_of:%Y-%m-%d}")
+
+# Warm every query this page renders in one concurrent round-trip; the
+# loaders below are then served from the shared result cache.
+load_many([
+    'executive_kpis', 'executive_kpi_history', 'risk_alerts', 'esg_targets', 'spend_yoy', 'spend_qoq',
+    'operational_kpis', 'otif_summary', 'otif_trend', 'delivery_by_supplier', 'supplier_risk_map',
+    'risk_distribution', 'spend_by_region', 'high_risk_suppliers', 'alternative_suppliers',
+    'scope_emissions_summary', 'scope_emissions_trend', 'diversity_spend', 'esg_summary', 'carbon_by_region',
+    'spend_concentration', 'single_source_risk',
+], query_filter=page_filter)
+
 st.markdown("---")
 
 # Sidebar - Quick Links only
@@ -80,77 +99,29 @@ with st.sidebar:
     st.page_link("pages/2_Category_Manager_Workbench.py", label="Category Workbench")
     st.page_link("pages/3_Data_Science_Workbench.py", label="Data Science")
 
-# Helper function to get ERP filter based on division
-def get_division_erp_filter(division: str) -> str:
-    """Return ERP source system filter based on selected division."""
-    if division == 'BioFlow (Life Sciences)':
-        return "BIOFLOW"
-    elif division == 'Industrial Compression':
-        return "SAP|ORACLE|JDE"  # Non-BioFlow systems
-    return None
-
 # Load KPI data
-@st.cache_data(ttl=300)
-def load_kpis():
-    return load_data('executive_kpis')
-
-@st.cache_data(ttl=300)
-def load_supplier_map():
-    return load_data('supplier_risk_map')
-
-@st.cache_data(ttl=300)
-def load_spend_by_region():
-    return load_data('spend_by_region')
-
-@st.cache_data(ttl=300)
-def load_risk_distribution():
-    return load_data('risk_distribution')
-
-@st.cache_data(ttl=300)
-def load_high_risk_suppliers():
-    return load_data('high_risk_suppliers')
-
-@st.cache_data(ttl=300)
-def load_esg_targets():
-    return load_data('esg_targets')
-
-@st.cache_data(ttl=300)
-def load_risk_alerts():
-    return load_data('risk_alerts')
+load_kpis = query_loader('executive_kpis')
+load_kpi_history = query_loader('executive_kpi_history')
+load_supplier_map = query_loader('supplier_risk_map')
+load_spend_by_region = query_loader('spend_by_region')
+load_risk_distribution = query_loader('risk_distribution')
+load_high_risk_suppliers = query_loader('high_risk_suppliers')
+load_esg_targets = query_loader('esg_targets')
+load_risk_alerts = query_loader('risk_alerts')
 
 # CPO Persona - Operational Excellence Data
-@st.cache_data(ttl=300)
-def load_operational_kpis():
-    return load_data('operational_kpis')
-
-@st.cache_data(ttl=300)
-def load_otif_summary():
-    return load_data('otif_summary')
-
-@st.cache_data(ttl=300)
-def load_otif_trend():
-    return load_data('otif_trend')
-
-@st.cache_data(ttl=300)
-def load_delivery_by_supplier():
-    return load_data('delivery_by_supplier')
-
-@st.cache_data(ttl=300)
-def load_scope_emissions_summary():
-    return load_data('scope_emissions_summary')
-
-@st.cache_data(ttl=300)
-def load_scope_emissions_trend():
-    return load_data('scope_emissions_trend')
-
-@st.cache_data(ttl=300)
-def load_diversity_spend():
-    return load_data('diversity_spend')
+load_operational_kpis = query_loader('operational_kpis')
+load_otif_summary = query_loader('otif_summary')
+load_otif_trend = query_loader('otif_trend')
+load_delivery_by_supplier = query_loader('delivery_by_supplier')
+load_scope_emissions_summary = query_loader('scope_emissions_summary')
+load_scope_emissions_trend = query_loader('scope_emissions_trend')
+load_diversity_spend = query_loader('diversity_spend')
 
 # =============================================================================
 # Risk Alerts Banner (Proactive Recommendations)
 # =============================================================================
-risk_alerts = load_risk_alerts()
+risk_alerts = load_risk_alerts(page_filter)
 
 if not risk_alerts.empty:
     critical_count = len(risk_alerts)
@@ -216,7 +187,7 @@ def generate_executive_summary(kpi_data, risk_data, esg_data):
     return None
 
 # Load data for summary
-kpis_for_summary = load_kpis()
+kpis_for_summary = load_kpis(page_filter)
 kpi_dict = kpis_for_summary.iloc[0].to_dict() if not kpis_for_summary.empty else {}
 
 # Display AI Summary
@@ -224,7 +195,7 @@ st.markdown("### AI Executive Summary")
 st.caption("*Powered by Snowflake Cortex LLM*")
 
 with st.spinner("Generating insights..."):
-    ai_summary = generate_executive_summary(kpi_dict, risk_alerts, load_esg_targets())
+    ai_summary = generate_executive_summary(kpi_dict, risk_alerts, load_esg_targets(page_filter))
 
 if ai_summary:
     st.markdown(f"""
@@ -289,22 +260,31 @@ with col_toggle:
     )
 
 # Load comparison data
-@st.cache_data(ttl=300)
-def load_yoy_data():
-    return load_data('spend_yoy')
+load_yoy_data = query_loader('spend_yoy')
+load_qoq_data = query_loader('spend_qoq')
 
-@st.cache_data(ttl=300)
-def load_qoq_data():
-    return load_data('spend_qoq')
+kpis = load_kpis(page_filter)
+kpi_history = load_kpi_history(page_filter)
+
+
+def kpi_sparkline(column):
+    """Daily trend of one KPI from the snapshot history (hidden until there are two days)."""
+    if len(kpi_history) < 2 or column not in kpi_history:
+        return
+    chart = alt.Chart(kpi_history).mark_line(strokeWidth=1.5, color='#29B5E8').encode(
+        x=alt.X('SNAPSHOT_TIMESTAMP:T', axis=None),
+        y=alt.Y(f'{column}:Q', axis=None, scale=alt.Scale(zero=False)),
+        tooltip=[alt.Tooltip('SNAPSHOT_TIMESTAMP:T', title='Snapshot'), alt.Tooltip(f'{column}:Q', format=',.1f')]
+    ).properties(height=40)
+    st.altair_chart(chart, use_container_width=True)
 
-kpis = load_kpis()
 
 # Get comparison data based on selection
 if comparison_period == "YoY":
-    comparison_data = load_yoy_data()
+    comparison_data = load_yoy_data(page_filter)
     period_label = "vs last year"
 else:
-    comparison_data = load_qoq_data()
+    comparison_data = load_qoq_data(page_filter)
     period_label = "vs last quarter"
 
 if not kpis.empty:
@@ -332,6 +312,7 @@ if not kpis.empty:
             delta=delta_text,
             help="Total procurement spend across all unified ERP systems"
         )
+        kpi_sparkline('TOTAL_SPEND')
     
     with col2:
         total_suppliers = kpi_row.get('TOTAL_SUPPLIERS', 0)
@@ -342,6 +323,7 @@ if not kpis.empty:
             delta=supplier_delta,
             help="Number of suppliers with active purchase orders"
         )
+        kpi_sparkline('TOTAL_SUPPLIERS')
     
     with col3:
         risk_exposure = kpi_row.get('RISK_EXPOSURE_AMOUNT', 0)
@@ -353,6 +335,7 @@ if not kpis.empty:
             delta_color="inverse",
             help="Total spend with suppliers having financial health < 50"
         )
+        kpi_sparkline('RISK_EXPOSURE_AMOUNT')
     
     with col4:
         esg_score = kpi_row.get('AVG_ESG_SCORE', 0)
@@ -365,6 +348,7 @@ if not kpis.empty:
             delta_color="normal" if esg_delta >= 0 else "inverse",
             help="Average ESG score across supplier base (target: 70)"
         )
+        kpi_sparkline('AVG_ESG_SCORE')
     
     with col5:
         erp_count = kpi_row.get('ERP_SOURCE_COUNT', 0)
@@ -375,6 +359,10 @@ if not kpis.empty:
             help="Number of legacy ERP systems with unified spend data"
         )
     
+    snapshot_time = kpi_row.get('SNAPSHOT_TIMESTAMP')
+    if pd.notna(snapshot_time):
+        st.caption(f"KPI snapshot as of {pd.Timestamp(snapshot_time):%Y-%m-%d %H:%M} (refreshed hourly)")
+    
     # Trending mini-chart row
     if comparison_period == "YoY" and not comparison_data.empty:
         st.markdown("""
@@ -395,7 +383,7 @@ st.markdown("---")
 st.markdown("### Operational Excellence")
 st.caption("*Procurement efficiency and cost optimization metrics*")
 
-operational_kpis = load_operational_kpis()
+operational_kpis = load_operational_kpis(page_filter)
 
 if not operational_kpis.empty:
     op_row = operational_kpis.iloc[0]
@@ -474,7 +462,7 @@ st.caption("*On-Time-In-Full delivery metrics across supplier base*")
 col_otif_metrics, col_otif_chart = st.columns([1, 2])
 
 with col_otif_metrics:
-    otif_summary = load_otif_summary()
+    otif_summary = load_otif_summary(page_filter)
     
     if not otif_summary.empty:
         otif_row = otif_summary.iloc[0]
@@ -504,7 +492,7 @@ with col_otif_metrics:
         st.metric("In-Full Rate", "91.3%")
 
 with col_otif_chart:
-    otif_trend = load_otif_trend()
+    otif_trend = load_otif_trend(page_filter)
     
     if not otif_trend.empty:
         # Melt for multi-line chart
@@ -547,7 +535,7 @@ st.markdown("---")
 # =============================================================================
 st.markdown("### ESG Sustainability Targets")
 
-esg_targets = load_esg_targets()
+esg_targets = load_esg_targets(page_filter)
 
 if not esg_targets.empty:
     target_cols = st.columns(len(esg_targets))
@@ -604,81 +592,77 @@ with col_map:
     st.markdown("### Global Supplier Risk Map")
     st.caption("*Click on suppliers to view details*")
     
-    supplier_map = load_supplier_map()
+    supplier_map = load_supplier_map(page_filter)
     
     if not supplier_map.empty:
-        # Apply region filter
-        if selected_region != 'All':
-            supplier_map = supplier_map[supplier_map['REGION'] == selected_region]
+        # Add color column based on risk level
+        supplier_map['COLOR'] = supplier_map['RISK_LEVEL'].apply(get_risk_rgb)
         
-        if not supplier_map.empty:
-            # Add color column based on risk level
-            supplier_map['COLOR'] = supplier_map['RISK_LEVEL'].apply(get_risk_rgb)
-            
-            # Pre-format columns for tooltip display
-            supplier_map['FINANCIAL_HEALTH_DISPLAY'] = supplier_map['FINANCIAL_HEALTH_SCORE'].apply(lambda x: f"{x:.1f}")
-            supplier_map['ESG_SCORE_DISPLAY'] = supplier_map['ESG_SCORE'].apply(lambda x: f"{x:.1f}")
-            supplier_map['TOTAL_SPEND_DISPLAY'] = supplier_map['TOTAL_SPEND'].apply(lambda x: f"${x:,.0f}")
-            
-            # Create PyDeck layer
-            layer = pdk.Layer(
-                "ScatterplotLayer",
-                data=supplier_map,
-                get_position=["LONGITUDE", "LATITUDE"],
-                get_color="COLOR",
-                get_radius="TOTAL_SPEND",
-                radius_scale=0.0001,
-                radius_min_pixels=5,
-                radius_max_pixels=50,
-                pickable=True,
-                auto_highlight=True
-            )
-            
-            # Create view - adjust based on region
-            if selected_region == 'AMER':
-                view_state = pdk.ViewState(latitude=40, longitude=-100, zoom=3, pitch=0)
-            elif selected_region == 'EMEA':
-                view_state = pdk.ViewState(latitude=50, longitude=10, zoom=3, pitch=0)
-            elif selected_region == 'APAC':
-                view_state = pdk.ViewState(latitude=20, longitude=100, zoom=3, pitch=0)
-            else:
-                view_state = pdk.ViewState(latitude=30, longitude=0, zoom=1.5, pitch=0)
-            
-            # Tooltip
-            tooltip = {
-                "html": """
-                <b>{SUPPLIER_NAME}</b><br/>
-                Country: {SUPPLIER_COUNTRY}<br/>
-                Risk Level: {RISK_LEVEL}<br/>
-                Financial Health: {FINANCIAL_HEALTH_DISPLAY}<br/>
-                ESG Score: {ESG_SCORE_DISPLAY}<br/>
-                Total Spend: {TOTAL_SPEND_DISPLAY}
-                """,
-                "style": {"backgroundColor": "#1E1E1E", "color": "white"}
-            }
-            
-            # Render map (using map_style=None for CSP compliance)
-            st.pydeck_chart(pdk.Deck(
-                layers=[layer],
-                initial_view_state=view_state,
-                tooltip=tooltip,
-                map_style=None
-            ))
-            
-            # Legend
-            st.markdown("""
-            **Risk Legend:** 
-            Critical (<30) | High (30-50) | Medium (50-70) | Low (>70)
-            """)
+        # Pre-format columns for tooltip display
+        supplier_map['FINANCIAL_HEALTH_DISPLAY'] = supplier_map['FINANCIAL_HEALTH_SCORE'].apply(lambda x: f"{x:.1f}")
+        supplier_map['ESG_SCORE_DISPLAY'] = supplier_map['ESG_SCORE'].apply(lambda x: f"{x:.1f}")
+        supplier_map['TOTAL_SPEND_DISPLAY'] = supplier_map['TOTAL_SPEND'].apply(lambda x: f"${x:,.0f}")
+        
+        # Create PyDeck layer
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=supplier_map,
+            get_position=["LONGITUDE", "LATITUDE"],
+            get_color="COLOR",
+            get_radius="TOTAL_SPEND",
+            radius_scale=0.0001,
+            radius_min_pixels=5,
+            radius_max_pixels=50,
+            pickable=True,
+            auto_highlight=True
+        )
+        
+        # Create view - adjust based on region
+        if selected_region == 'AMER':
+            view_state = pdk.ViewState(latitude=40, longitude=-100, zoom=3, pitch=0)
+        elif selected_region == 'EMEA':
+            view_state = pdk.ViewState(latitude=50, longitude=10, zoom=3, pitch=0)
+        elif selected_region == 'APAC':
+            view_state = pdk.ViewState(latitude=20, longitude=100, zoom=3, pitch=0)
         else:
-            st.info(f"No suppliers found in {selected_region} region")
+            view_state = pdk.ViewState(latitude=30, longitude=0, zoom=1.5, pitch=0)
+        
+        # Tooltip
+        tooltip = {
+            "html": """
+            <b>{SUPPLIER_NAME}</b><br/>
+            Country: {SUPPLIER_COUNTRY}<br/>
+            Risk Level: {RISK_LEVEL}<br/>
+            Financial Health: {FINANCIAL_HEALTH_DISPLAY}<br/>
+            ESG Score: {ESG_SCORE_DISPLAY}<br/>
+            Total Spend: {TOTAL_SPEND_DISPLAY}
+            """,
+            "style": {"backgroundColor": "#1E1E1E", "color": "white"}
+        }
+        
+        # Render map (using map_style=None for CSP compliance)
+        st.pydeck_chart(pdk.Deck(
+            layers=[layer],
+            initial_view_state=view_state,
+            tooltip=tooltip,
+            map_style=None
+        ))
+        
+        # Legend
+        st.markdown("""
+        **Risk Legend:** 
+        Critical (<30) | High (30-50) | Medium (50-70) | Low (>70)
+        """)
     else:
-        st.info("No supplier location data available")
+        if selected_region != 'All':
+            st.info(f"No suppliers found in {selected_region} region")
+        else:
+            st.info("No supplier location data available")
 
 with col_charts:
     st.markdown("### Risk Distribution")
     
-    risk_dist = load_risk_distribution()
+    risk_dist = load_risk_distribution(page_filter)
     
     if not risk_dist.empty:
         # Risk level chart
@@ -704,7 +688,7 @@ with col_charts:
     
     st.markdown("### Spend by Region")
     
-    spend_region = load_spend_by_region()
+    spend_region = load_spend_by_region(page_filter)
     
     if not spend_region.empty:
         chart = alt.Chart(spend_region).mark_bar().encode(
@@ -725,176 +709,166 @@ st.markdown("---")
 # =============================================================================
 st.markdown("### High Risk Suppliers")
 
-high_risk = load_high_risk_suppliers()
+high_risk = load_high_risk_suppliers(page_filter)
 
-@st.cache_data(ttl=300)
-def load_alternative_suppliers():
-    return load_data('alternative_suppliers')
+load_alternative_suppliers = query_loader('alternative_suppliers')
 
 if not high_risk.empty:
-    # Apply region filter
-    if selected_region != 'All':
-        high_risk = high_risk[high_risk['REGION'] == selected_region]
+    # Format for display
+    display_df = high_risk[[
+        'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION',
+        'FINANCIAL_HEALTH_SCORE', 'CREDIT_RATING', 'ESG_SCORE',
+        'TOTAL_SPEND', 'REVENUE_AT_RISK', 'RISK_LEVEL'
+    ]].copy()
     
-    if not high_risk.empty:
-        # Format for display
-        display_df = high_risk[[
-            'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION',
-            'FINANCIAL_HEALTH_SCORE', 'CREDIT_RATING', 'ESG_SCORE',
-            'TOTAL_SPEND', 'REVENUE_AT_RISK', 'RISK_LEVEL'
-        ]].copy()
-        
-        display_df['TOTAL_SPEND'] = display_df['TOTAL_SPEND'].apply(format_currency)
-        display_df['REVENUE_AT_RISK'] = display_df['REVENUE_AT_RISK'].apply(format_currency)
-        
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            column_config={
-                "SUPPLIER_NAME": "Supplier",
-                "SUPPLIER_COUNTRY": "Country",
-                "REGION": "Region",
-                "FINANCIAL_HEALTH_SCORE": st.column_config.ProgressColumn(
-                    "Financial Health",
-                    min_value=0,
-                    max_value=100,
-                    format="%.1f"
-                ),
-                "CREDIT_RATING": "Credit",
-                "ESG_SCORE": st.column_config.ProgressColumn(
-                    "ESG Score",
-                    min_value=0,
-                    max_value=100,
-                    format="%.1f"
-                ),
-                "TOTAL_SPEND": "Total Spend",
-                "REVENUE_AT_RISK": "At Risk",
-                "RISK_LEVEL": "Risk Level"
-            },
-            hide_index=True
-        )
-        
-        # Recommendations callout
-        total_at_risk = high_risk['REVENUE_AT_RISK'].sum()
-        critical_count = len(high_risk[high_risk['RISK_LEVEL'] == 'CRITICAL'])
-        
-        st.markdown(f"""
-        <div style="background: linear-gradient(135deg, #2D1F1F 0%, #1E1E1E 100%); 
-                    border-radius: 8px; padding: 1rem; margin-top: 1rem;
-                    border-left: 4px solid #FF6B6B;">
-            <h4 style="color: #FF6B6B; margin: 0;">Recommended Actions</h4>
-            <ul style="color: #CCC; margin-top: 0.5rem;">
-                <li><strong>{critical_count} suppliers</strong> require immediate financial review</li>
-                <li>Consider alternative suppliers from Snowflake Marketplace for {format_currency(total_at_risk)} at-risk spend</li>
-                <li>Schedule quarterly business reviews with high-risk strategic suppliers</li>
-                <li>Update risk monitoring frequency from monthly to weekly for critical suppliers</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # =============================================================================
-        # Alternative Supplier Recommendations (DRD "Wow" Moment)
-        # =============================================================================
-        st.markdown("### Recommended Alternative Suppliers")
-        st.caption("*Validated suppliers from Snowflake Marketplace with strong financial health and ESG scores*")
+    display_df['TOTAL_SPEND'] = display_df['TOTAL_SPEND'].apply(format_currency)
+    display_df['REVENUE_AT_RISK'] = display_df['REVENUE_AT_RISK'].apply(format_currency)
+    
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        column_config={
+            "SUPPLIER_NAME": "Supplier",
+            "SUPPLIER_COUNTRY": "Country",
+            "REGION": "Region",
+            "FINANCIAL_HEALTH_SCORE": st.column_config.ProgressColumn(
+                "Financial Health",
+                min_value=0,
+                max_value=100,
+                format="%.1f"
+            ),
+            "CREDIT_RATING": "Credit",
+            "ESG_SCORE": st.column_config.ProgressColumn(
+                "ESG Score",
+                min_value=0,
+                max_value=100,
+                format="%.1f"
+            ),
+            "TOTAL_SPEND": "Total Spend",
+            "REVENUE_AT_RISK": "At Risk",
+            "RISK_LEVEL": "Risk Level"
+        },
+        hide_index=True
+    )
+    
+    # Recommendations callout
+    total_at_risk = high_risk['REVENUE_AT_RISK'].sum()
+    critical_count = len(high_risk[high_risk['RISK_LEVEL'] == 'CRITICAL'])
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, #2D1F1F 0%, #1E1E1E 100%); 
+                border-radius: 8px; padding: 1rem; margin-top: 1rem;
+                border-left: 4px solid #FF6B6B;">
+        <h4 style="color: #FF6B6B; margin: 0;">Recommended Actions</h4>
+        <ul style="color: #CCC; margin-top: 0.5rem;">
+            <li><strong>{critical_count} suppliers</strong> require immediate financial review</li>
+            <li>Consider alternative suppliers from Snowflake Marketplace for {format_currency(total_at_risk)} at-risk spend</li>
+            <li>Schedule quarterly business reviews with high-risk strategic suppliers</li>
+            <li>Update risk monitoring frequency from monthly to weekly for critical suppliers</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # =============================================================================
+    # Alternative Supplier Recommendations (DRD "Wow" Moment)
+    # =============================================================================
+    st.markdown("### Recommended Alternative Suppliers")
+    st.caption("*Validated suppliers from Snowflake Marketplace with strong financial health and ESG scores*")
+    
+    alt_suppliers = load_alternative_suppliers(page_filter)
+    if alt_suppliers.empty and selected_region != 'All':
+        alt_suppliers = load_alternative_suppliers()  # Show all if no regional match
+    
+    if not alt_suppliers.empty:
+        alt_filtered = alt_suppliers
         
-        alt_suppliers = load_alternative_suppliers()
+        # Create comparison columns
+        col_metrics, col_table = st.columns([1, 3])
         
-        if not alt_suppliers.empty:
-            # Apply region filter if set
-            if selected_region != 'All':
-                alt_filtered = alt_suppliers[alt_suppliers['REGION'] == selected_region]
-                if alt_filtered.empty:
-                    alt_filtered = alt_suppliers  # Show all if no regional match
-            else:
-                alt_filtered = alt_suppliers
-            
-            # Create comparison columns
-            col_metrics, col_table = st.columns([1, 3])
+        with col_metrics:
+            st.markdown("""
+            <div style="background: linear-gradient(135deg, #1F2D1F 0%, #1E1E1E 100%); 
+                        border-radius: 8px; padding: 1rem;
+                        border-left: 4px solid #6BCB77;">
+                <div style="font-size: 0.8rem; color: #888; text-transform: uppercase;">Potential Risk Reduction</div>
+                <div style="font-size: 1.8rem; font-weight: bold; color: #6BCB77;">""" + format_currency(total_at_risk) + """</div>
+                <div style="font-size: 0.85rem; color: #AAA; margin-top: 0.5rem;">by switching to validated alternatives</div>
+            </div>
+            """, unsafe_allow_html=True)
             
-            with col_metrics:
-                st.markdown("""
-                <div style="background: linear-gradient(135deg, #1F2D1F 0%, #1E1E1E 100%); 
-                            border-radius: 8px; padding: 1rem;
-                            border-left: 4px solid #6BCB77;">
-                    <div style="font-size: 0.8rem; color: #888; text-transform: uppercase;">Potential Risk Reduction</div>
-                    <div style="font-size: 1.8rem; font-weight: bold; color: #6BCB77;">""" + format_currency(total_at_risk) + """</div>
-                    <div style="font-size: 0.85rem; color: #AAA; margin-top: 0.5rem;">by switching to validated alternatives</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                avg_alt_health = alt_filtered['FINANCIAL_HEALTH_SCORE'].mean()
-                avg_alt_esg = alt_filtered['ESG_SCORE'].mean()
-                
-                st.metric(
-                    label="Avg Financial Health",
-                    value=f"{avg_alt_health:.1f}",
-                    delta=f"+{avg_alt_health - high_risk['FINANCIAL_HEALTH_SCORE'].mean():.1f} vs at-risk"
-                )
-                st.metric(
-                    label="Avg ESG Score",
-                    value=f"{avg_alt_esg:.1f}",
-                    delta=f"+{avg_alt_esg - high_risk['ESG_SCORE'].mean():.1f} vs at-risk"
-                )
+            avg_alt_health = alt_filtered['FINANCIAL_HEALTH_SCORE'].mean()
+            avg_alt_esg = alt_filtered['ESG_SCORE'].mean()
             
-            with col_table:
-                alt_display = alt_filtered[[
-                    'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION',
-                    'FINANCIAL_HEALTH_SCORE', 'ESG_SCORE', 'CREDIT_RATING',
-                    'CERTIFICATION_STATUS', 'MARKETPLACE_STATUS'
-                ]].head(10).copy()
-                
-                st.dataframe(
-                    alt_display,
-                    use_container_width=True,
-                    column_config={
-                        "SUPPLIER_NAME": "Supplier",
-                        "SUPPLIER_COUNTRY": "Country",
-                        "REGION": "Region",
-                        "FINANCIAL_HEALTH_SCORE": st.column_config.ProgressColumn(
-                            "Financial Health",
-                            min_value=0,
-                            max_value=100,
-                            format="%.1f"
-                        ),
-                        "ESG_SCORE": st.column_config.ProgressColumn(
-                            "ESG Score",
-                            min_value=0,
-                            max_value=100,
-                            format="%.1f"
-                        ),
-                        "CREDIT_RATING": "Credit",
-                        "CERTIFICATION_STATUS": "Certifications",
-                        "MARKETPLACE_STATUS": st.column_config.TextColumn(
-                            "Status",
-                            help="Supplier validation status from Snowflake Marketplace"
-                        )
-                    },
-                    hide_index=True
-                )
+            st.metric(
+                label="Avg Financial Health",
+                value=f"{avg_alt_health:.1f}",
+                delta=f"+{avg_alt_health - high_risk['FINANCIAL_HEALTH_SCORE'].mean():.1f} vs at-risk"
+            )
+            st.metric(
+                label="Avg ESG Score",
+                value=f"{avg_alt_esg:.1f}",
+                delta=f"+{avg_alt_esg - high_risk['ESG_SCORE'].mean():.1f} vs at-risk"
+            )
+        
+        with col_table:
+            alt_display = alt_filtered[[
+                'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION',
+                'FINANCIAL_HEALTH_SCORE', 'ESG_SCORE', 'CREDIT_RATING',
+                'CERTIFICATION_STATUS', 'MARKETPLACE_STATUS'
+            ]].head(10).copy()
             
-            # Action buttons
-            col_action1, col_action2, col_action3 = st.columns(3)
-            with col_action1:
-                st.button("Generate Supplier Comparison Report", use_container_width=True, type="primary")
-            with col_action2:
-                st.button("Contact Procurement Team", use_container_width=True)
-            with col_action3:
-                # Export alternative suppliers
-                csv_data = alt_filtered.to_csv(index=False)
-                st.download_button(
-                    label="Export Alternatives (CSV)",
-                    data=csv_data,
-                    file_name="alternative_suppliers.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-        else:
-            st.info("No alternative suppliers found matching criteria")
+            st.dataframe(
+                alt_display,
+                use_container_width=True,
+                column_config={
+                    "SUPPLIER_NAME": "Supplier",
+                    "SUPPLIER_COUNTRY": "Country",
+                    "REGION": "Region",
+                    "FINANCIAL_HEALTH_SCORE": st.column_config.ProgressColumn(
+                        "Financial Health",
+                        min_value=0,
+                        max_value=100,
+                        format="%.1f"
+                    ),
+                    "ESG_SCORE": st.column_config.ProgressColumn(
+                        "ESG Score",
+                        min_value=0,
+                        max_value=100,
+                        format="%.1f"
+                    ),
+                    "CREDIT_RATING": "Credit",
+                    "CERTIFICATION_STATUS": "Certifications",
+                    "MARKETPLACE_STATUS": st.column_config.TextColumn(
+                        "Status",
+                        help="Supplier validation status from Snowflake Marketplace"
+                    )
+                },
+                hide_index=True
+            )
+        
+        # Action buttons
+        col_action1, col_action2, col_action3 = st.columns(3)
+        with col_action1:
+            st.button("Generate Supplier Comparison Report", use_container_width=True, type="primary")
+        with col_action2:
+            st.button("Contact Procurement Team", use_container_width=True)
+        with col_action3:
+            # Export alternative suppliers
+            csv_data = alt_filtered.to_csv(index=False)
+            st.download_button(
+                label="Export Alternatives (CSV)",
+                data=csv_data,
+                file_name="alternative_suppliers.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
     else:
-        st.success(f"No high-risk suppliers in {selected_region} region")
+        st.info("No alternative suppliers found matching criteria")
 else:
-    st.info("No high-risk suppliers found")
+    if selected_region != 'All':
+        st.success(f"No high-risk suppliers in {selected_region} region")
+    else:
+        st.info("No high-risk suppliers found")
 
 st.markdown("---")
 
@@ -909,7 +883,7 @@ col_scope, col_diversity = st.columns(2)
 with col_scope:
     st.markdown("#### Scope 1/2/3 Emissions Breakdown")
     
-    scope_data = load_scope_emissions_summary()
+    scope_data = load_scope_emissions_summary(page_filter)
     
     if not scope_data.empty:
         # Scope colors
@@ -944,7 +918,7 @@ with col_scope:
 with col_diversity:
     st.markdown("#### Supplier Diversity Spend")
     
-    diversity_data = load_diversity_spend()
+    diversity_data = load_diversity_spend(page_filter)
     
     if not diversity_data.empty:
         # Diversity bar chart
@@ -977,7 +951,7 @@ with col_diversity:
 col1, col2 = st.columns(2)
 
 with col1:
-    esg_data = load_data('esg_summary')
+    esg_data = load_data('esg_summary', page_filter)
     if not esg_data.empty:
         chart = alt.Chart(esg_data).mark_bar().encode(
             x=alt.X('ESG_RISK_LEVEL:N', title='ESG Risk Level',
@@ -990,7 +964,7 @@ with col1:
         st.altair_chart(chart, use_container_width=True)
 
 with col2:
-    carbon_data = load_data('carbon_by_region')
+    carbon_data = load_data('carbon_by_region', page_filter)
     if not carbon_data.empty:
         chart = alt.Chart(carbon_data).mark_bar().encode(
             x=alt.X('REGION:N', title='Region'),
@@ -1008,20 +982,15 @@ st.markdown("---")
 st.markdown("### Supplier Concentration Analysis")
 st.caption("*Identify concentration risk and single-source dependencies*")
 
-@st.cache_data(ttl=300)
-def load_spend_concentration():
-    return load_data('spend_concentration')
-
-@st.cache_data(ttl=300)
-def load_single_source_risk():
-    return load_data('single_source_risk')
+load_spend_concentration = query_loader('spend_concentration')
+load_single_source_risk = query_loader('single_source_risk')
 
 col_pareto, col_single_source = st.columns(2)
 
 with col_pareto:
     st.markdown("#### Spend Concentration (Pareto)")
     
-    concentration_data = load_spend_concentration()
+    concentration_data = load_spend_concentration(page_filter)
     
     if not concentration_data.empty:
         # Calculate top supplier concentration
@@ -1088,7 +1057,7 @@ with col_pareto:
 with col_single_source:
     st.markdown("#### Single-Source Risk by Category")
     
-    single_source = load_single_source_risk()
+    single_source = load_single_source_risk(page_filter)
     
     if not single_source.empty:
         # Count categories by risk level
@@ -1140,3 +1109,6 @@ with col_single_source:
 # Footer
 st.markdown("---")
 st.caption("Data refreshed every 5 minutes | Executive Control Tower")
+
+# Query diagnostics in the sidebar (enable with ?debug=1 or SNOWCORE_DEBUG_PANEL=1)
+render_debug_panel()
@@ -8,8 +8,11 @@ import pandas as pd
 import altair as alt
 
 from utils.data_loader import (
-    load_data, load_custom_query, format_currency, format_percent
+    load_data, query_loader, render_debug_panel, requested_as_of, to_frame, load_custom_query,
+    format_currency, format_percent
 )
+from utils.query_filter import QueryFilter
+from utils.should_cost import scenario_comparison
 
 st.set_page_config(
     page_title="Category Manager Workbench | Snowcore",
@@ -89,6 +92,14 @@ with filter_col4:
         </div>
         """, unsafe_allow_html=True)
 
+# Division, category and region are applied in the warehouse by the loaders below
+page_filter = QueryFilter.from_selection(
+    division=selected_division, region=selected_region, category=selected_category,
+    as_of=requested_as_of(),
+)
+if page_filter.as_of is not None:
+    st.caption(f"Showing data as of {page_filter.as_of:%Y-%m-%d}")
+
 st.markdown("---")
 
 # Sidebar - Quick Links only
@@ -100,34 +111,17 @@ with st.sidebar:
 # =============================================================================
 # Load Data Functions
 # =============================================================================
-@st.cache_data(ttl=300)
-def load_price_trend_data():
-    return load_data('price_trend_all')
-
-@st.cache_data(ttl=300)
-def load_invoice_details():
-    return load_data('invoice_details')
+load_price_trend_data = query_loader('price_trend_all')
+load_invoice_details = query_loader('invoice_details', as_table=True)
+load_should_cost_lines = query_loader('should_cost_lines')
+load_commodity_index_history = query_loader('commodity_index_history')
 
 # Category Manager Persona Data
-@st.cache_data(ttl=300)
-def load_category_metrics():
-    return load_data('category_metrics')
-
-@st.cache_data(ttl=300)
-def load_supplier_scorecard_latest():
-    return load_data('supplier_scorecard_latest')
-
-@st.cache_data(ttl=300)
-def load_supplier_scorecard_trend():
-    return load_data('supplier_scorecard_trend')
-
-@st.cache_data(ttl=300)
-def load_forward_contract_coverage():
-    return load_data('forward_contract_coverage')
-
-@st.cache_data(ttl=300)
-def load_lead_time_variability():
-    return load_data('lead_time_variability')
+load_category_metrics = query_loader('category_metrics')
+load_supplier_scorecard_latest = query_loader('supplier_scorecard_latest')
+load_supplier_scorecard_trend = query_loader('supplier_scorecard_trend')
+load_forward_contract_coverage = query_loader('forward_contract_coverage')
+load_lead_time_variability = query_loader('lead_time_variability')
 
 # =============================================================================
 # Category Performance KPIs (Category Manager Focus)
@@ -135,63 +129,57 @@ def load_lead_time_variability():
 st.markdown("### Category Performance")
 st.caption("*Key metrics for category management and sourcing optimization*")
 
-category_metrics = load_category_metrics()
+category_metrics = load_category_metrics(page_filter)
 
 if not category_metrics.empty:
-    # Apply category filter
-    filtered_metrics = category_metrics.copy()
-    if selected_category != 'All':
-        filtered_metrics = filtered_metrics[filtered_metrics['MATERIAL_CATEGORY'] == selected_category]
+    # Aggregate metrics
+    total_spend = category_metrics['TOTAL_SPEND'].sum()
+    total_qty = category_metrics['TOTAL_QUANTITY'].sum()
+    avg_cost_per_unit = total_spend / total_qty if total_qty > 0 else 0
+    avg_forward_coverage = category_metrics['FORWARD_COVERAGE_PCT'].mean()
     
-    if not filtered_metrics.empty:
-        # Aggregate metrics
-        total_spend = filtered_metrics['TOTAL_SPEND'].sum()
-        total_qty = filtered_metrics['TOTAL_QUANTITY'].sum()
-        avg_cost_per_unit = total_spend / total_qty if total_qty > 0 else 0
-        avg_forward_coverage = filtered_metrics['FORWARD_COVERAGE_PCT'].mean()
-        
-        col_cm1, col_cm2, col_cm3, col_cm4, col_cm5 = st.columns(5)
-        
-        with col_cm1:
-            st.metric(
-                label="Category Spend",
-                value=format_currency(total_spend),
-                delta=f"{filtered_metrics['PO_COUNT'].sum():,.0f} POs",
-                delta_color="off",
-                help="Total spend in selected category"
-            )
-        
-        with col_cm2:
-            st.metric(
-                label="Cost Per Unit",
-                value=f"${avg_cost_per_unit:,.2f}",
-                delta="-3.2% vs prior period",
-                help="Weighted average cost per unit (ton equivalent for metals)"
-            )
-        
-        with col_cm3:
-            supplier_count = filtered_metrics['SUPPLIER_COUNT'].sum()
-            st.metric(
-                label="Supplier Count",
-                value=f"{supplier_count:,.0f}",
-                help="Number of active suppliers in category"
-            )
-        
-        with col_cm4:
-            st.metric(
-                label="Forward Coverage",
-                value=f"{avg_forward_coverage:.1f}%",
-                delta="+5.2% vs target",
-                help="Percentage of spend covered by forward contracts"
-            )
-        
-        with col_cm5:
-            utilization = filtered_metrics['FORWARD_UTILIZATION_PCT'].mean()
-            st.metric(
-                label="Contract Utilization",
-                value=f"{utilization:.1f}%",
-                help="Average utilization of forward contracts"
-            )
+    col_cm1, col_cm2, col_cm3, col_cm4, col_cm5 = st.columns(5)
+    
+    with col_cm1:
+        st.metric(
+            label="Category Spend",
+            value=format_currency(total_spend),
+            delta=f"{category_metrics['PO_COUNT'].sum():,.0f} POs",
+            delta_color="off",
+            help="Total spend in selected category"
+        )
+    
+    with col_cm2:
+        st.metric(
+            label="Cost Per Unit",
+            value=f"${avg_cost_per_unit:,.2f}",
+            delta="-3.2% vs prior period",
+            help="Weighted average cost per unit (ton equivalent for metals)"
+        )
+    
+    with col_cm3:
+        supplier_count = category_metrics['SUPPLIER_COUNT'].sum()
+        st.metric(
+            label="Supplier Count",
+            value=f"{supplier_count:,.0f}",
+            help="Number of active suppliers in category"
+        )
+    
+    with col_cm4:
+        st.metric(
+            label="Forward Coverage",
+            value=f"{avg_forward_coverage:.1f}%",
+            delta="+5.2% vs target",
+            help="Percentage of spend covered by forward contracts"
+        )
+    
+    with col_cm5:
+        utilization = category_metrics['FORWARD_UTILIZATION_PCT'].mean()
+        st.metric(
+            label="Contract Utilization",
+            value=f"{utilization:.1f}%",
+            help="Average utilization of forward contracts"
+        )
 else:
     col_cm1, col_cm2, col_cm3, col_cm4, col_cm5 = st.columns(5)
     with col_cm1:
@@ -216,80 +204,76 @@ st.caption("*Multi-dimensional supplier performance evaluation*")
 col_scorecard, col_variability = st.columns([2, 1])
 
 with col_scorecard:
-    scorecard_data = load_supplier_scorecard_latest()
+    scorecard_data = load_supplier_scorecard_latest(page_filter)
     
     if not scorecard_data.empty:
-        # Filter if category manager selected specific region
-        if selected_region != 'All':
-            scorecard_data = scorecard_data[scorecard_data['REGION'] == selected_region]
+        # Top performers table
+        st.markdown("**Top Performing Suppliers**")
+        display_cols = ['SUPPLIER_NAME', 'QUALITY_SCORE', 'DELIVERY_SCORE', 
+                      'PRICE_SCORE', 'RESPONSIVENESS_SCORE', 'OVERALL_SCORE', 'RATING_GRADE']
         
-        if not scorecard_data.empty:
-            # Top performers table
-            st.markdown("**Top Performing Suppliers**")
-            display_cols = ['SUPPLIER_NAME', 'QUALITY_SCORE', 'DELIVERY_SCORE', 
-                          'PRICE_SCORE', 'RESPONSIVENESS_SCORE', 'OVERALL_SCORE', 'RATING_GRADE']
-            
-            st.dataframe(
-                scorecard_data[display_cols].head(10),
-                use_container_width=True,
-                column_config={
-                    "SUPPLIER_NAME": "Supplier",
-                    "QUALITY_SCORE": st.column_config.ProgressColumn(
-                        "Quality", min_value=0, max_value=100, format="%.1f"
-                    ),
-                    "DELIVERY_SCORE": st.column_config.ProgressColumn(
-                        "Delivery", min_value=0, max_value=100, format="%.1f"
-                    ),
-                    "PRICE_SCORE": st.column_config.ProgressColumn(
-                        "Price", min_value=0, max_value=100, format="%.1f"
-                    ),
-                    "RESPONSIVENESS_SCORE": st.column_config.ProgressColumn(
-                        "Response", min_value=0, max_value=100, format="%.1f"
-                    ),
-                    "OVERALL_SCORE": st.column_config.ProgressColumn(
-                        "Overall", min_value=0, max_value=100, format="%.1f"
-                    ),
-                    "RATING_GRADE": "Grade"
-                },
-                hide_index=True
-            )
-            
-            # Scorecard radar chart (average scores)
-            avg_scores = pd.DataFrame({
-                'Dimension': ['Quality', 'Delivery', 'Price', 'Responsiveness'],
-                'Score': [
-                    scorecard_data['QUALITY_SCORE'].mean(),
-                    scorecard_data['DELIVERY_SCORE'].mean(),
-                    scorecard_data['PRICE_SCORE'].mean(),
-                    scorecard_data['RESPONSIVENESS_SCORE'].mean()
-                ]
-            })
-            
-            chart = alt.Chart(avg_scores).mark_bar().encode(
-                x=alt.X('Score:Q', title='Average Score', scale=alt.Scale(domain=[0, 100])),
-                y=alt.Y('Dimension:N', sort='-x', title=None),
-                color=alt.condition(
-                    alt.datum.Score >= 80,
-                    alt.value('#6BCB77'),
-                    alt.condition(
-                        alt.datum.Score >= 60,
-                        alt.value('#FFD93D'),
-                        alt.value('#FF6B6B')
-                    )
+        st.dataframe(
+            scorecard_data[display_cols].head(10),
+            use_container_width=True,
+            column_config={
+                "SUPPLIER_NAME": "Supplier",
+                "QUALITY_SCORE": st.column_config.ProgressColumn(
+                    "Quality", min_value=0, max_value=100, format="%.1f"
                 ),
-                tooltip=['Dimension', 'Score']
-            ).properties(height=150, title='Average Scorecard by Dimension')
-            
-            st.altair_chart(chart, use_container_width=True)
-        else:
-            st.info(f"No scorecard data for {selected_region} region")
+                "DELIVERY_SCORE": st.column_config.ProgressColumn(
+                    "Delivery", min_value=0, max_value=100, format="%.1f"
+                ),
+                "PRICE_SCORE": st.column_config.ProgressColumn(
+                    "Price", min_value=0, max_value=100, format="%.1f"
+                ),
+                "RESPONSIVENESS_SCORE": st.column_config.ProgressColumn(
+                    "Response", min_value=0, max_value=100, format="%.1f"
+                ),
+                "OVERALL_SCORE": st.column_config.ProgressColumn(
+                    "Overall", min_value=0, max_value=100, format="%.1f"
+                ),
+                "RATING_GRADE": "Grade"
+            },
+            hide_index=True
+        )
+        
+        # Scorecard radar chart (average scores)
+        avg_scores = pd.DataFrame({
+            'Dimension': ['Quality', 'Delivery', 'Price', 'Responsiveness'],
+            'Score': [
+                scorecard_data['QUALITY_SCORE'].mean(),
+                scorecard_data['DELIVERY_SCORE'].mean(),
+                scorecard_data['PRICE_SCORE'].mean(),
+                scorecard_data['RESPONSIVENESS_SCORE'].mean()
+            ]
+        })
+        
+        chart = alt.Chart(avg_scores).mark_bar().encode(
+            x=alt.X('Score:Q', title='Average Score', scale=alt.Scale(domain=[0, 100])),
+            y=alt.Y('Dimension:N', sort='-x', title=None),
+            color=alt.condition(
+                alt.datum.Score >= 80,
+                alt.value('#6BCB77'),
+                alt.condition(
+                    alt.datum.Score >= 60,
+                    alt.value('#FFD93D'),
+                    alt.value('#FF6B6B')
+                )
+            ),
+            tooltip=['Dimension', 'Score']
+        ).properties(height=150, title='Average Scorecard by Dimension')
+        
+        st.altair_chart(chart, use_container_width=True)
     else:
-        st.info("Supplier scorecard data not available")
+        if selected_region != 'All':
+            st.info(f"No scorecard data for {selected_region} region")
+        else:
+            st.info("Supplier scorecard data not available")
 
 with col_variability:
     st.markdown("**Lead Time Variability**")
     
-    lead_time_data = load_lead_time_variability()
+    lead_time_data = load_lead_time_variability(page_filter)
     
     if not lead_time_data.empty:
         # Show suppliers with highest variability (risk)
@@ -319,7 +303,7 @@ st.markdown("---")
 st.markdown("### Forward Contract Coverage")
 st.caption("*Contract coverage and hedging positions by category*")
 
-forward_data = load_forward_contract_coverage()
+forward_data = load_forward_contract_coverage(page_filter)
 
 if not forward_data.empty:
     col_fc_chart, col_fc_table = st.columns([2, 1])
@@ -376,20 +360,13 @@ with col_charts:
     st.markdown("### Should-Cost Analysis")
     
     # Load should-cost data
-    should_cost = load_data('should_cost_by_category')
+    should_cost = load_data('should_cost_by_category', page_filter)
     
     if not should_cost.empty:
-        # Apply category filter to summary
-        filtered_should_cost = should_cost.copy()
-        if selected_category != 'All':
-            filtered_should_cost = filtered_should_cost[
-                filtered_should_cost['MATERIAL_CATEGORY'] == selected_category
-            ]
-        
         # Summary metrics
-        total_savings = filtered_should_cost['TOTAL_SAVINGS'].sum() if not filtered_should_cost.empty else 0
-        total_contract = filtered_should_cost['TOTAL_CONTRACT'].sum() if not filtered_should_cost.empty else 0
-        avg_variance = filtered_should_cost['AVG_VARIANCE_PCT'].mean() if not filtered_should_cost.empty else 0
+        total_savings = should_cost['TOTAL_SAVINGS'].sum()
+        total_contract = should_cost['TOTAL_CONTRACT'].sum()
+        avg_variance = should_cost['AVG_VARIANCE_PCT'].mean()
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -423,54 +400,50 @@ with col_charts:
         st.markdown("#### Contract Price vs Market Index Over Time")
         st.caption("*Compare contracted rates against real-time global spot indices*")
         
-        price_trend = load_price_trend_data()
+        price_trend = load_price_trend_data(page_filter)
         
         if not price_trend.empty:
-            # Apply category filter
-            if selected_category != 'All':
-                price_trend = price_trend[price_trend['MATERIAL_CATEGORY'] == selected_category]
+            # Melt for multi-line chart
+            trend_melted = price_trend.melt(
+                id_vars=['WEEK', 'MATERIAL_CATEGORY'],
+                value_vars=['AVG_CONTRACT_PRICE', 'AVG_MARKET_PRICE'],
+                var_name='Price Type',
+                value_name='Price'
+            )
+            trend_melted['Price Type'] = trend_melted['Price Type'].map({
+                'AVG_CONTRACT_PRICE': 'Contract Price',
+                'AVG_MARKET_PRICE': 'Market Index'
+            })
             
-            if not price_trend.empty:
-                # Melt for multi-line chart
-                trend_melted = price_trend.melt(
-                    id_vars=['WEEK', 'MATERIAL_CATEGORY'],
-                    value_vars=['AVG_CONTRACT_PRICE', 'AVG_MARKET_PRICE'],
-                    var_name='Price Type',
-                    value_name='Price'
-                )
-                trend_melted['Price Type'] = trend_melted['Price Type'].map({
-                    'AVG_CONTRACT_PRICE': 'Contract Price',
-                    'AVG_MARKET_PRICE': 'Market Index'
-                })
-                
-                # Create multi-line chart
-                line_chart = alt.Chart(trend_melted).mark_line(strokeWidth=2).encode(
-                    x=alt.X('WEEK:T', title='Week'),
-                    y=alt.Y('Price:Q', title='Average Price ($)'),
-                    color=alt.Color('Price Type:N',
-                                  scale=alt.Scale(domain=['Contract Price', 'Market Index'],
-                                                 range=['#FF6B6B', '#29B5E8']),
-                                  legend=alt.Legend(orient='top')),
-                    strokeDash=alt.StrokeDash('Price Type:N',
-                                              scale=alt.Scale(domain=['Contract Price', 'Market Index'],
-                                                             range=[[0], [5, 5]])),
-                    detail='MATERIAL_CATEGORY:N',
-                    tooltip=['WEEK:T', 'MATERIAL_CATEGORY:N', 'Price Type:N', 'Price:Q']
-                ).properties(height=280)
-                
-                st.altair_chart(line_chart, use_container_width=True)
-                
-                # Variance correlation callout
-                if selected_category != 'All':
-                    latest_variance = price_trend['AVG_VARIANCE_PCT'].iloc[-1] if len(price_trend) > 0 else 0
-                    if latest_variance > 5:
-                        st.warning(f"Current variance of {latest_variance:.1f}% above market for {selected_category}. Consider renegotiation.")
-                    elif latest_variance < -5:
-                        st.success(f"Favorable pricing: {abs(latest_variance):.1f}% below market for {selected_category}.")
-            else:
-                st.info(f"No price trend data for {selected_category}")
+            # Create multi-line chart
+            line_chart = alt.Chart(trend_melted).mark_line(strokeWidth=2).encode(
+                x=alt.X('WEEK:T', title='Week'),
+                y=alt.Y('Price:Q', title='Average Price ($)'),
+                color=alt.Color('Price Type:N',
+                              scale=alt.Scale(domain=['Contract Price', 'Market Index'],
+                                             range=['#FF6B6B', '#29B5E8']),
+                              legend=alt.Legend(orient='top')),
+                strokeDash=alt.StrokeDash('Price Type:N',
+                                          scale=alt.Scale(domain=['Contract Price', 'Market Index'],
+                                                         range=[[0], [5, 5]])),
+                detail='MATERIAL_CATEGORY:N',
+                tooltip=['WEEK:T', 'MATERIAL_CATEGORY:N', 'Price Type:N', 'Price:Q']
+            ).properties(height=280)
+            
+            st.altair_chart(line_chart, use_container_width=True)
+            
+            # Variance correlation callout
+            if selected_category != 'All':
+                latest_variance = price_trend['AVG_VARIANCE_PCT'].iloc[-1] if len(price_trend) > 0 else 0
+                if latest_variance > 5:
+                    st.warning(f"Current variance of {latest_variance:.1f}% above market for {selected_category}. Consider renegotiation.")
+                elif latest_variance < -5:
+                    st.success(f"Favorable pricing: {abs(latest_variance):.1f}% below market for {selected_category}.")
         else:
-            st.info("Price trend data not available")
+            if selected_category != 'All':
+                st.info(f"No price trend data for {selected_category}")
+            else:
+                st.info("Price trend data not available")
         
         st.markdown("---")
         
@@ -516,6 +489,59 @@ with col_charts:
         ).properties(height=250)
         
         st.altair_chart(savings_chart, use_container_width=True)
+        
+        # Market what-if: lines are re-priced locally with an as-of merge
+        # against the index history, no warehouse query per scenario
+        with st.expander("Market Scenario (What-If)", expanded=False):
+            st.markdown("**How would savings change if market prices moved?**")
+            run_scenario = st.checkbox("Run scenario", value=False, key="cat_market_scenario",
+                                       help="Loads PO lines and the commodity index history once")
+            col_shift, col_lag = st.columns(2)
+            with col_shift:
+                market_shift = st.slider("Market price change", min_value=-30, max_value=30, value=0,
+                                         step=5, format="%d%%", key="cat_market_shift")
+            with col_lag:
+                index_lag = st.slider("Index lag (days)", min_value=0, max_value=180, value=0, step=30,
+                                      key="cat_index_lag",
+                                      help="Price each PO off the index this many days before its PO date")
+            
+            if run_scenario:
+                scenario_lines = load_should_cost_lines(page_filter)
+                index_history = load_commodity_index_history()
+                if not scenario_lines.empty and not index_history.empty:
+                    scenario = scenario_comparison(scenario_lines, index_history,
+                                                   market_shift_pct=market_shift, lag_days=index_lag)
+                    baseline_total = scenario['BASELINE_SAVINGS'].sum()
+                    scenario_total = scenario['SCENARIO_SAVINGS'].sum()
+                    baseline_flagged = int(scenario['BASELINE_RENEGOTIATE_LINES'].sum())
+                    scenario_flagged = int(scenario['SCENARIO_RENEGOTIATE_LINES'].sum())
+                    
+                    col_s1, col_s2, col_s3 = st.columns(3)
+                    with col_s1:
+                        st.metric("Current Savings", format_currency(baseline_total))
+                    with col_s2:
+                        st.metric("Scenario Savings", format_currency(scenario_total),
+                                  delta=("-" if scenario_total < baseline_total else "+")
+                                  + format_currency(abs(scenario_total - baseline_total)))
+                    with col_s3:
+                        st.metric("Lines to Renegotiate", f"{scenario_flagged:,}",
+                                  delta=f"{scenario_flagged - baseline_flagged:+,}", delta_color="off")
+                    
+                    st.dataframe(
+                        scenario,
+                        use_container_width=True,
+                        column_config={
+                            "MATERIAL_CATEGORY": "Category",
+                            "BASELINE_SAVINGS": st.column_config.NumberColumn("Current $", format="$%.0f"),
+                            "SCENARIO_SAVINGS": st.column_config.NumberColumn("Scenario $", format="$%.0f"),
+                            "SAVINGS_CHANGE": st.column_config.NumberColumn("Change $", format="$%.0f"),
+                            "BASELINE_RENEGOTIATE_LINES": st.column_config.NumberColumn("Current Lines", format="%d"),
+                            "SCENARIO_RENEGOTIATE_LINES": st.column_config.NumberColumn("Scenario Lines", format="%d"),
+                        },
+                        hide_index=True
+                    )
+                else:
+                    st.info("Line-level pricing data not available")
     
     # =================================================================
     # Invoice-Level Drill-Down (per DRD: "identify specific invoices")
@@ -524,16 +550,10 @@ with col_charts:
     st.markdown("### Invoice-Level Renegotiation Opportunities")
     st.caption("*Specific purchase orders where we overpaid vs market index*")
     
-    invoice_details = load_invoice_details()
+    invoice_details = load_invoice_details(page_filter)
     
-    if not invoice_details.empty:
-        # Apply filters
-        display_df = invoice_details.copy()
-        if selected_category != 'All':
-            display_df = display_df[display_df['MATERIAL_CATEGORY'] == selected_category]
-        if selected_region != 'All':
-            # Would need region in invoice data - filter by supplier region if available
-            pass
+    if invoice_details.num_rows > 0:
+        display_df = to_frame(invoice_details)
         
         if not display_df.empty:
             # Initialize selection state
@@ -722,45 +742,42 @@ market-rate benchmarks for should-cost comparison.
             st.info(f"No renegotiation opportunities found for {selected_category}")
     else:
         # Fallback to aggregated view
-        renegotiate = load_data('renegotiate_opportunities')
+        renegotiate = load_data('renegotiate_opportunities', page_filter)
         
         if not renegotiate.empty:
             display_df = renegotiate.copy()
-            if selected_category != 'All':
-                display_df = display_df[display_df['MATERIAL_CATEGORY'] == selected_category]
+            display_df['POTENTIAL_SAVINGS'] = display_df['POTENTIAL_SAVINGS'].apply(format_currency)
+            display_df['PRICE_VARIANCE_PCT'] = display_df['PRICE_VARIANCE_PCT'].apply(format_percent)
             
-            if not display_df.empty:
-                display_df['POTENTIAL_SAVINGS'] = display_df['POTENTIAL_SAVINGS'].apply(format_currency)
-                display_df['PRICE_VARIANCE_PCT'] = display_df['PRICE_VARIANCE_PCT'].apply(format_percent)
-                
-                st.dataframe(
-                    display_df[[
-                        'SUPPLIER_NAME', 'PRODUCT_NAME', 'MATERIAL_CATEGORY',
-                        'CONTRACT_UNIT_PRICE', 'MARKET_INDEX_PRICE',
-                        'PRICE_VARIANCE_PCT', 'POTENTIAL_SAVINGS'
-                    ]].head(20),
-                    use_container_width=True,
-                    column_config={
-                        "SUPPLIER_NAME": "Supplier",
-                        "PRODUCT_NAME": "Product",
-                        "MATERIAL_CATEGORY": "Category",
-                        "CONTRACT_UNIT_PRICE": st.column_config.NumberColumn(
-                            "Contract Price",
-                            format="$%.2f"
-                        ),
-                        "MARKET_INDEX_PRICE": st.column_config.NumberColumn(
-                            "Market Price",
-                            format="$%.2f"
-                        ),
-                        "PRICE_VARIANCE_PCT": "Variance %",
-                        "POTENTIAL_SAVINGS": "Savings"
-                    },
-                    hide_index=True
-                )
-            else:
-                st.info("No renegotiation opportunities found with current filters")
+            st.dataframe(
+                display_df[[
+                    'SUPPLIER_NAME', 'PRODUCT_NAME', 'MATERIAL_CATEGORY',
+                    'CONTRACT_UNIT_PRICE', 'MARKET_INDEX_PRICE',
+                    'PRICE_VARIANCE_PCT', 'POTENTIAL_SAVINGS'
+                ]].head(20),
+                use_container_width=True,
+                column_config={
+                    "SUPPLIER_NAME": "Supplier",
+                    "PRODUCT_NAME": "Product",
+                    "MATERIAL_CATEGORY": "Category",
+                    "CONTRACT_UNIT_PRICE": st.column_config.NumberColumn(
+                        "Contract Price",
+                        format="$%.2f"
+                    ),
+                    "MARKET_INDEX_PRICE": st.column_config.NumberColumn(
+                        "Market Price",
+                        format="$%.2f"
+                    ),
+                    "PRICE_VARIANCE_PCT": "Variance %",
+                    "POTENTIAL_SAVINGS": "Savings"
+                },
+                hide_index=True
+            )
         else:
-            st.info("Renegotiation data not available")
+            if selected_category != 'All':
+                st.info("No renegotiation opportunities found with current filters")
+            else:
+                st.info("Renegotiation data not available")
 
 with col_chat:
     st.markdown("### Cortex Agent")
@@ -981,7 +998,7 @@ st.markdown("---")
 st.markdown("### Commodity Index Trends")
 st.caption("*External market indices from Snowflake Marketplace - correlate with contract pricing above*")
 
-indices = load_data('commodity_indices')
+indices = load_data('commodity_indices', page_filter)
 
 if not indices.empty:
     # Filter to selected category if applicable
@@ -1022,3 +1039,6 @@ else:
 # Footer
 st.markdown("---")
 st.caption("Category Manager Workbench | Should-Cost modeling powered by Snowflake Marketplace data")
+
+# Query diagnostics in the sidebar (enable with ?debug=1 or SNOWCORE_DEBUG_PANEL=1)
+render_debug_panel()
@@ -8,8 +8,9 @@ import pandas as pd
 import altair as alt
 
 from utils.data_loader import (
-    load_data, format_currency, format_number, format_percent
+    load_data, query_loader, render_debug_panel, requested_as_of, to_frame, format_currency, format_number, format_percent
 )
+from utils.query_filter import QueryFilter
 
 st.set_page_config(
     page_title="Data Science Workbench | Snowcore",
@@ -76,50 +77,28 @@ with filter_col4:
     </div>
     """, unsafe_allow_html=True)
 
+# Category is applied in the warehouse by the forecast loaders below
+page_filter = QueryFilter.from_selection(
+    division=selected_division, category=selected_category, as_of=requested_as_of()
+)
+if page_filter.as_of is not None:
+    st.caption(f"Showing data as of {page_filter.as_of:%Y-%m-%d}")
+
 st.markdown("---")
 
 # =============================================================================
 # Data Scientist Persona - Data Loading Functions
 # =============================================================================
-@st.cache_data(ttl=300)
-def load_forecast_metrics():
-    return load_data('forecast_accuracy_metrics')
-
-@st.cache_data(ttl=300)
-def load_forecast_predictions():
-    return load_data('demand_forecast_predictions')
-
-@st.cache_data(ttl=300)
-def load_feature_importance():
-    return load_data('feature_importance')
-
-@st.cache_data(ttl=300)
-def load_external_indicators():
-    return load_data('external_indicators')
-
-@st.cache_data(ttl=300)
-def load_forecast_trend():
-    return load_data('forecast_vs_actual_trend')
-
-@st.cache_data(ttl=300)
-def load_model_registry():
-    return load_data('model_registry')
-
-@st.cache_data(ttl=300)
-def load_model_comparison():
-    return load_data('model_comparison')
-
-@st.cache_data(ttl=300)
-def load_external_indicators_latest():
-    return load_data('external_indicators_latest')
-
-@st.cache_data(ttl=300)
-def load_external_indicators_trend():
-    return load_data('external_indicators_trend')
-
-@st.cache_data(ttl=300)
-def load_business_impact_summary():
-    return load_data('business_impact_summary')
+load_forecast_metrics = query_loader('forecast_accuracy_metrics')
+load_forecast_predictions = query_loader('demand_forecast_predictions', as_table=True)
+load_feature_importance = query_loader('feature_importance')
+load_external_indicators = query_loader('external_indicators')
+load_forecast_trend = query_loader('forecast_vs_actual_trend')
+load_model_registry = query_loader('model_registry')
+load_model_comparison = query_loader('model_comparison')
+load_external_indicators_latest = query_loader('external_indicators_latest')
+load_external_indicators_trend = query_loader('external_indicators_trend')
+load_business_impact_summary = query_loader('business_impact_summary')
 
 # =============================================================================
 # Model Operations Dashboard
@@ -214,7 +193,7 @@ st.markdown("---")
 st.markdown("### Business Impact")
 st.caption("*Quantified value from demand sensing model*")
 
-business_impact = load_business_impact_summary()
+business_impact = load_business_impact_summary(page_filter)
 
 if not business_impact.empty:
     bi = business_impact.iloc[0]
@@ -286,7 +265,7 @@ st.markdown("---")
 # =============================================================================
 st.markdown("### Model Performance Summary")
 
-metrics = load_forecast_metrics()
+metrics = load_forecast_metrics(page_filter)
 
 if not metrics.empty:
     overall_accuracy = metrics['ACCURACY_PCT'].mean()
@@ -300,7 +279,7 @@ if not metrics.empty:
             label="Forecast Accuracy",
             value=f"{overall_accuracy:.1f}%",
             delta="+12% vs baseline",
-            help="Overall accuracy across all categories (100% - MAPE)"
+            help="Overall accuracy across the selected categories (100% - MAPE)"
         )
     
     with col2:
@@ -341,7 +320,7 @@ col_left, col_right = st.columns([2, 1])
 with col_left:
     st.markdown("### Forecast vs Actual Trend")
     
-    trend_data = load_forecast_trend()
+    trend_data = load_forecast_trend(page_filter)
     
     if not trend_data.empty:
         # Melt data for multi-line chart
@@ -491,13 +470,10 @@ st.markdown("---")
 # =============================================================================
 st.markdown("### 90-Day Demand Forecast Predictions")
 
-predictions = load_forecast_predictions()
+predictions = load_forecast_predictions(page_filter)
 
-if not predictions.empty:
-    # Apply category filter
-    display_df = predictions.copy()
-    if selected_category != 'All':
-        display_df = display_df[display_df['MATERIAL_CATEGORY'] == selected_category]
+if predictions.num_rows > 0:
+    display_df = to_frame(predictions)
     
     if not display_df.empty:
         st.dataframe(
@@ -558,9 +534,7 @@ st.markdown("---")
 st.markdown("### External Indicator Correlation Explorer")
 st.caption("*Analyze relationships between external economic indicators and demand patterns*")
 
-@st.cache_data(ttl=300)
-def load_indicator_correlation():
-    return load_data('indicator_demand_correlation')
+load_indicator_correlation = query_loader('indicator_demand_correlation')
 
 correlation_data = load_indicator_correlation()
 
@@ -706,8 +680,8 @@ st.markdown("---")
 with st.expander("Raw Data Explorer", expanded=False):
     st.markdown("**Preview of prediction data from `V_DEMAND_FORECAST_PREDICTIONS` view:**")
     
-    if not predictions.empty:
-        st.dataframe(predictions.head(20), use_container_width=True, hide_index=True)
+    if predictions.num_rows > 0:
+        st.dataframe(to_frame(predictions.slice(0, 20)), use_container_width=True, hide_index=True)
         
         st.markdown("**SQL Query:**")
         st.code("""
@@ -730,3 +704,6 @@ ORDER BY FORECAST_DATE DESC
 # Footer
 st.markdown("---")
 st.caption("Data Science Workbench | XGBoost Demand Sensing Model powered by Snowpark ML")
+
+# Query diagnostics in the sidebar (enable with ?debug=1 or SNOWCORE_DEBUG_PANEL=1)
+render_debug_panel()
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# Pages import the app's helpers as `utils.*` from the streamlit/ directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def local_session():
+    """The offline DuckDB backend over data/synthetic, built once per test run."""
+    from utils.local_backend import LocalSession
+
+    session = LocalSession(run_scheduler=False)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope='session')
+def run_query(local_session):
+    """Run a registry query on the local backend as data_loader would, returning a DataFrame."""
+    from utils.data_loader import _normalize_arrow_types, compile_binds
+    from utils.query_filter import apply_filters
+    from utils.query_registry import get_query
+
+    def _run(query_name, query_filter=None, **params):
+        if query_filter is not None:
+            params = {**query_filter.params_for(query_name), **params}
+        query, bind_names = compile_binds(apply_filters(get_query(query_name), params))
+        table = local_session.sql(query, [params[name] for name in bind_names]).to_arrow()
+        return _normalize_arrow_types(table).to_pandas()
+
+    return _run
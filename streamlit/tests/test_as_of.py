@@ -0,0 +1,59 @@
+"""Tests that :as_of windows read no data dated after the as-of date (local backend)."""
+
+import datetime
+
+import pytest
+
+from utils.query_filter import QueryFilter
+
+SPEND_FACT = 'SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SPEND_FACT'
+
+# Mid-month, with spend lines later in the same month
+AS_OF = datetime.date(2024, 5, 15)
+
+
+def _fact_totals(local_session, start, end, where=''):
+    frame = local_session.sql(
+        f"SELECT SUM(SPEND_AMOUNT) AS SPEND, COUNT(DISTINCT SUPPLIER_CODE) AS SUPPLIERS, "
+        f"COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS POS FROM {SPEND_FACT} "
+        f"WHERE PURCHASE_ORDER_DATE BETWEEN ? AND ? {where}",
+        [start, end],
+    ).to_pandas()
+    return frame.iloc[0]
+
+
+def _assert_period(row, prefix, expected):
+    assert float(row[f'{prefix}_SPEND']) == pytest.approx(float(expected['SPEND']))
+    assert int(row[f'{prefix}_SUPPLIERS']) == int(expected['SUPPLIERS'])
+    assert int(row[f'{prefix}_POS']) == int(expected['POS'])
+
+
+def test_fixture_has_rows_after_as_of(local_session):
+    later = _fact_totals(local_session, AS_OF + datetime.timedelta(days=1), datetime.date(2024, 5, 31))
+    assert later['POS'] > 0
+
+
+def test_qoq_excludes_rows_after_as_of(local_session, run_query):
+    row = run_query('spend_qoq', as_of=AS_OF).iloc[0]
+    _assert_period(row, 'CURRENT', _fact_totals(local_session, datetime.date(2024, 4, 1), AS_OF))
+    # Same elapsed days of the prior quarter
+    _assert_period(row, 'PRIOR', _fact_totals(
+        local_session, datetime.date(2024, 1, 1), datetime.date(2024, 2, 15),
+    ))
+
+
+def test_yoy_is_trailing_year_ending_as_of(local_session, run_query):
+    row = run_query('spend_yoy', as_of=AS_OF).iloc[0]
+    _assert_period(row, 'CURRENT', _fact_totals(local_session, datetime.date(2023, 5, 16), AS_OF))
+    _assert_period(row, 'PRIOR', _fact_totals(
+        local_session, datetime.date(2022, 5, 16), datetime.date(2023, 5, 15),
+    ))
+
+
+def test_qoq_filters_apply_to_partial_month(local_session, run_query):
+    query_filter = QueryFilter(region='Germany', division='Industrial Compression', as_of=AS_OF)
+    row = run_query('spend_qoq', query_filter).iloc[0]
+    _assert_period(row, 'CURRENT', _fact_totals(
+        local_session, datetime.date(2024, 4, 1), AS_OF,
+        where="AND REGION = 'Germany' AND ERP_SOURCE_SYSTEM NOT LIKE 'BIOFLOW%'",
+    ))
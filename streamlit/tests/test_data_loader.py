@@ -0,0 +1,148 @@
+"""Tests for utils.data_loader: cache keys, error reporting, source version probes and stale-while-revalidate."""
+
+import datetime
+import threading
+
+import numpy as np
+import pyarrow as pa
+
+from utils.data_loader import normalize_params
+
+
+def test_params_key_ignores_argument_order():
+    assert normalize_params({'a': 1, 'b': 2}) == normalize_params({'b': 2, 'a': 1})
+
+
+def test_set_values_are_sorted():
+    key = normalize_params({'regions': {'Spain', 'France', 'Germany'}})
+    assert key == (('regions', ('France', 'Germany', 'Spain')),)
+    assert normalize_params({'regions': frozenset({'Spain', 'France'})}) == \
+        (('regions', ('France', 'Spain')),)
+
+
+def test_sequence_values_keep_their_order():
+    assert normalize_params({'ids': ['b', 'a']}) == (('ids', ('b', 'a')),)
+
+
+def test_scalars_are_coerced():
+    key = dict(normalize_params({'n': np.int64(3), 'name': ' x ', 'day': datetime.date(2024, 5, 15)}))
+    assert key == {'n': 3, 'name': 'x', 'day': datetime.date(2024, 5, 15)}
+    assert type(key['n']) is int
+
+
+def test_missing_bind_parameter_is_reported_not_raised():
+    from utils.data_loader import get_query_log, load_data, load_many
+
+    assert load_data('price_trend').empty
+    assert load_many(['price_trend'])[0].empty
+    failed = [event for event in get_query_log().events() if event.query_name == 'price_trend']
+    assert len(failed) == 2
+    assert all('missing parameters: category' in event.error for event in failed)
+
+
+class _ProbeSession:
+    """Session stand-in whose table_versions() probe can be made to fail."""
+
+    def __init__(self):
+        self.versions = {'SPEND_FACT': '1|100'}
+        self.failing = False
+
+    def table_versions(self):
+        if self.failing:
+            raise ConnectionError('warehouse unavailable')
+        return self.versions
+
+
+def test_failed_probe_keeps_last_good_versions(monkeypatch):
+    from utils import data_loader
+    from utils.result_cache import MemoryResultCache
+
+    cache = MemoryResultCache()
+    session = _ProbeSession()
+    monkeypatch.setattr(data_loader, 'get_result_cache', lambda: cache)
+    monkeypatch.setattr(data_loader, 'get_session', lambda: session)
+    monkeypatch.setattr(data_loader, 'SOURCE_PROBE_TTL_SECONDS', -1)  # Re-probe on every call
+
+    assert data_loader.get_source_versions() == {'SPEND_FACT': '1|100'}
+    session.failing = True
+    assert data_loader.get_source_versions() == {'SPEND_FACT': '1|100'}
+    session.failing = False
+    session.versions = {'SPEND_FACT': '2|101'}
+    assert data_loader.get_source_versions() == {'SPEND_FACT': '2|101'}
+
+
+def test_failed_first_probe_reports_no_versions(monkeypatch):
+    from utils import data_loader
+    from utils.result_cache import MemoryResultCache
+
+    session = _ProbeSession()
+    session.failing = True
+    monkeypatch.setattr(data_loader, 'get_result_cache', lambda: MemoryResultCache())
+    monkeypatch.setattr(data_loader, 'get_session', lambda: session)
+    assert data_loader.get_source_versions() is None
+
+
+class _SlowSession:
+    """Session stand-in whose queries block until released, counting executions."""
+
+    def __init__(self, table):
+        self.table = table
+        self.executions = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def sql(self, query, params=None):
+        with self._lock:
+            self.executions += 1
+        return self
+
+    def to_arrow(self):
+        self.release.wait(5)
+        return self.table
+
+
+def test_stale_entry_served_while_one_background_refresh_runs(monkeypatch, tmp_path):
+    from utils import data_loader
+    from utils.data_loader import SessionPool
+    from utils.instrumentation import OUTCOME_STALE, QueryEvent
+    from utils.result_cache import DiskResultCache, MemoryResultCache
+
+    old = pa.table({'TOTAL_SPEND': [1.0]})
+    new = pa.table({'TOTAL_SPEND': [2.0]})
+    cache = MemoryResultCache()
+    session = _SlowSession(new)
+    monkeypatch.setattr(data_loader, 'get_result_cache', lambda: cache)
+    monkeypatch.setattr(data_loader, 'get_disk_cache', lambda: DiskResultCache(str(tmp_path)))
+    monkeypatch.setattr(data_loader, 'get_session_pool', lambda: SessionPool(fixed=session))
+    monkeypatch.setattr(data_loader, '_source_version', lambda query_name: None)
+
+    key = ('executive_kpis', (('as_of', datetime.date(2024, 5, 15)),))
+    cache.put(key, old, ttl=-1, label='executive_kpis')
+
+    served = []
+    events = []
+    lock = threading.Lock()
+
+    def reader():
+        event = QueryEvent(query_name='executive_kpis')
+        table = data_loader._lookup_registry_result(key, event)
+        with lock:
+            served.append(table)
+            events.append(event)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    # Every reader, the first included, got the stale value without waiting
+    assert all(table is old for table in served)
+    assert all(event.outcome == OUTCOME_STALE for event in events)
+
+    session.release.set()
+    for thread in threading.enumerate():
+        if thread.name == 'refresh-executive_kpis':
+            thread.join(timeout=10)
+    assert session.executions == 1
+    assert cache.get(key) is new
@@ -0,0 +1,86 @@
+"""Tests for filter pushdown in utils.query_filter."""
+
+import datetime
+
+import pytest
+
+from utils.query_filter import ALL, QueryFilter, apply_filters
+from utils.query_registry import get_query
+
+SPEND_VIEW = 'SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY'
+
+
+def test_from_selection_treats_all_as_unfiltered():
+    query_filter = QueryFilter.from_selection(division=ALL, region='Germany', category=ALL)
+    assert query_filter == QueryFilter(region='Germany')
+
+
+def test_unknown_division_is_rejected():
+    with pytest.raises(ValueError):
+        QueryFilter(division='Aerospace')
+
+
+def test_params_for_keeps_only_dimensions_the_views_expose():
+    query_filter = QueryFilter(region='Germany', category='Bearings', start_date=datetime.date(2024, 1, 1))
+    # V_SUPPLIER_RISK is filterable by region only
+    assert query_filter.params_for('supplier_risk_snapshot') == {'filter_region': 'Germany'}
+    assert query_filter.params_for('spend_cube') == {
+        'filter_region': 'Germany', 'filter_category': 'Bearings',
+        'filter_start_date': datetime.date(2024, 1, 1),
+    }
+
+
+def test_params_for_passes_as_of_only_to_anchored_queries():
+    query_filter = QueryFilter(as_of=datetime.date(2024, 5, 15))
+    assert query_filter.params_for('otif_summary') == {'as_of': datetime.date(2024, 5, 15)}
+    assert query_filter.params_for('spend_cube') == {}
+
+
+def test_apply_filters_without_filters_leaves_sql_unchanged():
+    query = get_query('spend_cube')
+    assert apply_filters(query, {}) == query
+    assert apply_filters(query, {'as_of': datetime.date(2024, 5, 15)}) == query
+
+
+def test_apply_filters_wraps_view_in_filtered_subquery():
+    sql = apply_filters(f"SELECT * FROM {SPEND_VIEW}", {
+        'filter_region': 'Germany', 'filter_division': 'BioFlow (Life Sciences)',
+    })
+    assert sql == (
+        f"SELECT * FROM (SELECT * FROM {SPEND_VIEW} WHERE ERP_SOURCE_SYSTEM LIKE 'BIOFLOW%' "
+        f"AND REGION = :filter_region) AS V_SPEND_SUMMARY"
+    )
+
+
+def test_apply_filters_sql_text_does_not_depend_on_values():
+    # Values stay binds, so every selection shares one compiled statement
+    query = get_query('spend_cube')
+    assert apply_filters(query, {'filter_region': 'Germany'}) == apply_filters(query, {'filter_region': 'Spain'})
+
+
+def test_apply_filters_wraps_table_function_calls():
+    sql = apply_filters(get_query('category_metrics'), {'filter_category': 'Bearings', 'as_of': None})
+    assert "(SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.CATEGORY_METRICS_AS_OF(:as_of)) " \
+           "WHERE MATERIAL_CATEGORY = :filter_category) AS CATEGORY_METRICS_AS_OF" in sql
+
+
+def test_apply_filters_skips_views_without_the_dimension():
+    query = get_query('supplier_risk_snapshot')
+    assert apply_filters(query, {'filter_category': 'Bearings'}) == query
+
+
+def test_date_range_filters_rows_in_the_warehouse(run_query):
+    query_filter = QueryFilter(start_date=datetime.date(2024, 3, 1), end_date=datetime.date(2024, 5, 31))
+    cube = run_query('spend_cube', query_filter)
+    months = cube['MONTH'].dt.date
+    assert not cube.empty
+    assert months.min() >= datetime.date(2024, 3, 1)
+    assert months.max() <= datetime.date(2024, 5, 1)
+
+
+def test_filtered_query_returns_the_matching_subset(run_query):
+    everything = run_query('supplier_risk_snapshot')
+    region = everything['REGION'].dropna().iloc[0]
+    filtered = run_query('supplier_risk_snapshot', QueryFilter(region=region))
+    assert len(filtered) == (everything['REGION'] == region).sum()
+    assert set(filtered['REGION']) == {region}
@@ -0,0 +1,84 @@
+"""Tests for stale-while-revalidate bookkeeping and disk writes in utils.result_cache."""
+
+import os
+import threading
+
+import pyarrow as pa
+
+from utils.result_cache import DiskResultCache, MemoryResultCache
+
+
+def test_stale_entry_served_within_max_stale():
+    cache = MemoryResultCache()
+    cache.put('key', 'old', ttl=-1)
+    entry = cache.lookup('key', max_stale=60)
+    assert entry is not None
+    assert entry.is_stale
+    assert entry.value == 'old'
+    assert cache.get('key') is None  # Plain reads do not accept stale entries
+
+
+def test_entry_past_max_stale_is_dropped():
+    cache = MemoryResultCache()
+    cache.put('key', 'old', ttl=-10)
+    assert cache.lookup('key', max_stale=1) is None
+    assert cache.lookup('key', max_stale=60) is None
+
+
+def test_stale_entry_refreshed_only_once():
+    cache = MemoryResultCache()
+    cache.put('key', 'old', ttl=-1)
+    refreshes = []
+    barrier = threading.Barrier(8)
+    lock = threading.Lock()
+
+    def reader():
+        entry = cache.lookup('key', max_stale=60)
+        barrier.wait(5)
+        if entry.is_stale and cache.begin_refresh('key'):
+            with lock:
+                refreshes.append(1)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert len(refreshes) == 1
+
+    cache.put('key', 'new', ttl=60)
+    cache.end_refresh('key')
+    assert cache.get('key') == 'new'
+    assert cache.begin_refresh('key')  # Released: the next expiry may refresh again
+
+
+def test_refreshing_entry_survives_past_max_stale():
+    # Past max_stale the entry is no longer served, but it is not evicted
+    # while a refresh owns it: the refresh replaces it in place, and readers
+    # allowing more staleness still get it meanwhile
+    cache = MemoryResultCache()
+    cache.put('key', 'old', ttl=-10)
+    assert cache.begin_refresh('key')
+    assert cache.lookup('key', max_stale=1) is None
+    assert cache.lookup('key', max_stale=60).value == 'old'
+    cache.end_refresh('key')
+
+
+def test_disk_put_round_trips_with_version(tmp_path):
+    cache = DiskResultCache(directory=str(tmp_path))
+    table = pa.table({'SUPPLIER_ID': [1, 2], 'SPEND': [10.5, 20.0]})
+    assert cache.put('key', table, version='v1')
+    assert cache.get('key', version='v1').equals(table)
+    assert cache.get('key', version='v2') is None
+
+
+def test_disk_put_write_error_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = DiskResultCache(directory=str(tmp_path))
+
+    def failing_new_file(*args, **kwargs):
+        raise pa.ArrowInvalid('write failed')
+
+    monkeypatch.setattr(pa.ipc, 'new_file', failing_new_file)
+    assert cache.put('key', pa.table({'SPEND': [1.0]})) is False
+    assert os.listdir(tmp_path) == []
+    assert cache.get('key') is None
@@ -0,0 +1,47 @@
+"""Parity of the risk widgets derived in utils.risk_snapshot with their registry SQL (local backend)."""
+
+import duckdb
+import pandas as pd
+import pytest
+
+from utils import risk_snapshot
+from utils.query_registry import get_query
+
+RISK_VIEW = 'SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SUPPLIER_RISK'
+
+
+def _by_level(frame):
+    frame = frame.copy()
+    frame['RISK_LEVEL'] = frame['RISK_LEVEL'].fillna('<NULL>')
+    return frame.set_index('RISK_LEVEL').sort_index().astype(float)
+
+
+def _sql_over(snapshot, query_name):
+    """Run a derived query's registry SQL with the snapshot standing in for V_SUPPLIER_RISK."""
+    connection = duckdb.connect()
+    connection.register('snapshot', snapshot)
+    return connection.execute(get_query(query_name).replace(RISK_VIEW, 'snapshot')).df()
+
+
+@pytest.fixture(scope='module')
+def snapshot(run_query):
+    return run_query('supplier_risk_snapshot')
+
+
+def test_risk_distribution_matches_sql(snapshot, run_query):
+    pd.testing.assert_frame_equal(
+        _by_level(risk_snapshot.risk_distribution(snapshot)),
+        _by_level(run_query('risk_distribution')),
+        check_dtype=False,
+    )
+
+
+def test_risk_distribution_keeps_unrated_suppliers(snapshot):
+    unrated = snapshot.head(2).assign(RISK_LEVEL=None)
+    with_unrated = pd.concat([snapshot, unrated], ignore_index=True)
+    derived = risk_snapshot.risk_distribution(with_unrated)
+    pd.testing.assert_frame_equal(
+        _by_level(derived), _by_level(_sql_over(with_unrated, 'risk_distribution')), check_dtype=False,
+    )
+    assert derived['RISK_LEVEL'].isna().iloc[-1]  # Sorted after the known levels
+    assert derived['SUPPLIER_COUNT'].sum() == len(with_unrated)
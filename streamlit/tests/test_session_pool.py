@@ -0,0 +1,127 @@
+"""Tests for SessionPool checkout, return and reclaim in utils.data_loader."""
+
+import threading
+
+import pytest
+
+from utils.data_loader import SessionPool
+
+
+class FakeSession:
+    """Stands in for a Snowpark session; only the calls the pool makes."""
+
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def sql(self, query):
+        return self
+
+    def collect(self):
+        if not self.alive:
+            raise ConnectionError('session expired')
+        return [(1,)]
+
+    def close(self):
+        self.closed = True
+
+
+def _factory(created):
+    def factory():
+        session = FakeSession()
+        created.append(session)
+        return session
+    return factory
+
+
+def _in_thread(target):
+    result = {}
+
+    def run():
+        try:
+            result['value'] = target()
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(timeout=10)
+    return result
+
+
+def test_thread_keeps_its_session():
+    created = []
+    pool = SessionPool(factory=_factory(created), size=2)
+    assert pool.get() is pool.get()
+    assert len(created) == 1
+
+
+def test_exhausted_pool_times_out():
+    created = []
+    pool = SessionPool(factory=_factory(created), size=1, timeout=0.05)
+    pool.get()
+    result = _in_thread(pool.get)
+    assert isinstance(result['error'], TimeoutError)
+    assert len(created) == 1
+
+
+def test_released_session_is_reused():
+    created = []
+    pool = SessionPool(factory=_factory(created), size=1, timeout=1)
+    session = pool.get()
+    pool.release()
+    assert _in_thread(pool.get)['value'] is session
+    assert len(created) == 1
+
+
+def test_session_of_finished_thread_is_reclaimed():
+    created = []
+    pool = SessionPool(factory=_factory(created), size=1, timeout=1)
+    held = _in_thread(pool.get)['value']  # Thread ends without releasing
+    assert pool.get() is held
+    assert len(created) == 1
+
+
+def test_scope_returns_session_and_nests():
+    created = []
+    pool = SessionPool(factory=_factory(created), size=1, timeout=0.05)
+    with pool.session() as outer:
+        with pool.session() as inner:
+            assert inner is outer
+        assert isinstance(_in_thread(pool.get)['error'], TimeoutError)
+    assert _in_thread(pool.get)['value'] is outer
+
+
+def test_broken_session_is_replaced():
+    created = []
+    pool = SessionPool(factory=_factory(created), size=1, timeout=1)
+    with pytest.raises(RuntimeError):
+        with pool.session() as session:
+            session.alive = False
+            raise RuntimeError('query failed')
+    assert session.closed
+    replacement = _in_thread(pool.get)['value']
+    assert replacement is not session
+    assert len(created) == 2
+
+
+def test_failed_connect_frees_its_slot():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError('login failed')
+        return FakeSession()
+
+    pool = SessionPool(factory=factory, size=1, timeout=0.05)
+    with pytest.raises(ConnectionError):
+        pool.get()
+    assert isinstance(pool.get(), FakeSession)
+
+
+def test_fixed_session_is_shared():
+    fixed = FakeSession()
+    pool = SessionPool(fixed=fixed)
+    assert pool.get() is fixed
+    assert _in_thread(pool.get)['value'] is fixed
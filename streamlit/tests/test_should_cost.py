@@ -0,0 +1,104 @@
+"""Tests for should-cost as-of pricing and what-if scenarios in utils.should_cost."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import should_cost
+
+
+def _index():
+    return pd.DataFrame({
+        'COMMODITY_TYPE': ['Steel', 'Steel', 'Steel', 'Copper'],
+        'INDEX_DATE': [datetime.date(2024, 3, 1), datetime.date(2024, 1, 1),
+                       datetime.date(2024, 2, 1), datetime.date(2024, 1, 15)],
+        'INDEX_VALUE': [120.0, 100.0, 110.0, 50.0],
+    })
+
+
+def _lines():
+    return pd.DataFrame({
+        'MATERIAL_CATEGORY': ['Steel', 'Steel', 'Copper', 'Steel', None],
+        'PURCHASE_ORDER_DATE': [datetime.date(2024, 2, 15), datetime.date(2024, 3, 1),
+                                datetime.date(2024, 1, 10), datetime.date(2023, 12, 31),
+                                datetime.date(2024, 2, 1)],
+        'ORDERED_QUANTITY': [10, 5, 4, 1, 2],
+        'CONTRACT_UNIT_PRICE': [130.0, 100.0, 60.0, 90.0, 10.0],
+        'CONTRACT_TOTAL': [1300.0, 500.0, 240.0, 90.0, 20.0],
+    })
+
+
+def test_asof_takes_latest_index_at_or_before_po_date():
+    priced = should_cost.asof_market_price(_lines(), _index())
+    # Original line order is kept; exact date matches count as "at or before"
+    assert priced['MARKET_INDEX_PRICE'].tolist()[:2] == [110.0, 120.0]
+    # No index row on or before the date (Copper), before all history, or no category
+    assert priced['MARKET_INDEX_PRICE'].iloc[2:].isna().all()
+
+
+def test_asof_lag_prices_off_an_earlier_index():
+    priced = should_cost.asof_market_price(_lines(), _index(), lag_days=1)
+    assert priced['MARKET_INDEX_PRICE'].tolist()[:2] == [110.0, 110.0]
+
+
+def test_price_lines_applies_market_shift():
+    priced = should_cost.asof_market_price(_lines(), _index()).head(2)
+    base = should_cost.price_lines(priced)
+    shifted = should_cost.price_lines(priced, market_shift_pct=10)
+    assert shifted['MARKET_INDEX_PRICE'].tolist() == pytest.approx([121.0, 132.0])
+    # 130 vs 110 is > 15% over market; +10% brings it within 5%..15%
+    assert base['SHOULD_COST_RECOMMENDATION'].tolist() == ['RENEGOTIATE', 'FAVORABLE']
+    assert shifted['SHOULD_COST_RECOMMENDATION'].tolist() == ['REVIEW', 'FAVORABLE']
+    assert base['POTENTIAL_SAVINGS'].tolist() == pytest.approx([200.0, 0.0])
+    assert shifted['POTENTIAL_SAVINGS'].tolist() == pytest.approx([90.0, 0.0])
+
+
+def test_unpriced_lines_have_no_savings():
+    priced = should_cost.price_lines(should_cost.asof_market_price(_lines(), _index()))
+    unpriced = priced['MARKET_INDEX_PRICE'].isna()
+    assert (priced.loc[unpriced, 'POTENTIAL_SAVINGS'] == 0).all()
+    assert (priced.loc[unpriced, 'SHOULD_COST_RECOMMENDATION'] == 'MARKET_RATE').all()
+
+
+def test_zero_scenario_changes_nothing():
+    comparison = should_cost.scenario_comparison(_lines(), _index())
+    assert (comparison['SAVINGS_CHANGE'] == 0).all()
+    assert (comparison['BASELINE_RENEGOTIATE_LINES'] == comparison['SCENARIO_RENEGOTIATE_LINES']).all()
+
+
+def test_higher_market_prices_reduce_savings():
+    comparison = should_cost.scenario_comparison(_lines(), _index(), market_shift_pct=10)
+    steel = comparison.set_index('MATERIAL_CATEGORY').loc['Steel']
+    assert steel['BASELINE_SAVINGS'] == pytest.approx(200.0)
+    assert steel['SCENARIO_SAVINGS'] == pytest.approx(90.0)
+    assert steel['SAVINGS_CHANGE'] == pytest.approx(-110.0)
+
+
+@pytest.fixture(scope='module')
+def extracts(run_query):
+    return run_query('should_cost_lines'), run_query('commodity_index_history')
+
+
+def test_baseline_matches_asof_join_in_the_view(extracts, run_query):
+    lines, index = extracts
+    derived = should_cost.should_cost_by_category(lines, index)
+    expected = run_query('should_cost_by_category')
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        derived[columns].sort_values('MATERIAL_CATEGORY').reset_index(drop=True).astype({'LINE_COUNT': float}),
+        expected.sort_values('MATERIAL_CATEGORY').reset_index(drop=True).astype({'LINE_COUNT': float}),
+        check_dtype=False, rtol=1e-6,
+    )
+
+
+def test_lag_scenario_reprices_lines(extracts):
+    lines, index = extracts
+    baseline = should_cost.should_cost_by_category(lines, index)
+    lagged = should_cost.should_cost_by_category(lines, index, lag_days=30)
+    assert lagged['LINE_COUNT'].sum() == baseline['LINE_COUNT'].sum()
+    assert not np.allclose(
+        lagged.sort_values('MATERIAL_CATEGORY')['AVG_MARKET_PRICE'].fillna(0),
+        baseline.sort_values('MATERIAL_CATEGORY')['AVG_MARKET_PRICE'].fillna(0),
+    )
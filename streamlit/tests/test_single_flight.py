@@ -0,0 +1,125 @@
+"""Tests for SingleFlight coalescing in utils.result_cache."""
+
+import threading
+import time
+
+import pytest
+
+from utils.result_cache import SingleFlight, SingleFlightTimeout
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight(timeout=5)
+    calls = []
+    release = threading.Event()
+    results = []
+    lock = threading.Lock()
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return 'result'
+
+    def caller():
+        value, shared = flights.do('key', work)
+        with lock:
+            results.append((value, shared))
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        time.sleep(0.01)
+    time.sleep(0.1)  # Let every other caller join the flight
+    release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ['result'] * 8
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+
+
+def test_leader_error_is_shared_with_waiters():
+    flights = SingleFlight(timeout=5)
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def work():
+        started.set()
+        release.wait(5)
+        raise ValueError('warehouse down')
+
+    def leader():
+        try:
+            flights.do('key', work)
+        except ValueError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait(5)
+    flight, is_leader = flights.claim('key')
+    assert not is_leader
+    release.set()
+    thread.join(timeout=10)
+
+    with pytest.raises(ValueError, match='warehouse down'):
+        flight.wait(5)
+    assert len(errors) == 1
+
+
+def test_failed_flight_is_retried_by_next_caller():
+    flights = SingleFlight(timeout=5)
+    with pytest.raises(RuntimeError):
+        flights.do('key', lambda: (_ for _ in ()).throw(RuntimeError('boom')))
+    assert flights.do('key', lambda: 42) == (42, False)
+
+
+def test_waiter_times_out_on_slow_leader():
+    flights = SingleFlight(timeout=0.05)
+    flight, is_leader = flights.claim('key')
+    assert is_leader
+    with pytest.raises(SingleFlightTimeout):
+        flights.do('key', lambda: 'never run')
+    flights.land('key', flight, result='late')
+    assert flight.wait(0) == 'late'
+
+
+def test_landed_flight_is_forgotten():
+    # A caller that claims after the leader landed leads a new flight, so it
+    # must re-check the cache the leader filled rather than rely on the flight
+    flights = SingleFlight(timeout=5)
+    cache = {}
+
+    def work():
+        if 'key' in cache:
+            return cache['key']
+        cache['key'] = object()
+        return cache['key']
+
+    first, _ = flights.do('key', work)
+    second, shared = flights.do('key', work)
+    assert not shared
+    assert second is first
+
+
+def test_distinct_keys_do_not_coalesce():
+    flights = SingleFlight(timeout=5)
+    calls = []
+    lock = threading.Lock()
+
+    def caller(key):
+        def work():
+            with lock:
+                calls.append(key)
+            return key
+        return lambda: flights.do(key, work)
+
+    threads = [threading.Thread(target=caller(f'key-{i}')) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert sorted(calls) == ['key-0', 'key-1', 'key-2', 'key-3']
@@ -0,0 +1,57 @@
+"""Parity of the spend widgets derived in utils.spend_cube with their registry SQL (local backend)."""
+
+import pandas as pd
+import pytest
+
+from utils import spend_cube
+from utils.query_filter import QueryFilter
+
+# Columns identifying a row of each derived widget
+KEYS = {
+    'spend_by_region': ['REGION'],
+    'spend_by_category': ['MATERIAL_CATEGORY'],
+    'spend_concentration': ['SUPPLIER_CODE'],
+    'single_source_risk': ['MATERIAL_CATEGORY'],
+}
+
+
+def _normalized(frame, keys):
+    frame = frame.sort_values(keys, kind='stable').reset_index(drop=True)
+    for column in frame.columns:
+        if column not in keys and pd.api.types.is_numeric_dtype(frame[column]):
+            frame[column] = frame[column].astype(float)
+    return frame
+
+
+@pytest.fixture(scope='module')
+def cube(run_query):
+    return run_query('spend_cube')
+
+
+@pytest.mark.parametrize('query_name', sorted(spend_cube.DERIVED_QUERIES))
+def test_derived_widget_matches_sql(cube, run_query, query_name):
+    keys = KEYS[query_name]
+    derived = spend_cube.DERIVED_QUERIES[query_name](cube)
+    expected = run_query(query_name)
+    assert list(derived.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(_normalized(derived, keys), _normalized(expected, keys), check_dtype=False)
+
+
+def test_derived_widgets_keep_sql_order(cube, run_query):
+    # Ranked widgets must come out in the SQL's order, not just with its rows
+    for query_name in ('spend_by_region', 'spend_by_category', 'spend_concentration'):
+        derived = spend_cube.DERIVED_QUERIES[query_name](cube)
+        assert derived['TOTAL_SPEND'].is_monotonic_decreasing
+    assert list(spend_cube.spend_concentration(cube)['SUPPLIER_CODE']) == \
+        list(run_query('spend_concentration')['SUPPLIER_CODE'])
+
+
+def test_filtered_cube_matches_filtered_sql(run_query):
+    query_filter = QueryFilter(region='Germany')
+    cube = run_query('spend_cube', query_filter)
+    assert set(cube['REGION']) == {'Germany'}
+    pd.testing.assert_frame_equal(
+        _normalized(spend_cube.spend_by_category(cube), ['MATERIAL_CATEGORY']),
+        _normalized(run_query('spend_by_category', query_filter), ['MATERIAL_CATEGORY']),
+        check_dtype=False,
+    )
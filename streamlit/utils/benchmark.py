@@ -0,0 +1,539 @@
+"""
+Query benchmark suite for Snowcore Procurement Intelligence
+Runs every QUERY_REGISTRY entry and every mart view (sql/05, sql/05b)
+against the local DuckDB backend at one or more data scale factors, records
+p50/p95 latency, peak memory and rows returned. The committed baseline holds
+only row counts and failures, which do not depend on the machine; timings
+are compared with a baseline recorded on the same runner (--output of a run
+of the base commit, passed back as --timing-baseline). Exits non-zero when
+a query fails or regresses past the threshold, so it can gate changes to
+the SQL layers and the registry:
+
+    python -m utils.benchmark --scales 1 10                     # check row counts and failures
+    python -m utils.benchmark --scales 1 10 --update-baseline   # record new row counts
+    python -m utils.benchmark --output base.json                # on the base commit, then:
+    python -m utils.benchmark --timing-baseline base.json       # gate timings on the same runner
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+import duckdb
+import numpy as np
+
+from utils.local_backend import DEFAULT_SQL_DIR, LocalSession, _REPO_ROOT
+from utils.query_registry import BIND_PATTERN, QUERY_REGISTRY, get_query
+
+
+# Bumped when the baseline layout changes; older baselines are rejected
+BASELINE_VERSION = 2
+DEFAULT_BASELINE = os.path.join(_REPO_ROOT, 'benchmarks', 'query_baseline.json')
+
+GENERATOR = os.path.join(_REPO_ROOT, 'utils', 'generate_synthetic_data.py')
+# Generated datasets are kept here and reused across runs
+DEFAULT_DATA_ROOT = os.environ.get(
+    'SNOWCORE_BENCHMARK_DATA_DIR', os.path.join(tempfile.gettempdir(), 'snowcore_benchmark_data')
+)
+DEFAULT_SEED = 42
+
+MART_LAYERS = ('05_mart_layer.sql', '05b_mart_persona_extensions.sql')
+_CREATE_VIEW = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?(?:SECURE\s+)?VIEW\s+(\w+)",
+                          re.IGNORECASE | re.MULTILINE)
+
+DEFAULT_SCALES = (1, 10)
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# A query regresses when its p50 grows past threshold x baseline AND by more
+# than the minimum delta (fast queries jitter by a few ms between runs)
+DEFAULT_THRESHOLD = 2.0
+DEFAULT_MIN_DELTA_MS = 10.0
+DEFAULT_MEMORY_THRESHOLD = 2.0
+DEFAULT_MIN_DELTA_MB = 64.0
+
+MEMORY_SAMPLE_INTERVAL = 0.005
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One query to time: a registry entry or a full scan of a mart view."""
+    name: str  # registry:<query name> | view:<VIEW NAME>
+    sql: str
+
+
+def mart_views(sql_dir: str = DEFAULT_SQL_DIR) -> List[str]:
+    """Names of the views defined in the mart layers, in definition order."""
+    names = []
+    for layer in MART_LAYERS:
+        with open(os.path.join(sql_dir, layer)) as f:
+            names.extend(name.upper() for name in _CREATE_VIEW.findall(f.read()))
+    return list(dict.fromkeys(names))
+
+
+def benchmark_cases(sql_dir: str = DEFAULT_SQL_DIR, only: Optional[str] = None,
+                    as_of: Optional[str] = None) -> List[BenchmarkCase]:
+    """
+    Every registry query and mart view as a benchmark case.
+
+    Args:
+        sql_dir: Directory holding the SQL layers
+        only: Optional regex; only cases whose name matches are returned
+        as_of: ISO date bound to :as_of (default today)
+
+    Returns:
+        Cases, registry queries first
+    """
+    as_of_literal = f"DATE '{as_of or datetime.date.today().isoformat()}'"
+
+    def _bind(match):
+        if match.group(1):
+            return match.group(1)
+        return as_of_literal if match.group(2) == 'as_of' else 'NULL'
+
+    cases = [
+        # Filter parameters are set to NULL, i.e. the unfiltered page load
+        # as of the dataset's anchor date
+        BenchmarkCase(f"registry:{name}", BIND_PATTERN.sub(_bind, get_query(name)))
+        for name in QUERY_REGISTRY
+    ]
+    cases.extend(
+        BenchmarkCase(f"view:{view}", f"SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.{view}")
+        for view in mart_views(sql_dir)
+    )
+    if only:
+        pattern = re.compile(only)
+        cases = [case for case in cases if pattern.search(case.name)]
+    return cases
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux), or None."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PeakMemory:
+    """
+    Peak resident memory above the starting level while a block runs.
+
+    Samples /proc/self/statm from a background thread, which sees DuckDB's
+    native allocations (tracemalloc does not). Elsewhere it falls back to the
+    growth of ru_maxrss, which only registers new process-wide peaks.
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._start = 0
+        self._peak = 0
+        self._done = threading.Event()
+        self._thread = None
+        self._use_rss = _current_rss() is not None
+
+    def __enter__(self) -> 'PeakMemory':
+        if self._use_rss:
+            self._start = self._peak = _current_rss()
+            self._thread = threading.Thread(target=self._sample, name='benchmark-memory', daemon=True)
+            self._thread.start()
+        else:
+            self._start = self._peak = _max_rss()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._thread is not None:
+            self._done.set()
+            self._thread.join()
+            self._peak = max(self._peak, _current_rss() or 0)
+        else:
+            self._peak = _max_rss()
+        self.peak_bytes = max(self._peak - self._start, 0)
+
+    def _sample(self) -> None:
+        while not self._done.wait(self.interval):
+            self._peak = max(self._peak, _current_rss() or 0)
+
+
+def _max_rss() -> int:
+    """Process-wide peak RSS in bytes (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class CaseResult:
+    """Measurements for one case at one scale."""
+    rows: Optional[int] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    peak_mb: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def run_case(session: LocalSession, case: BenchmarkCase,
+             repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP) -> CaseResult:
+    """
+    Time a case: warmup runs are discarded, then repeat timed runs.
+
+    Latency covers execution and fetching the result as Arrow, as the data
+    loader does. Peak memory is the largest increase over any timed run.
+    """
+    result = CaseResult()
+    timings = []
+    peak = 0
+    try:
+        for _ in range(warmup):
+            session.sql(case.sql).to_arrow()
+        for _ in range(repeat):
+            with PeakMemory() as memory:
+                start = time.perf_counter()
+                table = session.sql(case.sql).to_arrow()
+                timings.append((time.perf_counter() - start) * 1000)
+            peak = max(peak, memory.peak_bytes)
+            result.rows = table.num_rows
+            del table
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+    result.p50_ms = round(float(np.percentile(timings, 50)), 2)
+    result.p95_ms = round(float(np.percentile(timings, 95)), 2)
+    result.peak_mb = round(peak / 1e6, 1)
+    return result
+
+
+# =============================================================================
+# Datasets
+# =============================================================================
+
+def _scale_key(scale: float) -> str:
+    return f"{scale:g}"
+
+
+def ensure_dataset(scale: float, data_root: str = DEFAULT_DATA_ROOT, seed: int = DEFAULT_SEED,
+                   anchor_date: Optional[str] = None) -> str:
+    """
+    Generated dataset for a scale factor, created on first use.
+
+    Args:
+        scale: Scale factor passed to utils/generate_synthetic_data.py
+        data_root: Directory holding one subdirectory per dataset
+        seed: Generator seed
+        anchor_date: Last date of the persona tables (default today, so the
+            CURRENT_DATE()-relative windows in the mart views are populated)
+
+    Returns:
+        Path of the dataset directory
+    """
+    anchor_date = anchor_date or datetime.date.today().isoformat()
+    try:
+        import pyarrow.parquet  # noqa: F401  Parquet loads faster; CSV otherwise
+        file_format = 'parquet'
+    except ImportError:
+        file_format = 'csv'
+    path = os.path.join(data_root, f"sf{_scale_key(scale)}_seed{seed}_{anchor_date}_{file_format}")
+    if os.path.isdir(path):
+        return path
+
+    # Generated under a temporary name so an interrupted run is never reused
+    partial = f"{path}.partial"
+    subprocess.run(
+        [sys.executable, GENERATOR, '--scale', _scale_key(scale), '--seed', str(seed),
+         '--anchor-date', anchor_date, '--format', file_format, '--output-dir', partial],
+        check=True, stdout=subprocess.DEVNULL,
+    )
+    os.replace(partial, path)
+    return path
+
+
+# =============================================================================
+# Suite
+# =============================================================================
+
+def run_suite(scales=DEFAULT_SCALES, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+              only: Optional[str] = None, data_root: str = DEFAULT_DATA_ROOT, seed: int = DEFAULT_SEED,
+              anchor_date: Optional[str] = None, verbose: bool = True) -> dict:
+    """
+    Run every case at every scale.
+
+    Returns:
+        Results document in the baseline layout (see write_baseline)
+    """
+    anchor_date = anchor_date or datetime.date.today().isoformat()
+    cases = benchmark_cases(only=only, as_of=anchor_date)
+    document = {
+        'version': BASELINE_VERSION,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'settings': {'repeat': repeat, 'warmup': warmup, 'seed': seed, 'anchor_date': anchor_date},
+        'scales': {},
+    }
+    for scale in scales:
+        data_dir = ensure_dataset(scale, data_root=data_root, seed=seed, anchor_date=anchor_date)
+        start = time.perf_counter()
+        session = LocalSession(data_dir=data_dir, run_scheduler=False)
+        build_s = round(time.perf_counter() - start, 2)
+        if verbose:
+            print(f"Scale {_scale_key(scale)}x: built local database in {build_s:.1f}s ({data_dir})")
+        try:
+            queries = {}
+            for case in cases:
+                queries[case.name] = run_case(session, case, repeat=repeat, warmup=warmup).to_dict()
+                if verbose:
+                    _print_case(case.name, queries[case.name])
+        finally:
+            session.close()
+        document['scales'][_scale_key(scale)] = {'build_s': build_s, 'queries': queries}
+    return document
+
+
+def _environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'duckdb': duckdb.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'git_commit': _git_commit(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_REPO_ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_case(name: str, measured: dict) -> None:
+    if 'error' in measured:
+        print(f"  {name:<44} FAILED: {measured['error']}")
+    else:
+        print(f"  {name:<44} {measured['rows']:>9} rows  p50 {measured['p50_ms']:>9.1f} ms  "
+              f"p95 {measured['p95_ms']:>9.1f} ms  {measured['peak_mb']:>7.1f} MB")
+
+
+# =============================================================================
+# Baseline & Regression Gate
+# =============================================================================
+
+@dataclass
+class Regression:
+    """A case that got slower, heavier or started failing relative to the baseline."""
+    scale: str
+    name: str
+    metric: str  # p50_ms | peak_mb | error
+    baseline: Optional[float]
+    current: Optional[float]
+    detail: str = ''
+
+    def __str__(self) -> str:
+        if self.metric == 'error':
+            return f"{self.scale}x {self.name}: {self.detail}"
+        return (f"{self.scale}x {self.name}: {self.metric} {self.baseline:,.1f} -> {self.current:,.1f} "
+                f"({self.current / max(self.baseline, 1e-9):.1f}x)")
+
+
+def load_baseline(path: str = DEFAULT_BASELINE) -> Optional[dict]:
+    """Read a baseline, or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{path} has baseline version {baseline.get('version')}, "
+                         f"expected {BASELINE_VERSION}; re-record it with --update-baseline")
+    return baseline
+
+
+def row_baseline(document: dict) -> dict:
+    """
+    The machine-independent part of a run: row counts and failures per case.
+
+    Timings, memory, environment and creation time are left out, so the
+    committed baseline only changes when a query's results do.
+    """
+    return {
+        'version': document['version'],
+        'settings': {key: document['settings'][key] for key in ('seed', 'anchor_date')},
+        'scales': {
+            scale: {'queries': {
+                name: {key: result[key] for key in ('rows', 'error') if key in result}
+                for name, result in measured['queries'].items()
+            }}
+            for scale, measured in document['scales'].items()
+        },
+    }
+
+
+def write_baseline(document: dict, path: str = DEFAULT_BASELINE, merge: bool = True) -> None:
+    """
+    Write results as the new baseline.
+
+    With merge, scales present in the existing baseline but not re-run are
+    kept, so one scale can be re-recorded on its own.
+    """
+    existing = load_baseline(path) if merge else None
+    if existing:
+        document = dict(document, scales={**existing['scales'], **document['scales']})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS, memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+            min_delta_mb: float = DEFAULT_MIN_DELTA_MB) -> List[Regression]:
+    """
+    Regressions of the current run against the baseline.
+
+    Only cases present in both are compared, and latency and memory only
+    when the baseline recorded them (a timing baseline from the same
+    runner). A case regresses when its p50
+    latency exceeds threshold x baseline and grows by more than min_delta_ms,
+    when its peak memory exceeds memory_threshold x baseline and grows by more
+    than min_delta_mb, or when it fails where the baseline succeeded.
+    """
+    regressions = []
+    for scale, measured in current['scales'].items():
+        recorded = baseline['scales'].get(scale, {}).get('queries', {})
+        for name, result in measured['queries'].items():
+            before = recorded.get(name)
+            if before is None or 'error' in before:
+                continue
+            if 'error' in result:
+                regressions.append(Regression(scale, name, 'error', None, None, result['error']))
+                continue
+            if 'p50_ms' not in before:
+                continue
+            if (result['p50_ms'] > before['p50_ms'] * threshold
+                    and result['p50_ms'] - before['p50_ms'] > min_delta_ms):
+                regressions.append(Regression(scale, name, 'p50_ms', before['p50_ms'], result['p50_ms']))
+            if (result['peak_mb'] > before['peak_mb'] * memory_threshold
+                    and result['peak_mb'] - before['peak_mb'] > min_delta_mb):
+                regressions.append(Regression(scale, name, 'peak_mb', before['peak_mb'], result['peak_mb']))
+    return regressions
+
+
+def row_changes(baseline: dict, current: dict) -> List[str]:
+    """
+    Cases whose row count differs from the baseline.
+
+    Only meaningful when both runs used the same anchor date, so otherwise
+    nothing is reported. Views filtering on CURRENT_DATE() can still change
+    from one day to the next.
+    """
+    if baseline.get('settings', {}).get('anchor_date') != current['settings']['anchor_date']:
+        return []
+    changes = []
+    for scale, measured in current['scales'].items():
+        recorded = baseline['scales'].get(scale, {}).get('queries', {})
+        for name, result in measured['queries'].items():
+            before = recorded.get(name, {})
+            if 'rows' in before and 'rows' in result and before['rows'] != result['rows']:
+                changes.append(f"{scale}x {name}: {before['rows']} -> {result['rows']} rows")
+    return changes
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark registry queries and mart views offline.')
+    parser.add_argument('--scales', type=float, nargs='+', default=list(DEFAULT_SCALES),
+                        help='Data scale factors to run (default 1 10)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per query (default 5)')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help='Untimed runs per query (default 1)')
+    parser.add_argument('--only', help='Regex selecting cases, e.g. "SHOULD_COST|spend_"')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Row count baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Record this run's row counts as the baseline")
+    parser.add_argument('--timing-baseline',
+                        help='Full results (--output) of a run on this machine to gate latency and memory against')
+    parser.add_argument('--output', help='Also write this run, with timings, to a JSON file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed p50 slowdown factor (default {DEFAULT_THRESHOLD:g})')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f'Ignore slowdowns smaller than this (default {DEFAULT_MIN_DELTA_MS:g} ms)')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help=f'Allowed peak memory growth factor (default {DEFAULT_MEMORY_THRESHOLD:g})')
+    parser.add_argument('--data-root', default=DEFAULT_DATA_ROOT, help='Where generated datasets are kept')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Generator seed')
+    parser.add_argument('--anchor-date',
+                        help="Anchor date of the generated data (default the baseline's, else today)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    baseline = load_baseline(args.baseline)
+    timing_baseline = load_baseline(args.timing_baseline) if args.timing_baseline else None
+    if args.anchor_date is None:
+        # Row counts are only comparable on data generated for the same date
+        reference = timing_baseline or baseline
+        args.anchor_date = reference['settings']['anchor_date'] if reference else None
+
+    results = run_suite(args.scales, repeat=args.repeat, warmup=args.warmup, only=args.only,
+                        data_root=args.data_root, seed=args.seed, anchor_date=args.anchor_date)
+    if args.output:
+        write_baseline(results, args.output, merge=False)
+
+    failures = [
+        f"{scale}x {name}: {result['error']}"
+        for scale, measured in results['scales'].items()
+        for name, result in measured['queries'].items() if 'error' in result
+    ]
+    if args.update_baseline:
+        write_baseline(row_baseline(results), args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        for failure in failures:
+            print(f"  FAILED {failure}")
+        raise SystemExit(1 if failures else 0)
+
+    if baseline is None and timing_baseline is None:
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
+        raise SystemExit(1 if failures else 0)
+
+    for change in row_changes(baseline or timing_baseline, results):
+        print(f"  ROWS CHANGED {change}")
+    regressions = compare(timing_baseline or baseline, results, threshold=args.threshold,
+                          min_delta_ms=args.min_delta_ms, memory_threshold=args.memory_threshold)
+    for regression in regressions:
+        print(f"  REGRESSION {regression}")
+    # Cases that also failed in the baseline are not regressions but still fail the run
+    regressed = {f"{regression.scale}x {regression.name}" for regression in regressions}
+    failures = [failure for failure in failures if failure.split(':', 1)[0] not in regressed]
+    for failure in failures:
+        print(f"  FAILED {failure}")
+    if regressions or failures:
+        raise SystemExit(1)
+    if timing_baseline is None:
+        print(f"No failures against {args.baseline} (pass --timing-baseline to gate latency)")
+    else:
+        print(f"No regressions against {args.timing_baseline} (threshold {args.threshold:g}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,71 +3,944 @@ Data Loader utilities for Snowcore Procurement Intelligence
 Handles Snowflake connections and data fetching with caching.
 """
 
+import os
+import time
+import hashlib
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
 import streamlit as st
 from snowflake.snowpark import Session
 import pandas as pd
-from typing import Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Any, Optional
+
+from utils.query_registry import (
+    BIND_PATTERN, QUERY_SOURCE_VERSIONS, get_freshness, get_max_staleness, get_query,
+    get_sources, get_spec
+)
+from utils import risk_snapshot, spend_cube
+from utils.query_filter import QueryFilter, apply_filters
+from utils.instrumentation import (
+    QueryLog, QueryEvent, debug_panel_enabled, render_query_panel,
+    OUTCOME_MEMORY, OUTCOME_STALE, OUTCOME_DISK, OUTCOME_WAREHOUSE, OUTCOME_DERIVED,
+    OUTCOME_COALESCED,
+)
+from utils.result_cache import (
+    DiskResultCache, MemoryResultCache, SingleFlight,
+    DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS, DEFAULT_MEMORY_MAX_BYTES,
+    DEFAULT_FLIGHT_TIMEOUT_SECONDS
+)
+
+RESULT_TTL_SECONDS = 300  # Freshness window for custom queries (registry queries use their spec)
+SOURCE_PROBE_TTL_SECONDS = 60  # How often each worker re-probes source table versions
+SESSION_POOL_SIZE = 4  # Default Snowpark sessions per worker outside Snowflake
+SESSION_CHECKOUT_TIMEOUT_SECONDS = 30
+SESSION_HEALTH_CHECK_SECONDS = 60  # Idle time after which a session is pinged before reuse
+LOAD_MANY_MAX_WORKERS = 8  # Concurrent queries for sessions without async jobs
 
-from utils.query_registry import get_query
+
+class SessionPool:
+    """
+    Bounded pool of Snowpark sessions with per-thread checkout.
+    
+    A thread checks out its own session on first use and keeps it until it
+    leaves session_scope() or the thread ends (Streamlit runs every script
+    execution on its own thread, so sessions held by finished runs are
+    reclaimed). Concurrent users therefore query in parallel instead of
+    serializing on one connection. Sessions idle for longer than the health
+    check interval are pinged before reuse and replaced if the ping fails.
+    
+    Inside Snowflake the pool wraps the single active session and never
+    creates connections of its own.
+    """
+    
+    def __init__(self, factory=None, size: int = SESSION_POOL_SIZE,
+                 timeout: float = SESSION_CHECKOUT_TIMEOUT_SECONDS,
+                 fixed: Optional[Session] = None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._fixed = fixed
+        self._idle = []  # (session, last used) pairs, most recent last
+        self._owners = {}  # thread -> session
+        self._created = 0
+        self._cond = threading.Condition()
+    
+    def get(self) -> Session:
+        """Return the current thread's session, checking one out if needed."""
+        if self._fixed is not None:
+            return self._fixed
+        thread = threading.current_thread()
+        with self._cond:
+            session = self._owners.get(thread)
+        if session is None:
+            session = self._checkout()
+            with self._cond:
+                self._owners[thread] = session
+        return session
+    
+    def release(self, broken: bool = False) -> None:
+        """Return the current thread's session to the pool (closing it if broken)."""
+        if self._fixed is not None:
+            return
+        with self._cond:
+            session = self._owners.pop(threading.current_thread(), None)
+            if session is None:
+                return
+            if broken:
+                self._created -= 1
+            else:
+                self._idle.append((session, time.time()))
+            self._cond.notify()
+        if broken:
+            self._close(session)
+    
+    @contextmanager
+    def session(self):
+        """
+        Check out a session for the duration of a block.
+        
+        Nested scopes, or a thread that already holds a session, reuse it;
+        only the outermost scope returns it. A session that fails its
+        health check after an error inside the block is discarded.
+        """
+        if self._fixed is not None:
+            yield self._fixed
+            return
+        with self._cond:
+            owned = threading.current_thread() in self._owners
+        session = self.get()
+        try:
+            yield session
+        except Exception:
+            if not owned:
+                self.release(broken=not self._is_alive(session))
+                owned = True  # Already released
+            raise
+        finally:
+            if not owned:
+                self.release()
+    
+    def _checkout(self) -> Session:
+        deadline = time.time() + self.timeout
+        with self._cond:
+            while True:
+                self._reclaim()
+                if self._idle:
+                    session, last_used = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    session, last_used = None, None
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No Snowflake session available within {self.timeout:g}s "
+                        f"(pool size {self.size})"
+                    )
+                self._cond.wait(min(remaining, 1.0))
+        
+        if session is not None:
+            if time.time() - last_used < SESSION_HEALTH_CHECK_SECONDS or self._is_alive(session):
+                return session
+            self._close(session)  # Dead connection: reconnect in its slot
+        try:
+            return self.factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+    
+    def _reclaim(self) -> None:
+        """Return sessions held by threads that have finished (caller holds the lock)."""
+        for thread in [t for t in self._owners if not t.is_alive()]:
+            self._idle.append((self._owners.pop(thread), time.time()))
+    
+    @staticmethod
+    def _is_alive(session: Session) -> bool:
+        try:
+            session.sql('SELECT 1').collect()
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _close(session: Session) -> None:
+        try:
+            session.close()
+        except Exception:
+            pass
 
 
 @st.cache_resource
-def get_session() -> Session:
-    """Get or create Snowpark session."""
+def get_session_pool() -> Optional[SessionPool]:
+    """Get the Snowpark session pool for this worker process."""
+    if os.environ.get('SNOWCORE_LOCAL_BACKEND', '').lower() in ('1', 'true', 'duckdb'):
+        # Offline DuckDB stand-in over data/synthetic (see utils/local_backend.py)
+        from utils.local_backend import LocalSession
+        return SessionPool(fixed=LocalSession())
     try:
         # Running in Snowflake Streamlit
         from snowflake.snowpark.context import get_active_session
-        return get_active_session()
+        return SessionPool(fixed=get_active_session())
     except:
         # Running locally - use connection from secrets
         if hasattr(st, 'secrets') and 'snowflake' in st.secrets:
-            return Session.builder.configs(st.secrets['snowflake']).create()
+            config = dict(st.secrets['snowflake'])
+            return SessionPool(
+                factory=lambda: Session.builder.configs(config).create(),
+                size=int(os.environ.get('SNOWCORE_SESSION_POOL_SIZE', SESSION_POOL_SIZE)),
+            )
         else:
             st.error("No Snowflake connection available")
             return None
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_data(query_name: str, **params) -> pd.DataFrame:
+def get_session() -> Session:
+    """
+    Get or create the Snowpark session for the current thread.
+    
+    Inside Snowflake this is the active session; otherwise the thread's
+    session is checked out from the pool (see SessionPool).
+    """
+    pool = get_session_pool()
+    if pool is None:
+        return None
+    try:
+        return pool.get()
+    except TimeoutError as e:
+        st.error(f"Snowflake is busy, please retry: {e}")
+        return None
+
+
+@contextmanager
+def session_scope():
+    """
+    Hold a session for a block and return it to the pool afterwards.
+    
+    Use this on threads Streamlit does not manage (background refreshes,
+    worker pools) so their sessions are returned promptly. Yields None when
+    no connection is configured.
+    """
+    pool = get_session_pool()
+    if pool is None:
+        yield None
+        return
+    with pool.session() as session:
+        yield session
+
+
+@st.cache_resource
+def get_result_cache() -> MemoryResultCache:
+    """Get the in-process result cache shared by every session in this worker."""
+    return MemoryResultCache(
+        max_bytes=int(os.environ.get('SNOWCORE_MEMORY_CACHE_MAX_BYTES', DEFAULT_MEMORY_MAX_BYTES)),
+    )
+
+
+@st.cache_resource
+def get_single_flight() -> SingleFlight:
+    """Get the registry of in-flight registry queries shared by every session in this worker."""
+    return SingleFlight(
+        timeout=float(os.environ.get('SNOWCORE_SINGLE_FLIGHT_TIMEOUT', DEFAULT_FLIGHT_TIMEOUT_SECONDS)),
+    )
+
+
+@st.cache_resource
+def get_disk_cache() -> DiskResultCache:
+    """Get the on-disk result cache shared by all worker processes."""
+    return DiskResultCache(
+        directory=os.environ.get('SNOWCORE_CACHE_DIR', DEFAULT_CACHE_DIR),
+        max_bytes=int(os.environ.get('SNOWCORE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)),
+        default_ttl=int(os.environ.get('SNOWCORE_CACHE_TTL', DEFAULT_TTL_SECONDS)),
+    )
+
+
+@st.cache_resource
+def get_query_log() -> QueryLog:
+    """Get the query instrumentation log for this worker process."""
+    return QueryLog(path=os.environ.get('SNOWCORE_QUERY_LOG') or None)
+
+
+def render_debug_panel() -> None:
+    """Show per-query diagnostics in the sidebar when debugging is enabled."""
+    if debug_panel_enabled():
+        render_query_panel(get_query_log(), get_result_cache().stats())
+
+
+def requested_as_of() -> Optional[datetime.date]:
+    """Replay date from the ?as_of=YYYY-MM-DD URL parameter, or None for today."""
+    try:
+        value = st.query_params.get('as_of')
+    except Exception:
+        return None
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        st.warning(f"Ignoring invalid as_of date '{value}' (expected YYYY-MM-DD)")
+        return None
+
+
+@lru_cache(maxsize=None)
+def compile_binds(query: str) -> tuple:
+    """
+    Rewrite :name placeholders in a registry query to qmark (?) binds.
+    
+    The rewritten SQL text depends only on the query, never on parameter
+    values, so Snowflake can reuse compiled plans and cached results.
+    
+    Args:
+        query: SQL text containing :name placeholders
+        
+    Returns:
+        Tuple of (qmark SQL text, placeholder names in bind order)
+    """
+    names = []
+    
+    def _replace(match):
+        if match.group(1):
+            return match.group(1)
+        names.append(match.group(2))
+        return '?'
+    
+    return BIND_PATTERN.sub(_replace, query), tuple(names)
+
+
+def _normalize_value(value: Any) -> Any:
+    """Coerce a parameter value into a stable, hashable bind value."""
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()  # numpy scalars
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (set, frozenset)):
+        # Set iteration order varies with per-process string hashing; sort so
+        # every worker builds the same (disk cache) key for a selection
+        return tuple(sorted((_normalize_value(v) for v in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(v) for v in value)
+    if value is None or isinstance(value, (bool, int, float, datetime.date)):
+        return value
+    return str(value)
+
+
+def normalize_params(params: dict) -> tuple:
+    """Build a hashable, order-independent key from query parameters."""
+    return tuple(sorted((key, _normalize_value(value)) for key, value in params.items()))
+
+
+def load_data(query_name: str, query_filter: Optional[QueryFilter] = None,
+              **params) -> pd.DataFrame:
     """
     Load data using a registered query.
     
+    Parameters are passed to Snowflake as bind variables rather than being
+    substituted into the SQL text, and results are cached once per worker
+    process under (query name, normalized parameters). Pages should not add
+    their own st.cache_data layer on top; use query_loader() instead.
+    
     Args:
         query_name: Name of the query in the registry
-        **params: Parameters to substitute in the query
+        query_filter: Page filter, applied in the warehouse to the views
+            the query reads
+        **params: Values for the query's :name placeholders
         
     Returns:
         DataFrame with query results
     """
+    return to_frame(load_table(query_name, query_filter, **params))
+
+
+def load_table(query_name: str, query_filter: Optional[QueryFilter] = None,
+               **params) -> pa.Table:
+    """
+    Load a registered query as an Arrow table.
+    
+    Results are fetched and cached in Arrow form; convert with to_frame()
+    after filtering or column selection so that only the rows and columns
+    a page actually renders are materialized in pandas.
+    
+    Args:
+        query_name: Name of the query in the registry
+        query_filter: Page filter, applied in the warehouse to the views
+            the query reads
+        **params: Values for the query's :name placeholders
+        
+    Returns:
+        pyarrow Table with query results (shared and immutable)
+    """
+    key = _request_key(query_name, params, query_filter)
+    if get_spec(query_name).derived_from:
+        return _load_derived(*key)
+    with get_query_log().track(query_name) as event:
+        table = _lookup_registry_result(key, event)
+        if table is None:
+            table = _fetch_registry_query(*key, event=event)
+        if table is None:
+            table = pa.table({})
+        event.set_result(table)
+    return table
+
+
+def query_loader(query_name: str, as_table: bool = False, **params):
+    """
+    Declare a page-level loader for a registry query.
+    
+    The loader takes an optional QueryFilter for the page's selections.
+    
+    Example:
+        load_kpis = query_loader('executive_kpis')
+        kpis = load_kpis()
+        by_region = query_loader('spend_by_region')(page_filter)
+    
+    Args:
+        query_name: Name of the query in the registry
+        as_table: Return a pyarrow Table instead of a DataFrame
+        **params: Values for the query's :name placeholders
+    """
+    loader = load_table if as_table else load_data
+    
+    def _loader(query_filter: Optional[QueryFilter] = None):
+        return loader(query_name, query_filter, **params)
+    
+    _loader.__name__ = f"load_{query_name}"
+    _loader.__doc__ = f"Load the '{query_name}' registry query."
+    return _loader
+
+
+def load_many(queries: list, query_filter: Optional[QueryFilter] = None) -> list:
+    """
+    Load several registry queries concurrently and fill the result cache.
+    
+    Cache misses are submitted together (Snowpark async jobs, or a thread
+    pool for other sessions), so a page's first paint waits for the slowest
+    query rather than the sum of all of them. Misses another session is
+    already fetching are awaited instead of run again. Errors are reported
+    once each, on the calling script thread.
+    
+    Example:
+        load_many(['executive_kpis', 'supplier_risk_map', ('otif_trend', {'months': 12})])
+    
+    Args:
+        queries: Query names, or (query name, params dict) tuples
+        query_filter: Page filter applied to every query in the batch
+        
+    Returns:
+        List of DataFrames in the same order as queries
+    """
+    requests = []
+    for item in queries:
+        query_name, params = (item, {}) if isinstance(item, str) else item
+        requests.append(_request_key(query_name, params, query_filter))
+    
+    # Derived queries are served from their base query's result
+    fetch_keys = []
+    for query_name, param_key in requests:
+        base_name = get_spec(query_name).derived_from
+        fetch_keys.append((base_name or query_name, param_key))
+    
+    start = time.perf_counter()
+    disk_cache = get_disk_cache()
+    tables = {}
+    pending = {}
+    events = {}
+    errors = {}
+    for key in fetch_keys:
+        if key in events:
+            continue
+        event = events[key] = QueryEvent(query_name=key[0], kind='batch')
+        table = _lookup_registry_result(key, event)
+        if table is not None:
+            tables[key] = table
+            continue
+        try:
+            query, binds, disk_key = _prepare_registry_query(*key)
+        except ValueError as e:
+            errors[key] = e  # Reported with the batch's other errors
+            continue
+        version = _source_version(key[0])
+        table = disk_cache.get(disk_key, version=version)
+        if table is not None:
+            event.outcome = OUTCOME_DISK
+            _store_registry_result(key, table, version)
+            tables[key] = table
+            continue
+        pending[key] = (query, binds, disk_key, version)
+    
+    # Misses already in flight elsewhere (another session or batch) are
+    # awaited rather than run again; this batch leads the others
+    flights = get_single_flight()
+    led = {}
+    joined = {}
+    for key in pending:
+        flight, leader = flights.claim(key)
+        (led if leader else joined)[key] = flight
+    
+    results = {}
+    batch_error = None
+    try:
+        session = get_session() if led else None
+        if session is not None:
+            results, batch_errors, durations = _execute_many(session, {key: pending[key] for key in led})
+            errors.update(batch_errors)
+            for key, table in results.items():
+                _, _, disk_key, version = pending[key]
+                _store_registry_result(key, table, version, disk_key=disk_key)
+                tables[key] = table
+            for key, duration in durations.items():
+                events[key].fetch_ms = duration
+    except BaseException as e:
+        batch_error = e
+        raise
+    finally:
+        for key, flight in led.items():
+            flights.land(key, flight, result=results.get(key), error=errors.get(key) or batch_error)
+    for key, flight in joined.items():
+        try:
+            table = flight.wait(flights.timeout)
+        except Exception as e:
+            errors[key] = e
+            continue
+        events[key].outcome = OUTCOME_COALESCED
+        if table is not None:
+            tables[key] = table
+    for key, error in errors.items():
+        events[key].set_error(error)
+        st.error(f"Error loading data ({key[0]}): {error}")
+    
+    # Every query in the batch waited for the batch as a whole
+    wall_ms = round((time.perf_counter() - start) * 1000, 2)
+    log = get_query_log()
+    for key, event in events.items():
+        event.wall_ms = wall_ms
+        event.set_result(tables.get(key))
+        log.record(event)
+    
+    frames = []
+    for key, fetch_key in zip(requests, fetch_keys):
+        table = tables.get(fetch_key, pa.table({}))
+        if key != fetch_key:
+            table = _load_derived(*key, base=table)
+        frames.append(to_frame(table))
+    return frames
+
+
+def _request_key(query_name: str, params: dict, query_filter: Optional[QueryFilter] = None) -> tuple:
+    """
+    Build the (query name, normalized parameters) cache key of a request.
+    
+    Queries with an :as_of placeholder are anchored to today unless the
+    params or filter give a date, so the date is always part of the key.
+    """
+    if 'as_of' in get_spec(query_name).params:
+        params = {'as_of': datetime.date.today(), **params}
+    if query_filter is not None:
+        params = {**params, **query_filter.params_for(query_name)}
+    return query_name, normalize_params(params)
+
+
+def to_frame(table: pa.Table, columns: Optional[list] = None, **equals) -> pd.DataFrame:
+    """
+    Convert an Arrow result to pandas at the edge of the render path.
+    
+    Filtering and projection happen in Arrow first, and the conversion uses
+    split blocks so numeric columns without nulls are zero-copy.
+    
+    Args:
+        table: Arrow table from load_table()
+        columns: Optional subset of columns to keep
+        **equals: Column equality filters; None values are ignored
+        
+    Returns:
+        DataFrame with the selected rows and columns
+    """
+    for column, value in equals.items():
+        if value is not None:
+            table = table.filter(pc.field(column) == value)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True)
+
+
+# Local computations for registry queries declared with derived_from
+_DERIVATIONS = {
+    **spend_cube.DERIVED_QUERIES,
+    **risk_snapshot.DERIVED_QUERIES,
+}
+
+
+def _load_derived(query_name: str, param_key: tuple, base: Optional[pa.Table] = None) -> pa.Table:
+    """
+    Compute a derived registry query from its base query's cached result.
+    
+    The base (e.g. the spend cube) is loaded through load_table() unless
+    given, so the warehouse sees one query per refresh however many widgets
+    derive from it. Derived results are cached until the base entry is
+    replaced or the date changes (period comparisons are relative to today).
+    """
+    base_name = get_spec(query_name).derived_from
+    if base is None:
+        base = load_table(base_name, **dict(param_key))
+    
+    key = (query_name, param_key)
+    cache = get_result_cache()
+    with get_query_log().track(query_name) as event:
+        base_entry = cache.lookup((base_name, param_key), max_stale=get_max_staleness(base_name))
+        version = None
+        if base_entry is not None and base_entry.value is base:
+            version = f"{base_entry.created_at}|{datetime.date.today()}"
+        
+        entry = cache.lookup(key)
+        if version is not None and entry is not None and entry.version == version:
+            event.outcome = OUTCOME_MEMORY
+            table = entry.value
+        else:
+            event.outcome = OUTCOME_DERIVED
+            table = pa.table({})  # Base failed or is empty
+            if base.num_rows > 0:
+                frame = _DERIVATIONS[query_name](to_frame(base))
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if version is not None:
+                    cache.put(key, table, ttl=get_freshness(base_name).versioned_ttl,
+                              label=query_name, version=version)
+        event.set_result(table)
+    return table
+
+
+def _lookup_registry_result(key: tuple, event: Optional[QueryEvent] = None) -> Optional[pa.Table]:
+    """
+    Serve a registry result from the in-process cache (stale-while-revalidate).
+    
+    An entry past its TTL but within the query's max staleness, or one whose
+    source tables have changed since it was computed, is returned immediately
+    and refreshed on a background thread; concurrent callers share a single
+    refresh.
+    """
+    query_name, param_key = key
+    entry = get_result_cache().lookup(key, max_stale=get_max_staleness(query_name))
+    if entry is None:
+        return None
+    outcome = OUTCOME_MEMORY
+    version = _source_version(query_name)
+    # While source versions are unknown only the TTL can invalidate an entry
+    if entry.is_stale or (version is not None and entry.version != version):
+        outcome = OUTCOME_STALE
+        _refresh_in_background(query_name, param_key)
+    if event is not None:
+        event.outcome = outcome
+    return entry.value
+
+
+def _refresh_in_background(query_name: str, param_key: tuple) -> None:
+    """Re-run a registry query off the script thread and replace its cache entry."""
+    key = (query_name, param_key)
+    cache = get_result_cache()
+    pool = get_session_pool()
+    if pool is None or not cache.begin_refresh(key):
+        return
+    
+    # Resolve everything that touches Streamlit on the script thread. The
+    # version is taken before the query runs, so a change that lands
+    # mid-query triggers another refresh rather than being missed.
+    disk_cache = get_disk_cache()
+    log = get_query_log()
+    query, binds, disk_key = _prepare_registry_query(query_name, param_key)
+    version = _source_version(query_name)
+    
+    def _refresh():
+        try:
+            with log.track(query_name, kind='refresh') as event:
+                with pool.session() as session:
+                    table = _timed_execute(event, session, query, binds)
+                event.set_result(table)
+            _store_registry_result(key, table, version, disk_key=disk_key,
+                                   cache=cache, disk_cache=disk_cache)
+        except Exception:
+            pass  # Keep serving the stale entry; the next request retries
+        finally:
+            cache.end_refresh(key)
+    
+    threading.Thread(target=_refresh, name=f"refresh-{query_name}", daemon=True).start()
+
+
+def get_source_versions() -> Optional[dict]:
+    """
+    Get a version token for every ATOMIC and PROCUREMENT_MART table, probed at most once a minute.
+    
+    Sessions that provide table_versions() (e.g. a local stand-in backend)
+    are asked directly; Snowflake sessions are probed through
+    INFORMATION_SCHEMA.TABLES (LAST_ALTERED and ROW_COUNT).
+    
+    When a probe fails the last good versions are kept until the next one:
+    reporting every table as changed would refresh every cached result
+    against a warehouse that is already failing.
+    
+    Returns:
+        Mapping of table name -> version token, or None if no probe is available
+    """
+    cache = get_result_cache()
+    key = ('__source_versions__',)
+    entry = cache.lookup(key, max_stale=float('inf'))
+    if entry is not None and not entry.is_stale:
+        return entry.value or None
+    last_good = entry.value if entry is not None else {}
     session = get_session()
     if session is None:
-        return pd.DataFrame()
+        return last_good or None
+    try:
+        if hasattr(session, 'table_versions'):
+            versions = dict(session.table_versions())
+        else:
+            versions = {
+                row['TABLE_NAME']: f"{row['LAST_ALTERED']}|{row['ROW_COUNT']}"
+                for row in session.sql(QUERY_SOURCE_VERSIONS).collect()
+            }
+    except Exception:
+        versions = last_good  # Retried on the next probe
+    cache.put(key, versions, ttl=SOURCE_PROBE_TTL_SECONDS, label='source_versions')
+    return versions or None
+
+
+def _source_version(query_name: str) -> Optional[str]:
+    """Fingerprint the current versions of a registry query's source tables."""
+    sources = get_sources(query_name)
+    versions = get_source_versions() if sources else None
+    if not versions:
+        return None
+    state = repr([(table, versions.get(table)) for table in sources])
+    return hashlib.sha1(state.encode('utf-8')).hexdigest()[:16]
+
+
+def _store_registry_result(key: tuple, table: pa.Table, version: Optional[str],
+                           disk_key: Optional[str] = None,
+                           cache: Optional[MemoryResultCache] = None,
+                           disk_cache: Optional[DiskResultCache] = None) -> None:
+    """
+    Store a registry result in the memory tier (and the disk tier if disk_key is given).
+    
+    TTLs come from the query's freshness class: results fingerprinted with a
+    source version use the longer versioned TTL and are invalidated by
+    version changes; others fall back to the plain TTL.
+    """
+    freshness = get_freshness(key[0])
+    ttl = freshness.versioned_ttl if version else freshness.ttl
+    if disk_key is not None:
+        disk_cache = disk_cache or get_disk_cache()
+        disk_cache.put(disk_key, table, ttl=ttl,
+                       query_name=key[0], version=version)
+    cache = cache or get_result_cache()
+    cache.put(key, table, ttl=ttl, label=key[0], version=version)
+
+
+def _normalize_arrow_types(table: pa.Table) -> pa.Table:
+    """
+    Cast Snowflake NUMBER columns to one canonical set of dtypes.
+    
+    Fixed-point NUMBER(p, s) arrives as decimal128 from to_arrow(), while
+    to_pandas() narrows whole numbers to int8/int16/int32. Both paths end up
+    as int64 for whole numbers and float64 otherwise, so a cache key holds
+    the same schema whichever path filled it.
+    """
+    fields = []
+    changed = False
+    for field in table.schema:
+        if pa.types.is_decimal(field.type):
+            target = pa.int64() if field.type.scale == 0 and field.type.precision <= 18 else pa.float64()
+            fields.append(pa.field(field.name, target, field.nullable))
+            changed = True
+        elif pa.types.is_integer(field.type) and field.type != pa.int64() and field.type != pa.uint64():
+            fields.append(pa.field(field.name, pa.int64(), field.nullable))
+            changed = True
+        else:
+            fields.append(field)
+    if not changed:
+        return table
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _execute_arrow(session: Session, query: str, binds: Optional[list] = None) -> pa.Table:
+    """Execute query and fetch the result batches directly as Arrow."""
+    df = session.sql(query, params=binds or None)
+    if hasattr(df, 'to_arrow'):
+        table = df.to_arrow()
+    else:
+        table = pa.Table.from_pandas(df.to_pandas(), preserve_index=False)
+    return _normalize_arrow_types(table)
+
+
+def _timed_execute(event: QueryEvent, session: Session, query: str,
+                   binds: Optional[list] = None) -> pa.Table:
+    """Run _execute_arrow and record its fetch time on event."""
+    start = time.perf_counter()
+    try:
+        return _execute_arrow(session, query, binds)
+    finally:
+        event.outcome = OUTCOME_WAREHOUSE
+        event.fetch_ms = round((time.perf_counter() - start) * 1000, 2)
+
+
+def _prepare_registry_query(query_name: str, param_key: tuple) -> tuple:
+    """
+    Resolve a registry query into executable form.
+    
+    Returns:
+        Tuple of (qmark SQL text, bind values, disk cache key)
+    """
+    params = dict(param_key)
+    query, bind_names = compile_binds(apply_filters(get_query(query_name), params))
+    missing = [name for name in bind_names if name not in params]
+    if missing:
+        raise ValueError(f"Query '{query_name}' is missing parameters: {', '.join(missing)}")
+    binds = [params[name] for name in bind_names]
+    return query, binds, get_disk_cache().key_for(query_name, param_key, query)
+
+
+def _fetch_registry_query(query_name: str, param_key: tuple,
+                          event: Optional[QueryEvent] = None) -> Optional[pa.Table]:
+    """
+    Execute a registry query with bind variables.
     
-    query = get_query(query_name)
+    Misses in the in-process cache fall through to the shared disk cache
+    before going to the warehouse, and the result is stored in both tiers.
+    Concurrent misses for the same key are coalesced (single-flight): one
+    caller runs the query and the others wait, up to the single-flight
+    timeout, for its result or error. Returns None on failure so that errors
+    are not cached; the failure is recorded on event.
+    """
+    event = event or QueryEvent(query_name=query_name)
+    key = (query_name, param_key)
+    cache = get_result_cache()
+    disk_cache = get_disk_cache()
     
-    # Substitute parameters if provided
-    for key, value in params.items():
-        query = query.replace(f':{key}', f"'{value}'")
+    def _execute() -> Optional[pa.Table]:
+        # Runs on the leading caller's thread, so event is the leader's own
+        table = cache.get(key)  # Stored by a flight that landed after our lookup
+        if table is not None:
+            event.outcome = OUTCOME_MEMORY
+            return table
+        table = disk_cache.get(disk_key, version=version)
+        if table is not None:
+            event.outcome = OUTCOME_DISK
+            _store_registry_result(key, table, version, cache=cache)
+            return table
+        session = get_session()
+        if session is None:
+            return None
+        table = _timed_execute(event, session, query, binds)
+        _store_registry_result(key, table, version, disk_key=disk_key, cache=cache, disk_cache=disk_cache)
+        return table
     
     try:
-        return session.sql(query).to_pandas()
+        query, binds, disk_key = _prepare_registry_query(query_name, param_key)
+        version = _source_version(query_name)
+        table, shared = get_single_flight().do(key, _execute)
     except Exception as e:
+        event.set_error(e)
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame()
+        return None
+    if shared:
+        event.outcome = OUTCOME_COALESCED
+    return table
+
+
+def _execute_many(session, pending: dict) -> tuple:
+    """
+    Run several prepared queries at once.
+    
+    Snowpark sessions submit every query as an async job before collecting
+    any results; other sessions (e.g. a local stand-in) use a thread pool.
+    
+    Args:
+        session: Active session
+        pending: Mapping of cache key -> (SQL text, bind values, disk key, version)
+        
+    Returns:
+        Tuple of ({key: Arrow table}, {key: exception}, {key: fetch ms})
+    """
+    results = {}
+    errors = {}
+    durations = {}
+    start = time.perf_counter()
+    
+    if isinstance(session, Session):
+        jobs = {}
+        for key, (query, binds, _, _) in pending.items():
+            try:
+                jobs[key] = session.sql(query, params=binds or None).to_pandas(block=False)
+            except Exception as e:
+                errors[key] = e
+        for key, job in jobs.items():
+            try:
+                results[key] = _normalize_arrow_types(
+                    pa.Table.from_pandas(job.result(), preserve_index=False)
+                )
+            except Exception as e:
+                errors[key] = e
+            # Jobs run server-side in parallel; time is from submission to collection
+            durations[key] = round((time.perf_counter() - start) * 1000, 2)
+        return results, errors, durations
+    
+    def _run(key, query, binds):
+        started = time.perf_counter()
+        try:
+            return _execute_arrow(session, query, binds)
+        finally:
+            durations[key] = round((time.perf_counter() - started) * 1000, 2)
+    
+    workers = min(LOAD_MANY_MAX_WORKERS, len(pending))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='load_many') as pool:
+        futures = {
+            key: pool.submit(_run, key, query, binds)
+            for key, (query, binds, _, _) in pending.items()
+        }
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return results, errors, durations
 
 
-@st.cache_data(ttl=300)
 def load_custom_query(query: str) -> pd.DataFrame:
     """Execute a custom query and return results."""
+    key = ('__custom__', query)
+    label = 'custom:' + hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+    cache = get_result_cache()
+    with get_query_log().track(label, kind='custom') as event:
+        table = cache.get(key)
+        if table is not None:
+            event.outcome = OUTCOME_MEMORY
+        else:
+            table = _fetch_custom_query(query, event)
+            if table is None:
+                table = pa.table({})
+            else:
+                cache.put(key, table, ttl=RESULT_TTL_SECONDS, label=label)
+        event.set_result(table)
+    return to_frame(table)
+
+
+def _fetch_custom_query(query: str, event: QueryEvent) -> Optional[pa.Table]:
     session = get_session()
     if session is None:
-        return pd.DataFrame()
+        return None
     
     try:
-        return session.sql(query).to_pandas()
+        return _timed_execute(event, session, query)
     except Exception as e:
+        event.set_error(e)
         st.error(f"Error executing query: {e}")
-        return pd.DataFrame()
+        return None
 
 
 def format_currency(value: float, currency: str = 'USD') -> str:
@@ -0,0 +1,189 @@
+"""
+Query instrumentation for Snowcore Procurement Intelligence
+Records one structured event per registry/custom query (latency, rows,
+memory, cache outcome, errors) to an in-memory ring buffer and, optionally,
+a JSON-lines log file, and renders them in an in-app debug panel.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Optional
+
+import streamlit as st
+import pandas as pd
+
+
+DEFAULT_EVENT_CAPACITY = 2000
+
+# Cache outcomes recorded on events
+OUTCOME_MEMORY = 'memory'        # Fresh in-process hit
+OUTCOME_STALE = 'stale'          # Served stale, background refresh started
+OUTCOME_DISK = 'disk'            # Disk tier hit
+OUTCOME_DERIVED = 'derived'      # Computed locally from a cached base result
+OUTCOME_COALESCED = 'coalesced'  # Shared another caller's in-flight execution
+OUTCOME_WAREHOUSE = 'warehouse'  # Executed against the warehouse
+OUTCOME_ERROR = 'error'
+
+_HIT_OUTCOMES = (OUTCOME_MEMORY, OUTCOME_STALE, OUTCOME_DISK, OUTCOME_DERIVED, OUTCOME_COALESCED)
+
+
+@dataclass
+class QueryEvent:
+    """Timing and size of one query served by the data loader."""
+    query_name: str
+    kind: str = 'registry'  # registry | custom | batch | refresh
+    outcome: str = OUTCOME_WAREHOUSE
+    started_at: float = field(default_factory=time.time)
+    wall_ms: float = 0.0
+    fetch_ms: Optional[float] = None
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    error: Optional[str] = None
+    thread: str = field(default_factory=lambda: threading.current_thread().name)
+
+    def set_result(self, result: Any) -> None:
+        """Record row count and approximate memory of a table or DataFrame."""
+        if result is None:
+            return
+        self.rows = int(getattr(result, 'num_rows', None) or len(result))
+        if hasattr(result, 'nbytes'):
+            self.bytes = int(result.nbytes)
+        elif isinstance(result, pd.DataFrame):
+            self.bytes = int(result.memory_usage(deep=True, index=True).sum())
+
+    def set_error(self, error: BaseException) -> None:
+        self.outcome = OUTCOME_ERROR
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class QueryLog:
+    """
+    Thread-safe sink for QueryEvents.
+
+    Keeps the most recent events in a ring buffer for the debug panel and
+    appends every event as one JSON object per line to path, if given.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = DEFAULT_EVENT_CAPACITY):
+        self.path = path
+        self._events = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def record(self, event: QueryEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+            if self.path:
+                try:
+                    with open(self.path, 'a', encoding='utf-8') as sink:
+                        sink.write(json.dumps(event.to_dict(), default=str) + '\n')
+                except OSError:
+                    pass  # Never fail a page because the log is unwritable
+
+    @contextmanager
+    def track(self, query_name: str, kind: str = 'registry'):
+        """
+        Time a block and record it as a QueryEvent.
+
+        The block fills in outcome, fetch time and result size on the yielded
+        event; exceptions are recorded as errors and re-raised.
+        """
+        event = QueryEvent(query_name=query_name, kind=kind)
+        start = time.perf_counter()
+        try:
+            yield event
+        except Exception as e:
+            event.set_error(e)
+            raise
+        finally:
+            event.wall_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.record(event)
+
+    def events(self) -> list:
+        with self._lock:
+            return list(self._events)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Recent events, newest first."""
+        frame = pd.DataFrame([event.to_dict() for event in self.events()])
+        if frame.empty:
+            return frame
+        frame['started_at'] = pd.to_datetime(frame['started_at'], unit='s')
+        return frame.iloc[::-1].reset_index(drop=True)
+
+    def summary(self) -> pd.DataFrame:
+        """Per-query latency percentiles, hit rate and error counts, slowest first."""
+        frame = self.to_frame()
+        if frame.empty:
+            return frame
+        frame['hit'] = frame['outcome'].isin(_HIT_OUTCOMES)
+        frame['failed'] = frame['outcome'] == OUTCOME_ERROR
+        grouped = frame.groupby('query_name')
+        summary = pd.DataFrame({
+            'CALLS': grouped.size(),
+            'HIT_RATE': grouped['hit'].mean(),
+            'P50_MS': grouped['wall_ms'].quantile(0.5),
+            'P95_MS': grouped['wall_ms'].quantile(0.95),
+            'MAX_FETCH_MS': grouped['fetch_ms'].max(),
+            'ROWS': grouped['rows'].max(),
+            'BYTES': grouped['bytes'].max(),
+            'ERRORS': grouped['failed'].sum(),
+        })
+        return summary.sort_values('P95_MS', ascending=False).reset_index()
+
+
+def debug_panel_enabled() -> bool:
+    """The panel is shown with SNOWCORE_DEBUG_PANEL=1 or the ?debug=1 URL parameter."""
+    if os.environ.get('SNOWCORE_DEBUG_PANEL', '').lower() in ('1', 'true', 'yes'):
+        return True
+    try:
+        return st.query_params.get('debug') == '1'
+    except Exception:
+        return False
+
+
+def render_query_panel(log: QueryLog, cache_stats: Optional[pd.DataFrame] = None) -> None:
+    """Render query diagnostics in the sidebar."""
+    with st.sidebar.expander("Query Diagnostics", expanded=False):
+        summary = log.summary()
+        if summary.empty:
+            st.caption("No queries recorded yet")
+            return
+
+        st.markdown("**By query** (slowest p95 first)")
+        st.dataframe(
+            summary.assign(HIT_RATE=summary['HIT_RATE'] * 100),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "query_name": "Query",
+                "HIT_RATE": st.column_config.NumberColumn("Hit %", format="%.0f%%"),
+                "P50_MS": st.column_config.NumberColumn("p50 ms", format="%.1f"),
+                "P95_MS": st.column_config.NumberColumn("p95 ms", format="%.1f"),
+                "MAX_FETCH_MS": st.column_config.NumberColumn("Max fetch ms", format="%.1f"),
+            }
+        )
+
+        st.markdown("**Recent events**")
+        st.dataframe(
+            log.to_frame()[['started_at', 'query_name', 'kind', 'outcome',
+                            'wall_ms', 'fetch_ms', 'rows', 'bytes', 'error']].head(50),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        if cache_stats is not None and not cache_stats.empty:
+            st.markdown(f"**Result cache** ({cache_stats['BYTES'].sum() / 1e6:,.1f} MB)")
+            st.dataframe(cache_stats, use_container_width=True, hide_index=True)
+
+        if log.path:
+            st.caption(f"Full log: `{log.path}`")
@@ -0,0 +1,668 @@
+"""
+Local DuckDB backend for Snowcore Procurement Intelligence
+An offline stand-in for a Snowpark session: loads data/synthetic/*.csv (or
+Parquet) into an in-process DuckDB database, applies the real SQL layers
+(sql/02 - 05b) and
+the COPY INTO mapping from sql/07_load_data.sql through a Snowflake dialect
+shim, and answers the slice of the Session interface that data_loader and
+the pages use.
+
+SQL table functions (RETURNS TABLE ... LANGUAGE SQL) become table macros
+called without the TABLE(...) wrapper. Streams, SQL procedures and tasks in
+the layers are emulated: a stream is a
+table collecting the rows each INSERT/UPDATE/DELETE/MERGE on its source
+returns (RETURNING *; an UPDATE contributes only its new row version, where
+Snowflake also records the old one), a DML statement that reads a stream
+empties it (at COMMIT inside BEGIN TRANSACTION), CALL runs the procedure
+body, and a task whose WHEN streams have data runs right after the write
+that filled them (EXECUTE TASK runs any task on demand). Tasks without a
+WHEN stream run on their SCHEDULE ('N MINUTE') from a background thread.
+HLL sketches are exact distinct-value lists. Enable it with SNOWCORE_LOCAL_BACKEND=1 to run the app,
+profile queries or check the registry without a Snowflake account:
+
+    python -m utils.local_backend          # run every registry query offline
+"""
+
+import datetime
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+from snowflake.snowpark import Row
+
+
+DATABASE = 'SNOWCORE_PROCUREMENT'
+SCHEMAS = ('RAW', 'ATOMIC', 'PROCUREMENT_MART')
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+# SNOWCORE_LOCAL_DATA_DIR points at another dataset, e.g. a scaled-up one
+# from utils/generate_synthetic_data.py
+DEFAULT_DATA_DIR = os.environ.get('SNOWCORE_LOCAL_DATA_DIR', os.path.join(_REPO_ROOT, 'data', 'synthetic'))
+DEFAULT_SQL_DIR = os.path.join(_REPO_ROOT, 'sql')
+
+# SQL layers applied in order (01_setup is replaced by the schemas above;
+# 06 needs Cortex and 07 only contributes its COPY INTO mapping)
+SQL_LAYERS = (
+    '02_atomic_reference.sql',
+    '03_atomic_procurement.sql',
+    '03b_atomic_persona_extensions.sql',
+    '04_raw_layer.sql',
+    '05_mart_layer.sql',
+    '05b_mart_persona_extensions.sql',
+)
+LOAD_SCRIPT = '07_load_data.sql'
+
+# How often the task scheduler thread checks for due scheduled tasks
+SCHEDULER_TICK_SECONDS = 10
+
+# Snowflake functions DuckDB lacks, as macros
+SHIM_MACROS = (
+    "CREATE MACRO IFF(condition, if_true, if_false) AS "
+    "CASE WHEN condition THEN if_true ELSE if_false END",
+    "CREATE MACRO DATEADD(part, amount, value) AS "
+    "value + CAST(CAST(amount AS VARCHAR) || ' ' || part AS INTERVAL)",
+    "CREATE MACRO NVL(value, fallback) AS COALESCE(value, fallback)",
+    "CREATE MACRO ZEROIFNULL(value) AS COALESCE(value, 0)",
+    "CREATE MACRO DIV0(dividend, divisor) AS "
+    "CASE WHEN divisor = 0 THEN 0 ELSE dividend / divisor END",
+    # HLL states are exact distinct-value lists here, so estimates are exact
+    "CREATE MACRO HLL_ACCUMULATE(value) AS list_distinct(list(value))",
+    "CREATE MACRO HLL_COMBINE(state) AS list_distinct(flatten(list(state)))",
+    "CREATE MACRO HLL_ESTIMATE(state) AS COALESCE(len(state), 0)",
+)
+
+# Date parts Snowflake accepts unquoted, normalized for DuckDB intervals
+_DATE_PARTS = {
+    'year': 'year', 'years': 'year', 'y': 'year', 'yy': 'year', 'yyyy': 'year',
+    'quarter': 'quarter', 'quarters': 'quarter', 'q': 'quarter',
+    'month': 'month', 'months': 'month', 'mm': 'month', 'mon': 'month',
+    'week': 'week', 'weeks': 'week', 'w': 'week', 'wk': 'week',
+    'day': 'day', 'days': 'day', 'd': 'day', 'dd': 'day',
+    'hour': 'hour', 'hours': 'hour', 'h': 'hour', 'hh': 'hour',
+    'minute': 'minute', 'minutes': 'minute', 'mi': 'minute',
+    'second': 'second', 'seconds': 'second', 's': 'second',
+}
+
+_DATE_PART_CALL = re.compile(r"\b(DATEADD|DATEDIFF|DATE_TRUNC)\(\s*'?([A-Za-z]+)'?\s*,", re.IGNORECASE)
+_LISTAGG = re.compile(r"\bLISTAGG\(", re.IGNORECASE)
+_WITHIN_GROUP = re.compile(r"\s*WITHIN\s+GROUP\s*\(", re.IGNORECASE)
+_NILADIC = re.compile(r"\b(CURRENT_TIMESTAMP|LOCALTIMESTAMP|SYSDATE)\(\)", re.IGNORECASE)
+_ASOF_JOIN = re.compile(
+    r"\bASOF\s+JOIN\s+([\w.]+(?:\s+(?!MATCH_CONDITION\b)(?:AS\s+)?\w+)?)\s+MATCH_CONDITION\s*\(",
+    re.IGNORECASE,
+)
+_ON = re.compile(r"\s*ON\s+", re.IGNORECASE)
+_TABLE_FUNCTION = re.compile(r"\b(FROM|JOIN)(\s+)TABLE\s*\(", re.IGNORECASE)
+
+_CREATE_STREAM = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?STREAM\s+([\w.]+)\s+ON\s+TABLE\s+([\w.]+)\s*$", re.IGNORECASE,
+)
+_CREATE_PROCEDURE = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE\s+([\w.]+)\s*\(\s*\).*?\$\$(.*)\$\$\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CREATE_TASK = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?TASK\s+([\w.]+)(.*?)\sAS\s+(.*)$", re.IGNORECASE | re.DOTALL,
+)
+_CREATE_FUNCTION = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+([\w.]+)\s*\(([^)]*)\)\s*RETURNS\s+TABLE\s*\(.*?\)"
+    r"\s*LANGUAGE\s+SQL\s+AS\s*\$\$(.*)\$\$\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_ALTER_TASK = re.compile(r"^\s*ALTER\s+TASK\b", re.IGNORECASE)
+_SCHEDULE_MINUTES = re.compile(r"\bSCHEDULE\s*=\s*'(\d+)\s*MINUTES?'", re.IGNORECASE)
+_STREAM_HAS_DATA = re.compile(r"SYSTEM\$STREAM_HAS_DATA\(\s*'([\w.]+)'\s*\)", re.IGNORECASE)
+_BLOCK = re.compile(r"^\s*BEGIN\b(.*)\bEND\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+_RETURN = re.compile(r"^\s*RETURN\s+'((?:[^']|'')*)'\s*$", re.IGNORECASE)
+_CALL = re.compile(r"^\s*CALL\s+([\w.]+)\s*\(\s*\)\s*;?\s*$", re.IGNORECASE)
+_EXECUTE_TASK = re.compile(r"^\s*EXECUTE\s+TASK\s+([\w.]+)\s*;?\s*$", re.IGNORECASE)
+_BEGIN_TRANSACTION = re.compile(r"^\s*BEGIN\s+(?:TRANSACTION|WORK)\s*$", re.IGNORECASE)
+_COMMIT = re.compile(r"^\s*COMMIT(?:\s+WORK)?\s*$", re.IGNORECASE)
+_DML = re.compile(r"^\s*(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+_TYPE_REWRITES = (
+    (re.compile(r"\bNUMBER\b(?!\s*\()", re.IGNORECASE), 'DECIMAL(38,0)'),
+    (re.compile(r"\bNUMBER\s*\(", re.IGNORECASE), 'DECIMAL('),
+    (re.compile(r"\b(?:TEXT|STRING)\s*\(\s*\d+\s*\)|\bSTRING\b", re.IGNORECASE), 'VARCHAR'),
+    (re.compile(r"\bTIMESTAMP_(?:NTZ|LTZ)\b", re.IGNORECASE), 'TIMESTAMP'),
+    (re.compile(r"\bTIMESTAMP_TZ\b", re.IGNORECASE), 'TIMESTAMPTZ'),
+    (re.compile(r"\b(?:VARIANT|OBJECT|ARRAY)\b", re.IGNORECASE), 'VARCHAR'),
+)
+# Constraints Snowflake declares but does not enforce
+_CONSTRAINTS = re.compile(
+    r"\s+(?:PRIMARY\s+KEY|UNIQUE|REFERENCES\s+\w+(?:\.\w+)*\s*\(\s*\w+\s*\))",
+    re.IGNORECASE,
+)
+_AUTOINCREMENT = re.compile(r"^(\s*(\w+)[^\n]*?)\s+(?:AUTOINCREMENT|IDENTITY)\b", re.IGNORECASE | re.MULTILINE)
+_CREATE_TABLE = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+([\w.]+)", re.IGNORECASE)
+_USE = re.compile(r"^\s*USE\s+(DATABASE|SCHEMA)\s+([\w.]+)\s*$", re.IGNORECASE)
+_COPY_INTO = re.compile(r"COPY\s+INTO\s+([\w.]+)\s+FROM\s+@[\w.]+/([\w.-]+)", re.IGNORECASE)
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT\s+(?:OVERWRITE\s+)?INTO|UPDATE|DELETE\s+FROM|MERGE\s+INTO|TRUNCATE\s+(?:TABLE\s+)?"
+    r"|CREATE\s+(?:OR\s+REPLACE\s+)?TABLE|DROP\s+TABLE)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?([\w.]+)",
+    re.IGNORECASE,
+)
+
+
+# =============================================================================
+# Dialect Shim
+# =============================================================================
+
+@lru_cache(maxsize=1024)
+def translate(query: str) -> str:
+    """
+    Rewrite Snowflake SQL into the DuckDB equivalent.
+
+    Covers what the SQL layers and registry use: unquoted date parts in
+    DATEADD/DATEDIFF/DATE_TRUNC, LISTAGG ... WITHIN GROUP, ASOF JOIN ...
+    MATCH_CONDITION, niladic CURRENT_TIMESTAMP() and FROM TABLE(fn(...)).
+    IFF, DATEADD and friends are macros (SHIM_MACROS).
+    """
+    def _date_part(match):
+        function, part = match.group(1).upper(), match.group(2).lower()
+        part = _DATE_PARTS.get(part, part)
+        if function == 'DATEDIFF':
+            function = 'DATE_DIFF'
+        return f"{function}('{part}',"
+
+    query = _DATE_PART_CALL.sub(_date_part, query)
+    query = _NILADIC.sub(lambda match: match.group(1).upper().replace('SYSDATE', 'CURRENT_TIMESTAMP'), query)
+    return _rewrite_table_functions(_rewrite_asof_join(_rewrite_listagg(query)))
+
+
+def _rewrite_listagg(query: str) -> str:
+    """LISTAGG(x, sep) WITHIN GROUP (ORDER BY y) -> STRING_AGG(x, sep ORDER BY y)."""
+    match = _LISTAGG.search(query)
+    while match:
+        args_end = _closing_paren(query, match.end() - 1)
+        args = query[match.end():args_end]
+        within = _WITHIN_GROUP.match(query, args_end + 1)
+        if within:
+            order_end = _closing_paren(query, within.end() - 1)
+            order_by = query[within.end():order_end].strip()
+            replacement = f"STRING_AGG({args} {order_by})"
+            tail = order_end + 1
+        else:
+            replacement = f"STRING_AGG({args})"
+            tail = args_end + 1
+        query = query[:match.start()] + replacement + query[tail:]
+        match = _LISTAGG.search(query, match.start() + len(replacement))
+    return query
+
+
+def _rewrite_asof_join(query: str) -> str:
+    """
+    ASOF JOIN t MATCH_CONDITION (cond) ON keys -> ASOF LEFT JOIN t ON (cond) AND keys.
+
+    Snowflake's ASOF JOIN keeps unmatched left rows (NULL-padded), which is
+    DuckDB's ASOF LEFT JOIN.
+    """
+    match = _ASOF_JOIN.search(query)
+    while match:
+        condition_end = _closing_paren(query, match.end() - 1)
+        condition = query[match.end():condition_end].strip()
+        on = _ON.match(query, condition_end + 1)
+        if on is None:
+            raise ValueError("ASOF JOIN needs an ON clause after MATCH_CONDITION")
+        replacement = f"ASOF LEFT JOIN {match.group(1)} ON ({condition}) AND "
+        query = query[:match.start()] + replacement + query[on.end():]
+        match = _ASOF_JOIN.search(query, match.start() + len(replacement))
+    return query
+
+
+def _rewrite_table_functions(query: str) -> str:
+    """FROM TABLE(fn(args)) -> FROM fn(args) (table functions are DuckDB table macros)."""
+    match = _TABLE_FUNCTION.search(query)
+    while match:
+        call_end = _closing_paren(query, match.end() - 1)
+        replacement = f"{match.group(1)}{match.group(2)}{query[match.end():call_end].strip()}"
+        query = query[:match.start()] + replacement + query[call_end + 1:]
+        match = _TABLE_FUNCTION.search(query, match.start() + len(replacement))
+    return query
+
+
+def _closing_paren(text: str, open_index: int) -> int:
+    """Index of the parenthesis closing the one at open_index (skipping string literals)."""
+    depth = 0
+    index = open_index
+    while index < len(text):
+        char = text[index]
+        if char == "'":
+            index = text.index("'", index + 1)
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    raise ValueError("Unbalanced parentheses in SQL")
+
+
+def split_statements(script: str) -> list:
+    """Split a SQL script on semicolons outside string literals, $$ bodies and comments."""
+    statements = []
+    current = []
+    index = 0
+    while index < len(script):
+        char = script[index]
+        if script.startswith('--', index):
+            end = script.find('\n', index)
+            index = len(script) if end == -1 else end
+            continue
+        if script.startswith('$$', index):
+            end = script.index('$$', index + 2)
+            current.append(script[index:end + 2])
+            index = end + 2
+            continue
+        if char == "'":
+            end = script.index("'", index + 1)
+            current.append(script[index:end + 1])
+            index = end + 1
+            continue
+        if char == ';':
+            statements.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        index += 1
+    statements.append(''.join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def translate_ddl(statement: str) -> Optional[str]:
+    """
+    Rewrite a DDL statement from the SQL layers, or None to skip it.
+
+    Types map to their DuckDB equivalents, AUTOINCREMENT columns draw from a
+    sequence, and unenforced PRIMARY KEY/UNIQUE/REFERENCES constraints are
+    dropped (DuckDB would enforce them and block CREATE OR REPLACE). SQL
+    table functions become table macros over their (untyped) arguments.
+    """
+    use = _USE.match(statement)
+    if use:
+        kind, name = use.group(1).upper(), use.group(2)
+        return f"USE {name}" if kind == 'DATABASE' else f"USE {DATABASE}.{name}"
+    if re.match(r"^\s*(GRANT|REVOKE)\b", statement, re.IGNORECASE) or _ALTER_TASK.match(statement):
+        return None
+
+    function = _CREATE_FUNCTION.match(statement)
+    if function:
+        arguments = ', '.join(argument.split()[0] for argument in function.group(2).split(',') if argument.strip())
+        body = function.group(3).strip().rstrip(';')
+        return f"CREATE OR REPLACE MACRO {function.group(1)}({arguments}) AS TABLE {translate(body)}"
+
+    create = _CREATE_TABLE.match(statement)
+    if create:
+        table = create.group(1).split('.')[-1]
+        statement = _CONSTRAINTS.sub('', statement)
+        for pattern, replacement in _TYPE_REWRITES:
+            statement = pattern.sub(replacement, statement)
+        sequences = []
+
+        def _autoincrement(match):
+            sequence = f"{table}_{match.group(2)}_SEQ"
+            sequences.append(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+            return f"{match.group(1)} DEFAULT nextval('{sequence}')"
+
+        statement = _AUTOINCREMENT.sub(_autoincrement, statement)
+        return ';\n'.join(sequences + [translate(statement)])
+    return translate(statement)
+
+
+# =============================================================================
+# Session
+# =============================================================================
+
+class LocalDataFrame:
+    """Lazily executed query result, mirroring the Snowpark DataFrame methods the app uses."""
+
+    def __init__(self, session: 'LocalSession', query: str, params: Optional[list] = None):
+        self._session = session
+        self._query = query
+        self._params = params
+
+    def to_arrow(self) -> pa.Table:
+        return self._session._execute(self._query, self._params)
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self.to_arrow().to_pandas()
+
+    def collect(self) -> list:
+        return [Row(**record) for record in self.to_arrow().to_pylist()]
+
+
+class LocalSession:
+    """
+    Snowpark Session stand-in backed by DuckDB.
+
+    Every query runs on its own cursor, so one instance serves concurrent
+    loaders (SessionPool(fixed=...)). Identifiers resolve as in Snowflake:
+    SNOWCORE_PROCUREMENT.ATOMIC.X and SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_X.
+    Writes to a table with streams, and the tasks they trigger, are
+    serialized.
+    """
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, sql_dir: str = DEFAULT_SQL_DIR,
+                 run_scheduler: bool = True):
+        self.data_dir = data_dir
+        self.sql_dir = sql_dir
+        self._connection = duckdb.connect()
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._last_altered = {}
+        self._streams = {}         # stream name -> qualified stream table
+        self._stream_origins = {}  # stream name -> table it was created on
+        self._stream_sources = {}  # source table name -> stream names
+        self._procedures = {}      # procedure name -> (body statements, return value)
+        self._tasks = {}           # task name -> (body, WHEN stream names, schedule in seconds)
+        self._deferred_consumption = None  # streams read inside an open transaction
+        self._running_tasks = False
+        self.task_history = []     # One dict per scheduled task run, as TASK_HISTORY
+        self._stop = threading.Event()
+        self._build()
+        if run_scheduler:
+            threading.Thread(target=self._schedule_tasks, name='local-task-scheduler', daemon=True).start()
+
+    def sql(self, query: str, params: Optional[list] = None) -> LocalDataFrame:
+        """Prepare a query (executed when its result is fetched)."""
+        return LocalDataFrame(self, query, params)
+
+    def table_versions(self) -> dict:
+        """
+        Version token per ATOMIC and PROCUREMENT_MART table (the local LAST_ALTERED|ROW_COUNT probe).
+
+        Returns:
+            Mapping of table name -> token that changes on every write
+        """
+        rows = self._connection.cursor().execute(
+            "SELECT table_name, estimated_size FROM duckdb_tables() "
+            "WHERE database_name = ? AND schema_name IN ('ATOMIC', 'PROCUREMENT_MART')",
+            [DATABASE],
+        ).fetchall()
+        with self._lock:
+            return {
+                name.upper(): f"{self._last_altered.get(name.upper(), 0)}|{row_count}"
+                for name, row_count in rows
+                if name.upper() not in self._streams
+            }
+
+    def run_tasks(self) -> list:
+        """
+        Run tasks whose WHEN streams have data until none has (a scheduler tick).
+
+        Tasks that fill another task's stream (e.g. SPEND_FACT feeding the
+        spend snapshots) chain within one call; tasks without a WHEN stream
+        only run through EXECUTE TASK.
+
+        Returns:
+            Names of the tasks that ran, in order
+        """
+        ran = []
+        with self._write_lock:
+            if self._running_tasks:
+                return ran
+            self._running_tasks = True
+            try:
+                pending = True
+                while pending:
+                    pending = False
+                    for name, (body, streams, _) in self._tasks.items():
+                        if any(self._stream_has_data(stream) for stream in streams):
+                            self._execute(body)
+                            ran.append(name)
+                            pending = True
+            finally:
+                self._running_tasks = False
+        return ran
+
+    def close(self) -> None:
+        self._stop.set()
+        self._connection.close()
+
+    def _execute(self, query: str, params: Optional[list] = None) -> pa.Table:
+        call = _CALL.match(query)
+        if call:
+            return self._call(_object_name(call.group(1)))
+        execute_task = _EXECUTE_TASK.match(query)
+        if execute_task:
+            with self._write_lock:
+                self._execute(self._tasks[_object_name(execute_task.group(1))][0])
+            return pa.table({'status': ['Task executed']})
+
+        if _DML.match(query):
+            target = _WRITE_TARGET.match(query)
+            streams = self._stream_sources.get(_object_name(target.group(1)), []) if target else []
+            consumed = [stream for stream in self._streams if re.search(rf"\b{stream}\b", query, re.IGNORECASE)]
+            if streams or consumed:
+                return self._execute_dml(query, params, streams, consumed)
+        return self._run(query, params)
+
+    def _run(self, query: str, params: Optional[list] = None) -> pa.Table:
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(f"USE {DATABASE}.PROCUREMENT_MART")  # Cursors start in the default catalog
+            cursor.execute(translate(query), params or None)
+            self._record_write(query)
+            if cursor.description is None:
+                return pa.table({})
+            fetch = getattr(cursor, 'to_arrow_table', None) or cursor.fetch_arrow_table
+            return fetch()
+        finally:
+            cursor.close()
+
+    def _execute_dml(self, query: str, params: Optional[list], streams: list, consumed: list) -> pa.Table:
+        """
+        Run DML that writes a table with streams or reads streams.
+
+        Streams read are emptied, the changed rows are appended to the target's
+        streams, and the tasks they trigger run.
+        """
+        with self._write_lock:
+            if not streams:
+                result = self._run(query, params)
+            else:
+                changes = self._run(query.rstrip().rstrip(';') + ' RETURNING *', params)
+                result = pa.table({'number of rows affected': [changes.num_rows]})
+
+            if self._deferred_consumption is not None:
+                self._deferred_consumption.update(consumed)
+            else:
+                self._consume(consumed)
+
+            if streams and changes.num_rows:
+                cursor = self._connection.cursor()
+                for stream in streams:
+                    columns = [row[0] for row in cursor.execute(
+                        f"SELECT * FROM {self._streams[stream]} LIMIT 0"
+                    ).description]
+                    cursor.register('_captured_changes', changes.select(columns))
+                    cursor.execute(f"INSERT INTO {self._streams[stream]} SELECT * FROM _captured_changes")
+                    cursor.unregister('_captured_changes')
+                self.run_tasks()
+            return result
+
+    def _consume(self, streams) -> None:
+        for stream in streams:
+            self._connection.cursor().execute(f"DELETE FROM {self._streams[stream]}")
+
+    def _call(self, procedure: str) -> pa.Table:
+        """Run a SQL procedure's statements in order (CALL name())."""
+        statements, returned = self._procedures[procedure]
+        with self._write_lock:
+            try:
+                for statement in statements:
+                    if _BEGIN_TRANSACTION.match(statement):
+                        self._deferred_consumption = set()
+                    elif _COMMIT.match(statement):
+                        self._consume(self._deferred_consumption or ())
+                        self._deferred_consumption = None
+                    else:
+                        self._execute(statement)
+            finally:
+                # A failed transaction leaves its streams unconsumed
+                self._deferred_consumption = None
+        return pa.table({procedure: [returned]})
+
+    def _schedule_tasks(self) -> None:
+        """Run tasks without WHEN streams every SCHEDULE interval, first one interval after startup."""
+        started = time.monotonic()
+        last_run = {}
+        while not self._stop.wait(SCHEDULER_TICK_SECONDS):
+            for name, (_, streams, interval) in list(self._tasks.items()):
+                if streams or interval is None:
+                    continue
+                if time.monotonic() - last_run.get(name, started) < interval:
+                    continue
+                last_run[name] = time.monotonic()
+                run = {'name': name, 'scheduled_time': time.time(), 'state': 'SUCCEEDED', 'error': None}
+                try:
+                    self._execute(f"EXECUTE TASK {name}")
+                except Exception as e:
+                    if self._stop.is_set():
+                        return
+                    run.update(state='FAILED', error=str(e))
+                self.task_history.append(run)
+
+    def _stream_has_data(self, stream: str) -> bool:
+        return self._connection.cursor().execute(
+            f"SELECT EXISTS (SELECT 1 FROM {self._streams[stream]})"
+        ).fetchone()[0]
+
+    def _register_object(self, cursor, statement: str) -> bool:
+        """Record a stream, procedure or task from the SQL layers; False for other statements."""
+        stream = _CREATE_STREAM.match(statement)
+        if stream:
+            name, source = _object_name(stream.group(1)), stream.group(2)
+            schema = cursor.execute("SELECT current_schema()").fetchone()[0]
+            cursor.execute(f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM {source} LIMIT 0")
+            self._streams[name] = f"{DATABASE}.{schema}.{name}"
+            self._stream_origins[name] = source
+            self._stream_sources.setdefault(_object_name(source), []).append(name)
+            return True
+        procedure = _CREATE_PROCEDURE.match(statement)
+        if procedure:
+            block = _BLOCK.match(procedure.group(2))
+            statements, returned = [], None
+            for body_statement in split_statements(block.group(1) if block else procedure.group(2)):
+                value = _RETURN.match(body_statement)
+                if value:
+                    returned = value.group(1).replace("''", "'")
+                else:
+                    statements.append(body_statement)
+            self._procedures[_object_name(procedure.group(1))] = (statements, returned)
+            return True
+        task = _CREATE_TASK.match(statement)
+        if task:
+            streams = [_object_name(stream) for stream in _STREAM_HAS_DATA.findall(task.group(2))]
+            schedule = _SCHEDULE_MINUTES.search(task.group(2))
+            interval = int(schedule.group(1)) * 60 if schedule else None
+            self._tasks[_object_name(task.group(1))] = (task.group(3).strip(), streams, interval)
+            return True
+        return False
+
+    def _record_write(self, query: str) -> None:
+        target = _WRITE_TARGET.match(query)
+        if target:
+            with self._lock:
+                self._last_altered[_object_name(target.group(1))] = time.time_ns()
+
+    def _build(self) -> None:
+        """Create the database, apply the SQL layers and load the synthetic CSVs."""
+        cursor = self._connection
+        cursor.execute(f"ATTACH ':memory:' AS {DATABASE}")
+        cursor.execute(f"USE {DATABASE}")
+        for schema in SCHEMAS:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        for macro in SHIM_MACROS:
+            cursor.execute(macro)
+        # Always plan ASOF JOIN as a sorted merge. On a low left-side estimate
+        # (e.g. after a filter) DuckDB otherwise falls back to a nested loop
+        # over lines x index history
+        cursor.execute("SET GLOBAL asof_loop_join_threshold = 0")
+
+        for layer in SQL_LAYERS:
+            with open(os.path.join(self.sql_dir, layer)) as f:
+                script = f.read()
+            for statement in split_statements(script):
+                if self._register_object(cursor, statement):
+                    continue
+                ddl = translate_ddl(statement)
+                if ddl is None:
+                    continue
+                try:
+                    cursor.execute(ddl)
+                except duckdb.Error as e:
+                    raise RuntimeError(f"{layer}: {e}\n{ddl[:500]}") from e
+
+        with open(os.path.join(self.sql_dir, LOAD_SCRIPT)) as f:
+            load_script = f.read()
+        copies = _COPY_INTO.findall(load_script)
+        for table, file_name in copies:
+            path = os.path.join(self.data_dir, file_name)
+            parquet_path = os.path.splitext(path)[0] + '.parquet'
+            if os.path.exists(path):
+                # Matched on header names (several persona CSVs omit trailing
+                # defaulted columns), with RAW.CSV_FORMAT's NULL_IF values
+                cursor.execute(
+                    f"INSERT INTO {table} BY NAME SELECT * FROM read_csv(?, header = true, all_varchar = true, "
+                    f"nullstr = ['NULL', 'null', ''])",
+                    [path],
+                )
+            elif os.path.exists(parquet_path):
+                # Parquet output of utils/generate_synthetic_data.py --format parquet
+                cursor.execute(f"INSERT INTO {table} BY NAME SELECT * FROM read_parquet(?)", [parquet_path])
+        cursor.execute(f"USE {DATABASE}.PROCUREMENT_MART")
+
+        # The streams saw the loads, as in Snowflake; then the script's
+        # CALLs refresh the incrementally maintained mart tables
+        for stream, source in self._stream_origins.items():
+            cursor.execute(f"INSERT INTO {self._streams[stream]} SELECT * FROM {source}")
+        for statement in split_statements(load_script):
+            if _CALL.match(statement):
+                self._execute(statement)
+
+
+def _object_name(identifier: str) -> str:
+    """Unqualified, upper-case object name (SNOWCORE_PROCUREMENT.ATOMIC.X -> X)."""
+    return identifier.split('.')[-1].upper()
+
+
+def main() -> None:
+    """Run every registry query against the local backend and report row counts and timings."""
+    from utils.query_registry import BIND_PATTERN, QUERY_REGISTRY, get_query
+
+    start = time.perf_counter()
+    session = LocalSession(run_scheduler=False)
+    print(f"Built local database in {time.perf_counter() - start:.1f}s")
+
+    today = f"DATE '{datetime.date.today().isoformat()}'"
+
+    def _bind(match):
+        if match.group(1):
+            return match.group(1)
+        return today if match.group(2) == 'as_of' else 'NULL'
+
+    failures = 0
+    for name in QUERY_REGISTRY:
+        # Bind parameters other than :as_of are set to NULL: this checks the
+        # SQL, not the rows
+        query = BIND_PATTERN.sub(_bind, get_query(name))
+        started = time.perf_counter()
+        try:
+            rows = session.sql(query).to_arrow().num_rows
+            print(f"  {name:<32} {rows:>8} rows  {(time.perf_counter() - started) * 1000:8.1f} ms")
+        except Exception as e:
+            failures += 1
+            print(f"  {name:<32} FAILED: {e}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
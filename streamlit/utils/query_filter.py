@@ -0,0 +1,153 @@
+"""
+Query filters for Snowcore Procurement Intelligence
+A QueryFilter carries a page's selections (business division, region,
+material category, date range, as-of date) into the registry queries it
+loads. Each filterable mart view or table function a query reads is wrapped
+in a filtered subquery, so the warehouse returns only the rows a page shows
+and each selection is cached under its own key.
+"""
+
+import datetime
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from utils.query_registry import VIEW_FILTER_COLUMNS, get_filter_dimensions, get_spec
+
+
+ALL = 'All'
+
+# Business divisions are identified by the ERP systems that serve them
+DIVISION_ERP_PATTERNS = {
+    'BioFlow (Life Sciences)': "LIKE 'BIOFLOW%'",
+    'Industrial Compression': "NOT LIKE 'BIOFLOW%'",
+}
+
+# Bind parameter name -> (filter dimension, comparison)
+FILTER_PARAMS = {
+    'filter_division': ('division', None),
+    'filter_region': ('region', '='),
+    'filter_category': ('category', '='),
+    'filter_start_date': ('date', '>='),
+    'filter_end_date': ('date', '<='),
+}
+
+# A mart view, or a table function call such as TABLE(...OTIF_SUMMARY_AS_OF(:as_of))
+_VIEW_REFERENCE = re.compile(
+    r"TABLE\(SNOWCORE_PROCUREMENT\.PROCUREMENT_MART\.([A-Z0-9_]+_AS_OF)\([^()]*\)\)"
+    r"|SNOWCORE_PROCUREMENT\.PROCUREMENT_MART\.(V_[A-Z0-9_]+)\b"
+)
+
+
+@dataclass(frozen=True)
+class QueryFilter:
+    """
+    Page-level data filter. A dimension left as None is not filtered.
+
+    Attributes:
+        division: Business division (a key of DIVISION_ERP_PATTERNS)
+        region: Supplier region
+        category: Material category
+        start_date: First date included
+        end_date: Last date included
+        as_of: Date the queries' relative windows (trailing year, latest
+            snapshot, ...) are anchored to; None means today
+    """
+    division: Optional[str] = None
+    region: Optional[str] = None
+    category: Optional[str] = None
+    start_date: Optional[datetime.date] = None
+    end_date: Optional[datetime.date] = None
+    as_of: Optional[datetime.date] = None
+
+    def __post_init__(self):
+        if self.division is not None and self.division not in DIVISION_ERP_PATTERNS:
+            raise ValueError(f"Unknown division '{self.division}'")
+
+    @classmethod
+    def from_selection(cls, division: str = ALL, region: str = ALL, category: str = ALL,
+                       start_date: Optional[datetime.date] = None,
+                       end_date: Optional[datetime.date] = None,
+                       as_of: Optional[datetime.date] = None) -> 'QueryFilter':
+        """Build a filter from page selectors, where 'All' means unfiltered."""
+        def _selected(value):
+            return None if value == ALL else value
+
+        return cls(
+            division=_selected(division),
+            region=_selected(region),
+            category=_selected(category),
+            start_date=start_date,
+            end_date=end_date,
+            as_of=as_of,
+        )
+
+    def params_for(self, query_name: str) -> dict:
+        """
+        Get the filter parameters that apply to a registered query.
+
+        Dimensions none of the query's views expose are left out, so the
+        query keeps sharing its cached result across those selections; as_of
+        is passed only to queries with an :as_of placeholder.
+
+        Args:
+            query_name: Name of the query in the registry
+
+        Returns:
+            Dict of filter_* (and as_of) parameter values
+        """
+        dimensions = get_filter_dimensions(query_name)
+        values = {
+            'filter_division': self.division,
+            'filter_region': self.region,
+            'filter_category': self.category,
+            'filter_start_date': self.start_date,
+            'filter_end_date': self.end_date,
+        }
+        params = {
+            param: value for param, value in values.items()
+            if value is not None and FILTER_PARAMS[param][0] in dimensions
+        }
+        if self.as_of is not None and 'as_of' in get_spec(query_name).params:
+            params['as_of'] = self.as_of
+        return params
+
+
+def apply_filters(query: str, params: dict) -> str:
+    """
+    Push filter parameters down into the mart views a query reads.
+
+    Each filterable view reference or table function call is replaced by a
+    subquery of the same name with the applicable predicates, e.g.
+    (SELECT * FROM ...V_SPEND_SUMMARY WHERE REGION = :filter_region) AS V_SPEND_SUMMARY.
+    Values stay :name binds except the division, which maps to a fixed ERP
+    pattern, so the SQL text depends only on which filters are set.
+
+    Args:
+        query: Registry SQL text
+        params: Query parameters, possibly including filter_* values
+
+    Returns:
+        SQL text with filters applied (unchanged when no filter applies)
+    """
+    active = sorted(param for param in params if param in FILTER_PARAMS)
+    if not active:
+        return query
+
+    def _wrap(match):
+        view = match.group(1) or match.group(2)
+        columns = VIEW_FILTER_COLUMNS.get(view, {})
+        predicates = []
+        for param in active:
+            dimension, comparison = FILTER_PARAMS[param]
+            if dimension not in columns:
+                continue
+            if dimension == 'division':
+                predicates.append(f"{columns[dimension]} {DIVISION_ERP_PATTERNS[params[param]]}")
+            else:
+                predicates.append(f"{columns[dimension]} {comparison} :{param}")
+        if not predicates:
+            return match.group(0)
+        return f"(SELECT * FROM {match.group(0)} WHERE {' AND '.join(predicates)}) AS {view}"
+
+    return _VIEW_REFERENCE.sub(_wrap, query)
@@ -3,12 +3,37 @@ Query Registry for Snowcore Procurement Intelligence
 All database queries are registered here for centralized management.
 """
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
 # =============================================================================
 # Executive KPI Queries
 # =============================================================================
 
+# Last hourly snapshot of V_EXECUTIVE_KPIS taken by the end of :as_of (one
+# stored row)
 QUERY_EXECUTIVE_KPIS = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_EXECUTIVE_KPIS
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.EXECUTIVE_KPIS_AS_OF(:as_of))
+"""
+
+# Last snapshot of each of the 90 days up to :as_of, for KPI sparklines
+QUERY_EXECUTIVE_KPI_HISTORY = """
+SELECT 
+    SNAPSHOT_TIMESTAMP,
+    TOTAL_SPEND,
+    TOTAL_SUPPLIERS,
+    RISK_EXPOSURE_AMOUNT,
+    HIGH_RISK_SUPPLIER_COUNT,
+    AVG_ESG_SCORE
+FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.EXECUTIVE_KPI_HISTORY
+WHERE SNAPSHOT_TIMESTAMP >= DATEADD(day, -90, :as_of)
+    AND SNAPSHOT_TIMESTAMP < DATEADD(day, 1, :as_of)
+QUALIFY ROW_NUMBER() OVER (
+    PARTITION BY DATE_TRUNC('day', SNAPSHOT_TIMESTAMP) ORDER BY SNAPSHOT_TIMESTAMP DESC
+) = 1
+ORDER BY SNAPSHOT_TIMESTAMP
 """
 
 QUERY_SPEND_BY_REGION = """
@@ -32,20 +57,77 @@ GROUP BY MATERIAL_CATEGORY
 ORDER BY TOTAL_SPEND DESC
 """
 
+# Reads the monthly spend snapshot (a few rows per month) instead of spend lines
 QUERY_SPEND_TREND = """
 SELECT 
-    DATE_TRUNC('month', PURCHASE_ORDER_DATE) AS MONTH,
-    SUM(SPEND_AMOUNT) AS TOTAL_SPEND,
-    COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS PO_COUNT
-FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY
-GROUP BY DATE_TRUNC('month', PURCHASE_ORDER_DATE)
+    MONTH,
+    SUM(TOTAL_SPEND) AS TOTAL_SPEND,
+    SUM(ANCHOR_PO_COUNT) AS PO_COUNT
+FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_MONTHLY
+GROUP BY MONTH
 ORDER BY MONTH
 """
 
+# One pre-aggregated extract of V_SPEND_SUMMARY; the spend widgets above and
+# the concentration queries below are derived from it locally
+# (utils/spend_cube.py). Their SQL is kept as the warehouse equivalent.
+QUERY_SPEND_CUBE = """
+WITH lines AS (
+    SELECT 
+        REGION,
+        MATERIAL_CATEGORY,
+        SUPPLIER_CODE,
+        SUPPLIER_NAME,
+        ERP_SOURCE_SYSTEM,
+        DATE_TRUNC('month', PURCHASE_ORDER_DATE) AS MONTH,
+        PURCHASE_ORDER_NUMBER,
+        SPEND_AMOUNT,
+        -- A PO spanning several categories is anchored to its first one
+        MATERIAL_CATEGORY IS NOT DISTINCT FROM
+            MIN(MATERIAL_CATEGORY) OVER (PARTITION BY PURCHASE_ORDER_NUMBER) AS IS_PO_ANCHOR
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY
+)
+SELECT 
+    REGION,
+    MATERIAL_CATEGORY,
+    SUPPLIER_CODE,
+    SUPPLIER_NAME,
+    ERP_SOURCE_SYSTEM,
+    MONTH,
+    SUM(SPEND_AMOUNT) AS SPEND_AMOUNT,
+    COUNT(*) AS LINE_COUNT,
+    COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS PO_COUNT,
+    COUNT(DISTINCT IFF(IS_PO_ANCHOR, PURCHASE_ORDER_NUMBER, NULL)) AS ANCHOR_PO_COUNT
+FROM lines
+GROUP BY REGION, MATERIAL_CATEGORY, SUPPLIER_CODE, SUPPLIER_NAME, ERP_SOURCE_SYSTEM, MONTH
+"""
+
 # =============================================================================
 # Supplier Risk Queries
 # =============================================================================
 
+# One cached read of V_SUPPLIER_RISK (a few hundred suppliers); the risk map,
+# high-risk table, distribution, alerts and alternative suppliers are derived
+# from it locally (utils/risk_snapshot.py). Their SQL is kept as the
+# warehouse equivalent.
+QUERY_SUPPLIER_RISK_SNAPSHOT = """
+SELECT 
+    SUPPLIER_CODE,
+    SUPPLIER_NAME,
+    SUPPLIER_COUNTRY,
+    REGION,
+    LATITUDE,
+    LONGITUDE,
+    FINANCIAL_HEALTH_SCORE,
+    CREDIT_RATING,
+    ESG_SCORE,
+    CERTIFICATION_STATUS,
+    RISK_LEVEL,
+    TOTAL_SPEND,
+    REVENUE_AT_RISK
+FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SUPPLIER_RISK
+"""
+
 QUERY_SUPPLIER_RISK_MAP = """
 SELECT 
     SUPPLIER_CODE,
@@ -141,6 +223,12 @@ GROUP BY DATE_TRUNC('week', PURCHASE_ORDER_DATE), MATERIAL_CATEGORY
 ORDER BY WEEK
 """
 
+# Line-level extract for the what-if scenarios (utils/should_cost.py)
+QUERY_SHOULD_COST_LINES = """
+SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SHOULD_COST_ANALYSIS
+WHERE MATERIAL_CATEGORY IS NOT NULL
+"""
+
 QUERY_RENEGOTIATE_OPPORTUNITIES = """
 SELECT 
     SUPPLIER_NAME,
@@ -197,10 +285,21 @@ SELECT
     INDEX_VALUE,
     PERCENTAGE_CHANGE_WEEKLY
 FROM SNOWCORE_PROCUREMENT.ATOMIC.MARKETPLACE_COMMODITY_INDEX
-WHERE INDEX_DATE >= DATEADD(month, -6, CURRENT_DATE())
+WHERE INDEX_DATE >= DATEADD(month, -6, :as_of)
+    AND INDEX_DATE <= :as_of
 ORDER BY INDEX_DATE, COMMODITY_TYPE
 """
 
+# Full history, for as-of lookups in the should-cost what-if scenarios
+QUERY_COMMODITY_INDEX_HISTORY = """
+SELECT 
+    COMMODITY_TYPE,
+    INDEX_DATE,
+    INDEX_VALUE
+FROM SNOWCORE_PROCUREMENT.ATOMIC.MARKETPLACE_COMMODITY_INDEX
+ORDER BY COMMODITY_TYPE, INDEX_DATE
+"""
+
 QUERY_COMMODITY_LATEST = """
 SELECT 
     COMMODITY_TYPE,
@@ -230,7 +329,7 @@ SELECT
     PREDICTION_CONFIDENCE,
     ABS(FORECASTED_DEMAND_QTY - COALESCE(ACTUAL_DEMAND_QTY, FORECASTED_DEMAND_QTY)) AS FORECAST_ERROR
 FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_DEMAND_FORECAST_PREDICTIONS
-WHERE FORECAST_DATE >= DATEADD(day, -90, CURRENT_DATE())
+WHERE FORECAST_DATE >= DATEADD(day, -90, :as_of)
 ORDER BY FORECAST_DATE DESC, MATERIAL_CATEGORY
 """
 
@@ -276,7 +375,7 @@ SELECT
     SUM(FORECASTED_DEMAND_QTY) AS TOTAL_FORECASTED,
     SUM(ACTUAL_DEMAND_QTY) AS TOTAL_ACTUAL
 FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_DEMAND_FORECAST_PREDICTIONS
-WHERE FORECAST_DATE >= DATEADD(month, -3, CURRENT_DATE())
+WHERE FORECAST_DATE >= DATEADD(month, -3, :as_of)
     AND ACTUAL_DEMAND_QTY IS NOT NULL
 GROUP BY DATE_TRUNC('week', FORECAST_DATE)
 ORDER BY WEEK
@@ -316,7 +415,8 @@ SELECT
     AVG(MARKET_INDEX_PRICE) AS AVG_MARKET_PRICE,
     AVG(PRICE_VARIANCE_PCT) AS AVG_VARIANCE_PCT
 FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SHOULD_COST_ANALYSIS
-WHERE PURCHASE_ORDER_DATE >= DATEADD(month, -6, CURRENT_DATE())
+WHERE PURCHASE_ORDER_DATE >= DATEADD(month, -6, :as_of)
+    AND PURCHASE_ORDER_DATE <= :as_of
     AND MATERIAL_CATEGORY IS NOT NULL
 GROUP BY DATE_TRUNC('week', PURCHASE_ORDER_DATE), MATERIAL_CATEGORY
 ORDER BY WEEK, MATERIAL_CATEGORY
@@ -327,26 +427,33 @@ ORDER BY WEEK, MATERIAL_CATEGORY
 # =============================================================================
 
 QUERY_ESG_TARGETS = """
+WITH esg AS (
+    SELECT 
+        AVG(ESG_SCORE) AS AVG_ESG_SCORE,
+        SUM(SUPPLIER_TOTAL_EMISSIONS_MT) AS TOTAL_EMISSIONS_MT,
+        COUNT(CASE WHEN ESG_RISK_LEVEL = 'HIGH_RISK' THEN 1 END) AS HIGH_RISK_SUPPLIERS
+    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_ESG_SUMMARY
+)
 SELECT 
     'ESG Score' AS METRIC_NAME,
-    AVG(ESG_SCORE) AS CURRENT_VALUE,
+    AVG_ESG_SCORE AS CURRENT_VALUE,
     70 AS TARGET_VALUE,
-    CASE WHEN AVG(ESG_SCORE) >= 70 THEN 'ON_TRACK' ELSE 'NEEDS_ATTENTION' END AS STATUS
-FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_ESG_SUMMARY
+    CASE WHEN AVG_ESG_SCORE >= 70 THEN 'ON_TRACK' ELSE 'NEEDS_ATTENTION' END AS STATUS
+FROM esg
 UNION ALL
 SELECT 
     'Carbon Footprint (MT)' AS METRIC_NAME,
-    SUM(SUPPLIER_TOTAL_EMISSIONS_MT) AS CURRENT_VALUE,
+    TOTAL_EMISSIONS_MT AS CURRENT_VALUE,
     50000 AS TARGET_VALUE,
-    CASE WHEN SUM(SUPPLIER_TOTAL_EMISSIONS_MT) <= 50000 THEN 'ON_TRACK' ELSE 'NEEDS_ATTENTION' END AS STATUS
-FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_ESG_SUMMARY
+    CASE WHEN TOTAL_EMISSIONS_MT <= 50000 THEN 'ON_TRACK' ELSE 'NEEDS_ATTENTION' END AS STATUS
+FROM esg
 UNION ALL
 SELECT 
     'High ESG Risk Suppliers' AS METRIC_NAME,
-    COUNT(CASE WHEN ESG_RISK_LEVEL = 'HIGH_RISK' THEN 1 END) AS CURRENT_VALUE,
+    HIGH_RISK_SUPPLIERS AS CURRENT_VALUE,
     10 AS TARGET_VALUE,
-    CASE WHEN COUNT(CASE WHEN ESG_RISK_LEVEL = 'HIGH_RISK' THEN 1 END) <= 10 THEN 'ON_TRACK' ELSE 'NEEDS_ATTENTION' END AS STATUS
-FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_ESG_SUMMARY
+    CASE WHEN HIGH_RISK_SUPPLIERS <= 10 THEN 'ON_TRACK' ELSE 'NEEDS_ATTENTION' END AS STATUS
+FROM esg
 """
 
 QUERY_RISK_ALERTS = """
@@ -445,24 +552,38 @@ ORDER BY SUPPLIER_COUNT ASC, TOTAL_SPEND DESC
 # =============================================================================
 # YoY/QoQ Trending Queries
 # =============================================================================
-
-QUERY_SPEND_YOY = """
-WITH current_period AS (
+# YoY compares the trailing year ending :as_of with the year before it; QoQ
+# the quarter of :as_of to date with the same elapsed days of the previous
+# quarter. Spend and PO counts are summed over snapshot cells, and distinct
+# suppliers are estimated by merging their HLL sketches. Whole months come
+# from the monthly snapshot (a few rows per month) and the days of a partial
+# first or last month from the day-level source, so each window ends exactly
+# at :as_of without scanning spend lines for the months in between.
+
+# Spend, distinct suppliers and POs from {start} to {end}, both included
+_SPEND_PERIOD = """
     SELECT 
-        SUM(SPEND_AMOUNT) AS CURRENT_SPEND,
-        COUNT(DISTINCT SUPPLIER_CODE) AS CURRENT_SUPPLIERS,
-        COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS CURRENT_POS
-    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY
-    WHERE PURCHASE_ORDER_DATE >= DATEADD(year, -1, CURRENT_DATE())
+        SUM(TOTAL_SPEND) AS {prefix}_SPEND,
+        COALESCE(HLL_ESTIMATE(HLL_COMBINE(SUPPLIER_SKETCH)), 0) AS {prefix}_SUPPLIERS,
+        COALESCE(SUM(ANCHOR_PO_COUNT), 0) AS {prefix}_POS
+    FROM (
+        SELECT TOTAL_SPEND, ANCHOR_PO_COUNT, SUPPLIER_SKETCH
+        FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_MONTHLY
+        WHERE MONTH >= DATEADD(month, 1, DATE_TRUNC('month', DATEADD(day, -1, {start})))
+            AND MONTH < DATE_TRUNC('month', DATEADD(day, 1, {end}))
+        UNION ALL
+        SELECT TOTAL_SPEND, ANCHOR_PO_COUNT, SUPPLIER_SKETCH
+        FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_DAILY_SOURCE
+        WHERE DAY >= {start}
+            AND DAY <= {end}
+            AND (DAY < DATEADD(month, 1, DATE_TRUNC('month', DATEADD(day, -1, {start})))
+                OR DAY >= DATE_TRUNC('month', DATEADD(day, 1, {end})))
+    )"""
+
+_SPEND_COMPARISON = """
+WITH current_period AS ({current}
 ),
-prior_period AS (
-    SELECT 
-        SUM(SPEND_AMOUNT) AS PRIOR_SPEND,
-        COUNT(DISTINCT SUPPLIER_CODE) AS PRIOR_SUPPLIERS,
-        COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS PRIOR_POS
-    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY
-    WHERE PURCHASE_ORDER_DATE >= DATEADD(year, -2, CURRENT_DATE())
-        AND PURCHASE_ORDER_DATE < DATEADD(year, -1, CURRENT_DATE())
+prior_period AS ({prior}
 )
 SELECT 
     c.CURRENT_SPEND,
@@ -477,36 +598,25 @@ SELECT
 FROM current_period c, prior_period p
 """
 
-QUERY_SPEND_QOQ = """
-WITH current_quarter AS (
-    SELECT 
-        SUM(SPEND_AMOUNT) AS CURRENT_SPEND,
-        COUNT(DISTINCT SUPPLIER_CODE) AS CURRENT_SUPPLIERS,
-        COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS CURRENT_POS
-    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY
-    WHERE PURCHASE_ORDER_DATE >= DATE_TRUNC('quarter', CURRENT_DATE())
-),
-prior_quarter AS (
-    SELECT 
-        SUM(SPEND_AMOUNT) AS PRIOR_SPEND,
-        COUNT(DISTINCT SUPPLIER_CODE) AS PRIOR_SUPPLIERS,
-        COUNT(DISTINCT PURCHASE_ORDER_NUMBER) AS PRIOR_POS
-    FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SPEND_SUMMARY
-    WHERE PURCHASE_ORDER_DATE >= DATEADD(quarter, -1, DATE_TRUNC('quarter', CURRENT_DATE()))
-        AND PURCHASE_ORDER_DATE < DATE_TRUNC('quarter', CURRENT_DATE())
+QUERY_SPEND_YOY = _SPEND_COMPARISON.format(
+    current=_SPEND_PERIOD.format(
+        prefix='CURRENT', start='DATEADD(day, 1, DATEADD(year, -1, :as_of))', end=':as_of',
+    ),
+    prior=_SPEND_PERIOD.format(
+        prefix='PRIOR', start='DATEADD(day, 1, DATEADD(year, -2, :as_of))',
+        end='DATEADD(year, -1, :as_of)',
+    ),
+)
+
+QUERY_SPEND_QOQ = _SPEND_COMPARISON.format(
+    current=_SPEND_PERIOD.format(
+        prefix='CURRENT', start="DATE_TRUNC('quarter', :as_of)", end=':as_of',
+    ),
+    prior=_SPEND_PERIOD.format(
+        prefix='PRIOR', start="DATEADD(quarter, -1, DATE_TRUNC('quarter', :as_of))",
+        end='DATEADD(quarter, -1, :as_of)',
+    ),
 )
-SELECT 
-    c.CURRENT_SPEND,
-    p.PRIOR_SPEND,
-    ROUND((c.CURRENT_SPEND - p.PRIOR_SPEND) / NULLIF(p.PRIOR_SPEND, 0) * 100, 1) AS SPEND_CHANGE_PCT,
-    c.CURRENT_SUPPLIERS,
-    p.PRIOR_SUPPLIERS,
-    c.CURRENT_SUPPLIERS - p.PRIOR_SUPPLIERS AS SUPPLIER_CHANGE,
-    c.CURRENT_POS,
-    p.PRIOR_POS,
-    ROUND((c.CURRENT_POS - p.PRIOR_POS) / NULLIF(p.PRIOR_POS, 0) * 100, 1) AS PO_CHANGE_PCT
-FROM current_quarter c, prior_quarter p
-"""
 
 # =============================================================================
 # External Indicator Correlation (Data Scientist)
@@ -586,20 +696,20 @@ ORDER BY ERP_SOURCE_SYSTEM
 # =============================================================================
 
 QUERY_OPERATIONAL_KPIS = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_OPERATIONAL_KPIS
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.OPERATIONAL_KPIS_AS_OF(:as_of))
 """
 
 QUERY_OTIF_SUMMARY = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_OTIF_SUMMARY
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.OTIF_SUMMARY_AS_OF(:as_of))
 """
 
 QUERY_OTIF_TREND = """
 SELECT 
     MONTH,
     SUM(DELIVERY_COUNT) AS TOTAL_DELIVERIES,
-    ROUND(AVG(ON_TIME_RATE), 1) AS ON_TIME_RATE,
-    ROUND(AVG(IN_FULL_RATE), 1) AS IN_FULL_RATE,
-    ROUND(AVG(OTIF_RATE), 1) AS OTIF_RATE
+    ROUND(SUM(ON_TIME_COUNT) * 100.0 / SUM(DELIVERY_COUNT), 1) AS ON_TIME_RATE,
+    ROUND(SUM(IN_FULL_COUNT) * 100.0 / SUM(DELIVERY_COUNT), 1) AS IN_FULL_RATE,
+    ROUND(SUM(OTIF_COUNT) * 100.0 / SUM(DELIVERY_COUNT), 1) AS OTIF_RATE
 FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_DELIVERY_PERFORMANCE
 GROUP BY MONTH
 ORDER BY MONTH
@@ -612,10 +722,10 @@ SELECT
     SUPPLIER_COUNTRY,
     REGION,
     SUM(DELIVERY_COUNT) AS TOTAL_DELIVERIES,
-    ROUND(AVG(ON_TIME_RATE), 1) AS ON_TIME_RATE,
-    ROUND(AVG(IN_FULL_RATE), 1) AS IN_FULL_RATE,
-    ROUND(AVG(OTIF_RATE), 1) AS OTIF_RATE,
-    ROUND(AVG(AVG_DAYS_VARIANCE), 1) AS AVG_DAYS_VARIANCE
+    ROUND(SUM(ON_TIME_COUNT) * 100.0 / SUM(DELIVERY_COUNT), 1) AS ON_TIME_RATE,
+    ROUND(SUM(IN_FULL_COUNT) * 100.0 / SUM(DELIVERY_COUNT), 1) AS IN_FULL_RATE,
+    ROUND(SUM(OTIF_COUNT) * 100.0 / SUM(DELIVERY_COUNT), 1) AS OTIF_RATE,
+    ROUND(SUM(DAYS_SUM) / NULLIF(SUM(DAYS_COUNT), 0), 1) AS AVG_DAYS_VARIANCE
 FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_DELIVERY_PERFORMANCE
 GROUP BY SUPPLIER_ID, SUPPLIER_NAME, SUPPLIER_COUNTRY, REGION
 ORDER BY OTIF_RATE DESC
@@ -623,7 +733,8 @@ LIMIT 50
 """
 
 QUERY_SCOPE_EMISSIONS_SUMMARY = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_SCOPE_EMISSIONS_SUMMARY
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.SCOPE_EMISSIONS_SUMMARY_AS_OF(:as_of))
+ORDER BY SCOPE_TYPE
 """
 
 QUERY_SCOPE_EMISSIONS_TREND = """
@@ -656,12 +767,12 @@ ORDER BY QUARTER DESC
 """
 
 QUERY_FORWARD_CONTRACT_COVERAGE = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_FORWARD_CONTRACT_COVERAGE
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.FORWARD_CONTRACT_COVERAGE_AS_OF(:as_of))
 ORDER BY TOTAL_CONTRACT_VALUE DESC
 """
 
 QUERY_CATEGORY_METRICS = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_CATEGORY_METRICS
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.CATEGORY_METRICS_AS_OF(:as_of))
 ORDER BY TOTAL_SPEND DESC
 """
 
@@ -688,94 +799,688 @@ SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_EXTERNAL_INDICATORS_LATEST
 """
 
 QUERY_EXTERNAL_INDICATORS_TREND = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_EXTERNAL_INDICATORS_TREND
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.EXTERNAL_INDICATORS_TREND_AS_OF(:as_of))
+ORDER BY WEEK, INDICATOR_NAME
 """
 
 QUERY_BUSINESS_IMPACT_SUMMARY = """
-SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_BUSINESS_IMPACT_SUMMARY
+SELECT * FROM TABLE(SNOWCORE_PROCUREMENT.PROCUREMENT_MART.BUSINESS_IMPACT_SUMMARY_AS_OF(:as_of))
 """
 
 QUERY_BUSINESS_IMPACT = """
 SELECT * FROM SNOWCORE_PROCUREMENT.PROCUREMENT_MART.V_BUSINESS_IMPACT
 """
 
+# =============================================================================
+# Query Specs
+# =============================================================================
+# Every registry entry is a QuerySpec: the SQL plus the metadata the data
+# loader uses to cache it (bind parameters, output columns, the mart views it
+# reads, a freshness class and the expected result size).
+
+# Matches single-quoted literals (left untouched) or :name bind placeholders.
+# The lookbehind skips Snowflake '::' casts.
+BIND_PATTERN = re.compile(r"('(?:[^']|'')*')|(?<!:):([A-Za-z_][A-Za-z0-9_]*)")
+
+_OBJECT_PATTERN = re.compile(r"SNOWCORE_PROCUREMENT\.(ATOMIC|PROCUREMENT_MART)\.([A-Z_][A-Z0-9_]*)")
+
+_SELECT_STAR = re.compile(r"^(\s*SELECT\s+)\*(?=\s+FROM\s)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Freshness:
+    """
+    How long results of a query may be served from the result cache.
+    
+    Once a cached result passes its TTL it is still served, for up to
+    max_staleness seconds, while a background refresh runs
+    (stale-while-revalidate). Beyond that window the next caller waits for
+    the warehouse.
+    """
+    name: str
+    ttl: int            # Fresh window for results without source versions
+    versioned_ttl: int  # Fresh window for results fingerprinted with source versions
+    max_staleness: int  # Extra seconds an expired result is served while refreshing
+
+
+# Alerts should never lag far behind the warehouse
+REALTIME = Freshness('realtime', ttl=60, versioned_ttl=300, max_staleness=300)
+STANDARD = Freshness('standard', ttl=300, versioned_ttl=6 * 3600, max_staleness=900)
+# External indicators land several times a day
+HOURLY = Freshness('hourly', ttl=3600, versioned_ttl=6 * 3600, max_staleness=6 * 3600)
+# Model outputs and commodity indices are refreshed by daily batch jobs
+DAILY = Freshness('daily', ttl=6 * 3600, versioned_ttl=24 * 3600, max_staleness=24 * 3600)
+# Filter lookups change rarely
+STATIC = Freshness('static', ttl=24 * 3600, versioned_ttl=7 * 24 * 3600, max_staleness=24 * 3600)
+
+# Expected result sizes
+SINGLE_ROW = 'single_row'  # One summary row
+SMALL = 'small'            # Tens of rows (a LIMIT or a small dimension)
+LARGE = 'large'            # Grows with history or the supplier base
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """
+    A registered query and its metadata.
+    
+    Attributes:
+        sql: SQL text with :name bind placeholders. :as_of is the date
+            that relative windows are anchored to (data_loader binds today
+            unless a QueryFilter sets it)
+        columns: Output columns in order. For a plain SELECT * over one view
+            only these columns are fetched (see statement)
+        freshness: Freshness class that sets the cache TTLs
+        cardinality: Expected result size (SINGLE_ROW, SMALL or LARGE)
+        derived_from: Registry query whose cached result this one is computed
+            from locally; sql is then the equivalent warehouse query
+    """
+    sql: str
+    columns: Tuple[str, ...] = ()
+    freshness: Freshness = STANDARD
+    cardinality: str = SMALL
+    derived_from: Optional[str] = None
+
+    @property
+    def params(self) -> tuple:
+        """Names of the :name bind placeholders, in order of first use."""
+        names = [match.group(2) for match in BIND_PATTERN.finditer(self.sql) if match.group(2)]
+        return tuple(dict.fromkeys(names))
+
+    @property
+    def source_views(self) -> tuple:
+        """Mart views and table functions the query reads."""
+        return tuple(dict.fromkeys(
+            name for schema, name in _OBJECT_PATTERN.findall(self.sql) if schema == 'PROCUREMENT_MART'
+        ))
+
+    @property
+    def statement(self) -> str:
+        """
+        SQL to execute.
+        
+        A plain SELECT * (no subqueries) is narrowed to the declared columns,
+        so view columns no page reads are never computed or transferred.
+        """
+        if self.columns and self.sql.upper().count('SELECT') == 1:
+            return _SELECT_STAR.sub(lambda match: match.group(1) + ', '.join(self.columns),
+                                    self.sql, count=1)
+        return self.sql
+
+
 # =============================================================================
 # Query Registry Dictionary
 # =============================================================================
 
 QUERY_REGISTRY = {
     # Executive KPIs
-    'executive_kpis': QUERY_EXECUTIVE_KPIS,
-    'spend_by_region': QUERY_SPEND_BY_REGION,
-    'spend_by_category': QUERY_SPEND_BY_CATEGORY,
-    'spend_trend': QUERY_SPEND_TREND,
+    'executive_kpis': QuerySpec(
+        QUERY_EXECUTIVE_KPIS,
+        columns=(
+            'SNAPSHOT_TIMESTAMP', 'TOTAL_SPEND', 'TOTAL_SUPPLIERS', 'RISK_EXPOSURE_AMOUNT',
+            'HIGH_RISK_SUPPLIER_COUNT', 'AVG_ESG_SCORE', 'ERP_SOURCE_COUNT',
+        ),
+        cardinality=SINGLE_ROW,
+    ),
+    'executive_kpi_history': QuerySpec(
+        QUERY_EXECUTIVE_KPI_HISTORY,
+        columns=(
+            'SNAPSHOT_TIMESTAMP', 'TOTAL_SPEND', 'TOTAL_SUPPLIERS', 'RISK_EXPOSURE_AMOUNT',
+            'HIGH_RISK_SUPPLIER_COUNT', 'AVG_ESG_SCORE',
+        ),
+    ),
+    'spend_by_region': QuerySpec(
+        QUERY_SPEND_BY_REGION,
+        columns=('REGION', 'TOTAL_SPEND', 'PO_COUNT', 'SUPPLIER_COUNT'),
+        derived_from='spend_cube',
+    ),
+    'spend_by_category': QuerySpec(
+        QUERY_SPEND_BY_CATEGORY,
+        columns=('MATERIAL_CATEGORY', 'TOTAL_SPEND', 'PO_COUNT'),
+        derived_from='spend_cube',
+    ),
+    'spend_trend': QuerySpec(
+        QUERY_SPEND_TREND,
+        columns=('MONTH', 'TOTAL_SPEND', 'PO_COUNT'),
+        cardinality=LARGE,
+    ),
+    'spend_cube': QuerySpec(
+        QUERY_SPEND_CUBE,
+        columns=(
+            'REGION', 'MATERIAL_CATEGORY', 'SUPPLIER_CODE', 'SUPPLIER_NAME', 'ERP_SOURCE_SYSTEM',
+            'MONTH', 'SPEND_AMOUNT', 'LINE_COUNT', 'PO_COUNT', 'ANCHOR_PO_COUNT',
+        ),
+        cardinality=LARGE,
+    ),
     # Supplier Risk
-    'supplier_risk_map': QUERY_SUPPLIER_RISK_MAP,
-    'high_risk_suppliers': QUERY_HIGH_RISK_SUPPLIERS,
-    'risk_distribution': QUERY_RISK_DISTRIBUTION,
-    'risk_alerts': QUERY_RISK_ALERTS,
+    'supplier_risk_snapshot': QuerySpec(
+        QUERY_SUPPLIER_RISK_SNAPSHOT,
+        columns=(
+            'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'LATITUDE',
+            'LONGITUDE', 'FINANCIAL_HEALTH_SCORE', 'CREDIT_RATING', 'ESG_SCORE',
+            'CERTIFICATION_STATUS', 'RISK_LEVEL', 'TOTAL_SPEND', 'REVENUE_AT_RISK',
+        ),
+        freshness=REALTIME,
+        cardinality=LARGE,
+    ),
+    'supplier_risk_map': QuerySpec(
+        QUERY_SUPPLIER_RISK_MAP,
+        columns=(
+            'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'LATITUDE',
+            'LONGITUDE', 'FINANCIAL_HEALTH_SCORE', 'ESG_SCORE', 'RISK_LEVEL', 'TOTAL_SPEND',
+            'REVENUE_AT_RISK',
+        ),
+        cardinality=LARGE,
+        derived_from='supplier_risk_snapshot',
+    ),
+    'high_risk_suppliers': QuerySpec(
+        QUERY_HIGH_RISK_SUPPLIERS,
+        columns=(
+            'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION',
+            'FINANCIAL_HEALTH_SCORE', 'CREDIT_RATING', 'ESG_SCORE', 'TOTAL_SPEND',
+            'REVENUE_AT_RISK', 'RISK_LEVEL',
+        ),
+        freshness=REALTIME,
+        derived_from='supplier_risk_snapshot',
+    ),
+    'risk_distribution': QuerySpec(
+        QUERY_RISK_DISTRIBUTION,
+        columns=('RISK_LEVEL', 'SUPPLIER_COUNT', 'TOTAL_SPEND', 'TOTAL_RISK'),
+        derived_from='supplier_risk_snapshot',
+    ),
+    'risk_alerts': QuerySpec(
+        QUERY_RISK_ALERTS,
+        columns=(
+            'ALERT_TYPE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'FINANCIAL_HEALTH_SCORE',
+            'REVENUE_AT_RISK', 'RECOMMENDATION',
+        ),
+        freshness=REALTIME,
+        derived_from='supplier_risk_snapshot',
+    ),
     # Alternative Suppliers (DRD "Wow" Moment)
-    'alternative_suppliers': QUERY_ALTERNATIVE_SUPPLIERS,
+    'alternative_suppliers': QuerySpec(
+        QUERY_ALTERNATIVE_SUPPLIERS,
+        columns=(
+            'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION',
+            'FINANCIAL_HEALTH_SCORE', 'CREDIT_RATING', 'ESG_SCORE', 'CERTIFICATION_STATUS',
+            'TOTAL_SPEND', 'RISK_LEVEL', 'MARKETPLACE_STATUS',
+        ),
+        derived_from='supplier_risk_snapshot',
+    ),
     # Should-Cost Analysis
-    'should_cost_summary': QUERY_SHOULD_COST_SUMMARY,
-    'should_cost_by_category': QUERY_SHOULD_COST_BY_CATEGORY,
-    'price_trend': QUERY_PRICE_TREND,
-    'price_trend_all': QUERY_PRICE_TREND_ALL,
-    'renegotiate_opportunities': QUERY_RENEGOTIATE_OPPORTUNITIES,
-    'invoice_details': QUERY_INVOICE_DETAILS,
+    'should_cost_summary': QuerySpec(
+        QUERY_SHOULD_COST_SUMMARY,
+        columns=(
+            'SHOULD_COST_RECOMMENDATION', 'LINE_COUNT', 'TOTAL_CONTRACT', 'TOTAL_SAVINGS',
+            'AVG_VARIANCE_PCT',
+        ),
+    ),
+    'should_cost_by_category': QuerySpec(
+        QUERY_SHOULD_COST_BY_CATEGORY,
+        columns=(
+            'MATERIAL_CATEGORY', 'LINE_COUNT', 'TOTAL_CONTRACT', 'TOTAL_SAVINGS',
+            'AVG_CONTRACT_PRICE', 'AVG_MARKET_PRICE', 'AVG_VARIANCE_PCT',
+        ),
+    ),
+    'price_trend': QuerySpec(
+        QUERY_PRICE_TREND,
+        columns=('WEEK', 'MATERIAL_CATEGORY', 'AVG_CONTRACT_PRICE', 'AVG_MARKET_PRICE'),
+        cardinality=LARGE,
+    ),
+    'price_trend_all': QuerySpec(
+        QUERY_PRICE_TREND_ALL,
+        columns=(
+            'WEEK', 'MATERIAL_CATEGORY', 'AVG_CONTRACT_PRICE', 'AVG_MARKET_PRICE',
+            'AVG_VARIANCE_PCT',
+        ),
+        cardinality=LARGE,
+    ),
+    'should_cost_lines': QuerySpec(
+        QUERY_SHOULD_COST_LINES,
+        columns=(
+            'PURCHASE_ORDER_DATE', 'MATERIAL_CATEGORY', 'ORDERED_QUANTITY', 'CONTRACT_UNIT_PRICE',
+            'CONTRACT_TOTAL',
+        ),
+        cardinality=LARGE,
+    ),
+    'renegotiate_opportunities': QuerySpec(
+        QUERY_RENEGOTIATE_OPPORTUNITIES,
+        columns=(
+            'SUPPLIER_NAME', 'PRODUCT_NAME', 'MATERIAL_CATEGORY', 'PURCHASE_ORDER_DATE',
+            'CONTRACT_UNIT_PRICE', 'MARKET_INDEX_PRICE', 'PRICE_VARIANCE_PCT', 'POTENTIAL_SAVINGS',
+            'SHOULD_COST_RECOMMENDATION',
+        ),
+    ),
+    'invoice_details': QuerySpec(
+        QUERY_INVOICE_DETAILS,
+        columns=(
+            'PURCHASE_ORDER_NUMBER', 'PURCHASE_ORDER_DATE', 'SUPPLIER_NAME', 'PRODUCT_CODE',
+            'PRODUCT_NAME', 'MATERIAL_CATEGORY', 'ORDERED_QUANTITY', 'CONTRACT_UNIT_PRICE',
+            'MARKET_INDEX_PRICE', 'PRICE_VARIANCE', 'PRICE_VARIANCE_PCT', 'POTENTIAL_SAVINGS',
+            'CONTRACT_TOTAL', 'SHOULD_COST_RECOMMENDATION',
+        ),
+    ),
     # ESG
-    'esg_summary': QUERY_ESG_SUMMARY,
-    'carbon_by_region': QUERY_CARBON_BY_REGION,
-    'esg_targets': QUERY_ESG_TARGETS,
+    'esg_summary': QuerySpec(
+        QUERY_ESG_SUMMARY,
+        columns=(
+            'ESG_RISK_LEVEL', 'SUPPLIER_COUNT', 'AVG_ESG_SCORE', 'AVG_ENV_SCORE', 'TOTAL_SPEND',
+            'TOTAL_EMISSIONS',
+        ),
+    ),
+    'carbon_by_region': QuerySpec(
+        QUERY_CARBON_BY_REGION,
+        columns=('REGION', 'TOTAL_EMISSIONS', 'SUPPLIER_COUNT', 'TOTAL_SPEND'),
+    ),
+    'esg_targets': QuerySpec(
+        QUERY_ESG_TARGETS,
+        columns=('METRIC_NAME', 'CURRENT_VALUE', 'TARGET_VALUE', 'STATUS'),
+    ),
     # Commodity Indices
-    'commodity_indices': QUERY_COMMODITY_INDICES,
-    'commodity_latest': QUERY_COMMODITY_LATEST,
+    'commodity_indices': QuerySpec(
+        QUERY_COMMODITY_INDICES,
+        columns=('INDEX_DATE', 'COMMODITY_TYPE', 'INDEX_VALUE', 'PERCENTAGE_CHANGE_WEEKLY'),
+        freshness=DAILY,
+        cardinality=LARGE,
+    ),
+    'commodity_latest': QuerySpec(
+        QUERY_COMMODITY_LATEST,
+        columns=(
+            'COMMODITY_TYPE', 'INDEX_VALUE', 'PERCENTAGE_CHANGE_DAILY', 'PERCENTAGE_CHANGE_WEEKLY',
+            'PERCENTAGE_CHANGE_MONTHLY', 'INDEX_DATE',
+        ),
+        freshness=DAILY,
+    ),
+    'commodity_index_history': QuerySpec(
+        QUERY_COMMODITY_INDEX_HISTORY,
+        columns=('COMMODITY_TYPE', 'INDEX_DATE', 'INDEX_VALUE'),
+        freshness=DAILY,
+        cardinality=LARGE,
+    ),
     # Demand Forecasting (Data Science)
-    'demand_forecast_predictions': QUERY_DEMAND_FORECAST_PREDICTIONS,
-    'forecast_accuracy_metrics': QUERY_FORECAST_ACCURACY_METRICS,
-    'feature_importance': QUERY_FEATURE_IMPORTANCE,
-    'external_indicators': QUERY_EXTERNAL_INDICATORS,
-    'forecast_vs_actual_trend': QUERY_FORECAST_VS_ACTUAL_TREND,
+    'demand_forecast_predictions': QuerySpec(
+        QUERY_DEMAND_FORECAST_PREDICTIONS,
+        columns=(
+            'MATERIAL_CATEGORY', 'PRODUCT_CODE', 'FORECAST_DATE', 'FORECASTED_DEMAND_QTY',
+            'ACTUAL_DEMAND_QTY', 'LOWER_BOUND', 'UPPER_BOUND', 'PREDICTION_CONFIDENCE',
+            'FORECAST_ERROR',
+        ),
+        freshness=DAILY,
+        cardinality=LARGE,
+    ),
+    'forecast_accuracy_metrics': QuerySpec(
+        QUERY_FORECAST_ACCURACY_METRICS,
+        columns=('MATERIAL_CATEGORY', 'PREDICTION_COUNT', 'MAPE', 'MAE', 'RMSE', 'ACCURACY_PCT'),
+        freshness=DAILY,
+    ),
+    'feature_importance': QuerySpec(
+        QUERY_FEATURE_IMPORTANCE,
+        columns=('FEATURE_NAME', 'IMPORTANCE_SCORE', 'FEATURE_TYPE', 'DESCRIPTION'),
+        freshness=DAILY,
+    ),
+    'external_indicators': QuerySpec(
+        QUERY_EXTERNAL_INDICATORS,
+        columns=(
+            'INDICATOR_NAME', 'INDICATOR_VALUE', 'PERCENTAGE_CHANGE', 'INDICATOR_DATE',
+            'INDICATOR_TYPE',
+        ),
+        freshness=HOURLY,
+    ),
+    'forecast_vs_actual_trend': QuerySpec(
+        QUERY_FORECAST_VS_ACTUAL_TREND,
+        columns=('WEEK', 'TOTAL_FORECASTED', 'TOTAL_ACTUAL'),
+        freshness=DAILY,
+        cardinality=LARGE,
+    ),
     # Supplier Concentration Analysis
-    'spend_concentration': QUERY_SPEND_CONCENTRATION,
-    'single_source_risk': QUERY_SINGLE_SOURCE_RISK,
+    'spend_concentration': QuerySpec(
+        QUERY_SPEND_CONCENTRATION,
+        columns=(
+            'SUPPLIER_CODE', 'SUPPLIER_NAME', 'TOTAL_SPEND', 'PO_COUNT', 'CATEGORY_COUNT',
+            'SPEND_PCT', 'CUMULATIVE_PCT', 'RANK',
+        ),
+        derived_from='spend_cube',
+    ),
+    'single_source_risk': QuerySpec(
+        QUERY_SINGLE_SOURCE_RISK,
+        columns=(
+            'MATERIAL_CATEGORY', 'SUPPLIER_COUNT', 'TOTAL_SPEND', 'SUPPLIERS',
+            'CONCENTRATION_RISK',
+        ),
+        derived_from='spend_cube',
+    ),
     # YoY/QoQ Trending
-    'spend_yoy': QUERY_SPEND_YOY,
-    'spend_qoq': QUERY_SPEND_QOQ,
+    'spend_yoy': QuerySpec(
+        QUERY_SPEND_YOY,
+        columns=(
+            'CURRENT_SPEND', 'PRIOR_SPEND', 'SPEND_CHANGE_PCT', 'CURRENT_SUPPLIERS',
+            'PRIOR_SUPPLIERS', 'SUPPLIER_CHANGE', 'CURRENT_POS', 'PRIOR_POS', 'PO_CHANGE_PCT',
+        ),
+        cardinality=SINGLE_ROW,
+    ),
+    'spend_qoq': QuerySpec(
+        QUERY_SPEND_QOQ,
+        columns=(
+            'CURRENT_SPEND', 'PRIOR_SPEND', 'SPEND_CHANGE_PCT', 'CURRENT_SUPPLIERS',
+            'PRIOR_SUPPLIERS', 'SUPPLIER_CHANGE', 'CURRENT_POS', 'PRIOR_POS', 'PO_CHANGE_PCT',
+        ),
+        cardinality=SINGLE_ROW,
+    ),
     # External Indicator Correlation
-    'indicator_demand_correlation': QUERY_INDICATOR_DEMAND_CORRELATION,
+    'indicator_demand_correlation': QuerySpec(
+        QUERY_INDICATOR_DEMAND_CORRELATION,
+        columns=(
+            'INDEX_DATE', 'INDICATOR_NAME', 'INDICATOR_VALUE', 'DEMAND_QUANTITY',
+            'INDICATOR_CHANGE',
+        ),
+        freshness=HOURLY,
+        cardinality=LARGE,
+    ),
     # Filters/Lookups
-    'regions': QUERY_REGIONS,
-    'categories': QUERY_CATEGORIES,
-    'suppliers': QUERY_SUPPLIERS,
-    'erp_systems': QUERY_ERP_SYSTEMS,
-    'divisions': QUERY_DIVISIONS,
+    'regions': QuerySpec(
+        QUERY_REGIONS,
+        columns=('REGION',),
+        freshness=STATIC,
+    ),
+    'categories': QuerySpec(
+        QUERY_CATEGORIES,
+        columns=('MATERIAL_CATEGORY',),
+        freshness=STATIC,
+    ),
+    'suppliers': QuerySpec(
+        QUERY_SUPPLIERS,
+        columns=('SUPPLIER_CODE', 'SUPPLIER_NAME'),
+        freshness=STATIC,
+        cardinality=LARGE,
+    ),
+    'erp_systems': QuerySpec(
+        QUERY_ERP_SYSTEMS,
+        columns=('ERP_SOURCE_SYSTEM',),
+        freshness=STATIC,
+    ),
+    'divisions': QuerySpec(
+        QUERY_DIVISIONS,
+        columns=('DIVISION',),
+        freshness=STATIC,
+    ),
     # CPO Persona - Operational Excellence
-    'operational_kpis': QUERY_OPERATIONAL_KPIS,
-    'otif_summary': QUERY_OTIF_SUMMARY,
-    'otif_trend': QUERY_OTIF_TREND,
-    'delivery_by_supplier': QUERY_DELIVERY_BY_SUPPLIER,
-    'scope_emissions_summary': QUERY_SCOPE_EMISSIONS_SUMMARY,
-    'scope_emissions_trend': QUERY_SCOPE_EMISSIONS_TREND,
-    'diversity_spend': QUERY_DIVERSITY_SPEND,
+    'operational_kpis': QuerySpec(
+        QUERY_OPERATIONAL_KPIS,
+        columns=(
+            'SPEND_UNDER_MANAGEMENT_PCT', 'COST_REDUCTION_PCT', 'PROCUREMENT_ROI',
+            'CONTRACT_COMPLIANCE_PCT', 'AVG_PO_CYCLE_TIME_DAYS',
+        ),
+        cardinality=SINGLE_ROW,
+    ),
+    'otif_summary': QuerySpec(
+        QUERY_OTIF_SUMMARY,
+        columns=('ON_TIME_RATE', 'IN_FULL_RATE', 'OTIF_RATE', 'OTIF_VS_TARGET'),
+        cardinality=SINGLE_ROW,
+    ),
+    'otif_trend': QuerySpec(
+        QUERY_OTIF_TREND,
+        columns=('MONTH', 'TOTAL_DELIVERIES', 'ON_TIME_RATE', 'IN_FULL_RATE', 'OTIF_RATE'),
+        cardinality=LARGE,
+    ),
+    'delivery_by_supplier': QuerySpec(
+        QUERY_DELIVERY_BY_SUPPLIER,
+        columns=(
+            'SUPPLIER_ID', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'TOTAL_DELIVERIES',
+            'ON_TIME_RATE', 'IN_FULL_RATE', 'OTIF_RATE', 'AVG_DAYS_VARIANCE',
+        ),
+    ),
+    'scope_emissions_summary': QuerySpec(
+        QUERY_SCOPE_EMISSIONS_SUMMARY,
+        columns=('SCOPE_TYPE', 'TOTAL_EMISSIONS_MT', 'SUPPLIER_COUNT', 'PCT_OF_TOTAL'),
+    ),
+    'scope_emissions_trend': QuerySpec(
+        QUERY_SCOPE_EMISSIONS_TREND,
+        columns=('MONTH', 'SCOPE_TYPE', 'TOTAL_EMISSIONS_MT', 'SUPPLIER_COUNT'),
+        cardinality=LARGE,
+    ),
+    'diversity_spend': QuerySpec(
+        QUERY_DIVERSITY_SPEND,
+        columns=('DIVERSITY_CATEGORY', 'SUPPLIER_COUNT', 'DIVERSITY_SPEND', 'PCT_OF_TOTAL'),
+    ),
     # Category Manager Persona
-    'supplier_scorecard_latest': QUERY_SUPPLIER_SCORECARD_LATEST,
-    'supplier_scorecard_trend': QUERY_SUPPLIER_SCORECARD_TREND,
-    'forward_contract_coverage': QUERY_FORWARD_CONTRACT_COVERAGE,
-    'category_metrics': QUERY_CATEGORY_METRICS,
-    'lead_time_variability': QUERY_LEAD_TIME_VARIABILITY,
+    'supplier_scorecard_latest': QuerySpec(
+        QUERY_SUPPLIER_SCORECARD_LATEST,
+        columns=(
+            'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'QUALITY_SCORE', 'DELIVERY_SCORE',
+            'PRICE_SCORE', 'RESPONSIVENESS_SCORE', 'OVERALL_SCORE', 'RATING_GRADE',
+        ),
+    ),
+    'supplier_scorecard_trend': QuerySpec(
+        QUERY_SUPPLIER_SCORECARD_TREND,
+        columns=(
+            'SUPPLIER_ID', 'SUPPLIER_NAME', 'QUARTER', 'AVG_QUALITY_SCORE', 'AVG_DELIVERY_SCORE',
+            'AVG_PRICE_SCORE', 'AVG_RESPONSIVENESS_SCORE', 'AVG_OVERALL_SCORE',
+        ),
+        cardinality=LARGE,
+    ),
+    'forward_contract_coverage': QuerySpec(
+        QUERY_FORWARD_CONTRACT_COVERAGE,
+        columns=(
+            'MATERIAL_CATEGORY', 'CONTRACT_COUNT', 'TOTAL_CONTRACT_VALUE', 'AVG_UTILIZATION_PCT',
+            'EXPIRING_SOON',
+        ),
+    ),
+    'category_metrics': QuerySpec(
+        QUERY_CATEGORY_METRICS,
+        columns=(
+            'MATERIAL_CATEGORY', 'TOTAL_SPEND', 'TOTAL_QUANTITY', 'PO_COUNT', 'SUPPLIER_COUNT',
+            'FORWARD_COVERAGE_PCT', 'FORWARD_UTILIZATION_PCT',
+        ),
+    ),
+    'lead_time_variability': QuerySpec(
+        QUERY_LEAD_TIME_VARIABILITY,
+        columns=('SUPPLIER_NAME', 'LEAD_TIME_STDDEV', 'VARIABILITY_RATING'),
+    ),
     # Data Scientist Persona
-    'model_registry': QUERY_MODEL_REGISTRY,
-    'model_comparison': QUERY_MODEL_COMPARISON,
-    'external_indicators_latest': QUERY_EXTERNAL_INDICATORS_LATEST,
-    'external_indicators_trend': QUERY_EXTERNAL_INDICATORS_TREND,
-    'business_impact_summary': QUERY_BUSINESS_IMPACT_SUMMARY,
-    'business_impact': QUERY_BUSINESS_IMPACT,
+    'model_registry': QuerySpec(
+        QUERY_MODEL_REGISTRY,
+        columns=(
+            'MODEL_NAME', 'MODEL_VERSION', 'ALGORITHM', 'TRAINING_DATE', 'MAE', 'MAPE', 'R2_SCORE',
+            'IS_DEPLOYED', 'ACCURACY_PCT',
+        ),
+        freshness=DAILY,
+    ),
+    'model_comparison': QuerySpec(
+        QUERY_MODEL_COMPARISON,
+        columns=(
+            'ALGORITHM', 'MODEL_NAME', 'MODEL_VERSION', 'MAE', 'MAPE', 'R2_SCORE', 'ACCURACY_PCT',
+            'IS_DEPLOYED',
+        ),
+        freshness=DAILY,
+    ),
+    'external_indicators_latest': QuerySpec(
+        QUERY_EXTERNAL_INDICATORS_LATEST,
+        columns=('INDICATOR_NAME', 'INDICATOR_VALUE', 'PERCENTAGE_CHANGE', 'INDICATOR_TYPE'),
+        freshness=HOURLY,
+    ),
+    'external_indicators_trend': QuerySpec(
+        QUERY_EXTERNAL_INDICATORS_TREND,
+        columns=('WEEK', 'INDICATOR_NAME', 'INDICATOR_TYPE', 'AVG_VALUE', 'AVG_CHANGE'),
+        freshness=HOURLY,
+        cardinality=LARGE,
+    ),
+    'business_impact_summary': QuerySpec(
+        QUERY_BUSINESS_IMPACT_SUMMARY,
+        columns=(
+            'TOTAL_INVENTORY_REDUCTION', 'TOTAL_COST_SAVINGS', 'AVG_SERVICE_LEVEL_IMPROVEMENT',
+            'AVG_STOCKOUT_REDUCTION', 'TOTAL_FORECAST_VALUE',
+        ),
+        freshness=DAILY,
+        cardinality=SINGLE_ROW,
+    ),
+    'business_impact': QuerySpec(
+        QUERY_BUSINESS_IMPACT,
+        columns=(
+            'METRIC_DATE', 'MODEL_NAME', 'MODEL_VERSION', 'INVENTORY_REDUCTION_AMOUNT',
+            'COST_SAVINGS_AMOUNT', 'SERVICE_LEVEL_IMPROVEMENT_PCT', 'STOCKOUT_REDUCTION_PCT',
+            'FORECAST_VALUE_ADDED',
+        ),
+        freshness=DAILY,
+        cardinality=LARGE,
+    ),
+}
+
+# =============================================================================
+# Source Tables (cache invalidation)
+# =============================================================================
+# Tables read by each mart view and *_AS_OF table function (mirrors
+# sql/05_mart_layer.sql and sql/05b_mart_persona_extensions.sql; keep in sync
+# when a view changes).
+# Views over incrementally maintained mart tables (SPEND_FACT, the spend
+# snapshots, SUPPLIER_SPEND_ROLLUP) list those tables: they change when
+# their refresh task has merged new source rows.
+# A registry query's sources are the ATOMIC and mart tables it reads directly
+# plus those behind every mart view it reads. Cached results are invalidated when
+# one of these tables changes rather than on a fixed timer.
+
+VIEW_SOURCES = {
+    'V_SPEND_SUMMARY': ('SPEND_FACT',),
+    'V_SPEND_MONTHLY': ('SPEND_MONTHLY_SNAPSHOT', 'SPEND_DAILY_SNAPSHOT'),
+    'V_SPEND_DAILY_SOURCE': ('SPEND_FACT',),
+    'V_SUPPLIER_RISK': (
+        'SUPPLIER', 'PARTY', 'PARTY_ADDRESS', 'GEOGRAPHY', 'MARKETPLACE_SUPPLIER_RISK',
+        'SUPPLIER_SPEND_ROLLUP',
+    ),
+    'V_SHOULD_COST_ANALYSIS': (
+        'PURCHASE_ORDER', 'PURCHASE_ORDER_LINE', 'SUPPLIER', 'PARTY', 'PRODUCT',
+        'PRODUCT_CATEGORY', 'CURRENCY', 'MARKETPLACE_COMMODITY_INDEX',
+    ),
+    'V_SUPPLIER_PERFORMANCE_SUMMARY': ('SUPPLIER', 'PARTY', 'SUPPLIER_PERFORMANCE'),
+    'V_ESG_SUMMARY': (
+        'SUPPLIER', 'PARTY', 'PARTY_ADDRESS', 'GEOGRAPHY', 'MARKETPLACE_SUPPLIER_RISK',
+        'SUPPLIER_EMISSIONS_MONTHLY', 'PURCHASE_ORDER',
+    ),
+    'V_DEMAND_FORECAST_ANALYSIS': (
+        'DEMAND_FORECAST', 'DEMAND_ACTUAL', 'PRODUCT', 'PRODUCT_CATEGORY', 'SITE',
+    ),
+    'V_DEMAND_FORECAST_PREDICTIONS': (
+        'DEMAND_FORECAST_PREDICTIONS', 'DEMAND_ACTUAL', 'PRODUCT', 'PRODUCT_CATEGORY',
+    ),
+    'V_EXECUTIVE_KPIS': (
+        'PURCHASE_ORDER', 'SUPPLIER', 'MARKETPLACE_SUPPLIER_RISK', 'SUPPLIER_EMISSIONS_MONTHLY',
+    ),
+    'EXECUTIVE_KPIS_AS_OF': ('EXECUTIVE_KPI_HISTORY',),
+    'OPERATIONAL_KPIS_AS_OF': ('PROCUREMENT_OPERATIONAL_METRICS',),
+    'V_DELIVERY_PERFORMANCE': (
+        'SUPPLIER_OTIF_MONTHLY', 'SUPPLIER', 'PARTY', 'PARTY_ADDRESS', 'GEOGRAPHY',
+    ),
+    'OTIF_SUMMARY_AS_OF': ('SUPPLIER_OTIF_MONTHLY', 'DELIVERY_PERFORMANCE'),
+    'V_SCOPE_EMISSIONS': ('SUPPLIER_EMISSIONS_MONTHLY',),
+    'SCOPE_EMISSIONS_SUMMARY_AS_OF': ('SUPPLIER_EMISSIONS_MONTHLY', 'EMISSION_RECORD_SCOPED'),
+    'V_DIVERSITY_SPEND': ('SUPPLIER_DIVERSITY', 'PURCHASE_ORDER'),
+    'V_SUPPLIER_SCORECARD_LATEST': (
+        'SUPPLIER_SCORECARD', 'SUPPLIER', 'PARTY', 'PARTY_ADDRESS', 'GEOGRAPHY',
+    ),
+    'V_SUPPLIER_SCORECARD_TREND': ('SUPPLIER_SCORECARD', 'SUPPLIER', 'PARTY'),
+    'FORWARD_CONTRACT_COVERAGE_AS_OF': ('FORWARD_CONTRACT',),
+    'CATEGORY_METRICS_AS_OF': (
+        'PURCHASE_ORDER', 'PURCHASE_ORDER_LINE', 'PRODUCT', 'PRODUCT_CATEGORY',
+        'FORWARD_CONTRACT',
+    ),
+    'V_LEAD_TIME_VARIABILITY': ('SUPPLIER_SCORECARD', 'SUPPLIER', 'PARTY'),
+    'V_MODEL_REGISTRY': ('MODEL_REGISTRY',),
+    'V_MODEL_COMPARISON': ('MODEL_REGISTRY',),
+    'V_EXTERNAL_INDICATORS_LATEST': ('MARKETPLACE_INDICATORS',),
+    'EXTERNAL_INDICATORS_TREND_AS_OF': ('MARKETPLACE_INDICATORS',),
+    'V_BUSINESS_IMPACT': ('BUSINESS_IMPACT_METRICS', 'MODEL_REGISTRY'),
+    'BUSINESS_IMPACT_SUMMARY_AS_OF': ('BUSINESS_IMPACT_METRICS',),
 }
 
+# =============================================================================
+# Filter Columns (filter pushdown)
+# =============================================================================
+# Columns through which each mart view or table function can be filtered, per
+# QueryFilter dimension (see utils/query_filter.py). Views not listed ignore
+# page filters.
+
+VIEW_FILTER_COLUMNS = {
+    'V_SPEND_SUMMARY': {
+        'division': 'ERP_SOURCE_SYSTEM', 'region': 'REGION',
+        'category': 'MATERIAL_CATEGORY', 'date': 'PURCHASE_ORDER_DATE',
+    },
+    'V_SHOULD_COST_ANALYSIS': {
+        'division': 'ERP_SOURCE_SYSTEM', 'category': 'MATERIAL_CATEGORY',
+        'date': 'PURCHASE_ORDER_DATE',
+    },
+    'V_SPEND_MONTHLY': {
+        'division': 'ERP_SOURCE_SYSTEM', 'region': 'REGION',
+        'category': 'MATERIAL_CATEGORY', 'date': 'MONTH',
+    },
+    'V_SPEND_DAILY_SOURCE': {
+        'division': 'ERP_SOURCE_SYSTEM', 'region': 'REGION',
+        'category': 'MATERIAL_CATEGORY', 'date': 'DAY',
+    },
+    'V_SUPPLIER_RISK': {'region': 'REGION'},
+    'V_ESG_SUMMARY': {'region': 'REGION'},
+    'V_DEMAND_FORECAST_ANALYSIS': {'category': 'MATERIAL_CATEGORY', 'date': 'FORECAST_DATE'},
+    'V_DEMAND_FORECAST_PREDICTIONS': {'category': 'MATERIAL_CATEGORY', 'date': 'FORECAST_DATE'},
+    'V_DELIVERY_PERFORMANCE': {'region': 'REGION', 'date': 'MONTH'},
+    'V_SCOPE_EMISSIONS': {'date': 'MONTH'},
+    'V_SUPPLIER_SCORECARD_LATEST': {'region': 'REGION'},
+    'FORWARD_CONTRACT_COVERAGE_AS_OF': {'category': 'MATERIAL_CATEGORY'},
+    'CATEGORY_METRICS_AS_OF': {'category': 'MATERIAL_CATEGORY'},
+}
 
-def get_query(query_name: str) -> str:
-    """Get a registered query by name."""
+# Cheap version probe for source tables: LAST_ALTERED moves on every DML/DDL
+QUERY_SOURCE_VERSIONS = """
+SELECT TABLE_NAME, LAST_ALTERED, ROW_COUNT
+FROM SNOWCORE_PROCUREMENT.INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA IN ('ATOMIC', 'PROCUREMENT_MART')
+  AND TABLE_TYPE = 'BASE TABLE'
+"""
+
+
+def get_spec(query_name: str) -> QuerySpec:
+    """Get the QuerySpec of a registered query."""
     if query_name not in QUERY_REGISTRY:
         raise ValueError(f"Query '{query_name}' not found in registry")
     return QUERY_REGISTRY[query_name]
+
+
+def get_query(query_name: str) -> str:
+    """Get the SQL to execute for a registered query."""
+    return get_spec(query_name).statement
+
+
+def get_freshness(query_name: str) -> Freshness:
+    """Get the freshness class of a registered query."""
+    return get_spec(query_name).freshness
+
+
+def get_max_staleness(query_name: str) -> int:
+    """Get how long (seconds) an expired result may be served while it refreshes."""
+    return get_freshness(query_name).max_staleness
+
+
+@lru_cache(maxsize=None)
+def get_filter_dimensions(query_name: str) -> frozenset:
+    """Get the QueryFilter dimensions a registered query can be filtered on."""
+    dimensions = set()
+    for view in get_spec(query_name).source_views:
+        dimensions.update(VIEW_FILTER_COLUMNS.get(view, {}))
+    return frozenset(dimensions)
+
+
+@lru_cache(maxsize=None)
+def get_sources(query_name: str) -> tuple:
+    """
+    Get the source tables (ATOMIC, or mart tables such as SPEND_FACT) a registered query ultimately reads.
+    
+    Returns:
+        Sorted tuple of table names, or an empty tuple if any referenced
+        mart view or table function has no declared sources (the query is then cached on TTL only)
+    """
+    sources = set()
+    for schema, name in _OBJECT_PATTERN.findall(get_spec(query_name).sql):
+        if name in VIEW_SOURCES:
+            sources.update(VIEW_SOURCES[name])
+        elif schema == 'ATOMIC' or not (name.startswith('V_') or name.endswith('_AS_OF')):
+            sources.add(name)
+        else:
+            return ()
+    return tuple(sorted(sources))
@@ -0,0 +1,393 @@
+"""
+Result caches for Snowcore Procurement Intelligence
+MemoryResultCache holds one shared copy of each result per worker process;
+DiskResultCache stores results on local disk as compressed Arrow IPC files so
+that every Streamlit worker process (and every restart) shares warm results.
+SingleFlight coalesces concurrent cache misses for the same key into one
+execution.
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Disk tier is disabled without pyarrow
+    pa = None
+
+
+DEFAULT_MEMORY_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'snowcore_procurement_cache')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_FLIGHT_TIMEOUT_SECONDS = 120
+
+_FILE_SUFFIX = '.arrow'
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate in-memory size of a cached result."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    return int(getattr(value, 'nbytes', 0))
+
+
+@dataclass
+class CacheEntry:
+    """A cached result plus the bookkeeping used for expiry and accounting."""
+    value: Any
+    label: str
+    nbytes: int
+    expires_at: float
+    version: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+    @property
+    def is_stale(self) -> bool:
+        return self.expires_at < time.time()
+
+
+class MemoryResultCache:
+    """
+    Thread-safe, size-bounded LRU of query results for one worker process.
+
+    Held via st.cache_resource so every user session reads the same object:
+    a single copy per result, with per-entry memory accounting. Callers must
+    treat returned values as read-only; data_loader caches immutable Arrow
+    tables and converts to pandas per caller.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self.lookup(key)
+        return None if entry is None or entry.is_stale else entry.value
+
+    def lookup(self, key: Hashable, max_stale: float = 0) -> Optional[CacheEntry]:
+        """
+        Return the entry for key, including one expired by at most max_stale seconds.
+
+        Callers check entry.is_stale to decide whether to refresh it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at + max_stale < time.time():
+                if key not in self._refreshing:
+                    self._pop(key)
+                return None
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        """Claim the refresh of key; False if another thread already owns it."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        """Release a refresh claimed with begin_refresh()."""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def put(self, key: Hashable, value: Any, ttl: float, label: str = '',
+            version: Optional[str] = None) -> None:
+        """
+        Store value for ttl seconds, evicting least recently used entries.
+
+        Args:
+            key: Cache key
+            value: Result to store
+            ttl: Seconds until the entry is stale
+            label: Name shown in stats()
+            version: Fingerprint of the source data the value was computed from
+        """
+        entry = CacheEntry(
+            value=value,
+            label=label,
+            nbytes=estimate_nbytes(value),
+            expires_at=time.time() + ttl,
+            version=version,
+        )
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = entry
+            self._total_bytes += entry.nbytes
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            elif key in self._entries:
+                self._pop(key)
+
+    def stats(self) -> pd.DataFrame:
+        """Per-entry memory accounting, largest entries first."""
+        now = time.time()
+        with self._lock:
+            rows = [{
+                'QUERY': entry.label,
+                'BYTES': entry.nbytes,
+                'HITS': entry.hits,
+                'AGE_SECONDS': round(now - entry.created_at, 1),
+                'EXPIRES_IN_SECONDS': round(entry.expires_at - now, 1),
+            } for entry in self._entries.values()]
+        return pd.DataFrame(rows, columns=['QUERY', 'BYTES', 'HITS', 'AGE_SECONDS', 'EXPIRES_IN_SECONDS']) \
+            .sort_values('BYTES', ascending=False, ignore_index=True)
+
+    def _pop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.nbytes
+
+
+class SingleFlightTimeout(TimeoutError):
+    """A caller gave up waiting for another caller's in-flight execution."""
+
+
+class Flight:
+    """One in-flight execution; waiters block until the leader lands it."""
+
+    def __init__(self):
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """
+        Block until the flight lands and return its result.
+
+        Raises:
+            SingleFlightTimeout: The flight did not land within timeout seconds
+            Exception: Whatever the leader's execution raised
+        """
+        if not self._done.wait(timeout):
+            raise SingleFlightTimeout(f"Gave up after {timeout:g}s waiting for an identical in-flight query")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent executions of the same key (single-flight).
+
+    The first caller for a key leads: it runs the work while callers that
+    arrive meanwhile wait, for at most timeout seconds, and receive the
+    leader's result or exception. A flight is forgotten as soon as it lands,
+    so results must still be cached by the caller and errors are retried by
+    the next request.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_FLIGHT_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: Hashable) -> Tuple[Flight, bool]:
+        """
+        Join the flight for key, starting one if none is in progress.
+
+        Returns:
+            Tuple of (flight, True if the caller leads it). The leader must
+            call land() exactly once, including when its work fails.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = Flight()
+            return flight, True
+
+    def land(self, key: Hashable, flight: Flight, result: Any = None,
+             error: Optional[BaseException] = None) -> None:
+        """Publish the leader's result (or error) to every waiter and close the flight."""
+        flight.result = result
+        flight.error = error
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight._done.set()
+
+    def do(self, key: Hashable, work: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run work once for every concurrent caller of key.
+
+        Returns:
+            Tuple of (result, True if it was shared from another caller's run)
+        """
+        flight, leader = self.claim(key)
+        if not leader:
+            return flight.wait(self.timeout), True
+        try:
+            result = work()
+        except BaseException as e:
+            self.land(key, flight, error=e)
+            raise
+        self.land(key, flight, result=result)
+        return result, False
+
+
+class DiskResultCache:
+    """
+    Size-bounded LRU cache of Arrow tables stored as zstd-compressed IPC files.
+
+    Entries are written to a temporary file and atomically renamed into place,
+    so concurrent readers in other processes never see a partial file. Each
+    entry carries its own expiry timestamp in the Arrow schema metadata, and
+    the file modification time doubles as the LRU clock (touched on every hit).
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: int = DEFAULT_TTL_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return pa is not None
+
+    @staticmethod
+    def key_for(*parts) -> str:
+        """Derive a filesystem-safe cache key from arbitrary hashable parts."""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _FILE_SUFFIX)
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional['pa.Table']:
+        """
+        Return the cached table for key, or None if missing or expired.
+
+        When version is given, entries written for a different source
+        version are treated as expired.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with pa.memory_map(path, 'r') as source:
+                reader = pa.ipc.open_file(source)
+                metadata = reader.schema.metadata or {}
+                expires_at = float(metadata.get(b'expires_at', b'0'))
+                outdated = version is not None and metadata.get(b'version') != version.encode()
+                if expires_at < time.time() or outdated:
+                    self._remove(path)
+                    return None
+                table = reader.read_all()
+            os.utime(path)  # Refresh LRU position
+            return table
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            return None
+
+    def put(self, key: str, data: Any, ttl: Optional[int] = None, **metadata) -> bool:
+        """
+        Atomically write a result to the cache.
+
+        Args:
+            key: Cache key from key_for()
+            data: pyarrow Table (or DataFrame) to store
+            ttl: Seconds until the entry expires (defaults to default_ttl)
+            **metadata: Extra string metadata stored alongside the entry
+
+        Returns:
+            True if the entry was written
+        """
+        if not self.enabled:
+            return False
+        ttl = self.default_ttl if ttl is None else ttl
+        if isinstance(data, pa.Table):
+            table = data
+        else:
+            try:
+                table = pa.Table.from_pandas(data, preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                return False
+
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata.update({
+            b'created_at': str(time.time()).encode(),
+            b'expires_at': str(time.time() + ttl).encode(),
+        })
+        schema_metadata.update({
+            k.encode(): str(v).encode() for k, v in metadata.items() if v is not None
+        })
+        table = table.replace_schema_metadata(schema_metadata)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink:
+                options = pa.ipc.IpcWriteOptions(compression='zstd')
+                with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, self._path(key))
+        except Exception:  # OSError or an Arrow write error; never leak the temp file
+            self._remove(tmp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(_FILE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            total_bytes -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for name in os.listdir(self.directory):
+            if name.endswith(_FILE_SUFFIX):
+                self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,85 @@
+"""
+Supplier risk snapshot for Snowcore Procurement Intelligence
+The supplier risk widgets (risk map, high-risk table, risk distribution,
+critical alerts and alternative suppliers) are computed locally from one
+cached read of V_SUPPLIER_RISK, instead of each re-running the view and its
+PO spend subquery.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+RISK_LEVEL_ORDER = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+HIGH_RISK_HEALTH_THRESHOLD = 50
+HIGH_RISK_TOP_N = 20
+ALERT_TOP_N = 5
+ALTERNATIVE_MIN_HEALTH = 70
+ALTERNATIVE_MIN_ESG = 60
+ALTERNATIVE_TOP_N = 15
+
+
+def supplier_risk_map(snapshot: pd.DataFrame) -> pd.DataFrame:
+    """Suppliers with coordinates, for the risk map."""
+    located = snapshot['LATITUDE'].notna() & snapshot['LONGITUDE'].notna()
+    return snapshot.loc[located, [
+        'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'LATITUDE', 'LONGITUDE',
+        'FINANCIAL_HEALTH_SCORE', 'ESG_SCORE', 'RISK_LEVEL', 'TOTAL_SPEND', 'REVENUE_AT_RISK',
+    ]].reset_index(drop=True)
+
+
+def high_risk_suppliers(snapshot: pd.DataFrame, top_n: int = HIGH_RISK_TOP_N) -> pd.DataFrame:
+    """Suppliers below the financial health threshold, most revenue at risk first."""
+    high_risk = snapshot[snapshot['FINANCIAL_HEALTH_SCORE'] < HIGH_RISK_HEALTH_THRESHOLD]
+    return high_risk.nlargest(top_n, 'REVENUE_AT_RISK')[[
+        'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'FINANCIAL_HEALTH_SCORE',
+        'CREDIT_RATING', 'ESG_SCORE', 'TOTAL_SPEND', 'REVENUE_AT_RISK', 'RISK_LEVEL',
+    ]].reset_index(drop=True)
+
+
+def risk_distribution(snapshot: pd.DataFrame) -> pd.DataFrame:
+    """Supplier count, spend and revenue at risk per risk level, most severe first (unrated last)."""
+    result = snapshot.groupby('RISK_LEVEL', dropna=False).agg(
+        SUPPLIER_COUNT=('SUPPLIER_CODE', 'size'),
+        TOTAL_SPEND=('TOTAL_SPEND', 'sum'),
+        TOTAL_RISK=('REVENUE_AT_RISK', 'sum'),
+    )
+    severity = result.index.map({level: rank for rank, level in enumerate(RISK_LEVEL_ORDER)})
+    return result.iloc[np.argsort(severity.to_numpy(dtype=float), kind='stable')].reset_index()
+
+
+def risk_alerts(snapshot: pd.DataFrame, top_n: int = ALERT_TOP_N) -> pd.DataFrame:
+    """Critical suppliers with the most revenue at risk, as alert rows."""
+    critical = snapshot[snapshot['RISK_LEVEL'] == 'CRITICAL'].nlargest(top_n, 'REVENUE_AT_RISK')
+    alerts = critical[[
+        'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'FINANCIAL_HEALTH_SCORE', 'REVENUE_AT_RISK',
+    ]].reset_index(drop=True)
+    alerts.insert(0, 'ALERT_TYPE', 'CRITICAL')
+    alerts['RECOMMENDATION'] = 'Immediate review recommended - financial health critical'
+    return alerts
+
+
+def alternative_suppliers(snapshot: pd.DataFrame, top_n: int = ALTERNATIVE_TOP_N) -> pd.DataFrame:
+    """Financially healthy, ESG-compliant, low-risk suppliers, healthiest first."""
+    candidates = snapshot[
+        (snapshot['FINANCIAL_HEALTH_SCORE'] >= ALTERNATIVE_MIN_HEALTH)
+        & (snapshot['ESG_SCORE'] >= ALTERNATIVE_MIN_ESG)
+        & (snapshot['RISK_LEVEL'] == 'LOW')
+    ]
+    result = candidates.sort_values(['FINANCIAL_HEALTH_SCORE', 'ESG_SCORE'], ascending=False) \
+        .head(top_n)[[
+            'SUPPLIER_CODE', 'SUPPLIER_NAME', 'SUPPLIER_COUNTRY', 'REGION', 'FINANCIAL_HEALTH_SCORE',
+            'CREDIT_RATING', 'ESG_SCORE', 'CERTIFICATION_STATUS', 'TOTAL_SPEND', 'RISK_LEVEL',
+        ]].reset_index(drop=True)
+    result['MARKETPLACE_STATUS'] = 'VALIDATED'
+    return result
+
+
+DERIVED_QUERIES = {
+    'supplier_risk_map': supplier_risk_map,
+    'high_risk_suppliers': high_risk_suppliers,
+    'risk_distribution': risk_distribution,
+    'risk_alerts': risk_alerts,
+    'alternative_suppliers': alternative_suppliers,
+}
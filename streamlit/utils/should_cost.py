@@ -0,0 +1,174 @@
+"""
+Should-cost pricing for Snowcore Procurement Intelligence
+Prices purchase order lines against the latest commodity index at or before
+each PO date with a sorted-merge as-of join (pandas.merge_asof), the local
+counterpart of the ASOF JOIN in V_SHOULD_COST_ANALYSIS. Both sides are
+sorted once and merged in a single pass, so the cost is linear in lines plus
+index history.
+
+The Category Manager what-if scenarios re-price the cached line extract and
+index history here (market prices shifted by a percentage, or an index lag
+as in contracts priced off an earlier index) without a warehouse round trip.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Contract price relative to the market index (mirrors V_SHOULD_COST_ANALYSIS)
+RENEGOTIATE_RATIO = 1.15
+REVIEW_RATIO = 1.05
+FAVORABLE_RATIO = 0.95
+
+LINE_KEY = 'MATERIAL_CATEGORY'
+LINE_DATE = 'PURCHASE_ORDER_DATE'
+INDEX_KEY = 'COMMODITY_TYPE'
+INDEX_DATE = 'INDEX_DATE'
+
+
+def asof_market_price(lines: pd.DataFrame, index: pd.DataFrame, lag_days: int = 0) -> pd.DataFrame:
+    """
+    Attach the latest index value at or before each line's PO date.
+
+    Args:
+        lines: PO lines with MATERIAL_CATEGORY and PURCHASE_ORDER_DATE
+        index: Commodity index history with COMMODITY_TYPE, INDEX_DATE and
+            INDEX_VALUE (any order)
+        lag_days: Look the index up this many days before the PO date
+
+    Returns:
+        lines in their original order plus COMMODITY_TYPE, MARKET_INDEX_PRICE
+        and MARKET_PRICE_DATE (NULL where no index row qualifies, as in the
+        view's ASOF JOIN)
+    """
+    left = lines.assign(
+        _ROW=np.arange(len(lines)),
+        _ASOF_DATE=pd.to_datetime(lines[LINE_DATE]).astype('datetime64[ns]')
+        - pd.Timedelta(days=lag_days),
+    )
+    # merge_asof needs non-null, sorted keys; lines without a category or
+    # date get NULL market columns
+    matchable = left[LINE_KEY].notna() & left['_ASOF_DATE'].notna()
+    right = pd.DataFrame({
+        LINE_KEY: index[INDEX_KEY].to_numpy(),
+        'COMMODITY_TYPE': index[INDEX_KEY].to_numpy(),
+        'MARKET_INDEX_PRICE': pd.to_numeric(index['INDEX_VALUE']).to_numpy(dtype=float),
+        'MARKET_PRICE_DATE': pd.to_datetime(index[INDEX_DATE]).astype('datetime64[ns]').to_numpy(),
+    }).dropna(subset=['MARKET_PRICE_DATE'])
+
+    merged = pd.merge_asof(
+        left[matchable].sort_values('_ASOF_DATE', kind='stable'),
+        right.sort_values('MARKET_PRICE_DATE', kind='stable'),
+        left_on='_ASOF_DATE',
+        right_on='MARKET_PRICE_DATE',
+        by=LINE_KEY,
+        direction='backward',
+    )
+    merged = pd.concat([merged, left[~matchable]], ignore_index=True)
+    return merged.sort_values('_ROW').drop(columns=['_ROW', '_ASOF_DATE']).reset_index(drop=True)
+
+
+def price_lines(priced: pd.DataFrame, market_shift_pct: float = 0.0) -> pd.DataFrame:
+    """
+    Variance, savings and recommendation per line, as V_SHOULD_COST_ANALYSIS computes them.
+
+    Args:
+        priced: Output of asof_market_price() with ORDERED_QUANTITY and
+            CONTRACT_UNIT_PRICE
+        market_shift_pct: Scenario move of every market price, in percent
+
+    Returns:
+        Copy of priced with MARKET_INDEX_PRICE shifted and PRICE_VARIANCE,
+        PRICE_VARIANCE_PCT, POTENTIAL_SAVINGS and SHOULD_COST_RECOMMENDATION
+    """
+    result = priced.copy()
+    market = result['MARKET_INDEX_PRICE'].astype(float) * (1 + market_shift_pct / 100)
+    contract = result['CONTRACT_UNIT_PRICE'].astype(float)
+    quantity = result['ORDERED_QUANTITY'].astype(float)
+
+    # Comparisons against a missing market price are false, as NULL is in SQL
+    result['MARKET_INDEX_PRICE'] = market
+    result['PRICE_VARIANCE'] = contract - market
+    result['PRICE_VARIANCE_PCT'] = np.where(
+        market > 0, ((contract - market) / market * 100).round(2), 0.0
+    )
+    result['POTENTIAL_SAVINGS'] = np.where(contract > market, (contract - market) * quantity, 0.0)
+    result['SHOULD_COST_RECOMMENDATION'] = np.select(
+        [contract > market * RENEGOTIATE_RATIO,
+         contract > market * REVIEW_RATIO,
+         contract < market * FAVORABLE_RATIO],
+        ['RENEGOTIATE', 'REVIEW', 'FAVORABLE'],
+        default='MARKET_RATE',
+    )
+    return result
+
+
+def should_cost_by_category(lines: pd.DataFrame, index: pd.DataFrame, market_shift_pct: float = 0.0,
+                            lag_days: int = 0) -> pd.DataFrame:
+    """
+    Should-cost totals per category under a market scenario.
+
+    With no shift and no lag this matches the should_cost_by_category
+    registry query.
+
+    Args:
+        lines: Line extract (registry query should_cost_lines)
+        index: Index history (registry query commodity_index_history)
+        market_shift_pct: Move of every market price, in percent
+        lag_days: Price each line off the index this many days before its PO date
+
+    Returns:
+        DataFrame with LINE_COUNT, TOTAL_CONTRACT, TOTAL_SAVINGS,
+        AVG_CONTRACT_PRICE, AVG_MARKET_PRICE, AVG_VARIANCE_PCT and
+        RENEGOTIATE_LINES per category, largest savings first
+    """
+    priced = price_lines(asof_market_price(lines, index, lag_days=lag_days), market_shift_pct)
+    priced = priced[priced[LINE_KEY].notna()]
+    priced = priced.assign(
+        _RENEGOTIATE=(priced['SHOULD_COST_RECOMMENDATION'] == 'RENEGOTIATE').astype(int),
+    )
+    result = priced.groupby(LINE_KEY).agg(
+        LINE_COUNT=('CONTRACT_UNIT_PRICE', 'size'),
+        TOTAL_CONTRACT=('CONTRACT_TOTAL', 'sum'),
+        TOTAL_SAVINGS=('POTENTIAL_SAVINGS', 'sum'),
+        AVG_CONTRACT_PRICE=('CONTRACT_UNIT_PRICE', 'mean'),
+        AVG_MARKET_PRICE=('MARKET_INDEX_PRICE', 'mean'),
+        AVG_VARIANCE_PCT=('PRICE_VARIANCE_PCT', 'mean'),
+        RENEGOTIATE_LINES=('_RENEGOTIATE', 'sum'),
+    )
+    return result.sort_values('TOTAL_SAVINGS', ascending=False).reset_index()
+
+
+def scenario_comparison(lines: pd.DataFrame, index: pd.DataFrame, market_shift_pct: float = 0.0,
+                        lag_days: int = 0, baseline: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Baseline vs scenario savings per category.
+
+    Args:
+        lines: Line extract (registry query should_cost_lines)
+        index: Index history (registry query commodity_index_history)
+        market_shift_pct: Scenario market price move, in percent
+        lag_days: Scenario index lag in days
+        baseline: Precomputed should_cost_by_category(lines, index), if any
+
+    Returns:
+        DataFrame with BASELINE_SAVINGS, SCENARIO_SAVINGS, SAVINGS_CHANGE and
+        BASELINE/SCENARIO_RENEGOTIATE_LINES per category
+    """
+    if baseline is None:
+        baseline = should_cost_by_category(lines, index)
+    scenario = should_cost_by_category(lines, index, market_shift_pct=market_shift_pct, lag_days=lag_days)
+    result = baseline[[LINE_KEY, 'TOTAL_SAVINGS', 'RENEGOTIATE_LINES']].merge(
+        scenario[[LINE_KEY, 'TOTAL_SAVINGS', 'RENEGOTIATE_LINES']],
+        on=LINE_KEY, how='outer', suffixes=('_BASELINE', '_SCENARIO'),
+    ).fillna(0)
+    result = result.rename(columns={
+        'TOTAL_SAVINGS_BASELINE': 'BASELINE_SAVINGS',
+        'TOTAL_SAVINGS_SCENARIO': 'SCENARIO_SAVINGS',
+        'RENEGOTIATE_LINES_BASELINE': 'BASELINE_RENEGOTIATE_LINES',
+        'RENEGOTIATE_LINES_SCENARIO': 'SCENARIO_RENEGOTIATE_LINES',
+    })
+    result['SAVINGS_CHANGE'] = result['SCENARIO_SAVINGS'] - result['BASELINE_SAVINGS']
+    return result.sort_values('SCENARIO_SAVINGS', ascending=False).reset_index(drop=True)
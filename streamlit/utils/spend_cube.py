@@ -0,0 +1,100 @@
+"""
+Spend cube for Snowcore Procurement Intelligence
+The spend widgets (by region and category, supplier concentration and
+single-source risk) are computed locally from one
+pre-aggregated extract of V_SPEND_SUMMARY at region x category x supplier x
+ERP system x month grain, instead of each scanning the spend view. Monthly
+trend and YoY/QoQ comparisons read V_SPEND_MONTHLY in the warehouse instead:
+their distinct supplier counts merge HLL sketches, which pandas cannot.
+
+PO counts: PO_COUNT counts each PO once per cube cell, which is exact for
+any grouping that keeps MATERIAL_CATEGORY (a PO has one supplier, ERP system
+and date). ANCHOR_PO_COUNT counts each PO only in its first category, so it
+adds up exactly across categories.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+CUBE_DIMENSIONS = [
+    'REGION', 'MATERIAL_CATEGORY', 'SUPPLIER_CODE', 'SUPPLIER_NAME', 'ERP_SOURCE_SYSTEM', 'MONTH',
+]
+CUBE_MEASURES = ['SPEND_AMOUNT', 'LINE_COUNT', 'PO_COUNT', 'ANCHOR_PO_COUNT']
+
+CONCENTRATION_TOP_N = 20
+
+
+def spend_by_region(cube: pd.DataFrame) -> pd.DataFrame:
+    """Spend, PO and supplier counts per region, largest spend first."""
+    result = cube.groupby('REGION', dropna=False).agg(
+        TOTAL_SPEND=('SPEND_AMOUNT', 'sum'),
+        PO_COUNT=('ANCHOR_PO_COUNT', 'sum'),
+        SUPPLIER_COUNT=('SUPPLIER_CODE', 'nunique'),
+    )
+    return result.sort_values('TOTAL_SPEND', ascending=False).reset_index()
+
+
+def spend_by_category(cube: pd.DataFrame) -> pd.DataFrame:
+    """Spend and PO count per material category, largest spend first."""
+    result = cube.groupby('MATERIAL_CATEGORY', dropna=False).agg(
+        TOTAL_SPEND=('SPEND_AMOUNT', 'sum'),
+        PO_COUNT=('PO_COUNT', 'sum'),
+    )
+    return result.sort_values('TOTAL_SPEND', ascending=False).reset_index()
+
+
+def spend_concentration(cube: pd.DataFrame, top_n: int = CONCENTRATION_TOP_N) -> pd.DataFrame:
+    """
+    Pareto view of spend by supplier.
+
+    Args:
+        cube: Spend cube frame
+        top_n: Number of top suppliers to return
+
+    Returns:
+        DataFrame with each supplier's spend share and the cumulative share
+        of all suppliers ranked at or above it
+    """
+    suppliers = cube.groupby(['SUPPLIER_CODE', 'SUPPLIER_NAME'], dropna=False).agg(
+        TOTAL_SPEND=('SPEND_AMOUNT', 'sum'),
+        PO_COUNT=('ANCHOR_PO_COUNT', 'sum'),
+        CATEGORY_COUNT=('MATERIAL_CATEGORY', 'nunique'),
+    )
+    suppliers = suppliers.sort_values('TOTAL_SPEND', ascending=False, kind='stable').reset_index()
+
+    grand_total = suppliers['TOTAL_SPEND'].sum()
+    share = suppliers['TOTAL_SPEND'] / grand_total * 100
+    suppliers['SPEND_PCT'] = share.round(2)
+    suppliers['CUMULATIVE_PCT'] = share.cumsum()
+    suppliers['RANK'] = np.arange(1, len(suppliers) + 1)
+    return suppliers.head(top_n)
+
+
+def single_source_risk(cube: pd.DataFrame) -> pd.DataFrame:
+    """Supplier count per category with a concentration risk rating, riskiest first."""
+    categorized = cube[cube['MATERIAL_CATEGORY'].notna()]
+    result = categorized.groupby('MATERIAL_CATEGORY').agg(
+        SUPPLIER_COUNT=('SUPPLIER_CODE', 'nunique'),
+        TOTAL_SPEND=('SPEND_AMOUNT', 'sum'),
+    )
+
+    names = categorized[['MATERIAL_CATEGORY', 'SUPPLIER_NAME']].dropna().drop_duplicates()
+    result['SUPPLIERS'] = names.sort_values('SUPPLIER_NAME') \
+        .groupby('MATERIAL_CATEGORY')['SUPPLIER_NAME'].agg(', '.join)
+
+    counts = result['SUPPLIER_COUNT']
+    result['CONCENTRATION_RISK'] = np.select(
+        [counts == 1, counts == 2, counts <= 3],
+        ['CRITICAL', 'HIGH', 'MEDIUM'],
+        default='LOW'
+    )
+    return result.sort_values(['SUPPLIER_COUNT', 'TOTAL_SPEND'], ascending=[True, False]).reset_index()
+
+
+DERIVED_QUERIES = {
+    'spend_by_region': spend_by_region,
+    'spend_by_category': spend_by_category,
+    'spend_concentration': spend_concentration,
+    'single_source_risk': single_source_risk,
+}
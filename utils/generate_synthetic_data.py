@@ -0,0 +1,1443 @@
+"""
+Synthetic data generator for Snowcore Procurement Intelligence
+Writes the demo dataset loaded by sql/07_load_data.sql: one file per ATOMIC
+table, with the column layout of data/synthetic/*.csv and consistent keys
+between tables. Reference data (currencies, geographies, organizations,
+sites, categories, market series) is fixed. Every other table grows linearly
+with --scale, from the 1x demo size (200 suppliers, 5,000 purchase orders) to
+1000x (200,000 suppliers, ~22.5M purchase order lines) for benchmarking.
+
+Output is deterministic for a given --seed, --scale and --anchor-date. Large
+tables are generated and written in blocks of BLOCK_ROWS parent rows, so
+memory stays bounded at any scale:
+
+    python3 utils/generate_synthetic_data.py                      # 1x demo data
+    python3 utils/generate_synthetic_data.py --scale 100 --format parquet \\
+        --output-dir /tmp/snowcore_sf100
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # CSV output falls back to pandas; Parquet needs pyarrow
+    pa = None
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_OUTPUT_DIR = os.path.join(REPO_ROOT, 'data', 'synthetic')
+
+DEFAULT_SEED = 42
+DEFAULT_ANCHOR_DATE = '2025-12-21'
+MIN_SCALE = 1
+MAX_SCALE = 1000
+FORMATS = ('csv', 'parquet')
+
+# Parent rows (suppliers, products, purchase orders, ...) generated and
+# written per block; each block has its own random stream
+BLOCK_ROWS = 50_000
+
+# Core ERP history (purchase orders, demand, emissions) covers a fixed window;
+# the persona extension tables cover the same length ending at --anchor-date
+HISTORY_START = np.datetime64('2023-01-01')
+HISTORY_DAYS = 700
+
+SYSTEM_TIMESTAMP = '2020-01-01 00:00:00'
+
+# Row counts at scale 1
+BASE_SUPPLIERS = 200
+BASE_PRODUCTS = 500
+BASE_PURCHASE_ORDERS = 5_000
+BASE_DEMAND_ACTUALS = 10_000
+BASE_SUPPLIER_PRODUCTS = 1_000
+BASE_FORWARD_CONTRACTS = 300
+
+# Share of purchase order lines with a delivery performance record
+DELIVERY_RATE = 0.355
+# Share of suppliers reporting monthly CO2 records / scoped emissions
+EMISSION_SUPPLIER_SHARE = 0.5
+SCOPED_EMISSION_SUPPLIER_SHARE = 0.75
+EMISSION_PERIODS = 24
+
+
+# =============================================================================
+# Reference data
+# =============================================================================
+
+CURRENCIES = [
+    (1, 'USD', 'US Dollar', '$', 2),
+    (2, 'EUR', 'Euro', '€', 2),
+    (3, 'GBP', 'British Pound', '£', 2),
+    (4, 'JPY', 'Japanese Yen', '¥', 0),
+    (5, 'CNY', 'Chinese Yuan', '¥', 2),
+    (6, 'CHF', 'Swiss Franc', 'CHF', 2),
+    (7, 'CAD', 'Canadian Dollar', 'C$', 2),
+    (8, 'AUD', 'Australian Dollar', 'A$', 2),
+    (9, 'INR', 'Indian Rupee', '₹', 2),
+    (10, 'MXN', 'Mexican Peso', '$', 2),
+]
+
+UNITS_OF_MEASURE = [
+    (1, 'EA', 'Each', 'COUNT', True, 1.0),
+    (2, 'KG', 'Kilogram', 'WEIGHT', True, 1.0),
+    (3, 'LB', 'Pound', 'WEIGHT', False, 0.453592),
+    (4, 'MT', 'Metric Ton', 'WEIGHT', False, 1000.0),
+    (5, 'L', 'Liter', 'VOLUME', True, 1.0),
+    (6, 'GAL', 'Gallon', 'VOLUME', False, 3.78541),
+    (7, 'M', 'Meter', 'LENGTH', True, 1.0),
+    (8, 'FT', 'Foot', 'LENGTH', False, 0.3048),
+    (9, 'SQM', 'Square Meter', 'AREA', True, 1.0),
+    (10, 'BOX', 'Box', 'COUNT', False, 1.0),
+]
+
+# (id, code, name, type, parent id, ISO alpha-3, ISO alpha-2)
+GEOGRAPHIES = [
+    (1, 'AMER', 'Americas', 'REGION', None, 'USA', 'US'),
+    (2, 'EMEA', 'Europe, Middle East & Africa', 'REGION', None, 'DEU', 'DE'),
+    (3, 'APAC', 'Asia Pacific', 'REGION', None, 'CHN', 'CN'),
+    (4, 'US', 'United States', 'COUNTRY', 1, 'USA', 'US'),
+    (5, 'CA', 'Canada', 'COUNTRY', 1, 'CAN', 'CA'),
+    (6, 'MX', 'Mexico', 'COUNTRY', 1, 'MEX', 'MX'),
+    (7, 'BR', 'Brazil', 'COUNTRY', 1, 'BRA', 'BR'),
+    (8, 'DE', 'Germany', 'COUNTRY', 2, 'DEU', 'DE'),
+    (9, 'GB', 'United Kingdom', 'COUNTRY', 2, 'GBR', 'GB'),
+    (10, 'FR', 'France', 'COUNTRY', 2, 'FRA', 'FR'),
+    (11, 'IT', 'Italy', 'COUNTRY', 2, 'ITA', 'IT'),
+    (12, 'ES', 'Spain', 'COUNTRY', 2, 'ESP', 'ES'),
+    (13, 'NL', 'Netherlands', 'COUNTRY', 2, 'NLD', 'NL'),
+    (14, 'CH', 'Switzerland', 'COUNTRY', 2, 'CHE', 'CH'),
+    (15, 'CN', 'China', 'COUNTRY', 3, 'CHN', 'CN'),
+    (16, 'JP', 'Japan', 'COUNTRY', 3, 'JPN', 'JP'),
+    (17, 'KR', 'South Korea', 'COUNTRY', 3, 'KOR', 'KR'),
+    (18, 'IN', 'India', 'COUNTRY', 3, 'IND', 'IN'),
+    (19, 'AU', 'Australia', 'COUNTRY', 3, 'AUS', 'AU'),
+    (20, 'SG', 'Singapore', 'COUNTRY', 3, 'SGP', 'SG'),
+    (21, 'TW', 'Taiwan', 'COUNTRY', 3, 'TWN', 'TW'),
+]
+
+# (id, code, name, type, parent id, level, legal entity)
+ORGANIZATIONS = [
+    (1, 'SNOWCORE', 'Snowcore Industries', 'ENTERPRISE', None, 1, True),
+    (2, 'IND_COMP', 'Industrial Compression Division', 'DIVISION', 1, 2, True),
+    (3, 'BIOFLOW', 'BioFlow Division', 'DIVISION', 1, 2, True),
+    (4, 'PROC_US', 'Procurement - Americas', 'FUNCTION', 2, 3, False),
+    (5, 'PROC_EMEA', 'Procurement - EMEA', 'FUNCTION', 2, 3, False),
+    (6, 'PROC_APAC', 'Procurement - APAC', 'FUNCTION', 2, 3, False),
+    (7, 'BIOFLOW_PROC', 'BioFlow Procurement', 'FUNCTION', 3, 3, False),
+]
+
+# (id, code, name, type, organization id, geography id, street number,
+#  city, state, postal code, country, latitude, longitude, capacity)
+SITES = [
+    (1, 'PLANT-US-EAST', 'US East Manufacturing', 'PLANT', 2, 4, 754, 'Philadelphia', 'PA', 24592, 'US', 39.9526, -75.1652, 56556),
+    (2, 'PLANT-US-WEST', 'US West Manufacturing', 'PLANT', 2, 4, 859, 'Phoenix', 'AZ', 46048, 'US', 33.4484, -112.074, 114196),
+    (3, 'PLANT-DE', 'Germany Manufacturing', 'PLANT', 2, 8, 328, 'Stuttgart', 'BW', 28289, 'DE', 48.7758, 9.1829, 76868),
+    (4, 'PLANT-CN', 'China Manufacturing', 'PLANT', 2, 15, 792, 'Suzhou', 'JS', 81482, 'CN', 31.299, 120.5853, 72790),
+    (5, 'WH-US-CENTRAL', 'US Central Distribution', 'WAREHOUSE', 2, 4, 704, 'Dallas', 'TX', 65302, 'US', 32.7767, -96.797, 58331),
+    (6, 'BIOFLOW-US', 'BioFlow US Facility', 'PLANT', 3, 4, 130, 'Boston', 'MA', 22280, 'US', 42.3601, -71.0589, 107314),
+    (7, 'BIOFLOW-EU', 'BioFlow EU Facility', 'PLANT', 3, 14, 338, 'Basel', 'BS', 76237, 'CH', 47.5596, 7.5886, 56956),
+    (8, 'BIOFLOW-ASIA', 'BioFlow Asia Facility', 'PLANT', 3, 20, 674, 'Singapore', 'SG', 36062, 'SG', 1.3521, 103.8198, 192853),
+]
+LOCATIONS_PER_SITE = 5
+
+# (id, code, name, description, product base names)
+PRODUCT_CATEGORIES = [
+    (1, 'THERMAL', 'Thermal Systems', 'Industrial compression components',
+     ['Heat Exchanger', 'Compressor Unit', 'Thermal Valve', 'Cooling Assembly']),
+    (2, 'HYDRAULIC', 'Hydraulic Systems', 'Fluid power components',
+     ['Accumulator', 'Cylinder Assembly', 'Control Valve', 'Hydraulic Pump']),
+    (3, 'PNEUMATIC', 'Pneumatic Systems', 'Air compression systems',
+     ['Actuator', 'Pressure Regulator', 'Filter Unit', 'Air Compressor']),
+    (4, 'BIOROBOT', 'Bio-Robotics', 'BioFlow precision automation',
+     ['Gripper Assembly', 'Control Module', 'Sensor Array', 'Precision Arm']),
+    (5, 'REAGENT', 'Reagents & Chemicals', 'BioFlow life sciences materials',
+     ['Buffer Solution', 'Culture Medium', 'Assay Reagent', 'Enzyme Kit']),
+    (6, 'PRECISION', 'Precision Components', 'BioFlow high-tolerance parts',
+     ['Encoder', 'Micro Bearing', 'Linear Guide', 'Servo Motor']),
+    (7, 'ALLOY', 'Alloys & Metals', 'Raw material metals',
+     ['Copper Sheet', 'Stainless Steel Plate', 'Aluminum Billet', 'Titanium Bar']),
+    (8, 'POLYMER', 'Polymers & Plastics', 'Engineering plastics',
+     ['PTFE Sheet', 'Silicone Seal', 'PEEK Rod', 'Nylon Block']),
+    (9, 'ELECTRONIC', 'Electronic Components', 'Control systems',
+     ['HMI Panel', 'Power Supply', 'Sensor Module', 'PLC Controller']),
+    (10, 'PACKAGING', 'Packaging Materials', 'Shipping and containment',
+     ['Shipping Container', 'Protective Foam', 'Anti-static Bag', 'Pallet']),
+]
+PRODUCT_SIZES = ['', 'Small', 'Medium', 'Large', 'XL']
+PRODUCT_GRADES = ['', 'Standard', 'Premium', 'Industrial', 'Medical-Grade']
+
+# Supplier cities: (city, state, country, geography id, latitude, longitude)
+CITIES = [
+    ('New York', 'NY', 'US', 4, 40.7128, -74.006), ('Chicago', 'IL', 'US', 4, 41.8781, -87.6298),
+    ('Houston', 'TX', 'US', 4, 29.7604, -95.3698), ('Los Angeles', 'CA', 'US', 4, 34.0522, -118.2437),
+    ('Toronto', 'ON', 'CA', 5, 43.6532, -79.3832), ('Vancouver', 'BC', 'CA', 5, 49.2827, -123.1207),
+    ('Mexico City', 'CDMX', 'MX', 6, 19.4326, -99.1332), ('Monterrey', 'NL', 'MX', 6, 25.6866, -100.3161),
+    ('Sao Paulo', 'SP', 'BR', 7, -23.5505, -46.6333), ('Munich', 'BY', 'DE', 8, 48.1351, 11.582),
+    ('Frankfurt', 'HE', 'DE', 8, 50.1109, 8.6821), ('London', 'ENG', 'GB', 9, 51.5074, -0.1278),
+    ('Manchester', 'ENG', 'GB', 9, 53.4808, -2.2426), ('Paris', 'IDF', 'FR', 10, 48.8566, 2.3522),
+    ('Lyon', 'ARA', 'FR', 10, 45.764, 4.8357), ('Milan', 'LO', 'IT', 11, 45.4642, 9.19),
+    ('Barcelona', 'CT', 'ES', 12, 41.3851, 2.1734), ('Amsterdam', 'NH', 'NL', 13, 52.3676, 4.9041),
+    ('Zurich', 'ZH', 'CH', 14, 47.3769, 8.5417), ('Shanghai', 'SH', 'CN', 15, 31.2304, 121.4737),
+    ('Shenzhen', 'GD', 'CN', 15, 22.5431, 114.0579), ('Tokyo', 'TK', 'JP', 16, 35.6762, 139.6503),
+    ('Osaka', 'OS', 'JP', 16, 34.6937, 135.5023), ('Seoul', 'SO', 'KR', 17, 37.5665, 126.978),
+    ('Mumbai', 'MH', 'IN', 18, 19.076, 72.8777), ('Bangalore', 'KA', 'IN', 18, 12.9716, 77.5946),
+    ('Sydney', 'NSW', 'AU', 19, -33.8688, 151.2093), ('Singapore', 'SG', 'SG', 20, 1.3521, 103.8198),
+    ('Taipei', 'TPE', 'TW', 21, 25.033, 121.5654),
+]
+
+PARTY_NAME_PREFIXES = [
+    'Advanced', 'Allied', 'Alpine', 'Apex', 'Atlantic', 'Continental', 'Dynamic', 'Elite', 'Global',
+    'Integrated', 'Nordic', 'Pacific', 'Precision', 'Premier', 'Prime', 'Strategic', 'Summit',
+    'Superior', 'United',
+]
+PARTY_NAME_DOMAINS = [
+    'Alloys', 'Bio', 'Ceramic', 'Chemical', 'Composite', 'Electronic', 'Hydraulic', 'Metals',
+    'Pneumatic', 'Polymer', 'Precision', 'Thermal',
+]
+PARTY_NAME_SUFFIXES = [
+    'AG', 'Co.', 'Components', 'Corp', 'Engineering', 'GmbH', 'Group', 'Inc', 'Industries', 'Ltd',
+    'Manufacturing', 'Materials', 'Partners', 'S.A.', 'Solutions', 'Supply', 'Systems', 'Technologies',
+]
+FIRST_NAMES = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'Robert', 'Lisa', 'Wei', 'Yuki']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Chen', 'Tanaka', 'Kim']
+
+# ERP systems feeding purchase orders; BIOFLOW_* systems serve the BioFlow division
+ERP_SYSTEMS = [
+    'BAAN_PLANT_1', 'BAAN_PLANT_2', 'BAAN_PLANT_3', 'BIOFLOW_LAB_ASIA', 'BIOFLOW_LAB_EU',
+    'BIOFLOW_LAB_US', 'BIOFLOW_MANUFACTURING', 'BIOFLOW_RESEARCH', 'CUSTOM_MES_1', 'CUSTOM_MES_2',
+    'CUSTOM_WMS_1', 'DYNAMICS_AX_1', 'DYNAMICS_NAV_1', 'DYNAMICS_NAV_2', 'EPICOR_SITE_A',
+    'EPICOR_SITE_B', 'EPICOR_SITE_C', 'INFOR_DIV_1', 'INFOR_DIV_2', 'INFOR_DIV_3', 'JDE_LEGACY_1',
+    'JDE_LEGACY_2', 'JDE_LEGACY_3', 'LEGACY_AS400_1', 'LEGACY_AS400_2', 'LEGACY_MAINFRAME',
+    'NETSUITE_SUBSIDIARY_1', 'NETSUITE_SUBSIDIARY_2', 'ORACLE_AMER_HQ', 'ORACLE_APAC_HQ',
+    'ORACLE_DISTRIBUTION', 'ORACLE_EMEA_HQ', 'ORACLE_MANUFACTURING', 'QAD_FACILITY_1',
+    'QAD_FACILITY_2', 'SAGE_OFFICE_1', 'SAGE_OFFICE_2', 'SAGE_OFFICE_3', 'SAP_AUSTRALIA',
+    'SAP_CANADA', 'SAP_CHINA', 'SAP_FRANCE', 'SAP_GERMANY', 'SAP_INDIA', 'SAP_ITALY', 'SAP_JAPAN',
+    'SAP_KOREA', 'SAP_SPAIN', 'SAP_UK', 'SAP_US_CENTRAL', 'SAP_US_EAST', 'SAP_US_WEST',
+]
+
+# (commodity, index value at HISTORY_START)
+COMMODITIES = [
+    ('Thermal Systems', 2478.50), ('Hydraulic Systems', 1688.90), ('Pneumatic Systems', 1133.47),
+    ('Alloys & Metals', 3582.10), ('Polymers & Plastics', 860.13), ('Electronic Components', 148.02),
+    ('Bio-Robotics', 5807.50), ('Precision Components', 2170.03), ('Reagents & Chemicals', 442.01),
+]
+COMMODITY_WEEKS = 105
+
+# (indicator, type, starting value)
+MARKET_INDICATORS = [
+    ('Construction Starts Index', 'ECONOMIC', 97.4), ('Clinical Trial Spend ($B)', 'INDUSTRY', 2.52),
+    ('Industrial Production Index', 'ECONOMIC', 95.3), ('Manufacturing PMI', 'ECONOMIC', 49.5),
+    ('Freight Cost Index', 'ECONOMIC', 116.0), ('Steel Demand Index', 'COMMODITY', 114.0),
+    ('Semiconductor Demand Index', 'INDUSTRY', 95.0), ('Chemical Production Index', 'INDUSTRY', 102.0),
+]
+INDICATOR_WEEKS = 104
+INDICATOR_SOURCES = ['Federal Reserve', 'Census Bureau', 'Industry Association', 'ISM']
+
+FORWARD_CONTRACT_CATEGORIES = [
+    'Alloys & Metals', 'Thermal Systems', 'Polymers & Plastics', 'Reagents & Chemicals',
+    'Electronic Components',
+]
+
+SCOPE_SOURCES = {
+    'SCOPE_1': (['Fugitive emissions', 'Company vehicles', 'Direct combustion'], 5.0, 30.0),
+    'SCOPE_2': (['Purchased electricity', 'Purchased steam', 'Purchased cooling'], 10.0, 50.0),
+    'SCOPE_3': (['Supplier manufacturing', 'Transportation', 'Product use', 'End-of-life'], 50.0, 300.0),
+}
+
+# (model, algorithm)
+MODELS = [
+    ('Demand Sensing XGBoost', 'XGBoost'),
+    ('Demand Sensing RF', 'RandomForest'),
+    ('Demand Baseline Linear', 'LinearRegression'),
+]
+MODEL_VERSIONS = 5
+
+CREDIT_RATINGS = ['CCC', 'B', 'B+', 'BB-', 'BB', 'BB+', 'BBB-', 'BBB', 'BBB+', 'A-', 'A', 'A+', 'AA', 'AA+', 'AAA']
+# Lower financial health bound of each rating above CCC
+CREDIT_RATING_BOUNDS = [25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80, 85, 90]
+
+
+# =============================================================================
+# Generation context and helpers
+# =============================================================================
+
+@dataclass(frozen=True)
+class GeneratorContext:
+    """
+    Settings shared by all table generators.
+
+    Attributes:
+        seed: Base random seed
+        scale: Scale factor applied to every non-reference table
+        anchor: Last date covered by the persona extension tables
+    """
+    seed: int
+    scale: float
+    anchor: np.datetime64
+
+    def rows(self, base: int) -> int:
+        """Row count for a table with `base` rows at scale 1."""
+        return max(1, int(round(base * self.scale)))
+
+    def rng(self, stream: str, block: int = 0) -> np.random.Generator:
+        """Independent random stream per table and block, stable across runs."""
+        return np.random.default_rng([self.seed, zlib.crc32(stream.encode()), block])
+
+    @property
+    def n_suppliers(self) -> int:
+        return self.rows(BASE_SUPPLIERS)
+
+    @property
+    def n_products(self) -> int:
+        return self.rows(BASE_PRODUCTS)
+
+    @property
+    def persona_start(self) -> np.datetime64:
+        return self.anchor - np.timedelta64(HISTORY_DAYS, 'D')
+
+    @cached_property
+    def party_names(self) -> np.ndarray:
+        """Supplier legal names by SUPPLIER_ID - 1 (also used in documents)."""
+        rng = self.rng('party_name')
+        n = self.n_suppliers
+        return _join(
+            _pick(rng, PARTY_NAME_PREFIXES, n),
+            _pick(rng, PARTY_NAME_DOMAINS, n),
+            _pick(rng, PARTY_NAME_SUFFIXES, n),
+        )
+
+
+def blocks(total: int, size: int = BLOCK_ROWS) -> Iterator[tuple]:
+    """Yield (block index, 1-based ids) covering ids 1..total."""
+    for block, start in enumerate(range(0, total, size)):
+        yield block, np.arange(start + 1, min(start + size, total) + 1, dtype=np.int64)
+
+
+def _pick(rng: np.random.Generator, values: list, n: int, p: Optional[list] = None) -> np.ndarray:
+    """Draw n values uniformly (or with weights p) as a string array."""
+    return np.asarray(values)[rng.choice(len(values), size=n, p=p)]
+
+
+def _codes(prefix: str, ids: np.ndarray, width: int) -> np.ndarray:
+    """Zero-padded business keys, e.g. SUP-00001."""
+    return np.char.add(prefix, np.char.zfill(ids.astype(str), width))
+
+
+def _join(*parts: np.ndarray, sep: str = ' ') -> np.ndarray:
+    """Join string arrays element-wise, skipping empty parts."""
+    result = parts[0].astype(str)
+    for part in parts[1:]:
+        part = part.astype(str)
+        result = np.where(part == '', result, np.char.add(np.char.add(result, sep), part))
+    return result
+
+
+def _dates(start: np.datetime64, offsets: np.ndarray) -> np.ndarray:
+    """ISO dates (YYYY-MM-DD) at day offsets from start."""
+    return (start + np.asarray(offsets).astype('timedelta64[D]')).astype(str)
+
+
+def _timestamps(dates: np.ndarray, time_of_day: str = '00:00:00') -> np.ndarray:
+    """Timestamps (YYYY-MM-DD HH:MM:SS) for ISO dates."""
+    return np.char.add(dates.astype(str), ' ' + time_of_day)
+
+
+def _render(template: str, n: int, **fields) -> np.ndarray:
+    """
+    Fill a {field} template element-wise from arrays.
+
+    Args:
+        template: Text with {name} placeholders
+        n: Number of rows
+        **fields: One array (or scalar) of length n per placeholder
+
+    Returns:
+        Object array of rendered strings
+    """
+    parts = re.split(r'\{(\w+)\}', template)
+    result = pd.Series([parts[0]] * n, dtype=object)
+    for i in range(1, len(parts), 2):
+        value = fields[parts[i]]
+        if np.ndim(value) == 0:
+            value = [value] * n
+        result = result + pd.Series(value, dtype=object).astype(str).to_numpy() + parts[i + 1]
+    return result.to_numpy()
+
+
+def _scd_columns(timestamp: str = SYSTEM_TIMESTAMP) -> Dict[str, object]:
+    """Validity and audit columns shared by the ATOMIC master tables."""
+    return {
+        'VALID_FROM_TIMESTAMP': timestamp,
+        'VALID_TO_TIMESTAMP': None,
+        'IS_CURRENT_FLAG': True,
+        **_audit_columns(timestamp),
+    }
+
+
+def _audit_columns(timestamp: str = SYSTEM_TIMESTAMP) -> Dict[str, object]:
+    """CREATED_/UPDATED_ audit columns."""
+    return {
+        'CREATED_BY_USER': 'SYSTEM',
+        'CREATED_TIMESTAMP': timestamp,
+        'UPDATED_BY_USER': 'SYSTEM',
+        'UPDATED_TIMESTAMP': timestamp,
+    }
+
+
+def _frame(n: int, columns: Dict[str, object]) -> pd.DataFrame:
+    """DataFrame of n rows; scalar column values are broadcast."""
+    return pd.DataFrame(columns, index=pd.RangeIndex(n))
+
+
+# =============================================================================
+# Reference tables (fixed size)
+# =============================================================================
+
+def generate_reference(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Currencies, units of measure, geographies, organizations, sites, locations and categories."""
+    rng = ctx.rng('reference')
+
+    currency = pd.DataFrame(CURRENCIES, columns=[
+        'CURRENCY_ID', 'CURRENCY_CODE', 'CURRENCY_NAME', 'CURRENCY_SYMBOL', 'DECIMAL_PLACES'])
+    uom = pd.DataFrame(UNITS_OF_MEASURE, columns=[
+        'UNIT_OF_MEASURE_ID', 'UNIT_OF_MEASURE_CODE', 'UNIT_OF_MEASURE_NAME', 'UNIT_OF_MEASURE_CLASS',
+        'BASE_UNIT_FLAG', 'CONVERSION_FACTOR_TO_BASE'])
+    uom['UNIT_OF_MEASURE_DESCRIPTION'] = uom['UNIT_OF_MEASURE_NAME'] + ' - ' + uom['UNIT_OF_MEASURE_CLASS']
+
+    geography = pd.DataFrame(GEOGRAPHIES, columns=[
+        'GEOGRAPHY_ID', 'GEOGRAPHY_CODE', 'GEOGRAPHY_NAME', 'GEOGRAPHY_TYPE', 'PARENT_GEOGRAPHY_ID',
+        'ISO_COUNTRY_CODE', 'ISO_COUNTRY_CODE_2'])
+    geography['PARENT_GEOGRAPHY_ID'] = geography['PARENT_GEOGRAPHY_ID'].astype('Int64')
+    for column in ('ISO_REGION_CODE', 'FIPS_CODE', 'POSTAL_CODE'):
+        geography[column] = None
+
+    organization = pd.DataFrame(ORGANIZATIONS, columns=[
+        'ORGANIZATION_ID', 'ORGANIZATION_CODE', 'ORGANIZATION_NAME', 'ORGANIZATION_TYPE',
+        'PARENT_ORGANIZATION_ID', 'ORGANIZATION_LEVEL', 'LEGAL_ENTITY_FLAG'])
+    organization['PARENT_ORGANIZATION_ID'] = organization['PARENT_ORGANIZATION_ID'].astype('Int64')
+    organization['TAX_ID'] = _codes('XX-', organization['ORGANIZATION_ID'].to_numpy(), 7)
+    organization['DUNS_NUMBER'] = 860000000 + organization['ORGANIZATION_ID']
+
+    sites = pd.DataFrame(SITES, columns=[
+        'SITE_ID', 'SITE_CODE', 'SITE_NAME', 'SITE_TYPE', 'ORGANIZATION_ID', 'GEOGRAPHY_ID', 'STREET_NUMBER',
+        'CITY', 'STATE_PROVINCE', 'POSTAL_CODE', 'COUNTRY', 'LATITUDE', 'LONGITUDE', 'CAPACITY_METRIC'])
+    site = _frame(len(sites), {
+        **sites[['SITE_ID', 'SITE_CODE', 'SITE_NAME', 'SITE_TYPE', 'ORGANIZATION_ID', 'GEOGRAPHY_ID']],
+        'ADDRESS_LINE_1': sites['STREET_NUMBER'].astype(str) + ' Manufacturing Way',
+        'ADDRESS_LINE_2': None,
+        **sites[['CITY', 'STATE_PROVINCE', 'POSTAL_CODE', 'COUNTRY', 'LATITUDE', 'LONGITUDE']],
+        'OPERATING_STATUS': 'ACTIVE',
+        'CAPACITY_METRIC': sites['CAPACITY_METRIC'],
+        'CAPACITY_UNIT_OF_MEASURE': 'SQM',
+    })
+
+    n_locations = len(SITES) * LOCATIONS_PER_SITE
+    location_ids = np.arange(1, n_locations + 1)
+    site_ids = np.repeat(sites['SITE_ID'].to_numpy(), LOCATIONS_PER_SITE)
+    slot = np.tile(np.arange(1, LOCATIONS_PER_SITE + 1), len(SITES))
+    location = _frame(n_locations, {
+        'LOCATION_ID': location_ids,
+        'LOCATION_CODE': np.char.add(np.char.add(_codes('LOC-', site_ids, 2), '-'),
+                                     np.char.zfill(slot.astype(str), 3)),
+        'LOCATION_NAME': _render('Location {slot} at Site {site}', n_locations, slot=slot, site=site_ids),
+        'LOCATION_TYPE': _pick(rng, ['PRODUCTION', 'WAREHOUSE', 'SHIPPING', 'RECEIVING'], n_locations),
+        'SITE_ID': site_ids,
+        'PARENT_LOCATION_ID': None,
+        'LOCATION_LEVEL': 1,
+        'CAPACITY_METRIC': rng.integers(1000, 5000, n_locations),
+        'CAPACITY_UNIT_OF_MEASURE': 'SQM',
+        'LENGTH': rng.integers(50, 201, n_locations),
+        'WIDTH': rng.integers(30, 101, n_locations),
+        'HEIGHT': rng.integers(5, 21, n_locations),
+        'DIMENSION_UNIT_OF_MEASURE': 'M',
+    })
+
+    category = pd.DataFrame([row[:4] for row in PRODUCT_CATEGORIES], columns=[
+        'PRODUCT_CATEGORY_ID', 'PRODUCT_CATEGORY_CODE', 'CATEGORY_NAME', 'CATEGORY_DESCRIPTION'])
+    category['PARENT_CATEGORY_ID'] = None
+    category['CATEGORY_LEVEL'] = 1
+
+    tables = {
+        'currency.csv': currency,
+        'unit_of_measure.csv': uom,
+        'geography.csv': geography,
+        'organization.csv': organization,
+        'site.csv': site,
+        'location.csv': location,
+        'product_category.csv': category,
+    }
+    yield {name: frame.assign(**_scd_columns()) for name, frame in tables.items()}
+
+
+# =============================================================================
+# Supplier master and supplier-level facts (scale with the supplier count)
+# =============================================================================
+
+def generate_suppliers(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Party, address, contact, supplier, site, diversity, risk, performance and scorecards."""
+    for block, ids in blocks(ctx.n_suppliers):
+        rng = ctx.rng('supplier', block)
+        n = len(ids)
+        tax_ids = _codes('TAX', ids, 9)
+        duns = 860000000 + ids
+
+        party = _frame(n, {
+            'PARTY_ID': ids,
+            'PARTY_CODE': _codes('PARTY-', ids, 5),
+            'PARTY_TYPE': 'SUPPLIER',
+            'PARTY_NAME': ctx.party_names[ids - 1],
+            'TAX_ID': tax_ids,
+            'DUNS_NUMBER': duns,
+            **_scd_columns(),
+        })
+
+        city = rng.integers(0, len(CITIES), n)
+        cities = list(zip(*CITIES))
+        party_address = _frame(n, {
+            'PARTY_ADDRESS_ID': ids,
+            'PARTY_ID': ids,
+            'ADDRESS_TYPE': 'PRIMARY',
+            'ADDRESS_LINE_1': np.char.add(rng.integers(100, 10000, n).astype(str), ' Industrial Blvd'),
+            'ADDRESS_LINE_2': np.char.add('Suite ', rng.integers(101, 1000, n).astype(str)),
+            'ADDRESS_LINE_3': None,
+            'CITY': np.asarray(cities[0])[city],
+            'STATE_PROVINCE': np.asarray(cities[1])[city],
+            'POSTAL_CODE': rng.integers(10000, 100000, n),
+            'COUNTRY': np.asarray(cities[2])[city],
+            'GEOGRAPHY_ID': np.asarray(cities[3])[city],
+            'PRIMARY_ADDRESS_FLAG': True,
+            'LATITUDE': np.asarray(cities[4])[city],
+            'LONGITUDE': np.asarray(cities[5])[city],
+            **_scd_columns(),
+        })
+
+        phone = _render('+1-555-{exchange}-{line}', n,
+                        exchange=rng.integers(100, 1000, n), line=rng.integers(1000, 10000, n))
+        person = _frame(n, {
+            'PERSON_ID': ids,
+            'PARTY_ID': ids,
+            'FIRST_NAME': _pick(rng, FIRST_NAMES, n),
+            'LAST_NAME': _pick(rng, LAST_NAMES, n),
+            'EMAIL': _render('contact{id}@supplier.com', n, id=ids),
+            'PHONE': phone,
+            **_scd_columns(),
+        })
+
+        supplier = _frame(n, {
+            'SUPPLIER_ID': ids,
+            'SUPPLIER_CODE': _codes('SUP-', ids, 5),
+            'PARTY_ID': ids,
+            'SUPPLIER_STATUS': 'ACTIVE',
+            'SUPPLIER_TYPE': _pick(rng, ['STRATEGIC', 'PREFERRED', 'APPROVED', 'STANDARD'], n),
+            'SUPPLIER_CLASS': _pick(rng, ['A', 'B', 'C'], n),
+            'APPROVAL_DATE': _dates(np.datetime64('2020-01-01'), rng.integers(0, 1000, n)),
+            'PRIMARY_CONTACT_PERSON_ID': None,
+            'PAYMENT_TERMS': _pick(rng, ['NET30', 'NET45', 'NET60', '2/10NET30'], n),
+            'CURRENCY_ID': _pick(rng, [1, 2, 3, 5], n),
+            'TAX_IDENTIFICATION_NUMBER': tax_ids,
+            'DUNS_NUMBER': duns,
+            'CERTIFICATION_STATUS': _pick(rng, ['ISO9001', 'ISO9001,ISO14001', 'ISO9001,ISO13485', 'PENDING'], n),
+            **_scd_columns(),
+        })
+
+        supplier_site = _frame(n, {
+            'SUPPLIER_SITE_ID': ids,
+            'SUPPLIER_ID': ids,
+            'SITE_CODE': _codes('SITE-', ids, 5),
+            'SITE_NAME': 'Primary Site',
+            'PARTY_ADDRESS_ID': ids,
+            'PRIMARY_CONTACT_AT_SITE': 'Primary Contact',
+            'SITE_CAPABILITIES': _pick(rng, ['Manufacturing', 'Distribution', 'R&D', 'Assembly'], n),
+            **_scd_columns(),
+        })
+
+        yield {
+            'party.csv': party,
+            'party_address.csv': party_address,
+            'person.csv': person,
+            'supplier.csv': supplier,
+            'supplier_site.csv': supplier_site,
+            'supplier_diversity.csv': _supplier_diversity(rng, ids),
+            'marketplace_supplier_risk.csv': _supplier_risk(rng, ids),
+            'supplier_performance.csv': _supplier_performance(rng, ids),
+            'supplier_scorecard.csv': _supplier_scorecard(ctx, rng, ids),
+        }
+
+
+def _supplier_diversity(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    """Ownership flags, certified by the first applicable body."""
+    n = len(ids)
+    minority = rng.random(n) < 0.155
+    women = rng.random(n) < 0.105
+    veteran = rng.random(n) < 0.04
+    small = rng.random(n) < 0.215
+    certification = np.select(
+        [minority, women, veteran, small],
+        [_pick(rng, ['MBE', 'NMSDC'], n), _pick(rng, ['WBE', 'WBENC'], n),
+         np.full(n, 'SDVOSB'), _pick(rng, ['SBA 8(a)', 'SDB', 'HUBZone'], n)],
+        default='',
+    )
+    return _frame(n, {
+        'SUPPLIER_DIVERSITY_ID': ids,
+        'SUPPLIER_ID': ids,
+        'IS_MINORITY_OWNED': minority,
+        'IS_WOMEN_OWNED': women,
+        'IS_VETERAN_OWNED': veteran,
+        'IS_SMALL_BUSINESS': small,
+        'DIVERSITY_CERTIFICATION': np.where(certification == '', None, certification),
+    })
+
+
+def _supplier_risk(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    """Third-party risk assessment as of 2025-01-01."""
+    n = len(ids)
+    financial = np.clip(rng.normal(66, 20, n), 10, 100).round(2)
+    geopolitical = rng.uniform(40, 95, n).round(2)
+    esg = np.clip(rng.normal(65, 18, n), 10, 100)
+    supply_chain = np.clip(rng.normal(60, 20, n), 10, 100).round(2)
+    composite = (financial + geopolitical + supply_chain) / 3
+    timestamp = '2025-01-01 00:00:00'
+    return _frame(n, {
+        'RISK_ID': ids,
+        'SUPPLIER_ID': ids,
+        'ASSESSMENT_DATE': '2025-01-01',
+        'FINANCIAL_HEALTH_SCORE': financial,
+        'CREDIT_RATING': np.asarray(CREDIT_RATINGS)[np.digitize(financial, CREDIT_RATING_BOUNDS)],
+        'BANKRUPTCY_PROBABILITY': np.clip((100 - financial) / 1000 + rng.normal(0, 0.01, n), 0.0001, 0.1).round(6),
+        'GEOPOLITICAL_RISK_LEVEL': np.where(geopolitical >= 70, 'LOW', 'MEDIUM'),
+        'GEOPOLITICAL_RISK_SCORE': geopolitical,
+        'ESG_SCORE': esg.round(2),
+        'ENVIRONMENTAL_SCORE': (esg + rng.normal(0, 6, n)).round(2),
+        'SOCIAL_SCORE': (esg + rng.normal(0, 6, n)).round(2),
+        'GOVERNANCE_SCORE': (esg + rng.normal(0, 6, n)).round(2),
+        'CYBER_RISK_SCORE': np.clip(rng.normal(72, 15, n), 10, 100).round(2),
+        'SUPPLY_CHAIN_RISK_SCORE': supply_chain,
+        'OVERALL_RISK_RATING': np.select([financial < 40, composite >= 70], ['HIGH', 'LOW'], default='MEDIUM'),
+        'DATA_SOURCE': _pick(rng, ["Moody's", 'S&P', 'D&B', 'Sustainalytics'], n),
+        'VALID_FROM_TIMESTAMP': timestamp,
+        'VALID_TO_TIMESTAMP': None,
+        'IS_CURRENT_FLAG': True,
+        'CREATED_TIMESTAMP': timestamp,
+    })
+
+
+def _supplier_performance(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    """2024-Q4 KPI values, one row per supplier and metric."""
+    metrics = ['ON_TIME_DELIVERY', 'QUALITY_ACCEPTANCE', 'PRICE_VARIANCE', 'LEAD_TIME_ADHERENCE', 'OVERALL_SCORE']
+    n = len(ids) * len(metrics)
+    metric = np.tile(metrics, len(ids))
+    is_variance = metric == 'PRICE_VARIANCE'
+    value = np.where(is_variance, rng.uniform(-10, 10, n), rng.uniform(70, 100, n)).round(2)
+    # Price variance is graded on its distance from zero
+    score = np.where(is_variance, 100 - 3 * np.abs(value), value)
+    first_id = (ids[0] - 1) * len(metrics) + 1
+    return _frame(n, {
+        'SUPPLIER_PERFORMANCE_ID': np.arange(first_id, first_id + n),
+        'SUPPLIER_ID': np.repeat(ids, len(metrics)),
+        'EVALUATION_PERIOD': '2024-Q4',
+        'METRIC_TYPE': metric,
+        'METRIC_VALUE': value,
+        'TARGET_VALUE': np.where(is_variance, 0, 95),
+        'RATING': np.asarray(['D', 'C', 'B', 'A'])[np.digitize(score, [80, 87, 94])],
+        'COMMENTS': None,
+        **_audit_columns('2025-01-01 00:00:00'),
+    })
+
+
+def _supplier_scorecard(ctx: GeneratorContext, rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    """Quarterly scorecards over the persona window."""
+    quarters = 8
+    n = len(ids) * quarters
+    evaluation_dates = _dates(ctx.persona_start, 10 + 90 * np.arange(quarters))
+    scores = {
+        name: np.clip(rng.normal(mean, 10, n), 30, 100).round(2)
+        for name, mean in (('QUALITY_SCORE', 80), ('DELIVERY_SCORE', 75),
+                           ('PRICE_SCORE', 70), ('RESPONSIVENESS_SCORE', 77))
+    }
+    overall = (0.3 * scores['QUALITY_SCORE'] + 0.3 * scores['DELIVERY_SCORE']
+               + 0.2 * scores['PRICE_SCORE'] + 0.2 * scores['RESPONSIVENESS_SCORE'])
+    first_id = (ids[0] - 1) * quarters + 1
+    return _frame(n, {
+        'SCORECARD_ID': np.arange(first_id, first_id + n),
+        'SUPPLIER_ID': np.tile(ids, quarters),
+        'EVALUATION_DATE': np.repeat(evaluation_dates, len(ids)),
+        **scores,
+        'OVERALL_SCORE': overall.round(2),
+        'LEAD_TIME_VARIANCE_DAYS': np.clip(rng.exponential(2.4, n), 0, 9.99).round(2),
+        'INVOICE_ACCURACY_PCT': np.clip(rng.normal(96, 2.5, n), 87, 100).round(2),
+    })
+
+
+def generate_supplier_documents(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """One to three contracts, audits or compliance certificates per supplier."""
+    next_id = 1
+    for block, supplier_ids in blocks(ctx.n_suppliers):
+        rng = ctx.rng('supplier_document', block)
+        counts = rng.integers(1, 4, len(supplier_ids))
+        supplier = np.repeat(supplier_ids, counts)
+        n = len(supplier)
+        ids = np.arange(next_id, next_id + n)
+        next_id += n
+
+        doc_type = _pick(rng, ['CONTRACT', 'AUDIT', 'COMPLIANCE', 'REGULATORY'], n)
+        names = ctx.party_names[supplier - 1]
+        effective_offset = rng.integers(0, 366, n)
+        effective = _dates(HISTORY_START, effective_offset)
+        expiration = _dates(HISTORY_START, effective_offset + rng.integers(365, 1096, n))
+
+        title = np.empty(n, dtype=object)
+        summary = np.empty(n, dtype=object)
+        content = np.empty(n, dtype=object)
+        for kind, render in DOCUMENT_TEMPLATES.items():
+            mask = np.isin(doc_type, kind)
+            if mask.any():
+                title[mask], summary[mask], content[mask] = render(
+                    rng, int(mask.sum()), names[mask], effective[mask], expiration[mask])
+
+        created = _timestamps(effective)
+        yield {'supplier_document.csv': _frame(n, {
+            'DOCUMENT_ID': ids,
+            'SUPPLIER_ID': supplier,
+            'DOCUMENT_TYPE': doc_type,
+            'DOCUMENT_TITLE': title,
+            'DOCUMENT_CONTENT': content,
+            'DOCUMENT_SUMMARY': summary,
+            'EFFECTIVE_DATE': effective,
+            'EXPIRATION_DATE': expiration,
+            'DOCUMENT_STATUS': 'ACTIVE',
+            'FILE_PATH': _render('/documents/{type}/{supplier}/{id}.pdf', n,
+                                 type=np.char.lower(doc_type), supplier=supplier, id=ids),
+            'FILE_SIZE_BYTES': rng.integers(50_000, 500_000, n),
+            'CREATED_BY_USER': 'SYSTEM',
+            'CREATED_TIMESTAMP': created,
+            'UPDATED_BY_USER': 'SYSTEM',
+            'UPDATED_TIMESTAMP': created,
+        })}
+
+
+CONTRACT_TEMPLATE = """MASTER SUPPLY AGREEMENT
+
+This Agreement is entered into between Snowcore Industries ("Buyer") and {name} ("Supplier").
+
+1. TERM: This agreement shall be effective for a period of {years} years from {effective}.
+
+2. PRICING:
+   - Base unit price: ${price} per unit
+   - Annual price adjustment: Maximum {adjustment}% based on commodity index
+   - Volume discounts: {discount}% for orders exceeding {volume} units
+
+3. PAYMENT TERMS: Net {net} days from invoice date
+
+4. DELIVERY:
+   - Lead time: {lead_time} days from PO receipt
+   - Delivery terms: {incoterm}
+   - On-time delivery target: {otd}%
+
+5. QUALITY:
+   - Acceptance rate target: {acceptance}%
+   - Inspection requirements: {inspection}
+   - Warranty period: {warranty} months
+
+6. INDEMNIFICATION:
+   Supplier shall indemnify Buyer against all claims arising from:
+   - Product defects
+   - Intellectual property infringement
+   - Regulatory non-compliance
+   - Environmental violations
+
+7. FORCE MAJEURE:
+   Neither party shall be liable for delays caused by events beyond reasonable control,
+   including but not limited to: natural disasters, war, pandemic, government actions.
+
+8. TERMINATION:
+   Either party may terminate with {notice} days written notice.
+   Immediate termination permitted for material breach.
+
+Signed: _______________ Date: _______________"""
+
+AUDIT_TEMPLATE = """SUPPLIER QUALITY AUDIT REPORT
+
+Supplier: {name}
+Audit Date: {effective}
+Audit Type: {audit_type}
+Auditor: Auditor-{auditor}
+
+EXECUTIVE SUMMARY:
+Overall Rating: {rating}
+Previous Rating: {previous_rating}
+
+FINDINGS:
+
+1. Quality Management System
+   - ISO 9001 Certification: {iso}
+   - Document Control: {document_control}
+   - Corrective Action Process: {corrective_action}
+
+2. Manufacturing Process
+   - Process Capability: Cpk: {cpk}
+   - Equipment Calibration: {calibration}
+   - Statistical Process Control: {spc}
+
+3. Supply Chain
+   - Sub-supplier Management: {sub_supplier}
+   - Traceability: {traceability}
+   - Inventory Management: {inventory}
+
+4. Environmental & Safety
+   - Environmental Compliance: {environmental}
+   - Safety Record: {incidents} incidents in past year
+   - Waste Management: {waste}
+
+CORRECTIVE ACTIONS REQUIRED:
+- Item 1: {corrective_item}
+
+NEXT AUDIT SCHEDULED: {next_audit}"""
+
+CERTIFICATE_TEMPLATE = """REGULATORY COMPLIANCE CERTIFICATE
+
+Certificate Number: CERT-{certificate}
+Issued To: {name}
+Effective Date: {effective}
+Expiration Date: {expiration}
+
+CERTIFICATIONS HELD:
+- ISO 9001:2015 Quality Management: {iso9001}
+- ISO 14001:2015 Environmental Management: {iso14001}
+- ISO 13485:2016 Medical Devices: {iso13485}
+- FDA Registration Number: {fda}
+- CE Marking: {ce}
+
+COMPLIANCE STATUS:
+- GMP Compliance: {gmp}
+- REACH Compliance: {reach}
+- RoHS Compliance: {rohs}
+- Conflict Minerals: {conflict_minerals}
+
+RECENT INSPECTIONS:
+Last FDA Inspection: {inspection_date}
+Inspection Result: {inspection_result}
+Form 483 Observations: {observations}
+
+WARNING LETTERS:
+No warning letters on file
+
+This certificate confirms that {name} maintains compliance with
+applicable regulatory requirements for the supply of {supply}."""
+
+_RATINGS = ['Excellent', 'Good', 'Adequate', 'Needs Improvement']
+_CERTIFICATION = ['Certified', 'Pending', 'N/A']
+_COMPLIANCE = ['Compliant', 'Conditional', 'In Progress', 'Exempt', 'N/A']
+
+
+def _contract(rng, n, names, effective, expiration):
+    title = _render('Master Supply Agreement - {name}', n, name=names)
+    summary = _render('Supply agreement with {name} covering pricing, delivery, quality, '
+                      'and indemnification terms.', n, name=names)
+    content = _render(
+        CONTRACT_TEMPLATE, n, name=names, effective=effective,
+        years=rng.integers(1, 6, n),
+        price=rng.uniform(50, 5000, n).round(2),
+        adjustment=rng.integers(2, 9, n),
+        discount=rng.integers(5, 16, n),
+        volume=rng.integers(500, 10000, n),
+        net=_pick(rng, ['30', '45', '60'], n),
+        lead_time=rng.integers(14, 61, n),
+        incoterm=_pick(rng, ['FOB', 'CIF', 'DDP', 'EXW'], n),
+        otd=rng.integers(90, 100, n),
+        acceptance=rng.integers(95, 100, n),
+        inspection=_pick(rng, ['Incoming', 'Source', 'Both'], n),
+        warranty=rng.integers(12, 37, n),
+        notice=rng.integers(30, 121, n),
+    )
+    return title, summary, content
+
+
+def _audit(rng, n, names, effective, expiration):
+    title = _render('Quality Audit Report - {name}', n, name=names)
+    summary = _render('Quality audit findings for {name} covering QMS, manufacturing, and compliance.',
+                      n, name=names)
+    content = _render(
+        AUDIT_TEMPLATE, n, name=names, effective=effective,
+        audit_type=_pick(rng, ['Routine', 'For-Cause', 'Qualification'], n),
+        auditor=rng.integers(1, 51, n),
+        rating=_pick(rng, ['A', 'B', 'C', 'D'], n),
+        previous_rating=_pick(rng, ['A', 'B', 'C', 'D'], n),
+        iso=_pick(rng, ['Certified', 'Pending', 'Expired'], n),
+        document_control=_pick(rng, _RATINGS, n),
+        corrective_action=_pick(rng, _RATINGS, n),
+        cpk=rng.uniform(0.9, 2.0, n).round(2),
+        calibration=_pick(rng, ['Current', 'Past Due'], n),
+        spc=_pick(rng, ['Full', 'Partial', 'None'], n),
+        sub_supplier=_pick(rng, _RATINGS, n),
+        traceability=_pick(rng, ['Full', 'Partial'], n),
+        inventory=_pick(rng, _RATINGS, n),
+        environmental=_pick(rng, ['Compliant', 'Non-Compliant'], n, p=[0.85, 0.15]),
+        incidents=rng.integers(0, 6, n),
+        waste=_pick(rng, _RATINGS, n),
+        corrective_item=_pick(rng, ['None required', 'Update calibration schedule',
+                                    'Improve lot traceability', 'Close open CAPAs'], n),
+        next_audit=(effective.astype('datetime64[D]') + np.timedelta64(365, 'D')).astype(str),
+    )
+    return title, summary, content
+
+
+def _certificate(rng, n, names, effective, expiration):
+    title = _render('Regulatory Compliance Certificate - {name}', n, name=names)
+    summary = _render('Regulatory compliance status for {name} including FDA, ISO, and GMP certifications.',
+                      n, name=names)
+    has_fda = rng.random(n) < 0.5
+    content = _render(
+        CERTIFICATE_TEMPLATE, n, name=names, effective=effective, expiration=expiration,
+        certificate=rng.integers(100000, 1000000, n),
+        iso9001=_pick(rng, _CERTIFICATION, n),
+        iso14001=_pick(rng, _CERTIFICATION, n),
+        iso13485=_pick(rng, _CERTIFICATION, n),
+        fda=np.where(has_fda, np.char.add('FDA-', rng.integers(1000000, 10000000, n).astype(str)), 'N/A'),
+        ce=_pick(rng, _CERTIFICATION, n),
+        gmp=_pick(rng, _COMPLIANCE[:3], n),
+        reach=_pick(rng, _COMPLIANCE, n),
+        rohs=_pick(rng, _COMPLIANCE, n),
+        conflict_minerals=_pick(rng, _COMPLIANCE, n),
+        inspection_date=(effective.astype('datetime64[D]') - rng.integers(30, 365, n).astype('timedelta64[D]')).astype(str),
+        inspection_result=_pick(rng, ['NAI', 'VAI', 'OAI'], n, p=[0.6, 0.3, 0.1]),
+        observations=rng.integers(0, 6, n),
+        supply=_pick(rng, ['precision components', 'reagents', 'industrial equipment', 'raw materials'], n),
+    )
+    return title, summary, content
+
+
+# Document types -> renderer(rng, n, names, effective, expiration) -> (title, summary, content)
+DOCUMENT_TEMPLATES: Dict[tuple, Callable] = {
+    ('CONTRACT',): _contract,
+    ('AUDIT',): _audit,
+    ('COMPLIANCE', 'REGULATORY'): _certificate,
+}
+
+
+def generate_forward_contracts(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Forward buy contracts starting around --anchor-date."""
+    for block, ids in blocks(ctx.rows(BASE_FORWARD_CONTRACTS)):
+        rng = ctx.rng('forward_contract', block)
+        n = len(ids)
+        start = rng.integers(-335, 263, n)
+        yield {'forward_contract.csv': _frame(n, {
+            'CONTRACT_ID': ids,
+            'SUPPLIER_ID': rng.integers(1, ctx.n_suppliers + 1, n),
+            'MATERIAL_CATEGORY': _pick(rng, FORWARD_CONTRACT_CATEGORIES, n),
+            'CONTRACT_START_DATE': _dates(ctx.anchor, start),
+            'CONTRACT_END_DATE': _dates(ctx.anchor, start + rng.integers(90, 731, n)),
+            'CONTRACTED_QUANTITY': rng.integers(1000, 50000, n),
+            'CONTRACTED_PRICE': rng.uniform(50, 5000, n).round(2),
+            'UTILIZATION_PCT': rng.uniform(0.4, 1.0, n).round(4),
+        })}
+
+
+def generate_emissions(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Monthly CO2 records (core history) and scope 1-3 emissions (persona window)."""
+    periods = np.arange(EMISSION_PERIODS)
+
+    emitters = int(round(ctx.n_suppliers * EMISSION_SUPPLIER_SHARE))
+    for block, suppliers in blocks(emitters, BLOCK_ROWS // EMISSION_PERIODS):
+        rng = ctx.rng('emission_record', block)
+        n = len(suppliers) * EMISSION_PERIODS
+        quantity = rng.uniform(50, 500, n).round(2)
+        first_id = (suppliers[0] - 1) * EMISSION_PERIODS + 1
+        yield {'emission_record.csv': _frame(n, {
+            'EMISSION_RECORD_ID': np.arange(first_id, first_id + n),
+            'RECORD_DATE': np.tile(_dates(HISTORY_START, 30 * periods), len(suppliers)),
+            'SITE_ID': None,
+            'SUPPLIER_ID': np.repeat(suppliers, EMISSION_PERIODS),
+            'EMISSION_SOURCE': _pick(rng, ['Manufacturing', 'Transportation', 'Facilities'], n),
+            'POLLUTANT_NAME': 'CO2',
+            'EMISSION_QUANTITY': quantity,
+            'EMISSION_UNIT_OF_MEASURE_ID': 4,
+            'PERMIT_LIMIT': (quantity * rng.uniform(1.05, 1.5, n)).round(2),
+            'IS_WITHIN_PERMIT_LIMIT_FLAG': True,
+            'MEASUREMENT_METHOD': _pick(rng, ['Direct Measurement', 'Calculated', 'Estimated'], n),
+        })}
+
+    scopes = list(SCOPE_SOURCES)
+    per_supplier = EMISSION_PERIODS * len(scopes)
+    reporters = int(round(ctx.n_suppliers * SCOPED_EMISSION_SUPPLIER_SHARE))
+    for block, suppliers in blocks(reporters, BLOCK_ROWS // per_supplier):
+        rng = ctx.rng('scope_emissions', block)
+        n = len(suppliers) * per_supplier
+        scope = np.tile(scopes, len(suppliers) * EMISSION_PERIODS)
+        source = np.empty(n, dtype=object)
+        quantity = np.empty(n)
+        for name, (sources, low, high) in SCOPE_SOURCES.items():
+            mask = scope == name
+            source[mask] = _pick(rng, sources, int(mask.sum()))
+            quantity[mask] = rng.uniform(low, high, int(mask.sum()))
+        first_id = (suppliers[0] - 1) * per_supplier + 1
+        record_dates = np.repeat(_dates(ctx.persona_start, 30 * periods), len(scopes))
+        yield {'scope_emissions.csv': _frame(n, {
+            'EMISSION_SCOPED_ID': np.arange(first_id, first_id + n),
+            'RECORD_DATE': np.tile(record_dates, len(suppliers)),
+            'SUPPLIER_ID': np.repeat(suppliers, per_supplier),
+            'SCOPE_TYPE': scope,
+            'EMISSION_QUANTITY_MT': quantity.round(4),
+            'EMISSION_SOURCE': source,
+        })}
+
+
+# =============================================================================
+# Products (scale with the product count)
+# =============================================================================
+
+def generate_products(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Products, standard costs, inventory balances and demand actuals."""
+    codes = np.asarray([row[1][:3] for row in PRODUCT_CATEGORIES])
+    category_codes = np.asarray([row[1] for row in PRODUCT_CATEGORIES])
+    bases = np.asarray([row[4] for row in PRODUCT_CATEGORIES])
+    for block, ids in blocks(ctx.n_products):
+        rng = ctx.rng('product', block)
+        n = len(ids)
+        category = rng.integers(0, len(PRODUCT_CATEGORIES), n)
+        names = _join(bases[category, rng.integers(0, bases.shape[1], n)],
+                      _pick(rng, PRODUCT_SIZES, n), _pick(rng, PRODUCT_GRADES, n))
+
+        product = _frame(n, {
+            'PRODUCT_ID': ids,
+            'PRODUCT_CODE': np.char.add(np.char.add(codes[category], '-'), np.char.zfill(ids.astype(str), 6)),
+            'PRODUCT_NAME': names,
+            'PRODUCT_DESCRIPTION_SHORT': np.char.add(names, ' for industrial applications'),
+            'PRODUCT_DESCRIPTION_LONG': _render(
+                'Detailed specification for {name}. Category: {category}. Compliant with industry standards.',
+                n, name=names, category=category_codes[category]),
+            'PRODUCT_TYPE': 'MATERIAL',
+            'PRODUCT_STATUS': 'ACTIVE',
+            'BASE_UNIT_OF_MEASURE_ID': 1,
+            'MAKE_BUY_INDICATOR': _pick(rng, ['BUY', 'MAKE'], n, p=[2 / 3, 1 / 3]),
+            'PRODUCT_CATEGORY_ID': category + 1,
+            'OWNING_ORGANIZATION_ID': 1,
+            **_scd_columns(),
+        })
+
+        material = rng.uniform(50, 2000, n).round(2)
+        labor = rng.uniform(10, 500, n).round(2)
+        overhead = rng.uniform(5, 200, n).round(2)
+        product_cost = _frame(n, {
+            'PRODUCT_COST_ID': ids,
+            'PRODUCT_ID': ids,
+            'SITE_ID': rng.integers(1, len(SITES) + 1, n),
+            'COST_TYPE': 'STANDARD',
+            'MATERIAL_COST': material,
+            'LABOR_COST': labor,
+            'OVERHEAD_COST': overhead,
+            'TOTAL_COST': (material + labor + overhead).round(2),
+            'CURRENCY_ID': 1,
+            'COSTING_METHOD': 'STANDARD',
+            'EFFECTIVE_DATE': '2024-01-01',
+            **_scd_columns('2024-01-01 00:00:00'),
+        })
+
+        # Two inventory lots per product at scale-independent density
+        lots = 2 * n
+        lot_ids = np.arange(2 * ids[0] - 1, 2 * ids[0] - 1 + lots)
+        site = rng.integers(1, len(SITES) + 1, lots)
+        inventory_balance = _frame(lots, {
+            'INVENTORY_BALANCE_ID': lot_ids,
+            'PRODUCT_ID': rng.integers(1, ctx.n_products + 1, lots),
+            'SITE_ID': site,
+            'LOCATION_ID': (site - 1) * LOCATIONS_PER_SITE + rng.integers(1, LOCATIONS_PER_SITE + 1, lots),
+            'LOT_ID': lot_ids,
+            'INVENTORY_STATUS': _pick(rng, ['AVAILABLE', 'RESERVED', 'QC_HOLD'], lots),
+            'QUANTITY_ON_HAND': rng.integers(0, 1001, lots),
+            'UNIT_OF_MEASURE_ID': 1,
+            'LAST_TRANSACTION_DATE': '2025-01-10 12:00:00',
+        })
+
+        yield {
+            'product.csv': product,
+            'product_cost.csv': product_cost,
+            'inventory_balance.csv': inventory_balance,
+        }
+
+    for block, ids in blocks(ctx.rows(BASE_DEMAND_ACTUALS)):
+        rng = ctx.rng('demand_actual', block)
+        n = len(ids)
+        yield {'demand_actual.csv': _frame(n, {
+            'DEMAND_ACTUAL_ID': ids,
+            'PRODUCT_ID': rng.integers(1, ctx.n_products + 1, n),
+            'SITE_ID': rng.integers(1, len(SITES) + 1, n),
+            'DEMAND_DATE': _dates(HISTORY_START, rng.integers(0, HISTORY_DAYS + 1, n)),
+            'ACTUAL_QUANTITY': rng.integers(1, 501, n),
+            'ACTUAL_UNIT_OF_MEASURE_ID': 1,
+            'DEMAND_SOURCE': _pick(rng, ['Production', 'MRO', 'Project', 'Stock'], n),
+        })}
+
+
+def generate_supplier_products(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Supplier catalogue entries (supplier x product price and lead time)."""
+    for block, ids in blocks(ctx.rows(BASE_SUPPLIER_PRODUCTS)):
+        rng = ctx.rng('supplier_product', block)
+        n = len(ids)
+        yield {'supplier_product.csv': _frame(n, {
+            'SUPPLIER_PRODUCT_ID': ids,
+            'SUPPLIER_ID': rng.integers(1, ctx.n_suppliers + 1, n),
+            'PRODUCT_ID': rng.integers(1, ctx.n_products + 1, n),
+            'SUPPLIER_PART_NUMBER': _codes('SP-', ids, 8),
+            'SUPPLIER_PRODUCT_DESCRIPTION': _render('Supplier Part {id}', n, id=ids),
+            'LEAD_TIME_DAYS': rng.integers(7, 61, n),
+            'MINIMUM_ORDER_QUANTITY': rng.integers(1, 101, n),
+            'ORDER_MULTIPLE': rng.integers(1, 11, n),
+            'UNIT_PRICE': rng.uniform(10, 5000, n).round(2),
+            'PRICE_UNIT_OF_MEASURE_ID': 1,
+            'CURRENCY_ID': rng.integers(1, 4, n),
+            'PREFERRED_SUPPLIER_FLAG': rng.random(n) < 0.3,
+            'EFFECTIVE_DATE': '2023-01-01',
+            **_scd_columns('2023-01-01 00:00:00'),
+        })}
+
+
+# =============================================================================
+# Purchase orders (scale with the purchase order count)
+# =============================================================================
+
+def generate_purchase_orders(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Purchase orders, their 1-8 lines and delivery performance records for a share of lines."""
+    erp_systems = np.asarray(ERP_SYSTEMS)
+    erp_prefixes = np.asarray([name[:3] for name in ERP_SYSTEMS])
+    next_line_id = 1
+    next_delivery_id = 1
+    for block, ids in blocks(ctx.rows(BASE_PURCHASE_ORDERS)):
+        rng = ctx.rng('purchase_order', block)
+        n = len(ids)
+        order_offset = rng.integers(0, HISTORY_DAYS + 1, n)
+        order_date = _dates(HISTORY_START, order_offset)
+        order_timestamp = _timestamps(order_date)
+        supplier = rng.integers(1, ctx.n_suppliers + 1, n)
+        erp = rng.integers(0, len(ERP_SYSTEMS), n)
+
+        # Lines
+        lines_per_order = rng.integers(1, 9, n)
+        m = int(lines_per_order.sum())
+        order_index = np.repeat(np.arange(n), lines_per_order)
+        line_ids = np.arange(next_line_id, next_line_id + m)
+        next_line_id += m
+        line_number = np.arange(m) - np.repeat(np.cumsum(lines_per_order) - lines_per_order, lines_per_order) + 1
+        product = rng.integers(1, ctx.n_products + 1, m)
+        quantity = rng.integers(10, 1001, m)
+        unit_price = rng.uniform(10, 5000, m).round(2)
+        extended = (quantity * unit_price).round(2)
+        need_by_offset = order_offset[order_index] + rng.integers(14, 91, m)
+        promised_offset = need_by_offset + rng.integers(-7, 8, m)
+
+        purchase_order_line = _frame(m, {
+            'PURCHASE_ORDER_LINE_ID': line_ids,
+            'PURCHASE_ORDER_ID': ids[order_index],
+            'LINE_NUMBER': line_number,
+            'PURCHASE_REQUISITION_LINE_ID': None,
+            'PRODUCT_ID': product,
+            'ITEM_DESCRIPTION': _render('Product {id}', m, id=product),
+            'SUPPLIER_PART_NUMBER': _render('SUP-PART-{id}', m, id=product),
+            'ORDERED_QUANTITY': quantity,
+            'ORDERED_UNIT_OF_MEASURE_ID': 1,
+            'UNIT_PRICE': unit_price,
+            'EXTENDED_PRICE': extended,
+            'NEED_BY_DATE': _dates(HISTORY_START, need_by_offset),
+            'PROMISED_DELIVERY_DATE': _dates(HISTORY_START, promised_offset),
+            'LINE_STATUS': _pick(rng, ['OPEN', 'RECEIVED', 'CLOSED', 'CANCELLED'], m),
+            'RECEIVED_QUANTITY': np.where(rng.random(m) < 0.8, quantity, 0),
+            'INVOICED_QUANTITY': np.where(rng.random(m) < 0.7, quantity, 0),
+            'TAX_CODE': 'TAX1',
+            'TAX_AMOUNT': (extended * 0.08).round(2),
+            'GENERAL_LEDGER_ACCOUNT_CODE': '5000-00',
+        })
+
+        purchase_order = _frame(n, {
+            'PURCHASE_ORDER_ID': ids,
+            'PURCHASE_ORDER_NUMBER': _render('PO-{prefix}-{id}', n, prefix=erp_prefixes[erp],
+                                             id=np.char.zfill(ids.astype(str), 8)),
+            'PURCHASE_ORDER_DATE': order_date,
+            'REVISION_NUMBER': 0,
+            'SUPPLIER_ID': supplier,
+            'SUPPLIER_SITE_ID': None,
+            'BUYER_EMPLOYEE_ID': rng.integers(1, 101, n),
+            'PURCHASE_ORDER_TYPE': _pick(rng, ['STANDARD', 'BLANKET', 'CONTRACT'], n),
+            'PURCHASE_ORDER_STATUS': _pick(rng, ['OPEN', 'APPROVED', 'CLOSED', 'CANCELLED'], n),
+            'CURRENCY_ID': _pick(rng, [1, 2, 3, 5], n),
+            'PAYMENT_TERMS': _pick(rng, ['NET30', 'NET45', 'NET60'], n),
+            'SHIPPING_TERMS': _pick(rng, ['FOB', 'CIF', 'DDP', 'EXW'], n),
+            'SHIP_TO_SITE_ID': rng.integers(1, len(SITES) + 1, n),
+            'SHIP_TO_LOCATION_ID': None,
+            'BILL_TO_ORGANIZATION_ID': rng.integers(1, len(ORGANIZATIONS) + 1, n),
+            'TOTAL_PURCHASE_ORDER_VALUE': np.bincount(order_index, weights=extended, minlength=n).round(2),
+            'VENDOR_REFERENCE_NUMBER': _codes('VR-', ids, 8),
+            'ERP_SOURCE_SYSTEM': erp_systems[erp],
+            'VALID_FROM_TIMESTAMP': order_timestamp,
+            'VALID_TO_TIMESTAMP': None,
+            'IS_CURRENT_FLAG': True,
+            'CREATED_BY_USER': 'SYSTEM',
+            'CREATED_TIMESTAMP': order_timestamp,
+            'UPDATED_BY_USER': 'SYSTEM',
+            'UPDATED_TIMESTAMP': order_timestamp,
+        })
+
+        # Deliveries against a share of the lines, dated in the persona window
+        delivered_lines = np.flatnonzero(rng.random(m) < DELIVERY_RATE)
+        d = len(delivered_lines)
+        days_late = np.clip(np.round(rng.normal(0, 4, d)), -10, 14).astype(np.int64)
+        promised = rng.integers(0, HISTORY_DAYS + 1, d)
+        requested = rng.integers(50, 501, d)
+        short = rng.random(d) < 0.1
+        delivered = np.where(short, np.floor(requested * rng.uniform(0.69, 0.99, d)), requested).astype(np.int64)
+        on_time = days_late <= 0
+        in_full = delivered >= requested
+        promised_date = _dates(ctx.persona_start, promised)
+        delivery_performance = _frame(d, {
+            'DELIVERY_ID': np.arange(next_delivery_id, next_delivery_id + d),
+            'PURCHASE_ORDER_LINE_ID': line_ids[delivered_lines],
+            'SUPPLIER_ID': supplier[order_index[delivered_lines]],
+            'PROMISED_DATE': promised_date,
+            'ACTUAL_DELIVERY_DATE': _dates(ctx.persona_start, promised + days_late),
+            'REQUESTED_QUANTITY': requested,
+            'DELIVERED_QUANTITY': delivered,
+            'ON_TIME_FLAG': on_time,
+            'IN_FULL_FLAG': in_full,
+            'OTIF_FLAG': on_time & in_full,
+            'DAYS_EARLY_LATE': days_late,
+            'CREATED_TIMESTAMP': _timestamps(promised_date),
+        })
+        next_delivery_id += d
+
+        yield {
+            'purchase_order.csv': purchase_order,
+            'purchase_order_line.csv': purchase_order_line,
+            'delivery_performance.csv': delivery_performance,
+        }
+
+
+# =============================================================================
+# Market, operational and model series (fixed size)
+# =============================================================================
+
+def generate_market_series(ctx: GeneratorContext) -> Iterator[Dict[str, pd.DataFrame]]:
+    """Commodity indices, market indicators, operational metrics and the model registry."""
+    rng = ctx.rng('market')
+
+    # Weekly commodity index random walks over the core history
+    weeks, k = COMMODITY_WEEKS, len(COMMODITIES)
+    base = np.asarray([value for _, value in COMMODITIES])
+    returns = rng.normal(0, 0.015, (weeks, k))
+    returns[0] = 0
+    values = base * np.exp(np.cumsum(returns, axis=0))
+    weekly = np.vstack([rng.normal(0, 1.5, (1, k)), (values[1:] / values[:-1] - 1) * 100])
+    monthly = np.vstack([rng.normal(0, 3, (4, k)), (values[4:] / values[:-4] - 1) * 100])
+    index_dates = np.repeat(_dates(HISTORY_START, 7 * np.arange(weeks)), k)
+    n = weeks * k
+    commodity_names = np.tile([name for name, _ in COMMODITIES], weeks)
+    commodity_index = _frame(n, {
+        'INDEX_ID': np.arange(1, n + 1),
+        'INDEX_DATE': index_dates,
+        'COMMODITY_TYPE': commodity_names,
+        'COMMODITY_NAME': commodity_names,
+        'INDEX_VALUE': values.ravel().round(2),
+        'INDEX_UNIT': 'USD/UNIT',
+        'CURRENCY_ID': 1,
+        'PERCENTAGE_CHANGE_DAILY': (weekly.ravel() / 5 + rng.normal(0, 1, n)).round(4),
+        'PERCENTAGE_CHANGE_WEEKLY': weekly.ravel().round(4),
+        'PERCENTAGE_CHANGE_MONTHLY': monthly.ravel().round(4),
+        'DATA_SOURCE': _pick(rng, ['LME', 'COMEX', 'CME', 'ICE'], n),
+        'CREATED_TIMESTAMP': _timestamps(index_dates),
+    })
+
+    # Weekly market indicators over the persona window
+    weeks, k = INDICATOR_WEEKS, len(MARKET_INDICATORS)
+    base = np.asarray([value for _, _, value in MARKET_INDICATORS])
+    returns = rng.normal(0, 0.012, (weeks, k))
+    values = base * np.exp(np.cumsum(returns, axis=0))
+    n = weeks * k
+    market_indicators = _frame(n, {
+        'INDICATOR_ID': np.arange(1, n + 1),
+        'INDICATOR_DATE': np.repeat(_dates(ctx.persona_start, 7 * np.arange(weeks)), k),
+        'INDICATOR_NAME': np.tile([name for name, _, _ in MARKET_INDICATORS], weeks),
+        'INDICATOR_VALUE': values.ravel().round(4),
+        'PERCENTAGE_CHANGE': (returns.ravel() * 100).round(4),
+        'INDICATOR_TYPE': np.tile([kind for _, kind, _ in MARKET_INDICATORS], weeks),
+        'DATA_SOURCE': _pick(rng, INDICATOR_SOURCES, n),
+    })
+
+    # Monthly operational metrics; volumes follow the scale factor
+    months = EMISSION_PERIODS
+    operational_metrics = _frame(months, {
+        'METRIC_ID': np.arange(1, months + 1),
+        'METRIC_DATE': _dates(ctx.persona_start, 30 * np.arange(months)),
+        'TOTAL_PO_COUNT': np.round(rng.integers(400, 590, months) * ctx.scale).astype(np.int64),
+        'MAVERICK_SPEND_AMOUNT': (rng.uniform(450_000, 1_900_000, months) * ctx.scale).round(2),
+        'MANAGED_SPEND_AMOUNT': (rng.uniform(8_100_000, 12_000_000, months) * ctx.scale).round(2),
+        'PROCUREMENT_OPEX': (rng.uniform(155_000, 250_000, months) * ctx.scale).round(2),
+        'REALIZED_SAVINGS': (rng.uniform(290_000, 940_000, months) * ctx.scale).round(2),
+        'EMERGENCY_PO_COUNT': np.round(rng.integers(5, 26, months) * ctx.scale).astype(np.int64),
+        'AVG_CYCLE_TIME_DAYS': rng.uniform(3.4, 7.9, months).round(2),
+    })
+
+    # Monthly retrains of each demand model; the latest XGBoost version is deployed
+    n = len(MODELS) * MODEL_VERSIONS
+    version = np.tile(np.arange(1, MODEL_VERSIONS + 1), len(MODELS))
+    training_date = _timestamps(_dates(ctx.anchor, 30 * (version - MODEL_VERSIONS)))
+    deployed = (np.arange(n) == MODEL_VERSIONS - 1)
+    mae = rng.uniform(30, 70, n)
+    model_registry = _frame(n, {
+        'MODEL_ID': np.arange(1, n + 1),
+        'MODEL_NAME': np.repeat([name for name, _ in MODELS], MODEL_VERSIONS),
+        'MODEL_VERSION': np.char.add(np.char.add('v', version.astype(str)), '.0.0'),
+        'ALGORITHM': np.repeat([algorithm for _, algorithm in MODELS], MODEL_VERSIONS),
+        'TRAINING_DATE': training_date,
+        'MAE': mae.round(4),
+        'RMSE': (mae * rng.uniform(1.2, 1.45, n)).round(4),
+        'MAPE': rng.uniform(6, 18, n).round(4),
+        'R2_SCORE': rng.uniform(0.6, 0.92, n).round(6),
+        'FEATURE_COUNT': rng.integers(8, 16, n),
+        'TRAINING_SAMPLES': rng.integers(8500, 12000, n),
+        'IS_DEPLOYED': deployed,
+        'DEPLOYMENT_DATE': np.where(deployed, training_date, None),
+    })
+
+    yield {
+        'marketplace_commodity_index.csv': commodity_index,
+        'marketplace_indicators.csv': market_indicators,
+        'procurement_operational_metrics.csv': operational_metrics,
+        'model_registry.csv': model_registry,
+    }
+
+
+# Generators in output order; each yields {file name: block of rows}
+GENERATORS: List[Callable[[GeneratorContext], Iterator[Dict[str, pd.DataFrame]]]] = [
+    generate_reference,
+    generate_suppliers,
+    generate_supplier_documents,
+    generate_products,
+    generate_supplier_products,
+    generate_purchase_orders,
+    generate_emissions,
+    generate_forward_contracts,
+    generate_market_series,
+]
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+class TableWriter:
+    """Appends generated blocks of one table to a CSV or Parquet file."""
+
+    def __init__(self, path: str, file_format: str):
+        self.path = path
+        self.file_format = file_format
+        self.rows = 0
+        self._file = None
+        self._parquet = None
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.file_format == 'parquet':
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pa_parquet.ParquetWriter(self.path, table.schema)
+            else:
+                table = table.cast(self._parquet.schema)
+            self._parquet.write_table(table)
+        elif pa is None:
+            frame.to_csv(self.path, mode='a' if self.rows else 'w', header=not self.rows, index=False)
+        else:
+            # Arrow's CSV writer is several times faster than DataFrame.to_csv;
+            # booleans keep the True/False spelling of the checked-in files
+            if self._file is None:
+                self._file = open(self.path, 'wb')
+                self._file.write((','.join(frame.columns) + '\n').encode())
+            frame = frame.assign(**{
+                column: np.where(frame[column], 'True', 'False')
+                for column in frame.columns if frame[column].dtype == bool
+            })
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            pa_csv.write_csv(table, self._file, pa_csv.WriteOptions(include_header=False))
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def generate(output_dir: str, scale: float = 1, seed: int = DEFAULT_SEED,
+             anchor_date: str = DEFAULT_ANCHOR_DATE, file_format: str = 'csv') -> Dict[str, int]:
+    """
+    Generate the full synthetic dataset.
+
+    Args:
+        output_dir: Directory for the table files (created if missing)
+        scale: Scale factor between MIN_SCALE and MAX_SCALE
+        seed: Random seed
+        anchor_date: Last date (YYYY-MM-DD) of the persona extension tables
+        file_format: 'csv' or 'parquet'
+
+    Returns:
+        Dict of file name -> rows written
+    """
+    if not MIN_SCALE <= scale <= MAX_SCALE:
+        raise ValueError(f"scale must be between {MIN_SCALE} and {MAX_SCALE}, got {scale}")
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format '{file_format}'")
+    if file_format == 'parquet' and pa is None:
+        raise ImportError("Parquet output requires pyarrow")
+
+    ctx = GeneratorContext(seed=seed, scale=scale, anchor=np.datetime64(anchor_date, 'D'))
+    os.makedirs(output_dir, exist_ok=True)
+    writers: Dict[str, TableWriter] = {}
+    try:
+        for generator in GENERATORS:
+            for tables in generator(ctx):
+                for file_name, frame in tables.items():
+                    if file_format != 'csv':
+                        file_name = file_name.replace('.csv', f'.{file_format}')
+                    if file_name not in writers:
+                        writers[file_name] = TableWriter(os.path.join(output_dir, file_name), file_format)
+                    writers[file_name].write(frame)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return {name: writer.rows for name, writer in writers.items()}
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description='Generate Snowcore synthetic procurement data.')
+    parser.add_argument('--scale', type=float, default=1,
+                        help=f'Scale factor for all non-reference tables ({MIN_SCALE}-{MAX_SCALE}, default 1)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'Random seed (default {DEFAULT_SEED})')
+    parser.add_argument('--anchor-date', default=DEFAULT_ANCHOR_DATE,
+                        help=f'Last date of the persona extension tables (default {DEFAULT_ANCHOR_DATE})')
+    parser.add_argument('--format', choices=FORMATS, default='csv', dest='file_format',
+                        help='Output format (default csv; sql/07_load_data.sql loads CSV)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help='Output directory (default data/synthetic)')
+    args = parser.parse_args(argv)
+    if not MIN_SCALE <= args.scale <= MAX_SCALE:
+        parser.error(f"--scale must be between {MIN_SCALE} and {MAX_SCALE}")
+
+    start = time.perf_counter()
+    counts = generate(args.output_dir, scale=args.scale, seed=args.seed,
+                      anchor_date=args.anchor_date, file_format=args.file_format)
+    for name, rows in sorted(counts.items()):
+        print(f"  {name:<42} {rows:>12,} rows")
+    print(f"Generated {sum(counts.values()):,} rows in {len(counts)} files at {args.scale:g}x "
+          f"to {args.output_dir} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())